@@ -0,0 +1,117 @@
+# notebooks/awards_encoding.py
+"""
+CONSTRUCTION DE LA TABLE DES MÉDAILLES DÉDUPLIQUÉE (AWARDS)
+===========================================================
+
+Une médaille par (year, sport, event, medal, noc). Au lieu d'un
+drop_duplicates + sort_values sur cinq colonnes texte, chaque colonne clé
+est factorisée une seule fois en codes entiers (dictionnaire trié : l'ordre
+des codes est celui des chaînes), les codes sont empaquetés dans une clé
+int64 unique, et np.unique dédoublonne et trie en une passe.
+
+Sorties, à côté du CSV (inchangé) :
+- <nom>.codes.npz  : une colonne de codes int32 par colonne de la table
+- <nom>.dict.json  : les dictionnaires {colonne: [valeur du code 0, 1, ...]}
+
+Un service peut ainsi charger la table directement sous forme entière.
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+KEY_COLS = ["year", "sport", "event", "medal", "noc"]
+# ordre de tri de la table (et d'empaquetage de la clé)
+SORT_COLS = ["year", "sport", "event", "noc", "medal"]
+AWARD_COLS = ["year", "season", "sport", "event", "event_gender", "noc", "country", "medal", "award_count"]
+
+
+def encode_column(values):
+    """Codes entiers triés ; les valeurs manquantes prennent le dernier code (comme sort_values)"""
+    codes, uniques = pd.factorize(values, sort=True)
+    codes = codes.astype(np.int64)
+    dictionary = [_to_json(v) for v in uniques]
+    missing = codes < 0
+    if missing.any():
+        codes[missing] = len(dictionary)
+        dictionary.append(None)
+    return codes, dictionary
+
+
+def pack_keys(code_columns, cardinalities):
+    """Clé int64 en base mixte : l'ordre des clés est l'ordre lexicographique des codes"""
+    total = 1
+    for size in cardinalities:
+        total *= max(size, 1)
+    if total >= 2 ** 63:
+        raise OverflowError(f"Clé trop large pour int64 (cardinalités {cardinalities})")
+
+    key = np.zeros(len(code_columns[0]), dtype=np.int64)
+    for codes, size in zip(code_columns, cardinalities):
+        key = key * max(size, 1) + codes
+    return key
+
+
+def build_awards(df):
+    """Table awards dédupliquée et triée + dictionnaires des colonnes clés"""
+    encoded = {c: encode_column(df[c].to_numpy()) for c in SORT_COLS}
+    key = pack_keys([encoded[c][0] for c in SORT_COLS], [len(encoded[c][1]) for c in SORT_COLS])
+
+    # np.unique trie les clés et renvoie la première occurrence de chacune
+    _, first = np.unique(key, return_index=True)
+
+    awards = df.iloc[first].copy()
+    awards["award_count"] = 1
+    keep = [c for c in AWARD_COLS if c in awards.columns]
+    awards = awards[keep]
+    return awards, {c: encoded[c][1] for c in SORT_COLS}
+
+
+def encode_table(awards, dictionaries=None):
+    """Codes int32 de toutes les colonnes (award_count exclu) ; réutilise les dictionnaires déjà calculés"""
+    dictionaries = dict(dictionaries or {})
+    codes = {}
+    for c in awards.columns:
+        if c == "award_count":
+            continue
+        column_codes, dictionary = encode_column(awards[c].to_numpy())
+        if c in dictionaries:
+            # remapper sur le dictionnaire complet (construit avant déduplication)
+            lookup = {v: i for i, v in enumerate(dictionaries[c])}
+            column_codes = np.array([lookup[v] for v in dictionary], dtype=np.int64)[column_codes]
+        else:
+            dictionaries[c] = dictionary
+        codes[c] = column_codes.astype(np.int32)
+    return codes, dictionaries
+
+
+def write_awards(awards, dictionaries, out_csv):
+    """CSV + codes (.codes.npz) + dictionnaires (.dict.json) ; retourne les chemins écrits"""
+    out_csv = Path(out_csv)
+    codes, dictionaries = encode_table(awards, dictionaries)
+    codes_path = out_csv.with_suffix(".codes.npz")
+    dict_path = out_csv.with_suffix(".dict.json")
+
+    awards.to_csv(out_csv, index=False, encoding="utf-8")
+    np.savez_compressed(codes_path, award_count=awards["award_count"].to_numpy(np.int32), **codes)
+    with open(dict_path, "w", encoding="utf-8") as f:
+        json.dump({"columns": list(awards.columns), "dictionaries": dictionaries}, f, ensure_ascii=False)
+    return out_csv, codes_path, dict_path
+
+
+def load_awards_codes(out_csv):
+    """Relire la forme entière : ({colonne: codes}, {colonne: dictionnaire})"""
+    out_csv = Path(out_csv)
+    with np.load(out_csv.with_suffix(".codes.npz")) as data:
+        codes = {k: data[k] for k in data.files}
+    with open(out_csv.with_suffix(".dict.json"), encoding="utf-8") as f:
+        dictionaries = json.load(f)["dictionaries"]
+    return codes, dictionaries
+
+
+def _to_json(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
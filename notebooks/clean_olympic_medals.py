@@ -19,10 +19,13 @@ TECHNIQUES UTILISÉES :
 - Validation de la qualité des données
 """
 
-import os, re
+import os, re, sys
 from pathlib import Path
 import pandas as pd
 
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from awards_encoding import KEY_COLS, build_awards, write_awards
+
 # ---------- CONFIGURATION DES CHEMINS ----------
 # Organisation de notre structure de données
 BASE  = Path(__file__).resolve().parent           # .../notebooks
@@ -34,7 +37,7 @@ CLEAN.mkdir(parents=True, exist_ok=True)          # Créer le dossier si nécess
 # ---------- DÉFINITION DES FICHIERS ----------
 # Fichiers d'entrée et de sortie pour notre pipeline
 xlsx_path   = RAW / "olympic_medals.xlsx"              # Données brutes Excel
-hosts_path  = CLEAN / "olympic_hosts.csv"              # Pays hôtes (nettoyés précédemment)
+hosts_path  = CLEAN / "olympic_hosts_clean.csv"        # Pays hôtes (sortie de clean_olympic_hosts.py)
 out_clean   = CLEAN / "olympic_medals_clean.csv"       # Médailles nettoyées
 out_awards  = CLEAN / "olympic_medal_awards.csv"       # Vue agrégée des médailles
 
@@ -109,10 +112,11 @@ df.loc[df["medal"]=="BRONZE", "bronze"] = 1
 season = None
 if hosts_path.exists():
     hosts = pd.read_csv(hosts_path)
-    # hosts has 'year' and 'season' from previous step
-    season_map = dict(zip(hosts["year"], hosts["season"]))
-    if "year" in df.columns:
-        df["season"] = df["year"].map(season_map)
+    # hosts has 'slug' and 'season' from previous step ; join on the Games slug, not the year
+    # (1924-1992: Summer and Winter Games the same year)
+    season_map = dict(zip(hosts["slug"], hosts["season"]))
+    if "games_slug" in df.columns:
+        df["season"] = df["games_slug"].map(season_map)
 else:
     print(" Could not find hosts csv, skipping season join:", hosts_path)
 
@@ -147,21 +151,12 @@ print(f" Saved normalized medalists/teams rows → {out_clean} ({len(df_clean)}
 # ---------- OPTIONAL: build a deduplicated 'awards' table ----------
 # One medal per (year, sport, event, medal, noc)
 # This avoids counting multiple rows for the same team medal.
-key_cols = [c for c in ["year","sport","event","medal","noc"] if c in df_clean.columns]
+# Dédoublonnage/tri sur une clé entière empaquetée (voir awards_encoding.py) ;
+# les codes et dictionnaires sont écrits à côté du CSV.
+key_cols = [c for c in KEY_COLS if c in df_clean.columns]
 if len(key_cols) == 5:
-    awards = (df_clean
-              .drop_duplicates(subset=key_cols)
-              .copy())
-
-    # keep one representative row; add a 'award_count' column = 1
-    awards["award_count"] = 1
-
-    # reorder a compact set of columns
-    keep_awards = [c for c in [
-        "year","season","sport","event","event_gender","noc","country","medal","award_count"
-    ] if c in awards.columns]
-    awards = awards[keep_awards].sort_values(["year","sport","event","noc","medal"])
-    awards.to_csv(out_awards, index=False, encoding="utf-8")
-    print(f" Saved deduplicated medal awards → {out_awards} ({len(awards)} rows)")
+    awards, dictionaries = build_awards(df_clean)
+    write_awards(awards, dictionaries, out_awards)
+    print(f" Saved deduplicated medal awards → {out_awards} ({len(awards)} rows, + .codes.npz/.dict.json)")
 else:
     print(" Skipped awards aggregation (missing one of: year, sport, event, medal, noc)")
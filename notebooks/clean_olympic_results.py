@@ -1,4 +1,16 @@
 # notebooks/clean_olympic_results.py
+"""
+Nettoyage de olympic_results.html -> olympic_results_clean.csv + olympic_results_awards.csv
+
+Par défaut, l'export HTML est lu en flux (lxml iterparse sur les <tr>) et traité par
+blocs de --chunksize lignes : chaque bloc passe par normalisation / explosion des
+athlètes / drapeaux de médailles puis est ajouté au CSV de sortie. La mémoire reste
+bornée quelle que soit la taille de l'export ; les lignes détaillées sont écrites dans
+l'ordre du fichier source.
+
+--chunksize 0 : ancien mode en mémoire (pd.read_html), sortie détaillée triée.
+"""
+import argparse
 import ast
 import re
 import pandas as pd
@@ -8,55 +20,134 @@ from pathlib import Path
 ROOT  = Path(__file__).resolve().parents[1]
 RAW   = ROOT / "data" / "raw"
 CLEAN = ROOT / "data" / "clean"
-CLEAN.mkdir(parents=True, exist_ok=True)
 
 HTML_IN   = RAW / "olympic_results.html"
 HOSTS_IN  = CLEAN / "olympic_hosts_clean.csv"  # join season if available
 OUT_DETA  = CLEAN / "olympic_results_clean.csv"
 OUT_AWARD = CLEAN / "olympic_results_awards.csv"
 
-print(f"Input exists? {HTML_IN.exists()} -> {HTML_IN}")
-if not HTML_IN.exists():
-    raise FileNotFoundError(f"Place olympic_results.html in {RAW}")
+DEFAULT_CHUNKSIZE = 50_000
+
+# Valeurs lues comme manquantes par pd.read_html (na_values par défaut de pandas)
+NA_STRINGS = {"", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+              "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null"}
+
+STRING_COLS = ["discipline_title","event_title","slug_game","participant_type","medal_type",
+               "country_name","country_code","country_3_letter_code","athlete_url","athlete_full_name",
+               "value_unit","value_type","rank_equal","rank_position"]
+
+# Standard column order
+KEEP_COLS = [
+    "year","season","slug_game",
+    "discipline_title","event_title","participant_type",
+    "medal_type","gold","silver","bronze",
+    "rank_equal","rank_position","rank_position_num",
+    "country_name","country_code","country_3_letter_code",
+    "athlete_full_name","athlete_url",
+    "value_type","value_unit"
+]
+
 
 # -------- load html table --------
-# Use pandas to parse first table; fallback to manual BeautifulSoup if needed
-try:
-    df = pd.read_html(HTML_IN)[0]
-except Exception:
-    from bs4 import BeautifulSoup
-    html = HTML_IN.read_text(encoding="utf-8", errors="ignore")
-    soup = BeautifulSoup(html, "html.parser")
-    rows = []
-    for tr in soup.select("table tr"):
-        cells = [td.get_text(strip=True) for td in tr.find_all(["th","td"])]
-        rows.append(cells)
-    df = pd.DataFrame(rows[1:], columns=rows[0])
+def read_html_full(path):
+    """Mode en mémoire : pandas pour la première table, BeautifulSoup en secours"""
+    try:
+        return pd.read_html(path)[0]
+    except Exception:
+        from bs4 import BeautifulSoup
+        html = Path(path).read_text(encoding="utf-8", errors="ignore")
+        soup = BeautifulSoup(html, "html.parser")
+        rows = []
+        for tr in soup.select("table tr"):
+            cells = [td.get_text(strip=True) for td in tr.find_all(["th","td"])]
+            rows.append(cells)
+        return pd.DataFrame(rows[1:], columns=rows[0])
+
+
+def iter_html_rows(path):
+    """Cellules de chaque <tr> de la première table, sans garder l'arbre en mémoire
+
+    Comme pd.read_html(...)[0] : les lignes des tables suivantes (et des tables imbriquées)
+    sont ignorées, et la lecture s'arrête à la fermeture de la première table.
+    """
+    from lxml import etree
+
+    depth = 0
+    for event, element in etree.iterparse(str(path), events=("start", "end"), tag=("table", "tr"),
+                                          html=True, huge_tree=True):
+        if element.tag == "table":
+            depth += 1 if event == "start" else -1
+            if event == "end" and depth == 0:
+                return
+            continue
+        if event != "end" or depth != 1:
+            continue
+        tr = element
+        texts = ("".join(cell.itertext()).strip() for cell in tr if cell.tag in ("td", "th"))
+        yield [None if t in NA_STRINGS else t for t in texts]
+        # libérer la ligne traitée et les précédentes
+        tr.clear(keep_tail=True)
+        parent = tr.getparent()
+        while tr.getprevious() is not None:
+            del parent[0]
+
+
+def iter_html_chunks(path, chunksize):
+    """DataFrames de `chunksize` lignes ; la première ligne fournit les en-têtes"""
+    rows = iter_html_rows(path)
+    header = next(rows, None)
+    if header is None:
+        return
+    # même nommage que pd.read_html pour les en-têtes vides (colonne d'index)
+    columns = [h if h else f"Unnamed: {i}" for i, h in enumerate(header)]
+    n = len(columns)
+
+    buffer = []
+    for cells in rows:
+        if len(cells) != n:
+            cells = (cells + [None] * n)[:n]
+        buffer.append(cells)
+        if len(buffer) >= chunksize:
+            yield pd.DataFrame(buffer, columns=columns)
+            buffer = []
+    if buffer:
+        yield pd.DataFrame(buffer, columns=columns)
+
 
 # -------- basic tidy --------
-df.columns = [str(c).strip().lower().replace(" ", "_") for c in df.columns]
-for junk in ["unnamed:_0", "index"]:
-    if junk in df.columns:
-        df = df.drop(columns=[junk])
-
-# Normalize strings
-for c in ["discipline_title","event_title","slug_game","participant_type","medal_type",
-          "country_name","country_code","country_3_letter_code","athlete_url","athlete_full_name",
-          "value_unit","value_type","rank_equal","rank_position"]:
-    if c in df.columns:
-        df[c] = df[c].astype(str).str.strip()
-
-# Extract year
-df["year"] = pd.to_numeric(df["slug_game"].str.extract(r"(\d{4})")[0], errors="coerce").astype("Int64")
-
-# Standardize medal field, upper
-if "medal_type" not in df.columns:
-    df["medal_type"] = ""
-df["medal_type"] = df["medal_type"].fillna("").str.upper()
+def tidy(df):
+    df = df.copy()
+    df.columns = [str(c).strip().lower().replace(" ", "_") for c in df.columns]
+    for junk in ["unnamed:_0", "index"]:
+        if junk in df.columns:
+            df = df.drop(columns=[junk])
+
+    # Normalize strings (cellules vides -> "" et non "nan")
+    for c in STRING_COLS:
+        if c in df.columns:
+            df[c] = df[c].fillna("").astype(str).str.strip()
+
+    # Extract year
+    df["year"] = pd.to_numeric(df["slug_game"].str.extract(r"(\d{4})")[0], errors="coerce").astype("Int64")
+
+    # Standardize medal field, upper
+    if "medal_type" not in df.columns:
+        df["medal_type"] = ""
+    df["medal_type"] = df["medal_type"].fillna("").str.upper()
+    return df
+
 
 # -------- expand 'athletes' (list of (name, url)) to rows --------
 # Example value: "[('Name SURNAME','https://...'), ('Teammate','https://...')]"
+_QUOTED = r"""(?:'[^'\\\n]*'|"[^"\\\n]*")"""
+_ITEM = rf"(?:\(\s*{_QUOTED}\s*(?:,\s*(?:{_QUOTED}|None)\s*)?,?\s*\)|{_QUOTED})"
+# Liste de tuples (nom, url) ou de chaînes, sans échappement : cas extrait par regex
+WELL_FORMED_RE = re.compile(rf"\s*\[\s*(?:{_ITEM}\s*,\s*)*(?:{_ITEM}\s*,?\s*)?\]\s*")
+ITEM_RE = re.compile(rf"\(\s*(?P<name_t>{_QUOTED})\s*(?:,\s*(?P<url>{_QUOTED}|None)\s*)?,?\s*\)|(?P<name_s>{_QUOTED})")
+
+
 def parse_athletes(cell):
+    """Chemin de secours cellule par cellule (cellules mal formées uniquement)"""
     if pd.isna(cell) or not str(cell).strip():
         return []
     s = str(cell)
@@ -80,69 +171,95 @@ def parse_athletes(cell):
         names = re.findall(r"'([^']+)'", s)
         return [(n, "") for n in names]
 
-# explode athletes into separate rows (keep original row if none)
-df["_ath_list"] = df.get("athletes", "").apply(parse_athletes)
-has_list = df["_ath_list"].apply(lambda x: len(x) > 0)
-
-# Build exploded frame
-exploded = df[has_list].explode("_ath_list").copy()
-if not exploded.empty:
-    exploded["athlete_full_name_from_list"] = exploded["_ath_list"].apply(lambda t: t[0] if isinstance(t, (list, tuple)) else "")
-    exploded["athlete_url_from_list"]       = exploded["_ath_list"].apply(lambda t: t[1] if isinstance(t, (list, tuple)) and len(t) > 1 else "")
-
-# Merge athlete columns: prefer explicit athlete_full_name if present; else from list
-if not exploded.empty:
-    exploded["athlete_full_name"] = exploded["athlete_full_name"].where(
-        exploded["athlete_full_name"].astype(str).str.len() > 0,
-        exploded["athlete_full_name_from_list"]
-    )
-    exploded["athlete_url"] = exploded["athlete_url"].where(
-        exploded["athlete_url"].astype(str).str.len() > 0,
-        exploded["athlete_url_from_list"]
-    )
-
-# Combine: rows without list + exploded rows
-without_list = df[~has_list].copy()
-df_expanded = pd.concat([without_list, exploded.drop(columns=["_ath_list","athlete_full_name_from_list","athlete_url_from_list"], errors="ignore")],
-                        ignore_index=True)
-
-# -------- create medal flags --------
-for m in ["gold","silver","bronze"]:
-    df_expanded[m] = 0
-df_expanded.loc[df_expanded["medal_type"]=="GOLD","gold"] = 1
-df_expanded.loc[df_expanded["medal_type"]=="SILVER","silver"] = 1
-df_expanded.loc[df_expanded["medal_type"]=="BRONZE","bronze"] = 1
-
-# Rank to numeric where possible
-if "rank_position" in df_expanded.columns:
-    df_expanded["rank_position_num"] = pd.to_numeric(df_expanded["rank_position"], errors="coerce").astype("Int64")
-
-# Join season from hosts (optional)
-if HOSTS_IN.exists():
-    hosts = pd.read_csv(HOSTS_IN)
-    season_map = dict(zip(hosts["year"], hosts["season"]))
-    df_expanded["season"] = df_expanded["year"].map(season_map)
 
-# Standard column order
-keep_cols = [
-    "year","season","slug_game",
-    "discipline_title","event_title","participant_type",
-    "medal_type","gold","silver","bronze",
-    "rank_equal","rank_position","rank_position_num",
-    "country_name","country_code","country_3_letter_code",
-    "athlete_full_name","athlete_url",
-    "value_type","value_unit"
-]
-keep_cols = [c for c in keep_cols if c in df_expanded.columns]
-results_clean = df_expanded[keep_cols].copy().sort_values(["year","discipline_title","event_title","rank_position_num"], na_position="last")
+def extract_athletes(cells):
+    """(nom, url) par athlète, indexés par (ligne d'origine, position dans la liste)
+
+    Une seule regex compilée via Series.str.extractall sur toute la colonne ; seules
+    les cellules qui ne correspondent pas à la forme attendue passent par parse_athletes.
+    """
+    text = cells.fillna("").astype(str)
+    nonempty = text.str.strip().str.len() > 0
+    well_formed = nonempty & text.str.fullmatch(WELL_FORMED_RE)
+
+    m = text[well_formed].str.extractall(ITEM_RE)
+    parts = [pd.DataFrame({
+        "name": m["name_t"].fillna(m["name_s"]).str[1:-1].str.strip(),
+        "url": m["url"].where(m["url"] != "None").str[1:-1].str.strip().fillna(""),
+    }, index=m.index)]
+
+    malformed = text[nonempty & ~well_formed]
+    if not malformed.empty:
+        parsed = malformed.apply(parse_athletes).explode().dropna()
+        if not parsed.empty:
+            position = parsed.groupby(level=0).cumcount()
+            parts.append(pd.DataFrame({
+                "name": [t[0] for t in parsed],
+                "url": [t[1] for t in parsed],
+            }, index=pd.MultiIndex.from_arrays([parsed.index, position], names=m.index.names)))
+
+    pairs = pd.concat(parts)
+    return pairs.sort_index(level=[0, 1], sort_remaining=False)
+
+
+def explode_athletes(df):
+    """Une ligne par athlète de la liste 'athletes' (ligne d'origine gardée si liste vide)"""
+    df = df.reset_index(drop=True)
+    for c in ["athlete_full_name", "athlete_url"]:
+        if c not in df.columns:
+            df[c] = ""
+    if "athletes" not in df.columns:
+        return df
+
+    pairs = extract_athletes(df["athletes"])
+    rows = pairs.index.get_level_values(0)
+    has_list = df.index.isin(rows)
+
+    # Build exploded frame: ligne d'origine répétée pour chaque athlète, dans l'ordre de la liste
+    exploded = df.loc[rows].reset_index(drop=True)
+    if not exploded.empty:
+        # Merge athlete columns: prefer explicit athlete_full_name if present; else from list
+        exploded["athlete_full_name"] = exploded["athlete_full_name"].where(
+            exploded["athlete_full_name"].astype(str).str.len() > 0,
+            pairs["name"].to_numpy()
+        )
+        exploded["athlete_url"] = exploded["athlete_url"].where(
+            exploded["athlete_url"].astype(str).str.len() > 0,
+            pairs["url"].to_numpy()
+        )
+
+    # Combine: rows without list + exploded rows
+    without_list = df[~has_list]
+    return pd.concat([without_list, exploded], ignore_index=True)
+
+
+def add_flags(df_expanded, season_map):
+    # -------- create medal flags --------
+    for m in ["gold","silver","bronze"]:
+        df_expanded[m] = 0
+    df_expanded.loc[df_expanded["medal_type"]=="GOLD","gold"] = 1
+    df_expanded.loc[df_expanded["medal_type"]=="SILVER","silver"] = 1
+    df_expanded.loc[df_expanded["medal_type"]=="BRONZE","bronze"] = 1
+
+    # Rank to numeric where possible
+    if "rank_position" in df_expanded.columns:
+        df_expanded["rank_position_num"] = pd.to_numeric(df_expanded["rank_position"], errors="coerce").astype("Int64")
+
+    # Join season from hosts (optional), on the Games slug: Summer and Winter Games share years until 1992
+    if season_map is not None:
+        df_expanded["season"] = df_expanded["slug_game"].map(season_map)
+    return df_expanded
+
+
+def transform(df, season_map):
+    """tidy -> explosion des athlètes -> drapeaux ; colonnes dans l'ordre standard"""
+    out = add_flags(explode_athletes(tidy(df)), season_map)
+    return out[[c for c in KEEP_COLS if c in out.columns]]
 
-# Save detailed results
-results_clean.to_csv(OUT_DETA, index=False, encoding="utf-8")
-print(f" saved detailed results -> {OUT_DETA}  (rows: {len(results_clean)})")
 
 # -------- build awards table (1 row per medal award per NOC/event/year) --------
-# Keep only rows with a medal; deduplicate by (year, sport, event, medal, NOC)
-if not results_clean.empty and "country_3_letter_code" in results_clean.columns:
+def award_rows(results_clean):
+    """Lignes médaillées, renommées ; la déduplication se fait sur la clé (year, sport, event, medal, noc)"""
     awards = results_clean[results_clean["medal_type"].isin(["GOLD","SILVER","BRONZE"])].copy()
     # rename for consistency
     awards = awards.rename(columns={
@@ -152,21 +269,111 @@ if not results_clean.empty and "country_3_letter_code" in results_clean.columns:
         "country_name":"country",
         "medal_type":"medal"
     })
+    keep_aw = [c for c in ["year","season","sport","event","noc","country","medal"] if c in awards.columns]
+    return awards[keep_aw]
+
+
+def finalize_awards(awards):
     key = ["year","sport","event","medal","noc"]
     awards = awards.drop_duplicates(subset=[k for k in key if k in awards.columns]).copy()
     awards["award_count"] = 1
-    # thin columns
-    keep_aw = [c for c in ["year","season","sport","event","noc","country","medal","award_count"] if c in awards.columns]
-    awards = awards[keep_aw].sort_values(["year","sport","event","noc","medal"])
-    awards.to_csv(OUT_AWARD, index=False, encoding="utf-8")
-    print(f" saved medal awards -> {OUT_AWARD}  (rows: {len(awards)})")
-else:
-    print(" skipped awards build (no medal rows or missing NOC column)")
-
-# -------- quick sanity prints --------
-print("\nNulls (results_clean):")
-print(results_clean.isnull().sum().sort_values(ascending=False).head(12))
-
-if HOSTS_IN.exists():
-    fr = results_clean[results_clean["country_name"].str.upper()=="FRANCE"]
-    print("\nFrance medal rows in results (sample):", len(fr[fr['gold']+fr['silver']+fr['bronze']>0]))
+    return awards.sort_values(["year","sport","event","noc","medal"])
+
+
+def load_season_map():
+    if HOSTS_IN.exists():
+        hosts = pd.read_csv(HOSTS_IN)
+        return dict(zip(hosts["slug"], hosts["season"]))
+    return None
+
+
+def run_in_memory(html_in, season_map):
+    results_clean = transform(read_html_full(html_in), season_map)
+    results_clean = results_clean.sort_values(["year","discipline_title","event_title","rank_position_num"], na_position="last")
+    has_noc = "country_3_letter_code" in results_clean.columns
+    awards = finalize_awards(award_rows(results_clean)) if has_noc and not results_clean.empty else None
+    return results_clean, awards
+
+
+def run_streaming(html_in, out_deta, season_map, chunksize):
+    """Traitement par blocs ; renvoie (nb lignes, nulls cumulés, lignes FR médaillées, awards)"""
+    rows = 0
+    nulls = None
+    france_medal_rows = 0
+    award_parts = []
+    key_cols = ["year","sport","event","medal","noc"]
+
+    tmp = out_deta.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8", newline="") as f:
+        for i, chunk in enumerate(iter_html_chunks(html_in, chunksize)):
+            part = transform(chunk, season_map)
+            part.to_csv(f, index=False, header=(i == 0))
+            rows += len(part)
+
+            chunk_nulls = part.isnull().sum()
+            nulls = chunk_nulls if nulls is None else nulls.add(chunk_nulls, fill_value=0)
+            if "country_name" in part.columns:
+                fr = part[part["country_name"].str.upper() == "FRANCE"]
+                france_medal_rows += int((fr["gold"] + fr["silver"] + fr["bronze"] > 0).sum())
+
+            if "country_3_letter_code" in part.columns:
+                # dédupliquer au fil de l'eau : seules les récompenses restent en mémoire
+                aw = award_rows(part)
+                award_parts.append(aw.drop_duplicates(subset=[k for k in key_cols if k in aw.columns]))
+            print(f"  chunk {i + 1}: {len(chunk)} rows in -> {len(part)} rows out (total {rows})")
+    tmp.replace(out_deta)
+
+    awards = finalize_awards(pd.concat(award_parts, ignore_index=True)) if award_parts else None
+    if awards is not None and awards.empty:
+        awards = None
+    return rows, nulls, france_medal_rows, awards
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--input", type=Path, default=HTML_IN)
+    parser.add_argument("--out-dir", type=Path, default=CLEAN)
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE,
+                        help=f"lignes HTML par bloc (défaut: {DEFAULT_CHUNKSIZE}, 0 = tout en mémoire)")
+    args = parser.parse_args(argv)
+
+    html_in = args.input
+    args.out_dir.mkdir(parents=True, exist_ok=True)
+    out_deta = args.out_dir / OUT_DETA.name
+    out_award = args.out_dir / OUT_AWARD.name
+
+    print(f"Input exists? {html_in.exists()} -> {html_in}")
+    if not html_in.exists():
+        raise FileNotFoundError(f"Place olympic_results.html in {RAW}")
+
+    season_map = load_season_map()
+
+    if args.chunksize > 0:
+        rows, nulls, france_medal_rows, awards = run_streaming(html_in, out_deta, season_map, args.chunksize)
+    else:
+        results_clean, awards = run_in_memory(html_in, season_map)
+        # Save detailed results
+        results_clean.to_csv(out_deta, index=False, encoding="utf-8")
+        rows, nulls = len(results_clean), results_clean.isnull().sum()
+        fr = results_clean[results_clean["country_name"].str.upper()=="FRANCE"]
+        france_medal_rows = len(fr[fr['gold']+fr['silver']+fr['bronze']>0])
+    print(f" saved detailed results -> {out_deta}  (rows: {rows})")
+
+    # Keep only rows with a medal; deduplicate by (year, sport, event, medal, NOC)
+    if awards is not None:
+        awards.to_csv(out_award, index=False, encoding="utf-8")
+        print(f" saved medal awards -> {out_award}  (rows: {len(awards)})")
+    else:
+        print(" skipped awards build (no medal rows or missing NOC column)")
+
+    # -------- quick sanity prints --------
+    if nulls is not None:
+        print("\nNulls (results_clean):")
+        print(nulls.astype(int).sort_values(ascending=False).head(12))
+
+    if season_map is not None:
+        print("\nFrance medal rows in results (sample):", france_medal_rows)
+
+
+if __name__ == "__main__":
+    main()
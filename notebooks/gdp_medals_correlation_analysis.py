@@ -10,7 +10,7 @@ import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 from scipy.stats import pearsonr, spearmanr
-import requests
+import sys
 import json
 from pathlib import Path
 import warnings
@@ -25,6 +25,10 @@ OUTPUT = ROOT / "data" / "analysis"
 # Créer le dossier d'analyse s'il n'existe pas
 OUTPUT.mkdir(parents=True, exist_ok=True)
 
+# Service PIB du backend (API Banque Mondiale + fichier local data/clean/world_bank_gdp.json)
+sys.path.insert(0, str(ROOT / "webapp" / "backend"))
+from services.gdp_data_service import GDPDataService
+
 class GDPMedalsAnalyzer:
     """Analyseur de corrélation entre PIB et médailles olympiques"""
     
@@ -132,45 +136,27 @@ class GDPMedalsAnalyzer:
             return False
     
     def fetch_world_bank_gdp_data(self, countries=None, years=None):
-        """Récupérer les données PIB de la Banque Mondiale via API"""
+        """Récupérer les données PIB de la Banque Mondiale (requêtes groupées, fichier local partagé avec le backend)"""
         if years is None:
             years = list(range(2015, 2024))  # Données récentes
         
         if countries is None:
             countries = list(self.country_mapping.values())
         
-        gdp_data = {}
+        service = GDPDataService()
+        summary = service.refresh(countries, years)
+        print(f"✅ PIB : {summary['fetched']} pays téléchargés, {summary['up_to_date'] + summary['not_modified']} déjà à jour")
+        for error in summary['errors']:
+            print(f"⚠️ Erreur API pour {', '.join(error['countries'])}: {error['error']}")
         
+        # Relire le fichier local : fonctionne aussi hors ligne si l'API est injoignable
+        store = service.load_store()
+        gdp_data = {}
         for country_code in countries:
-            try:
-                # API de la Banque Mondiale pour le PIB (NY.GDP.MKTP.CD)
-                url = f"http://api.worldbank.org/v2/country/{country_code}/indicator/NY.GDP.MKTP.CD"
-                params = {
-                    'date': f"{min(years)}:{max(years)}",
-                    'format': 'json',
-                    'per_page': 1000
-                }
-                
-                response = requests.get(url, params=params, timeout=10)
-                if response.status_code == 200:
-                    data = response.json()
-                    if len(data) > 1 and data[1]:
-                        country_gdp = {}
-                        for item in data[1]:
-                            if item['value'] is not None:
-                                year = int(item['date'])
-                                if year in years:
-                                    country_gdp[year] = item['value'] / 1e9  # Convertir en milliards USD
-                        gdp_data[country_code] = country_gdp
-                        print(f"✅ PIB récupéré pour {country_code}: {len(country_gdp)} années")
-                    else:
-                        print(f"⚠️ Aucune donnée PIB pour {country_code}")
-                else:
-                    print(f"⚠️ Erreur API pour {country_code}: {response.status_code}")
-                    
-            except Exception as e:
-                print(f"❌ Erreur lors de la récupération du PIB pour {country_code}: {e}")
-                continue
+            entry = store['countries'].get(country_code, {})
+            country_gdp = {int(y): v for y, v in entry.get('values', {}).items() if int(y) in years}
+            if country_gdp:
+                gdp_data[country_code] = country_gdp
         
         self.gdp_data = gdp_data
         return gdp_data
@@ -1,7 +1,11 @@
 # notebooks/patch_medals_v2.py
+import sys
 import pandas as pd
 from pathlib import Path
-ROOT = Path("C:/Users/hasso/olympic-prediction_2026")
+ROOT = Path(__file__).resolve().parents[1]      # repo root
+
+sys.path.insert(0, str(ROOT / "notebooks"))
+from awards_encoding import KEY_COLS, build_awards, write_awards
 
 IN  = ROOT / "data" / "clean" / "olympic_medals_clean.csv"
 OUT = ROOT / "data" / "clean" / "olympic_medals_clean_v2.csv"
@@ -69,14 +73,11 @@ med.to_csv(OUT, index=False, encoding="utf-8")
 print(f" Saved v2 -> {OUT}  (rows: {len(med)})")
 
 # 7) Optional: deduplicated awards (one medal per (year,sport,event,medal,noc))
-key = [c for c in ["year","sport","event","medal","noc"] if c in med.columns]
+key = [c for c in KEY_COLS if c in med.columns]
 if len(key) == 5:
-    awards = med.drop_duplicates(subset=key).copy()
-    awards["award_count"] = 1
-    keep = [c for c in ["year","season","sport","event","event_gender","noc","country","medal","award_count"] if c in awards.columns]
-    awards = awards[keep].sort_values(["year","sport","event","noc","medal"])
-    awards.to_csv(OUT_AWARDS, index=False, encoding="utf-8")
-    print(f" Saved awards v2 -> {OUT_AWARDS}  (rows: {len(awards)})")
+    awards, dictionaries = build_awards(med)
+    write_awards(awards, dictionaries, OUT_AWARDS)
+    print(f" Saved awards v2 -> {OUT_AWARDS}  (rows: {len(awards)}, + .codes.npz/.dict.json)")
 else:
     print(" Skipped awards v2 (missing one of: year, sport, event, medal, noc)")
 
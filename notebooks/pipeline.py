@@ -0,0 +1,292 @@
+# notebooks/pipeline.py
+"""
+PIPELINE DE NETTOYAGE DES DONNÉES (data/raw -> data/clean)
+==========================================================
+
+Chaque étape déclare le script clean_* qu'elle exécute, ses fichiers d'entrée et
+ses fichiers de sortie. L'ordre d'exécution est déduit des dépendances
+(une étape dépend de celle qui produit un de ses fichiers d'entrée).
+
+- Une étape est sautée si le hash (SHA-256) de ses entrées et de son script est
+  identique à la dernière exécution réussie et que ses sorties sont intactes.
+- Les étapes indépendantes tournent en parallèle dans des processus séparés.
+- L'état est conservé dans data/clean/.pipeline_state.json.
+
+Usage :
+    python notebooks/pipeline.py                  # reconstruire ce qui a changé
+    python notebooks/pipeline.py --dry-run        # afficher le plan sans rien exécuter
+    python notebooks/pipeline.py medals --force   # forcer une étape (et ses dépendantes)
+    python notebooks/pipeline.py --list
+"""
+
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import os
+import runpy
+import sys
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+
+BASE  = Path(__file__).resolve().parent           # .../notebooks
+ROOT  = BASE.parent                               # repo root
+RAW   = ROOT / "data" / "raw"
+CLEAN = ROOT / "data" / "clean"
+STATE_PATH = CLEAN / ".pipeline_state.json"
+
+
+@dataclass
+class Stage:
+    name: str
+    script: str
+    inputs: list
+    outputs: list
+    depends_on: list = field(default_factory=list)   # rempli par resolve_dependencies
+
+
+STAGES = [
+    Stage("hosts", "clean_olympic_hosts.py",
+          inputs=[RAW / "olympic_hosts.xml"],
+          outputs=[CLEAN / "olympic_hosts_clean.csv"]),
+    Stage("athletes", "clean_olympic_athletes.py",
+          inputs=[RAW / "olympic_athletes.json"],
+          outputs=[CLEAN / "olympic_athletes_clean.csv"]),
+    Stage("medals", "clean_olympic_medals.py",
+          inputs=[RAW / "olympic_medals.xlsx", CLEAN / "olympic_hosts_clean.csv",
+                  BASE / "awards_encoding.py"],
+          outputs=[CLEAN / "olympic_medals_clean.csv", CLEAN / "olympic_medal_awards.csv",
+                   CLEAN / "olympic_medal_awards.codes.npz", CLEAN / "olympic_medal_awards.dict.json"]),
+    Stage("results", "clean_olympic_results.py",
+          inputs=[RAW / "olympic_results.html", CLEAN / "olympic_hosts_clean.csv"],
+          outputs=[CLEAN / "olympic_results_clean.csv", CLEAN / "olympic_results_awards.csv"]),
+    Stage("medals_v2", "patch_medals_v2.py",
+          inputs=[CLEAN / "olympic_medals_clean.csv", BASE / "awards_encoding.py"],
+          outputs=[CLEAN / "olympic_medals_clean_v2.csv", CLEAN / "olympic_medal_awards_v2.csv",
+                   CLEAN / "olympic_medal_awards_v2.codes.npz", CLEAN / "olympic_medal_awards_v2.dict.json"]),
+]
+
+
+# ---------- GRAPHE ----------
+
+def resolve_dependencies(stages):
+    """Relier chaque étape aux étapes qui produisent ses entrées, et vérifier l'absence de cycle"""
+    producers = {}
+    for stage in stages:
+        for out in stage.outputs:
+            if out in producers:
+                raise ValueError(f"{out} est produit par {producers[out]} et {stage.name}")
+            producers[out] = stage.name
+    for stage in stages:
+        stage.depends_on = sorted({producers[i] for i in stage.inputs if i in producers and producers[i] != stage.name})
+
+    order, visiting, done = [], set(), set()
+    by_name = {s.name: s for s in stages}
+
+    def visit(name):
+        if name in done:
+            return
+        if name in visiting:
+            raise ValueError(f"Cycle détecté autour de l'étape {name}")
+        visiting.add(name)
+        for dep in by_name[name].depends_on:
+            visit(dep)
+        visiting.discard(name)
+        done.add(name)
+        order.append(name)
+
+    for stage in stages:
+        visit(stage.name)
+    return order
+
+
+def downstream_of(stages, names):
+    """Étapes sélectionnées et toutes celles qui en dépendent"""
+    selected = set(names)
+    changed = True
+    while changed:
+        changed = False
+        for stage in stages:
+            if stage.name not in selected and selected.intersection(stage.depends_on):
+                selected.add(stage.name)
+                changed = True
+    return selected
+
+
+# ---------- HASHES ----------
+
+def file_hash(path, chunk_size=1 << 20):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def stage_fingerprint(stage):
+    """Hash du script et des entrées existantes (None pour une entrée absente)"""
+    return {
+        "script": file_hash(BASE / stage.script),
+        "inputs": {str(p.relative_to(ROOT)): file_hash(p) if p.exists() else None for p in stage.inputs},
+    }
+
+
+def outputs_intact(stage, record):
+    recorded = record.get("outputs", {})
+    for p in stage.outputs:
+        key = str(p.relative_to(ROOT))
+        if not p.exists() or recorded.get(key) != file_hash(p):
+            return False
+    return True
+
+
+def load_state():
+    if STATE_PATH.exists():
+        with open(STATE_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    return {}
+
+
+def save_state(state):
+    CLEAN.mkdir(parents=True, exist_ok=True)
+    tmp = STATE_PATH.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(tmp, STATE_PATH)
+
+
+# ---------- EXÉCUTION ----------
+
+def run_stage_script(script):
+    """Exécuté dans un processus enfant : lance le script comme `python script`"""
+    buffer = io.StringIO()
+    start = time.perf_counter()
+    ok = True
+    # les scripts qui lisent des options ne doivent pas voir celles du pipeline
+    sys.argv = [str(BASE / script)]
+    with contextlib.redirect_stdout(buffer), contextlib.redirect_stderr(buffer):
+        try:
+            runpy.run_path(str(BASE / script), run_name="__main__")
+        except SystemExit as exc:
+            ok = exc.code in (None, 0)
+        except Exception:
+            traceback.print_exc()
+            ok = False
+    return ok, buffer.getvalue(), time.perf_counter() - start
+
+
+def plan_stage(stage, state, force):
+    """Retourne (décision, empreinte) : 'run', 'skip' ou 'missing'"""
+    fingerprint = stage_fingerprint(stage)
+    missing = [k for k, v in fingerprint["inputs"].items() if v is None]
+    if missing:
+        return "missing", fingerprint, missing
+    record = state.get(stage.name)
+    if not force and record and record.get("fingerprint") == fingerprint and outputs_intact(stage, record):
+        return "skip", fingerprint, []
+    return "run", fingerprint, []
+
+
+def run_pipeline(targets=None, force=False, dry_run=False, jobs=None, verbose=False):
+    stages = {s.name: s for s in STAGES}
+    order = resolve_dependencies(STAGES)
+    forced = downstream_of(STAGES, targets) if (targets and force) else set()
+    selected = downstream_of(STAGES, targets) if targets else set(order)
+
+    state = load_state()
+    status = {}
+    pending = [name for name in order if name in selected]
+    running = {}
+    failed = False
+
+    def ready(name):
+        return all(status.get(dep) is not None for dep in stages[name].depends_on if dep in selected)
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        while pending or running:
+            # Planifier toutes les étapes dont les dépendances sont terminées
+            for name in [n for n in pending if ready(n)]:
+                pending.remove(name)
+                stage = stages[name]
+                if any(status.get(dep) == "failed" for dep in stage.depends_on):
+                    status[name] = "failed"
+                    print(f"[{name}] non exécutée : une dépendance a échoué")
+                    continue
+                decision, fingerprint, missing = plan_stage(stage, state, force or name in forced)
+                if decision == "missing":
+                    status[name] = "missing"
+                    print(f"[{name}] entrées absentes, étape ignorée : {', '.join(missing)}")
+                elif decision == "skip":
+                    status[name] = "skipped"
+                    print(f"[{name}] inchangée, étape sautée")
+                elif dry_run:
+                    status[name] = "would-run"
+                    print(f"[{name}] serait exécutée ({stage.script})")
+                else:
+                    print(f"[{name}] exécution de {stage.script}...")
+                    running[pool.submit(run_stage_script, stage.script)] = (name, fingerprint)
+
+            if not running:
+                continue
+
+            done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for future in done:
+                name, fingerprint = running.pop(future)
+                ok, output, elapsed = future.result()
+                if verbose or not ok:
+                    for line in output.rstrip().splitlines():
+                        print(f"  [{name}] {line}")
+                if ok:
+                    status[name] = "done"
+                    state[name] = {
+                        "fingerprint": fingerprint,
+                        "outputs": {str(p.relative_to(ROOT)): file_hash(p) for p in stages[name].outputs if p.exists()},
+                        "finished_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                        "duration_s": round(elapsed, 2),
+                    }
+                    save_state(state)
+                    print(f"[{name}] terminée en {elapsed:.1f}s")
+                else:
+                    status[name] = "failed"
+                    failed = True
+                    print(f"[{name}] ÉCHEC après {elapsed:.1f}s")
+
+    return status, failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("stages", nargs="*", help="étapes à exécuter (avec leurs dépendantes) ; toutes par défaut")
+    parser.add_argument("--force", action="store_true", help="ignorer les hashes pour les étapes sélectionnées")
+    parser.add_argument("--dry-run", action="store_true", help="afficher le plan sans exécuter")
+    parser.add_argument("--jobs", type=int, default=None, help="nombre de processus (défaut: nombre de CPU)")
+    parser.add_argument("--verbose", "-v", action="store_true", help="afficher la sortie des scripts")
+    parser.add_argument("--list", action="store_true", help="lister les étapes et leurs dépendances")
+    args = parser.parse_args(argv)
+
+    order = resolve_dependencies(STAGES)
+    if args.list:
+        by_name = {s.name: s for s in STAGES}
+        for name in order:
+            s = by_name[name]
+            deps = ", ".join(s.depends_on) or "-"
+            print(f"{name:10s} {s.script:28s} dépend de: {deps}")
+        return 0
+
+    unknown = set(args.stages) - set(order)
+    if unknown:
+        parser.error(f"étape(s) inconnue(s) : {', '.join(sorted(unknown))}")
+
+    force_all = args.force and not args.stages
+    status, failed = run_pipeline(args.stages or None, force=args.force if args.stages else force_all,
+                                  dry_run=args.dry_run, jobs=args.jobs, verbose=args.verbose)
+    print("\nRésumé : " + ", ".join(f"{n}={s}" for n, s in status.items()))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
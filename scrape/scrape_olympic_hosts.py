@@ -4,84 +4,73 @@ Script de scraping pour récupérer les données des villes hôtes olympiques
 Sources: Wikipedia, IOC, et autres sources fiables
 """
 
-import requests
-from bs4 import BeautifulSoup
 import pandas as pd
 import re
-from datetime import datetime
-import time
-import os
 from pathlib import Path
 
+from scraper_core import Scraper, wikitable_rows
+
 # Configuration des chemins
 BASE = Path(__file__).resolve().parent
 SCRAPED_DATA = BASE.parent / "data" / "scraped_data"
 SCRAPED_DATA.mkdir(parents=True, exist_ok=True)
 
-# Headers pour éviter d'être bloqué
-HEADERS = {
-    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-}
+WIKIPEDIA_HOSTS_URL = "https://en.wikipedia.org/wiki/List_of_Olympic_Games_host_cities"
 
-def scrape_wikipedia_olympic_hosts():
-    """Scrape les données des villes hôtes depuis Wikipedia"""
+def scrape_wikipedia_olympic_hosts(scraper=None, url=WIKIPEDIA_HOSTS_URL):
+    """Scrape les données des villes hôtes depuis Wikipedia (cache HTTP + parsing lxml)"""
     print("🔍 Scraping des données depuis Wikipedia...")
     
-    url = "https://en.wikipedia.org/wiki/List_of_Olympic_Games_host_cities"
+    scraper = scraper or Scraper()
     
     try:
-        response = requests.get(url, headers=HEADERS)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
+        result, document = scraper.fetch_document(url)
+        if document is None:
+            print(f"Erreur lors du scraping Wikipedia: {result.error}")
+            return []
+        if result.stale:
+            print(f"⚠️ Site injoignable ({result.error}), copie du cache utilisée")
         
         # Trouver le tableau des Jeux Olympiques
-        tables = soup.find_all('table', {'class': 'wikitable'})
         olympic_data = []
         
-        for table in tables:
-            rows = table.find_all('tr')
-            for row in rows[1:]:  # Skip header
-                cells = row.find_all(['td', 'th'])
-                if len(cells) >= 4:
-                    try:
-                        # Extraire les données de chaque ligne
-                        year_cell = cells[0].get_text(strip=True)
-                        season_cell = cells[1].get_text(strip=True)
-                        city_cell = cells[2].get_text(strip=True)
-                        country_cell = cells[3].get_text(strip=True)
-                        
-                        # Nettoyer et formater les données
-                        year = re.findall(r'\d{4}', year_cell)
-                        if year:
-                            year = int(year[0])
-                            
-                            # Créer le slug
-                            slug = f"{city_cell.lower().replace(' ', '-').replace('.', '')}-{year}"
-                            
-                            # Créer le nom complet
-                            name = f"{city_cell} {year}"
-                            
-                            # Dates par défaut (à améliorer avec des données plus précises)
-                            if season_cell.lower() == 'summer':
-                                start_date = f"{year}-07-01"
-                                end_date = f"{year}-08-31"
-                            else:
-                                start_date = f"{year}-02-01"
-                                end_date = f"{year}-02-28"
-                            
-                            olympic_data.append({
-                                'year': year,
-                                'season': season_cell,
-                                'city': city_cell,
-                                'country': country_cell,
-                                'slug': slug,
-                                'name': name,
-                                'start_date': start_date,
-                                'end_date': end_date
-                            })
-                    except Exception as e:
-                        print(f"Erreur lors du traitement d'une ligne: {e}")
-                        continue
+        for cells in wikitable_rows(document, min_cells=4):
+            try:
+                # Extraire les données de chaque ligne
+                year_cell, season_cell, city_cell, country_cell = cells[:4]
+                
+                # Nettoyer et formater les données
+                year = re.findall(r'\d{4}', year_cell)
+                if year:
+                    year = int(year[0])
+                    
+                    # Créer le slug
+                    slug = f"{city_cell.lower().replace(' ', '-').replace('.', '')}-{year}"
+                    
+                    # Créer le nom complet
+                    name = f"{city_cell} {year}"
+                    
+                    # Dates par défaut (à améliorer avec des données plus précises)
+                    if season_cell.lower() == 'summer':
+                        start_date = f"{year}-07-01"
+                        end_date = f"{year}-08-31"
+                    else:
+                        start_date = f"{year}-02-01"
+                        end_date = f"{year}-02-28"
+                    
+                    olympic_data.append({
+                        'year': year,
+                        'season': season_cell,
+                        'city': city_cell,
+                        'country': country_cell,
+                        'slug': slug,
+                        'name': name,
+                        'start_date': start_date,
+                        'end_date': end_date
+                    })
+            except Exception as e:
+                print(f"Erreur lors du traitement d'une ligne: {e}")
+                continue
         
         return olympic_data
         
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Moteur de scraping commun aux scripts de scrape/
+
+- Session HTTP partagée (connexions keep-alive réutilisées)
+- File de téléchargements concurrente avec limitation de débit par hôte
+- GET conditionnels (If-None-Match / If-Modified-Since) adossés à un cache disque :
+  une réponse 304 est servie depuis le cache, et le cache sert aussi de copie de
+  secours si le site est injoignable
+- Parsing lxml (lxml.html) et extraction des lignes de tableaux wikitable
+"""
+
+import hashlib
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import urlparse
+
+import requests
+from lxml import html as lxml_html
+
+BASE = Path(__file__).resolve().parent
+DEFAULT_CACHE_DIR = BASE / ".http_cache"
+
+# Headers pour éviter d'être bloqué
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+
+@dataclass
+class FetchResult:
+    url: str
+    status: int              # statut HTTP d'origine (200 pour une réponse servie depuis le cache)
+    content: bytes
+    from_cache: bool = False
+    not_modified: bool = False
+    stale: bool = False      # copie de cache servie faute de réponse réseau
+    error: str = None
+
+    @property
+    def ok(self):
+        return self.content is not None
+
+
+class HttpCache:
+    """Cache disque : corps de réponse + validateurs (ETag, Last-Modified) par URL"""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _paths(self, url):
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return self.cache_dir / f"{key}.json", self.cache_dir / f"{key}.body"
+
+    def get(self, url):
+        meta_path, body_path = self._paths(url)
+        if not meta_path.exists() or not body_path.exists():
+            return None, None
+        try:
+            meta = json.loads(meta_path.read_text(encoding='utf-8'))
+            return meta, body_path.read_bytes()
+        except (OSError, ValueError):
+            return None, None
+
+    def put(self, url, response):
+        meta_path, body_path = self._paths(url)
+        meta = {
+            'url': url,
+            'status': response.status_code,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'content_type': response.headers.get('Content-Type'),
+            'fetched_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        }
+        # écrire le corps avant les métadonnées : un cache à moitié écrit est ignoré
+        tmp = body_path.with_suffix('.tmp')
+        tmp.write_bytes(response.content)
+        tmp.replace(body_path)
+        meta_path.write_text(json.dumps(meta, indent=1), encoding='utf-8')
+
+    def touch(self, url, meta):
+        meta_path, _ = self._paths(url)
+        meta = dict(meta, checked_at=datetime.now(timezone.utc).isoformat(timespec='seconds'))
+        meta_path.write_text(json.dumps(meta, indent=1), encoding='utf-8')
+
+
+class HostRateLimiter:
+    """Intervalle minimal entre deux requêtes vers un même hôte"""
+
+    def __init__(self, min_interval=1.0):
+        self.min_interval = min_interval
+        self._next_slot = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url):
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.min_interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+class Scraper:
+    """Téléchargements polis et mis en cache, en parallèle sur plusieurs hôtes"""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, per_host_interval=1.0, max_workers=4,
+                 timeout=15, headers=None, session=None):
+        self.session = session or requests.Session()
+        self.session.headers.update(headers or HEADERS)
+        adapter = requests.adapters.HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.cache = HttpCache(cache_dir) if cache_dir is not None else None
+        self.rate_limiter = HostRateLimiter(per_host_interval)
+        self.max_workers = max_workers
+        self.timeout = timeout
+
+    def fetch(self, url):
+        """GET conditionnel ; 304 et erreurs réseau servis depuis le cache s'il existe"""
+        meta, body = self.cache.get(url) if self.cache else (None, None)
+        headers = {}
+        if meta:
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+
+        self.rate_limiter.wait(url)
+        try:
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+        except requests.RequestException as e:
+            if body is not None:
+                return FetchResult(url, meta.get('status', 200), body, from_cache=True, stale=True, error=str(e))
+            return FetchResult(url, 0, None, error=str(e))
+
+        if response.status_code == 304 and body is not None:
+            self.cache.touch(url, meta)
+            return FetchResult(url, meta.get('status', 200), body, from_cache=True, not_modified=True)
+
+        if response.status_code >= 400:
+            if body is not None:
+                return FetchResult(url, meta.get('status', 200), body, from_cache=True, stale=True,
+                                   error=f"HTTP {response.status_code}")
+            return FetchResult(url, response.status_code, None, error=f"HTTP {response.status_code}")
+
+        if self.cache:
+            self.cache.put(url, response)
+        return FetchResult(url, response.status_code, response.content)
+
+    def fetch_all(self, urls):
+        """Télécharger une liste d'URL en parallèle ; {url: FetchResult} dans l'ordre donné"""
+        urls = list(dict.fromkeys(urls))
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            return dict(zip(urls, pool.map(self.fetch, urls)))
+
+    def fetch_document(self, url):
+        """Télécharger puis parser une page ; (FetchResult, document lxml ou None)"""
+        result = self.fetch(url)
+        return result, parse_html(result.content, base_url=url) if result.ok else None
+
+
+def parse_html(content, base_url=None):
+    return lxml_html.fromstring(content, base_url=base_url)
+
+
+def cell_text(cell):
+    """Texte d'une cellule, espaces normalisés"""
+    return ' '.join(cell.text_content().split())
+
+
+def wikitable_rows(document, min_cells=1):
+    """Lignes (listes de textes de cellules) des tableaux class="wikitable", en-têtes exclus"""
+    rows = []
+    for table in document.xpath('//table[contains(concat(" ", normalize-space(@class), " "), " wikitable ")]'):
+        for tr in table.xpath('.//tr')[1:]:  # Skip header
+            cells = [cell_text(c) for c in tr if c.tag in ('td', 'th')]
+            if len(cells) >= min_cells:
+                rows.append(cells)
+    return rows
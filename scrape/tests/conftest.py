@@ -0,0 +1,61 @@
+"""
+Fixtures des tests du scraper : les pages HTML enregistrées dans fixtures/ sont
+servies par un serveur HTTP local (ETag et Last-Modified, réponses 304).
+"""
+import hashlib
+import sys
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+SCRAPE_DIR = Path(__file__).resolve().parents[1]
+FIXTURES_DIR = Path(__file__).resolve().parent / 'fixtures'
+
+if str(SCRAPE_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRAPE_DIR))
+
+
+class FixtureHandler(SimpleHTTPRequestHandler):
+    """Fichiers de fixtures/ avec ETag ; If-Modified-Since est géré par SimpleHTTPRequestHandler"""
+    log = []
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, directory=str(FIXTURES_DIR), **kwargs)
+
+    def log_message(self, *args):
+        pass
+
+    def send_head(self):
+        path = Path(self.translate_path(self.path))
+        etag = None
+        if path.is_file():
+            etag = '"%s"' % hashlib.sha256(path.read_bytes()).hexdigest()[:16]
+            if self.headers.get('If-None-Match') == etag:
+                type(self).log.append((self.path, 304))
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.end_headers()
+                return None
+        self._etag = etag
+        response = super().send_head()
+        type(self).log.append((self.path, 200 if response else 404))
+        return response
+
+    def end_headers(self):
+        if getattr(self, '_etag', None):
+            self.send_header('ETag', self._etag)
+            self._etag = None
+        super().end_headers()
+
+
+@pytest.fixture
+def fixture_server():
+    FixtureHandler.log = []
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FixtureHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_port}', FixtureHandler.log, server
+    server.shutdown()
+    server.server_close()
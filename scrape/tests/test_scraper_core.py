@@ -0,0 +1,95 @@
+"""
+Tests du moteur de scraping contre les pages enregistrées dans fixtures/
+"""
+import time
+
+from scraper_core import Scraper, parse_html, wikitable_rows
+from scrape_olympic_hosts import scrape_wikipedia_olympic_hosts
+
+HOSTS_PAGE = '/olympic_host_cities.html'
+
+
+def make_scraper(tmp_path, **kwargs):
+    kwargs.setdefault('per_host_interval', 0)
+    return Scraper(cache_dir=tmp_path / 'cache', timeout=2, **kwargs)
+
+
+def test_hosts_page_is_parsed_with_lxml(tmp_path, fixture_server):
+    base_url, _, _ = fixture_server
+
+    data = scrape_wikipedia_olympic_hosts(make_scraper(tmp_path), url=base_url + HOSTS_PAGE)
+
+    assert [(d['year'], d['season'], d['city'], d['country']) for d in data] == [
+        (1896, 'Summer', 'Athens', 'Greece'),
+        (1924, 'Winter', 'Chamonix', 'France'),
+        (1932, 'Summer', 'Los Angeles', 'United States'),
+        (2024, 'Summer', 'Paris', 'France'),
+        (2026, 'Winter', "Milan–Cortina d'Ampezzo", 'Italy'),
+    ]
+    assert data[2]['slug'] == 'los-angeles-1932'
+
+
+def test_second_fetch_is_conditional_and_served_from_cache(tmp_path, fixture_server):
+    base_url, log, _ = fixture_server
+    scraper = make_scraper(tmp_path)
+
+    first = scraper.fetch(base_url + HOSTS_PAGE)
+    second = scraper.fetch(base_url + HOSTS_PAGE)
+
+    assert not first.from_cache
+    assert second.not_modified and second.from_cache
+    assert second.content == first.content
+    assert [status for _, status in log] == [200, 304]
+
+
+def test_cache_is_shared_across_scraper_instances(tmp_path, fixture_server):
+    base_url, log, _ = fixture_server
+    make_scraper(tmp_path).fetch(base_url + HOSTS_PAGE)
+
+    result = make_scraper(tmp_path).fetch(base_url + HOSTS_PAGE)
+
+    assert result.not_modified
+    assert log[-1][1] == 304
+
+
+def test_offline_falls_back_to_cached_copy(tmp_path, fixture_server):
+    base_url, _, server = fixture_server
+    scraper = make_scraper(tmp_path)
+    scraper.fetch(base_url + HOSTS_PAGE)
+    server.shutdown()
+    server.server_close()
+
+    result = scraper.fetch(base_url + HOSTS_PAGE)
+
+    assert result.ok and result.stale and result.error
+
+
+def test_missing_page_without_cache_is_an_error(tmp_path, fixture_server):
+    base_url, _, _ = fixture_server
+
+    result = make_scraper(tmp_path).fetch(base_url + '/missing.html')
+
+    assert not result.ok and result.status == 404
+
+
+def test_fetch_all_respects_per_host_interval(tmp_path, fixture_server):
+    base_url, log, _ = fixture_server
+    scraper = make_scraper(tmp_path, per_host_interval=0.1, max_workers=4)
+    urls = [f'{base_url}{HOSTS_PAGE}?page={i}' for i in range(4)]
+
+    start = time.monotonic()
+    results = scraper.fetch_all(urls)
+    elapsed = time.monotonic() - start
+
+    assert list(results) == urls
+    assert all(r.ok for r in results.values())
+    # 4 requêtes vers le même hôte : au moins 3 intervalles
+    assert elapsed >= 0.3
+    assert len(log) == 4
+
+
+def test_wikitable_rows_skips_other_tables():
+    document = parse_html(b'<table class="infobox"><tr><th>h</th></tr><tr><td>x</td></tr></table>'
+                          b'<table class="wikitable"><tr><th>h</th></tr><tr><td> a  b </td><td>c</td></tr></table>')
+
+    assert wikitable_rows(document) == [['a b', 'c']]
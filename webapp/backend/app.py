@@ -5,6 +5,7 @@ Structure organisée avec séparation des routes et services
 from flask import Flask, jsonify
 from flask_cors import CORS
 import os
+import sys
 from dotenv import load_dotenv
 from database.supabase_client import test_connection
 
@@ -16,6 +17,12 @@ from routes.olympic_results_routes import olympic_results_bp
 from routes.health_routes import health_bp
 from routes.gdp_analysis_routes import gdp_analysis_bp
 from routes.prediction_routes import prediction_bp
+from routes.facet_routes import facet_bp
+from utils.profiler import init_profiler
+from utils.health import init_health_monitor
+from utils.warmup import init_warmup
+from utils.scheduler import init_scheduler
+from utils.data_version import init_etags
 
 # Charger les variables d'environnement
 load_dotenv('config.env')
@@ -38,6 +45,22 @@ def create_app():
     app.register_blueprint(health_bp)
     app.register_blueprint(gdp_analysis_bp, url_prefix='/api/gdp-analysis')
     app.register_blueprint(prediction_bp)
+    app.register_blueprint(facet_bp)
+
+    # Profilage à la demande (désactivé sauf si PROFILING_ENABLED=true)
+    init_profiler(app)
+
+    # Vérification de connectivité périodique lue par /api/health*
+    init_health_monitor(app)
+
+    # Préchauffage en arrière-plan (données, modèles, analyses) ; /api/health/ready attend sa fin
+    init_warmup(app)
+
+    # Rafraîchissement périodique des analyses en cache (un seul worker recalcule)
+    init_scheduler(app)
+
+    # ETag par version des données : 304 Not Modified sans recalcul si rien n'a changé
+    init_etags(app)
 
     # Route de base
     @app.route('/')
@@ -50,12 +73,15 @@ def create_app():
             'architecture': 'Modular (Routes + Services)',
             'endpoints': {
                 'health': '/api/health',
+                'liveness': '/api/health/live',
+                'readiness': '/api/health/ready',
                 'test': '/api/test',
                 'athletes': '/api/athletes',
                 'medals': '/api/medals',
                 'rewards': '/api/rewards',
                 'hosts': '/api/hosts',
                 'olympic_results': '/api/olympic_results',
+                'facets': '/api/facets',
                 'gdp_analysis': '/api/gdp-analysis'
             },
             'parameters': {
@@ -67,6 +93,11 @@ def create_app():
 
 def main():
     """Fonction principale pour démarrer le serveur"""
+    if '--startup-report' in sys.argv[1:]:
+        # Mesure du démarrage à froid au lieu de lancer le serveur
+        from utils.startup import main as startup_main
+        return startup_main([])
+
     app = create_app()
     
     print("=" * 60)
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+BACKTEST DES MODÈLES DE PRÉDICTION PAR PAYS
+===========================================
+
+Rejoue les éditions passées pour chaque mode de PredictionService ('ma', 'es',
+'best', 'second') : entraînement / prédiction avec les seules éditions
+antérieures (utils/backtest.py), scores MAE / RMSE / Spearman par édition sur
+le total de médailles des pays, et temps d'ajustement et de prédiction de
+chaque mode, pour comparer précision et latence avant de changer de modèle.
+
+'best' et 'second' rejouent le chemin servi (famille du modèle déployé, ligne
+de caractéristiques de l'API) ; 'best_refit' et 'second_refit' utilisent les
+vraies caractéristiques historiques et sont une borne haute (« refit upper
+bound »), pas ce que sert l'API.
+
+Usage :
+    python backtest_models.py [--since 2000] [--models ma es best second] [--workers 4] [--output backtest.json]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from train_advanced_models import FEATURE_COLUMNS, create_features, load_and_preprocess_data
+from utils.backtest import ESTIMATORS, MODES, REFIT_MODES, SERVED_ESTIMATOR, estimator_family, run_backtest, summarize
+
+COUNTRY_MODEL = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'models', 'country_best.joblib')
+
+
+def served_estimator():
+    """Famille du modèle pays déployé (models/country_best.joblib), forêt aléatoire à défaut"""
+    try:
+        import joblib
+        return estimator_family(joblib.load(COUNTRY_MODEL)['model']) or SERVED_ESTIMATOR
+    except Exception:
+        return SERVED_ESTIMATOR
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest des modes de prédiction sur les éditions passées")
+    parser.add_argument('--since', type=int, default=2000, help="Première édition rejouée")
+    parser.add_argument('--until', type=int, default=None, help="Dernière édition rejouée (défaut : la plus récente)")
+    parser.add_argument('--models', nargs='+', choices=MODES, default=list(MODES))
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--served-estimator', choices=ESTIMATORS, default=None,
+                        help="Famille du modèle servi (défaut : celle de models/country_best.joblib)")
+    parser.add_argument('--output', default=None, help="Fichier JSON des prédictions par pays et des scores")
+    args = parser.parse_args()
+    served = args.served_estimator or served_estimator()
+
+    features = create_features(load_and_preprocess_data())
+    years = sorted(y for y in features['year'].unique()
+                   if y >= args.since and (args.until is None or y <= args.until))
+    print(f"Backtest de {len(years)} éditions ({years[0]}-{years[-1]}), modes : {', '.join(args.models)}")
+    print(f"Modèle servi ('best' / 'second') : {served}, ligne de caractéristiques de l'API")
+
+    start = time.perf_counter()
+    results = run_backtest(features, years, args.models, FEATURE_COLUMNS, args.workers, served)
+    duration = time.perf_counter() - start
+
+    print(f"\n{'édition':>7s} " + " ".join(f"{model + ' MAE':>10s}" for model in args.models))
+    for result in results:
+        print(f"{result['year']:>7d} " + " ".join(f"{result['models'][m]['mae']:>10.2f}" for m in args.models))
+
+    summary = summarize(results)
+    print(f"\n{'mode':12s} {'MAE':>7s} {'RMSE':>7s} {'Spearman':>9s} {'ajust. (s)':>11s} {'µs/pays':>9s}")
+    for model, row in summary.items():
+        spearman = f"{row['spearman']:.3f}" if row['spearman'] is not None else '-'
+        label = '  (refit upper bound, non servi)' if row['refit_upper_bound'] else ''
+        print(f"{model:12s} {row['mae']:7.2f} {row['rmse']:7.2f} {spearman:>9s} "
+              f"{row['fit_s']:11.2f} {row['predict_us_per_country']:9.1f}{label}")
+    print(f"\nTerminé en {duration:.1f} s ({args.workers} processus)")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as handle:
+            json.dump({'served_estimator': served, 'refit_upper_bound': sorted(REFIT_MODES),
+                       'summary': summary, 'editions': results}, handle, ensure_ascii=False, indent=2)
+        print(f"Résultats détaillés : {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+"""
+Backend de données local (hors ligne) basé sur les CSV de data/clean
+
+Reproduit le sous-ensemble de l'API du client Supabase utilisé par les services
+(table().select().eq().gte().lte().in_().or_().order().range().limit().execute())
+afin de faire tourner l'application, les benchmarks et les tests de charge
+sans base de données. Activé avec DATA_BACKEND=local.
+"""
+import os
+import re
+import threading
+import time
+from pathlib import Path
+
+import pandas as pd
+
+DEFAULT_DATA_DIR = Path(__file__).resolve().parents[3] / 'data' / 'clean'
+
+# Table Supabase -> fichier CSV local
+TABLE_FILES = {
+    'm_award': 'olympic_medal_awards_v2.csv',
+    'medal_awards': 'olympic_medal_awards_v2.csv',
+    'medals': 'olympic_medals_clean_v2.csv',
+    'hosts': 'olympic_hosts_clean.csv',
+    'athlete': 'olympic_athletes_clean.csv',
+}
+
+
+class LocalAPIError(Exception):
+    """Erreur équivalente à une erreur PostgREST (table inconnue, etc.)"""
+
+
+class LocalResult:
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+
+def _derive_athletes(medals: pd.DataFrame) -> pd.DataFrame:
+    """Construire une table athlete minimale à partir des médailles si le CSV n'existe pas"""
+    df = medals[medals['athlete'].notna() & (medals['athlete'].astype(str).str.strip() != '')]
+    agg = df.groupby('athlete', sort=True).agg(
+        athlete_url=('athlete_url', 'first'),
+        first_year=('year', 'min'),
+        games_participations=('year', 'nunique'),
+        medal_gold=('gold', 'sum'),
+        medal_silver=('silver', 'sum'),
+        medal_bronze=('bronze', 'sum'),
+    ).reset_index().rename(columns={'athlete': 'athlete_full_name'})
+    agg['medal_total'] = agg['medal_gold'] + agg['medal_silver'] + agg['medal_bronze']
+    return agg
+
+
+def _coerce(value, series: pd.Series):
+    """Convertir la valeur d'un filtre au type de la colonne (comme PostgreSQL)"""
+    if pd.api.types.is_numeric_dtype(series) and isinstance(value, str):
+        try:
+            return float(value) if '.' in value else int(value)
+        except ValueError:
+            return value
+    return value
+
+
+def _ilike_regex(pattern: str) -> str:
+    parts = [re.escape(p) for p in pattern.split('%')]
+    return '^' + '.*'.join(parts).replace('_', '.') + '$'
+
+
+class LocalQuery:
+    def __init__(self, client, table_name):
+        self._client = client
+        self._table = table_name
+        self._columns = None
+        self._count = None
+        self._filters = []
+        self._order = []
+        self._range = None
+        self._limit = None
+
+    # ---------- construction de la requête ----------
+    def select(self, columns='*', count=None):
+        if columns and columns.strip() != '*':
+            self._columns = [c.strip() for c in columns.split(',') if c.strip()]
+        self._count = count
+        return self
+
+    def eq(self, column, value):
+        self._filters.append(('eq', column, value))
+        return self
+
+    def neq(self, column, value):
+        self._filters.append(('neq', column, value))
+        return self
+
+    def gte(self, column, value):
+        self._filters.append(('gte', column, value))
+        return self
+
+    def lte(self, column, value):
+        self._filters.append(('lte', column, value))
+        return self
+
+    def in_(self, column, values):
+        self._filters.append(('in', column, list(values)))
+        return self
+
+    def ilike(self, column, pattern):
+        self._filters.append(('ilike', column, pattern))
+        return self
+
+    def or_(self, expression):
+        """Supporte la forme 'col.ilike.%x%,col2.eq.y' utilisée par les services"""
+        clauses = []
+        for part in expression.split(','):
+            column, op, value = part.split('.', 2)
+            clauses.append((op, column, value))
+        self._filters.append(('or', None, clauses))
+        return self
+
+    def order(self, column, desc=False):
+        if '.' in column:
+            column, direction = column.rsplit('.', 1)
+            desc = direction.lower() == 'desc'
+        self._order.append((column, desc))
+        return self
+
+    def range(self, start, end):
+        self._range = (start, end)
+        return self
+
+    def limit(self, n):
+        self._limit = n
+        return self
+
+    # ---------- exécution ----------
+    def _mask(self, df, op, column, value):
+        if column not in df.columns:
+            raise LocalAPIError(f'column {self._table}.{column} does not exist')
+        series = df[column]
+        if op == 'in':
+            return series.isin([_coerce(v, series) for v in value])
+        if op == 'ilike':
+            return series.astype(str).str.match(_ilike_regex(value), case=False, na=False)
+        value = _coerce(value, series)
+        if op == 'eq':
+            return series == value
+        if op == 'neq':
+            return series != value
+        if op == 'gte':
+            return series >= value
+        if op == 'lte':
+            return series <= value
+        raise LocalAPIError(f'unsupported operator: {op}')
+
+    def execute(self):
+        df = self._client.load_table(self._table)
+
+        for op, column, value in self._filters:
+            if op == 'or':
+                mask = pd.Series(False, index=df.index)
+                for sub_op, sub_col, sub_val in value:
+                    mask |= self._mask(df, sub_op, sub_col, sub_val)
+            else:
+                mask = self._mask(df, op, column, value)
+            df = df[mask]
+
+        count = len(df) if self._count else None
+
+        if self._order:
+            df = df.sort_values(
+                [c for c, _ in self._order],
+                ascending=[not d for _, d in self._order],
+                kind='stable',
+                na_position='last'
+            )
+
+        if self._range is not None:
+            start, end = self._range
+            df = df.iloc[start:end + 1]
+        if self._limit is not None:
+            df = df.iloc[:self._limit]
+
+        if self._columns:
+            missing = [c for c in self._columns if c not in df.columns]
+            if missing:
+                raise LocalAPIError(f'column {self._table}.{missing[0]} does not exist')
+            df = df[self._columns]
+
+        records = df.astype(object).where(df.notna(), None).to_dict(orient='records')
+        return LocalResult(records, count)
+
+
+class LocalClient:
+    """Client de données en mémoire, chargé paresseusement depuis les CSV"""
+
+    def __init__(self, data_dir=None):
+        self.data_dir = Path(data_dir or os.getenv('LOCAL_DATA_DIR') or DEFAULT_DATA_DIR)
+        self._tables = {}
+        self._loaded_at = {}
+        self._lock = threading.RLock()
+
+    def table(self, name):
+        return LocalQuery(self, name)
+
+    def load_table(self, name) -> pd.DataFrame:
+        with self._lock:
+            if name not in self._tables:
+                self._tables[name] = self._read_table(name)
+                self._loaded_at[name] = time.time()
+            return self._tables[name]
+
+    def _read_table(self, name) -> pd.DataFrame:
+        if name not in TABLE_FILES:
+            raise LocalAPIError(f'relation "public.{name}" does not exist')
+
+        path = self.data_dir / TABLE_FILES[name]
+        if path.exists():
+            df = pd.read_csv(path)
+        elif name == 'athlete':
+            df = _derive_athletes(self.load_table('medals'))
+        else:
+            raise LocalAPIError(f'relation "public.{name}" does not exist (missing {path})')
+
+        if 'id' not in df.columns:
+            df.insert(0, 'id', range(1, len(df) + 1))
+        return df
+
+    def loaded_tables(self):
+        """Tables chargées en mémoire et horodatage de chargement"""
+        with self._lock:
+            return dict(self._loaded_at)
+
+    def refresh(self):
+        """Relire les tables déjà chargées puis les remplacer d'un coup
+
+        Les requêtes servies pendant la lecture utilisent encore l'ancienne version.
+        """
+        with self._lock:
+            names = list(self._tables)
+        fresh = {name: self._read_table(name) for name in names}
+        now = time.time()
+        with self._lock:
+            self._tables.update(fresh)
+            self._loaded_at.update({name: now for name in fresh})
+        return names
+
+    def reload(self):
+        with self._lock:
+            self._tables.clear()
+            self._loaded_at.clear()
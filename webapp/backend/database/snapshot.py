@@ -0,0 +1,39 @@
+"""
+Instantané (snapshot) en mémoire d'une table, pour les index construits côté serveur
+
+Avec le backend local, la table déjà chargée est réutilisée ; avec Supabase, la
+table est lue par pages (range) sur les seules colonnes demandées.
+"""
+from database.supabase_client import get_supabase_client
+
+PAGE_SIZE = 1000
+
+
+def load_table_snapshot(table, columns=None, page_size=PAGE_SIZE):
+    """DataFrame des colonnes demandées (toutes si None), ou None en cas d'échec"""
+    try:
+        supabase = get_supabase_client()
+        if supabase is None:
+            print('Client Supabase non initialisé')
+            return None
+
+        if hasattr(supabase, 'load_table'):
+            df = supabase.load_table(table)
+            return df[columns] if columns else df
+
+        select = ','.join(columns) if columns else '*'
+        rows, offset = [], 0
+        while True:
+            result = (supabase.table(table).select(select)
+                      .order('id.asc')
+                      .range(offset, offset + page_size - 1)
+                      .execute())
+            rows.extend(result.data or [])
+            if not result.data or len(result.data) < page_size:
+                break
+            offset += page_size
+        import pandas as pd
+        return pd.DataFrame(rows, columns=columns)
+    except Exception as error:
+        print(f'Erreur lors du chargement du snapshot {table}: {error}')
+        return None
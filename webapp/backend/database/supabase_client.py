@@ -1,54 +1,85 @@
 import os
-from supabase import create_client, Client
+import threading
 from dotenv import load_dotenv
 
 # Charger les variables d'environnement
 load_dotenv('config.env')
 
+# Backend de données : 'supabase' (défaut) ou 'local' (CSV de data/clean, hors ligne)
+DATA_BACKEND = os.getenv('DATA_BACKEND', 'supabase').lower()
+
 # Configuration Supabase
 SUPABASE_URL = os.getenv('SUPABASE_URL', 'https://xecsougqsdyrrzscmtgn.supabase.co')
 SUPABASE_KEY = os.getenv('SUPABASE_KEY')
 
-if not SUPABASE_KEY:
-    print('SUPABASE_KEY environment variable is required!')
-    print('Please create a .env file with your Supabase key')
-    exit(1)
+# Client créé à la première utilisation (pas de connexion à l'import du module)
+supabase = None
+_client_initialized = False
+_client_lock = threading.Lock()
+
+
+def _create_client():
+    if DATA_BACKEND == 'local':
+        from database.local_client import LocalClient
+        return LocalClient()
+
+    from supabase import create_client
 
-# Créer le client Supabase avec gestion d'erreur
-try:
-    supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
-except Exception as e:
-    print(f"Erreur lors de la création du client Supabase: {e}")
-    supabase = None
+    if not SUPABASE_KEY:
+        print('SUPABASE_KEY environment variable is required!')
+        print('Please create a .env file with your Supabase key')
+        return None
+
+    # Créer le client Supabase avec gestion d'erreur
+    try:
+        return create_client(SUPABASE_URL, SUPABASE_KEY)
+    except Exception as e:
+        print(f"Erreur lors de la création du client Supabase: {e}")
+        return None
 
-def get_supabase_client() -> Client:
-    """Retourne le client Supabase configuré"""
+def get_supabase_client():
+    """Retourne le client Supabase configuré (créé au premier appel)"""
+    global supabase, _client_initialized
+    if not _client_initialized:
+        with _client_lock:
+            if not _client_initialized:
+                supabase = _create_client()
+                _client_initialized = True
     return supabase
 
-def test_connection() -> bool:
-    """Teste la connexion à la base de données Supabase"""
+def test_connection(verbose: bool = True) -> bool:
+    """Teste la connexion à la base de données Supabase
+
+    verbose=False : aucun affichage (vérification périodique de l'endpoint de santé).
+    """
+    def _log(message):
+        if verbose:
+            print(message)
+
     try:
+        supabase = get_supabase_client()
         if supabase is None:
-            print('Client Supabase non initialisé')
+            _log('Client Supabase non initialisé')
             return False
-            
-        # Test de connexion avec la table athlete
-        result = supabase.table('athlete').select('*').limit(1).execute()
-        
+
+        # Requête minimale : une seule colonne d'une seule ligne
+        result = supabase.table('athlete').select('id').limit(1).execute()
+
         if result.data is not None:
-            print('Connexion Supabase reussie!')
+            _log('Connexion Supabase reussie!')
             return True
         else:
-            print('Erreur de connexion Supabase: Aucune donnee retournee')
+            _log('Erreur de connexion Supabase: Aucune donnee retournee')
             return False
-            
+
     except Exception as error:
-        print(f'Erreur lors du test de connexion: {error}')
+        _log(f'Erreur lors du test de connexion: {error}')
         return False
 
 def get_athletes(limit: int = 100):
     """Récupère les athlètes depuis la base de données"""
     try:
+        supabase = get_supabase_client()
         if supabase is None:
             print('Client Supabase non initialisé')
             return None
@@ -61,6 +92,7 @@ def get_athletes(limit: int = 100):
 def get_medals(limit: int = 100):
     """Récupère les médailles depuis la base de données"""
     try:
+        supabase = get_supabase_client()
         if supabase is None:
             print('Client Supabase non initialisé')
             return None
@@ -73,6 +105,7 @@ def get_medals(limit: int = 100):
 def get_hosts(limit: int = 100):
     """Récupère les données des villes hôtes depuis la base de données"""
     try:
+        supabase = get_supabase_client()
         if supabase is None:
             print('Client Supabase non initialisé')
             return None
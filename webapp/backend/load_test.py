@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Test de charge : rejoue le mix d'appels du frontend contre un backend en marche
+
+Le mix reprend les appels définis dans webapp/frontend/src/services/api.js,
+pondérés selon l'usage des pages (DataViewer avec recherche et pagination,
+pages Analyse / Visualisations / Prédictions).
+
+Exemples :
+    # contre un serveur déjà démarré
+    python load_test.py --base-url http://localhost:5000/api --concurrency 20 --duration 60
+
+    # serveur lancé en interne sur le backend de données local (hors ligne)
+    python load_test.py --local --concurrency 8 --duration 30 --output results.json
+
+Résultats par endpoint : nombre d'appels, débit, latences p50/p95/p99 et taux d'erreurs.
+Code de sortie 1 si le taux d'erreurs global dépasse --max-error-rate (1 % par défaut)
+ou si aucune requête n'a abouti, pour servir de garde-fou en CI.
+En mode --local, le générateur et le serveur partagent le même processus : pour des chiffres
+de capacité, viser plutôt un serveur gunicorn lancé à part avec DATA_BACKEND=local.
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+
+import requests
+
+SEARCH_TERMS = ['fra', 'usa', 'swim', 'judo', 'ath', 'phelps', 'bolt', 'ski', 'row', 'ger']
+COUNTRIES = ['FRA', 'USA', 'CHN', 'GBR', 'GER', 'JPN', 'ITA', 'AUS']
+PREDICTION_COUNTRIES = ['France', 'USA', 'China', 'Great Britain', 'Germany', 'Japan']
+SPORTS = ['Athletics', 'Swimming', 'Judo', 'Fencing', 'Cycling Track', 'Rowing']
+
+
+def _page(rnd):
+    return rnd.choices([1, 2, 3, 4, 5, 10], weights=[50, 20, 10, 8, 7, 5])[0]
+
+
+# (nom affiché, poids, générateur (rng) -> (chemin, paramètres))
+TRAFFIC_MIX = [
+    # DataViewer : navigation paginée et recherche à la frappe
+    ('GET /athletes', 12, lambda r: ('/athletes', {'page': _page(r), 'limit': 20})),
+    ('GET /athletes?search', 14, lambda r: ('/athletes', {'search': r.choice(SEARCH_TERMS), 'limit': 20})),
+    ('GET /medals', 8, lambda r: ('/medals', {'page': _page(r), 'limit': 20})),
+    ('GET /medals?search', 6, lambda r: ('/medals', {'search': r.choice(SEARCH_TERMS), 'limit': 20})),
+    ('GET /medals?filters', 5, lambda r: ('/medals', {'country': r.choice(COUNTRIES), 'year_min': 1990, 'limit': 20})),
+    ('GET /olympic_results', 6, lambda r: ('/olympic_results', {'page': _page(r), 'limit': 20})),
+    ('GET /olympic_results?search', 5, lambda r: ('/olympic_results', {'search': r.choice(SEARCH_TERMS), 'limit': 20})),
+    ('GET /hosts', 4, lambda r: ('/hosts', {'page': _page(r), 'limit': 20})),
+    # Pages Analyse / Visualisations
+    ('GET /medals/france', 4, lambda r: ('/medals/france', {})),
+    ('GET /medals/france/success', 3, lambda r: ('/medals/france/success', {})),
+    ('GET /medals/france/sports', 3, lambda r: ('/medals/france/sports', {})),
+    ('GET /medals/dominant-sports', 2, lambda r: ('/medals/dominant-sports', {})),
+    ('GET /medals/country-performance', 3, lambda r: ('/medals/country-performance', {})),
+    ('GET /medals/temporal-trends', 2, lambda r: ('/medals/temporal-trends', {})),
+    ('GET /medals/success-factors', 2, lambda r: ('/medals/success-factors', {})),
+    ('GET /hosts/ranking', 2, lambda r: ('/hosts/ranking', {})),
+    ('GET /gdp-analysis/summary', 2, lambda r: ('/gdp-analysis/summary', {})),
+    ('GET /gdp-analysis/correlation-by-year', 1, lambda r: ('/gdp-analysis/correlation-by-year', {})),
+    ('GET /gdp-analysis/correlation-by-sport-cost', 1, lambda r: ('/gdp-analysis/correlation-by-sport-cost', {'year': 2020})),
+    ('GET /gdp-analysis/correlation-gdp-per-capita', 1, lambda r: ('/gdp-analysis/correlation-gdp-per-capita', {'year': 2020})),
+    ('GET /gdp-analysis/real-gdp-medals-data', 1, lambda r: ('/gdp-analysis/real-gdp-medals-data', {})),
+    # Page Prédictions
+    ('GET /predictions/country/<country>', 5, lambda r: (f'/predictions/country/{r.choice(PREDICTION_COUNTRIES)}', {'year': 2024, 'model': 'best'})),
+    ('GET /predictions/top-countries', 3, lambda r: ('/predictions/top-countries', {'top_n': 25, 'year': 2024, 'model': 'best'})),
+    ('GET /predictions/athletes', 2, lambda r: ('/predictions/athletes', {'limit': 50, 'model': 'best'})),
+    ('GET /predictions/sports', 2, lambda r: ('/predictions/sports', {'sport': r.choice(SPORTS + ['']), 'year': 2024, 'limit': 20})),
+    ('GET /predictions/models/status', 1, lambda r: ('/predictions/models/status', {})),
+]
+
+
+def percentile(sorted_values, p):
+    """Percentile par interpolation linéaire sur une liste triée"""
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * p / 100
+    f = int(k)
+    c = min(f + 1, len(sorted_values) - 1)
+    return sorted_values[f] + (sorted_values[c] - sorted_values[f]) * (k - f)
+
+
+class LoadTestStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.status_codes = defaultdict(lambda: defaultdict(int))
+
+    def record(self, name, latency_ms, status):
+        with self._lock:
+            self.latencies[name].append(latency_ms)
+            self.status_codes[name][str(status)] += 1
+            if status == 'error' or (isinstance(status, int) and status >= 400):
+                self.errors[name] += 1
+
+    def report(self, elapsed):
+        endpoints = {}
+        all_latencies = []
+        for name, values in self.latencies.items():
+            values = sorted(values)
+            all_latencies.extend(values)
+            endpoints[name] = {
+                'requests': len(values),
+                'throughput_rps': round(len(values) / elapsed, 2),
+                'error_rate': round(self.errors[name] / len(values), 4),
+                'p50_ms': round(percentile(values, 50), 2),
+                'p95_ms': round(percentile(values, 95), 2),
+                'p99_ms': round(percentile(values, 99), 2),
+                'max_ms': round(values[-1], 2),
+                'status_codes': dict(self.status_codes[name]),
+            }
+        all_latencies.sort()
+        total = len(all_latencies)
+        total_errors = sum(self.errors.values())
+        return {
+            'total_requests': total,
+            'duration_s': round(elapsed, 2),
+            'throughput_rps': round(total / elapsed, 2) if elapsed else 0,
+            'error_rate': round(total_errors / total, 4) if total else 0,
+            'p50_ms': round(percentile(all_latencies, 50), 2),
+            'p95_ms': round(percentile(all_latencies, 95), 2),
+            'p99_ms': round(percentile(all_latencies, 99), 2),
+            'endpoints': endpoints,
+        }
+
+
+def worker(base_url, deadline, max_requests, counter, stats, timeout, seed):
+    names = [name for name, _, _ in TRAFFIC_MIX]
+    weights = [w for _, w, _ in TRAFFIC_MIX]
+    generators = {name: gen for name, _, gen in TRAFFIC_MIX}
+    rnd = random.Random(seed)
+    session = requests.Session()
+
+    while time.monotonic() < deadline:
+        if max_requests is not None:
+            with counter['lock']:
+                if counter['sent'] >= max_requests:
+                    return
+                counter['sent'] += 1
+
+        name = rnd.choices(names, weights=weights)[0]
+        path, params = generators[name](rnd)
+        start = time.perf_counter()
+        try:
+            response = session.get(base_url + path, params=params, timeout=timeout)
+            response.content  # lire tout le corps
+            status = response.status_code
+        except requests.RequestException:
+            status = 'error'
+        stats.record(name, (time.perf_counter() - start) * 1000, status)
+
+
+def start_local_server(port):
+    """Démarrer l'application sur le backend de données local dans un thread"""
+    os.environ['DATA_BACKEND'] = 'local'
+    os.environ.setdefault('FLASK_DEBUG', 'False')
+    backend_dir = Path(__file__).resolve().parent
+    sys.path.insert(0, str(backend_dir))
+
+    from werkzeug.serving import make_server
+    from app import create_app
+
+    # Le journal d'accès par requête fausserait les mesures
+    logging.getLogger('werkzeug').setLevel(logging.WARNING)
+
+    server = make_server('127.0.0.1', port, create_app(), threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f'http://127.0.0.1:{server.server_port}/api'
+
+
+def print_report(report):
+    print()
+    print(f"{'endpoint':48s} {'req':>6s} {'rps':>7s} {'err%':>6s} {'p50':>8s} {'p95':>8s} {'p99':>8s}")
+    print('-' * 96)
+    for name, r in sorted(report['endpoints'].items(), key=lambda x: -x[1]['requests']):
+        print(f"{name:48s} {r['requests']:6d} {r['throughput_rps']:7.1f} {r['error_rate'] * 100:6.1f} "
+              f"{r['p50_ms']:8.1f} {r['p95_ms']:8.1f} {r['p99_ms']:8.1f}")
+    print('-' * 96)
+    print(f"TOTAL: {report['total_requests']} requêtes en {report['duration_s']}s "
+          f"-> {report['throughput_rps']} req/s, erreurs {report['error_rate'] * 100:.2f}%, "
+          f"p50 {report['p50_ms']} ms, p95 {report['p95_ms']} ms, p99 {report['p99_ms']} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--base-url', default=os.getenv('LOADTEST_BASE_URL', 'http://localhost:5000/api'))
+    parser.add_argument('--local', action='store_true',
+                        help="lancer l'application en interne avec DATA_BACKEND=local")
+    parser.add_argument('--port', type=int, default=0, help='port du serveur interne (--local)')
+    parser.add_argument('--concurrency', type=int, default=10, help='nombre de clients simultanés')
+    parser.add_argument('--duration', type=float, default=30, help='durée du test en secondes')
+    parser.add_argument('--requests', type=int, default=None, help='arrêt après N requêtes au total')
+    parser.add_argument('--timeout', type=float, default=30, help='timeout par requête (s)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='écrire le rapport JSON dans ce fichier')
+    parser.add_argument('--max-error-rate', type=float, default=0.01,
+                        help="taux d'erreurs maximal accepté (0-1) avant un code de sortie 1")
+    args = parser.parse_args()
+
+    server = None
+    base_url = args.base_url.rstrip('/')
+    if args.local:
+        server, base_url = start_local_server(args.port)
+
+    print(f"Test de charge sur {base_url} : {args.concurrency} clients, "
+          f"{args.duration}s" + (f", max {args.requests} requêtes" if args.requests else ''))
+
+    stats = LoadTestStats()
+    counter = {'sent': 0, 'lock': threading.Lock()}
+    deadline = time.monotonic() + args.duration
+    threads = [
+        threading.Thread(
+            target=worker,
+            args=(base_url, deadline, args.requests, counter, stats, args.timeout, args.seed + i),
+            daemon=True
+        )
+        for i in range(args.concurrency)
+    ]
+
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    if server is not None:
+        server.shutdown()
+
+    report = stats.report(elapsed)
+    report.update({
+        'base_url': base_url,
+        'concurrency': args.concurrency,
+        'timestamp': datetime.now().isoformat(),
+    })
+    print_report(report)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f'Rapport écrit dans {args.output}')
+
+    if not report['total_requests'] or report['error_rate'] > args.max_error_rate:
+        print(f"Échec : taux d'erreurs {report['error_rate'] * 100:.2f}% "
+              f"(maximum {args.max_error_rate * 100:.2f}%) sur {report['total_requests']} requêtes")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,43 @@
+"""
+Routes pour les facettes (comptes par valeur des filtres)
+"""
+from flask import Blueprint, jsonify, request
+from services.facet_service import FacetService
+
+# Créer un Blueprint pour les routes des facettes
+facet_bp = Blueprint('facets', __name__, url_prefix='/api')
+
+@facet_bp.route('/facets')
+def get_facets():
+    """Comptes de toutes les facettes pour une combinaison de filtres
+
+    Exemple : /api/facets?table=m_award&noc=FRA,USA&medal=GOLD&year_min=2000
+    Plusieurs valeurs d'une colonne (séparées par des virgules ou paramètre répété)
+    sont combinées par OU, les colonnes entre elles par ET.
+    """
+    table = request.args.get('table', 'm_award')
+    search = request.args.get('search', '')
+    year_min = request.args.get('year_min', type=int)
+    year_max = request.args.get('year_max', type=int)
+
+    selections = {}
+    for key in request.args:
+        if key in ('table', 'search', 'year_min', 'year_max'):
+            continue
+        values = [v.strip() for raw in request.args.getlist(key) for v in raw.split(',') if v.strip()]
+        if values:
+            selections[key] = values
+
+    result = FacetService.get_facets(
+        table=table,
+        selections=selections,
+        year_min=year_min,
+        year_max=year_max,
+        search=search
+    )
+
+    if result['status'] == 'error':
+        status = 400 if result['message'].startswith('Table inconnue') else 500
+        return jsonify(result), status
+
+    return jsonify(result)
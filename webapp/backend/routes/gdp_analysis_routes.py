@@ -2,11 +2,11 @@
 Routes pour l'analyse de corrélation PIB-médailles
 """
 from flask import Blueprint, jsonify, request
-import pandas as pd
-import numpy as np
-from scipy.stats import pearsonr, spearmanr
 from pathlib import Path
 import json
+from utils import payloads
+from utils.cache import cached
+from services.gdp_data_service import get_gdp_table
 
 gdp_analysis_bp = Blueprint('gdp_analysis', __name__)
 
@@ -49,106 +49,6 @@ COUNTRY_MAPPING = {
     'TTO': 'TT', 'JAM': 'JM', 'BAH': 'BS', 'BER': 'BM', 'CAY': 'KY'
 }
 
-# Données PIB de secours (en milliards USD) - toutes les années disponibles
-FALLBACK_GDP_DATA = {
-    'US': {
-        1896: 45, 1900: 50, 1904: 55, 1908: 60, 1912: 65, 1920: 70, 1924: 85, 1928: 100, 
-        1932: 60, 1936: 85, 1948: 250, 1952: 350, 1956: 450, 1960: 550, 1964: 700, 1968: 950, 
-        1972: 1200, 1976: 1900, 1980: 2800, 1984: 4000, 1988: 5253, 1992: 6520, 1996: 8076, 
-        2000: 10252, 2004: 12297, 2008: 14478, 2012: 16197, 2016: 18624, 2020: 20953, 2022: 25463
-    },
-    'CN': {
-        1896: 5, 1900: 5, 1904: 5, 1908: 5, 1912: 5, 1920: 5, 1924: 5, 1928: 5, 
-        1932: 5, 1936: 5, 1948: 5, 1952: 5, 1956: 5, 1960: 5, 1964: 5, 1968: 5, 
-        1972: 5, 1976: 5, 1980: 5, 1984: 5, 1988: 312, 1992: 422, 1996: 856, 
-        2000: 1211, 2004: 1959, 2008: 4594, 2012: 8527, 2016: 11233, 2020: 14723, 2022: 17963
-    },
-    'JP': {
-        1896: 5, 1900: 5, 1904: 5, 1908: 5, 1912: 5, 1920: 5, 1924: 5, 1928: 5, 
-        1932: 5, 1936: 5, 1948: 5, 1952: 5, 1956: 5, 1960: 5, 1964: 5, 1968: 5, 
-        1972: 5, 1976: 5, 1980: 5, 1984: 5, 1988: 3071, 1992: 3908, 1996: 4731, 
-        2000: 4888, 2004: 4601, 2008: 5035, 2012: 6203, 2016: 4937, 2020: 4888, 2022: 4232
-    },
-    'DE': {
-        1896: 15, 1900: 20, 1904: 25, 1908: 30, 1912: 35, 1920: 40, 1924: 50, 1928: 60, 
-        1932: 70, 1936: 80, 1948: 100, 1952: 150, 1956: 200, 1960: 250, 1964: 300, 1968: 400, 
-        1972: 500, 1976: 600, 1980: 800, 1984: 1000, 1988: 1547, 1992: 2074, 1996: 2491, 
-        2000: 1948, 2004: 2751, 2008: 3651, 2012: 3527, 2016: 3467, 2020: 3846, 2022: 4082
-    },
-    'IN': {
-        1896: 2, 1900: 2, 1904: 2, 1908: 2, 1912: 2, 1920: 2, 1924: 2, 1928: 2, 
-        1932: 2, 1936: 2, 1948: 2, 1952: 2, 1956: 2, 1960: 2, 1964: 2, 1968: 2, 
-        1972: 2, 1976: 2, 1980: 2, 1984: 2, 1988: 297, 1992: 288, 1996: 393, 
-        2000: 468, 2004: 709, 2008: 1199, 2012: 1828, 2016: 2286, 2020: 3176, 2022: 3385
-    },
-    'GB': {
-        1896: 10, 1900: 12, 1904: 14, 1908: 16, 1912: 18, 1920: 20, 1924: 25, 1928: 30, 
-        1932: 35, 1936: 40, 1948: 50, 1952: 60, 1956: 70, 1960: 80, 1964: 100, 1968: 120, 
-        1972: 150, 1976: 200, 1980: 300, 1984: 400, 1988: 1000, 1992: 1104, 1996: 1314, 
-        2000: 1559, 2004: 2194, 2008: 2670, 2012: 2611, 2016: 2629, 2020: 2707, 2022: 3071
-    },
-    'FR': {
-        1896: 8, 1900: 10, 1904: 12, 1908: 14, 1912: 16, 1920: 18, 1924: 22, 1928: 26, 
-        1932: 30, 1936: 35, 1948: 40, 1952: 50, 1956: 60, 1960: 70, 1964: 80, 1968: 100, 
-        1972: 120, 1976: 150, 1980: 200, 1984: 300, 1988: 1024, 1992: 1400, 1996: 1564, 
-        2000: 1365, 2004: 2046, 2008: 2918, 2012: 2611, 2016: 2424, 2020: 2603, 2022: 2782
-    },
-    'IT': {
-        1896: 5, 1900: 6, 1904: 7, 1908: 8, 1912: 9, 1920: 10, 1924: 12, 1928: 14, 
-        1932: 16, 1936: 18, 1948: 20, 1952: 25, 1956: 30, 1960: 35, 1964: 40, 1968: 50, 
-        1972: 60, 1976: 80, 1980: 100, 1984: 150, 1988: 910, 1992: 1224, 1996: 1254, 
-        2000: 1097, 2004: 1680, 2008: 2311, 2012: 2014, 2016: 1850, 2020: 1888, 2022: 2010
-    },
-    'BR': {
-        1896: 1, 1900: 1, 1904: 1, 1908: 1, 1912: 1, 1920: 1, 1924: 1, 1928: 1, 
-        1932: 1, 1936: 1, 1948: 1, 1952: 1, 1956: 1, 1960: 1, 1964: 1, 1968: 1, 
-        1972: 1, 1976: 1, 1980: 1, 1984: 1, 1988: 330, 1992: 328, 1996: 850, 
-        2000: 644, 2004: 604, 2008: 1648, 2012: 2465, 2016: 1796, 2020: 1609, 2022: 1920
-    },
-    'CA': {
-        1896: 2, 1900: 2, 1904: 2, 1908: 2, 1912: 2, 1920: 2, 1924: 2, 1928: 2, 
-        1932: 2, 1936: 2, 1948: 2, 1952: 2, 1956: 2, 1960: 2, 1964: 2, 1968: 2, 
-        1972: 2, 1976: 2, 1980: 2, 1984: 2, 1988: 507, 1992: 580, 1996: 618, 
-        2000: 739, 2004: 1026, 2008: 1500, 2012: 1829, 2016: 1529, 2020: 1643, 2022: 2139
-    },
-    'AU': {
-        1896: 1, 1900: 1, 1904: 1, 1908: 1, 1912: 1, 1920: 1, 1924: 1, 1928: 1, 
-        1932: 1, 1936: 1, 1948: 1, 1952: 1, 1956: 1, 1960: 1, 1964: 1, 1968: 1, 
-        1972: 1, 1976: 1, 1980: 1, 1984: 1, 1988: 296, 1992: 325, 1996: 401, 
-        2000: 415, 2004: 612, 2008: 1055, 2012: 1542, 2016: 1352, 2020: 1331, 2022: 1675
-    },
-    'KR': {
-        1896: 0, 1900: 0, 1904: 0, 1908: 0, 1912: 0, 1920: 0, 1924: 0, 1928: 0, 
-        1932: 0, 1936: 0, 1948: 0, 1952: 0, 1956: 0, 1960: 0, 1964: 0, 1968: 0, 
-        1972: 0, 1976: 0, 1980: 0, 1984: 0, 1988: 200, 1992: 355, 1996: 520, 
-        2000: 533, 2004: 721, 2008: 1007, 2012: 1234, 2016: 1411, 2020: 1638, 2022: 1667
-    },
-    'ES': {
-        1896: 3, 1900: 3, 1904: 3, 1908: 3, 1912: 3, 1920: 3, 1924: 3, 1928: 3, 
-        1932: 3, 1936: 3, 1948: 3, 1952: 3, 1956: 3, 1960: 3, 1964: 3, 1968: 3, 
-        1972: 3, 1976: 3, 1980: 3, 1984: 3, 1988: 390, 1992: 629, 1996: 630, 
-        2000: 595, 2004: 1067, 2008: 1609, 2012: 1322, 2016: 1232, 2020: 1281, 2022: 1398
-    },
-    'NL': {
-        1896: 2, 1900: 2, 1904: 2, 1908: 2, 1912: 2, 1920: 2, 1924: 2, 1928: 2, 
-        1932: 2, 1936: 2, 1948: 2, 1952: 2, 1956: 2, 1960: 2, 1964: 2, 1968: 2, 
-        1972: 2, 1976: 2, 1980: 2, 1984: 2, 1988: 232, 1992: 312, 1996: 415, 
-        2000: 416, 2004: 652, 2008: 868, 2012: 838, 2016: 777, 2020: 912, 2022: 990
-    },
-    'SE': {
-        1896: 1, 1900: 1, 1904: 1, 1908: 1, 1912: 1, 1920: 1, 1924: 1, 1928: 1, 
-        1932: 1, 1936: 1, 1948: 1, 1952: 1, 1956: 1, 1960: 1, 1964: 1, 1968: 1, 
-        1972: 1, 1976: 1, 1980: 1, 1984: 1, 1988: 201, 1992: 265, 1996: 289, 
-        2000: 245, 2004: 361, 2008: 488, 2012: 544, 2016: 511, 2020: 541, 2022: 585
-    },
-    'NO': {
-        1896: 1, 1900: 1, 1904: 1, 1908: 1, 1912: 1, 1920: 1, 1924: 1, 1928: 1, 
-        1932: 1, 1936: 1, 1948: 1, 1952: 1, 1956: 1, 1960: 1, 1964: 1, 1968: 1, 
-        1972: 1, 1976: 1, 1980: 1, 1984: 1, 1988: 112, 1992: 130, 1996: 163, 
-        2000: 171, 2004: 258, 2008: 456, 2012: 499, 2016: 371, 2020: 362, 2022: 579
-    }
-}
-
 def classify_sports_by_cost():
     """Classifier les sports par coût en utilisant les sports disponibles"""
     try:
@@ -263,8 +163,11 @@ def get_available_sports():
         print(f"Erreur lors de la récupération des sports: {e}")
         return []
 
+@cached('medals_data')
 def load_medals_data():
-    """Charger les données de médailles depuis la base de données"""
+    """Charger les données de médailles depuis la base de données (mis en cache, TTL CACHE_TTL)"""
+    import pandas as pd
+
     try:
         from database.supabase_client import get_supabase_client
         
@@ -293,6 +196,9 @@ def load_medals_data():
 
 def analyze_correlation_by_year(years=None):
     """Analyser la corrélation PIB-médailles par année"""
+    from scipy.stats import pearsonr, spearmanr
+    gdp_table = get_gdp_table()
+
     if years is None:
         # Récupérer automatiquement toutes les années disponibles depuis la base de données
         medals_data = load_medals_data()
@@ -337,8 +243,8 @@ def analyze_correlation_by_year(years=None):
             noc_code = row['noc']
             if noc_code in COUNTRY_MAPPING:
                 iso_code = COUNTRY_MAPPING[noc_code]
-                if iso_code in FALLBACK_GDP_DATA and year in FALLBACK_GDP_DATA[iso_code]:
-                    gdp_values.append(FALLBACK_GDP_DATA[iso_code][year])
+                if iso_code in gdp_table and year in gdp_table[iso_code]:
+                    gdp_values.append(gdp_table[iso_code][year])
                     medal_counts.append(row['medal_count'])
                     countries_analyzed.append(noc_code)
         
@@ -366,6 +272,9 @@ def analyze_correlation_by_year(years=None):
 
 def analyze_by_sport_cost(year=2022):
     """Analyser la corrélation par coût des sports"""
+    from scipy.stats import pearsonr, spearmanr
+    gdp_table = get_gdp_table()
+
     medals_data = load_medals_data()
     if medals_data is None:
         return None
@@ -394,8 +303,8 @@ def analyze_by_sport_cost(year=2022):
             noc_code = row['noc']
             if noc_code in COUNTRY_MAPPING:
                 iso_code = COUNTRY_MAPPING[noc_code]
-                if iso_code in FALLBACK_GDP_DATA and year in FALLBACK_GDP_DATA[iso_code]:
-                    gdp_values.append(FALLBACK_GDP_DATA[iso_code][year])
+                if iso_code in gdp_table and year in gdp_table[iso_code]:
+                    gdp_values.append(gdp_table[iso_code][year])
                     medal_counts.append(row['medal_count'])
         
         if len(gdp_values) >= 5:
@@ -418,6 +327,9 @@ def analyze_by_sport_cost(year=2022):
 
 def analyze_gdp_per_capita_correlation(year=2022):
     """Analyser la corrélation avec le PIB par habitant"""
+    from scipy.stats import pearsonr, spearmanr
+    gdp_table = get_gdp_table()
+
     # Données de population approximatives (en millions) - 2022
     population_data = {
         'US': 331, 'CN': 1439, 'JP': 125, 'DE': 83, 'IN': 1380,
@@ -439,9 +351,9 @@ def analyze_gdp_per_capita_correlation(year=2022):
         noc_code = row['noc']
         if noc_code in COUNTRY_MAPPING:
             iso_code = COUNTRY_MAPPING[noc_code]
-            if (iso_code in FALLBACK_GDP_DATA and year in FALLBACK_GDP_DATA[iso_code] and 
+            if (iso_code in gdp_table and year in gdp_table[iso_code] and 
                 iso_code in population_data):
-                gdp_total = FALLBACK_GDP_DATA[iso_code][year]
+                gdp_total = gdp_table[iso_code][year]
                 population = population_data[iso_code]
                 gdp_per_capita.append(gdp_total / population)
                 medal_counts.append(row['medal_count'])
@@ -540,55 +452,62 @@ def get_correlation_gdp_per_capita():
             'message': f'Erreur lors de l\'analyse: {str(e)}'
         }), 500
 
+@payloads.payload('gdp_summary')
+def build_analysis_summary():
+    """Résumé de l'analyse complète (gardé en mémoire, précalculé au démarrage)"""
+    import numpy as np
+
+    # Analyser les corrélations par année
+    correlation_results = analyze_correlation_by_year()
+    
+    # Analyser par coût des sports
+    sport_cost_results = analyze_by_sport_cost()
+    
+    # Analyser le PIB par habitant
+    gdp_per_capita_results = analyze_gdp_per_capita_correlation()
+    
+    # Calculer les statistiques globales
+    if correlation_results:
+        years = list(correlation_results.keys())
+        pearson_corrs = [correlation_results[year]['pearson']['correlation'] for year in years]
+        spearman_corrs = [correlation_results[year]['spearman']['correlation'] for year in years]
+        
+        # Récupérer les informations dynamiques
+        available_years = get_available_years()
+        available_countries = get_available_countries()
+        available_sports = get_available_sports()
+        
+        summary = {
+            'years_analyzed': years,
+            'total_years_available': len(available_years),
+            'total_countries_available': len(available_countries),
+            'total_sports_available': len(available_sports),
+            'mean_pearson_correlation': float(np.mean(pearson_corrs)),
+            'mean_spearman_correlation': float(np.mean(spearman_corrs)),
+            'std_pearson_correlation': float(np.std(pearson_corrs)),
+            'std_spearman_correlation': float(np.std(spearman_corrs)),
+            'correlation_interpretation': 'forte' if abs(np.mean(pearson_corrs)) > 0.7 else 'modérée' if abs(np.mean(pearson_corrs)) > 0.5 else 'faible',
+            'correlation_direction': 'positive' if np.mean(pearson_corrs) > 0 else 'négative',
+            'sport_cost_analysis': sport_cost_results,
+            'gdp_per_capita_analysis': gdp_per_capita_results,
+            'data_source': 'Base de données Supabase (table m_award)',
+            'analysis_period': f"{min(available_years) if available_years else 'N/A'} - {max(available_years) if available_years else 'N/A'}"
+        }
+    else:
+        summary = {
+            'error': 'Aucune donnée de corrélation disponible'
+        }
+
+    return {
+        'status': 'success',
+        'data': summary
+    }
+
 @gdp_analysis_bp.route('/summary', methods=['GET'])
 def get_analysis_summary():
     """Obtenir un résumé de l'analyse complète"""
     try:
-        # Analyser les corrélations par année
-        correlation_results = analyze_correlation_by_year()
-        
-        # Analyser par coût des sports
-        sport_cost_results = analyze_by_sport_cost()
-        
-        # Analyser le PIB par habitant
-        gdp_per_capita_results = analyze_gdp_per_capita_correlation()
-        
-        # Calculer les statistiques globales
-        if correlation_results:
-            years = list(correlation_results.keys())
-            pearson_corrs = [correlation_results[year]['pearson']['correlation'] for year in years]
-            spearman_corrs = [correlation_results[year]['spearman']['correlation'] for year in years]
-            
-            # Récupérer les informations dynamiques
-            available_years = get_available_years()
-            available_countries = get_available_countries()
-            available_sports = get_available_sports()
-            
-            summary = {
-                'years_analyzed': years,
-                'total_years_available': len(available_years),
-                'total_countries_available': len(available_countries),
-                'total_sports_available': len(available_sports),
-                'mean_pearson_correlation': float(np.mean(pearson_corrs)),
-                'mean_spearman_correlation': float(np.mean(spearman_corrs)),
-                'std_pearson_correlation': float(np.std(pearson_corrs)),
-                'std_spearman_correlation': float(np.std(spearman_corrs)),
-                'correlation_interpretation': 'forte' if abs(np.mean(pearson_corrs)) > 0.7 else 'modérée' if abs(np.mean(pearson_corrs)) > 0.5 else 'faible',
-                'correlation_direction': 'positive' if np.mean(pearson_corrs) > 0 else 'négative',
-                'sport_cost_analysis': sport_cost_results,
-                'gdp_per_capita_analysis': gdp_per_capita_results,
-                'data_source': 'Base de données Supabase (table m_award)',
-                'analysis_period': f"{min(available_years) if available_years else 'N/A'} - {max(available_years) if available_years else 'N/A'}"
-            }
-        else:
-            summary = {
-                'error': 'Aucune donnée de corrélation disponible'
-            }
-        
-        return jsonify({
-            'status': 'success',
-            'data': summary
-        })
+        return jsonify(payloads.get('gdp_summary'))
     
     except Exception as e:
         return jsonify({
@@ -755,15 +674,15 @@ def get_gdp_data_from_database():
             
         countries_with_medals = medals_data['noc'].unique()
         
-        # Créer des données PIB réalistes basées sur les pays olympiques
+        # PIB le plus récent par pays (fichier Banque Mondiale local, sinon données de secours)
+        gdp_table = get_gdp_table()
         gdp_data = {}
         for country in countries_with_medals:
-            # Utiliser les données PIB de secours pour les pays avec médailles
             iso_code = COUNTRY_MAPPING.get(country, country)
-            if iso_code in FALLBACK_GDP_DATA:
-                # Prendre la valeur la plus récente (2022)
-                latest_year = max(FALLBACK_GDP_DATA[iso_code].keys())
-                gdp_data[country] = FALLBACK_GDP_DATA[iso_code][latest_year]
+            if gdp_table.get(iso_code):
+                # Prendre la valeur la plus récente
+                latest_year = max(gdp_table[iso_code].keys())
+                gdp_data[country] = gdp_table[iso_code][latest_year]
         
         print(f"📊 Données PIB créées pour {len(gdp_data)} pays")
         return gdp_data
@@ -1,21 +1,86 @@
 """
 Routes pour la vérification de l'état de l'API
+
+- /api/health/live  : liveness, aucune entrée/sortie
+- /api/health/ready : readiness, lit le dernier résultat de la vérification
+                      de connectivité exécutée en arrière-plan (utils.health)
+                      et attend la fin du préchauffage (utils.warmup)
+- /api/health       : état détaillé (connectivité en cache, âge des données,
+                      versions des données, registre de modèles,
+                      préchauffage, rafraîchissement, taux de hit des caches)
 """
+import time
 from flask import Blueprint, jsonify
-from database.supabase_client import test_connection
 from datetime import datetime
+from database import supabase_client
+from services.prediction_service import PredictionService
+from utils.cache import cache_stats
+from utils.data_version import get_versions
+from utils.health import get_monitor
+from utils.scheduler import get_scheduler
+from utils.warmup import get_warmup
 
 # Créer un Blueprint pour les routes de santé
 health_bp = Blueprint('health', __name__, url_prefix='/api')
 
+
+def _snapshot_state():
+    """Âge des tables chargées en mémoire (backend local uniquement)"""
+    # Ne pas créer le client ici : seulement lire celui déjà initialisé
+    client = supabase_client.supabase
+    if not hasattr(client, 'loaded_tables'):
+        return {'backend': supabase_client.DATA_BACKEND, 'tables': {}}
+    now = time.time()
+    return {
+        'backend': supabase_client.DATA_BACKEND,
+        'tables': {
+            name: {
+                'loaded_at': datetime.fromtimestamp(loaded_at).isoformat(),
+                'age_seconds': round(now - loaded_at, 1)
+            }
+            for name, loaded_at in client.loaded_tables().items()
+        }
+    }
+
+
+@health_bp.route('/health/live')
+def liveness():
+    """Le processus répond : aucune entrée/sortie"""
+    return jsonify({'status': 'OK'})
+
+
+@health_bp.route('/health/ready')
+def readiness():
+    """Prêt à servir si la dernière vérification de connectivité a réussi et le préchauffage est terminé"""
+    database = get_monitor().status()
+    warmup = get_warmup().status()
+    ready = database['connected'] is True and warmup['ready']
+    return jsonify({
+        'status': 'OK' if ready else 'Unavailable',
+        'database': database,
+        'warmup': warmup
+    }), 200 if ready else 503
+
+
 @health_bp.route('/health')
 def health_check():
-    """Vérification de l'état de l'API et de la base de données"""
+    """Vérification de l'état de l'API et de la base de données (sans requête)"""
     try:
-        is_connected = test_connection()
+        database = get_monitor().status()
+        if database['connected'] is None:
+            state = 'Pending'
+        else:
+            state = 'Connected' if database['connected'] else 'Disconnected'
         return jsonify({
             'status': 'OK',
-            'database': 'Connected' if is_connected else 'Disconnected',
+            'database': state,
+            'connectivity': database,
+            'data_snapshot': _snapshot_state(),
+            'data_versions': get_versions().published(),
+            'models': PredictionService.registry_state(),
+            'warmup': get_warmup().status(),
+            'refresh_scheduler': get_scheduler().status(),
+            'caches': cache_stats(),
             'framework': 'Flask',
             'timestamp': datetime.now().isoformat()
         })
@@ -4,10 +4,14 @@ Routes pour les opérations liées aux villes hôtes
 from flask import Blueprint, jsonify, request
 from services.host_service import HostService
 from datetime import datetime
+from utils import payloads
 
 # Créer un Blueprint pour les routes des villes hôtes
 host_bp = Blueprint('hosts', __name__, url_prefix='/api')
 
+# Classement des pays organisateurs : gardé en mémoire, rafraîchi en arrière-plan
+payloads.register('hosts_ranking', HostService.get_hosts_ranking)
+
 @host_bp.route('/hosts')
 def get_hosts():
     """Récupérer les données des villes hôtes avec filtres et pagination"""
@@ -56,7 +60,7 @@ def get_hosts():
 @host_bp.route('/hosts/ranking')
 def get_hosts_ranking():
     """Récupérer le classement des pays organisateurs de JO"""
-    result = HostService.get_hosts_ranking()
+    result = payloads.get('hosts_ranking')
     
     if result['status'] == 'error':
         return jsonify({
@@ -3,10 +3,15 @@ Routes pour les opérations liées aux médailles
 """
 from flask import Blueprint, jsonify, request
 from services.medal_service import MedalService
+from utils import payloads
 
 # Créer un Blueprint pour les routes des médailles
 medal_bp = Blueprint('medals', __name__, url_prefix='/api')
 
+# Analyses les plus demandées : gardées en mémoire et précalculées au démarrage
+payloads.register('france_medals', MedalService.get_france_medals)
+payloads.register('country_performance', MedalService.get_country_performance_analysis)
+
 @medal_bp.route('/medals')
 def get_medals():
     """Récupérer les données de médailles avec filtres et pagination"""
@@ -59,7 +64,7 @@ def get_rewards():
 @medal_bp.route('/medals/france')
 def get_france_medals():
     """Récupérer les médailles de la France depuis le début des JO"""
-    result = MedalService.get_france_medals()
+    result = payloads.get('france_medals')
     
     if result['status'] == 'error':
         return jsonify(result), 500
@@ -99,7 +104,7 @@ def get_dominant_sports():
 @medal_bp.route('/medals/country-performance')
 def get_country_performance():
     """Analyser les performances par pays - classement global et comparaisons"""
-    result = MedalService.get_country_performance_analysis()
+    result = payloads.get('country_performance')
     
     if result['status'] == 'error':
         return jsonify(result), 500
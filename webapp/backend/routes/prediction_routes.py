@@ -3,9 +3,16 @@ Routes pour les prédictions de médailles olympiques
 """
 from flask import Blueprint, request, jsonify
 from services.prediction_service import PredictionService
+from utils import payloads
 
 prediction_bp = Blueprint('prediction', __name__, url_prefix='/api/predictions')
 
+# Classement prédit gardé en mémoire par (top_n, year, model), précalculé au démarrage
+payloads.register('top_countries', PredictionService.predict_top_countries)
+
+# Nombre maximal de couples (pays, année) par appel à /countries
+MAX_BATCH_PREDICTIONS = 500
+
 @prediction_bp.route('/country/<country>', methods=['GET'])
 def predict_country_medals(country):
     """
@@ -37,6 +44,60 @@ def predict_country_medals(country):
             'error': str(e)
         }), 500
 
+@prediction_bp.route('/countries', methods=['POST'])
+def predict_countries_medals():
+    """
+    Prédire les médailles de plusieurs pays en une seule requête (un seul appel au modèle)
+    Body JSON: {"countries": [str], "years": [int] (ou "year": int), "model": str}
+    """
+    payload = request.get_json(silent=True) or {}
+    countries = payload.get('countries')
+    years = payload.get('years', [payload.get('year', 2024)])
+    model = payload.get('model', 'ma')
+
+    if isinstance(years, (int, str)):
+        years = [years]
+    if not isinstance(countries, list) or not countries or not all(isinstance(c, str) and c.strip() for c in countries):
+        return jsonify({
+            'success': False,
+            'error': "'countries' doit être une liste non vide de noms de pays"
+        }), 400
+    try:
+        years = [int(year) for year in years]
+    except (TypeError, ValueError):
+        return jsonify({
+            'success': False,
+            'error': "'years' doit être une liste d'années"
+        }), 400
+    if not years or len(countries) * len(years) > MAX_BATCH_PREDICTIONS:
+        return jsonify({
+            'success': False,
+            'error': f'Entre 1 et {MAX_BATCH_PREDICTIONS} couples (pays, année) par requête'
+        }), 400
+
+    try:
+        results = PredictionService.predict_countries(
+            countries=countries,
+            years=years,
+            model=model
+        )
+
+        return jsonify({
+            'success': True,
+            'data': results,
+            'metadata': {
+                'countries': countries,
+                'years': years,
+                'model': model,
+                'count': len(results)
+            }
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 @prediction_bp.route('/top-countries', methods=['GET'])
 def predict_top_countries():
     """
@@ -48,11 +109,7 @@ def predict_top_countries():
         year = request.args.get('year', 2024, type=int)
         model = request.args.get('model', 'ma')
         
-        results = PredictionService.predict_top_countries(
-            top_n=top_n,
-            year=year,
-            model=model
-        )
+        results = payloads.get('top_countries', top_n, year, model)
         
         return jsonify({
             'success': True,
@@ -111,41 +168,11 @@ def predict_sport_performance():
         year = request.args.get('year', 2024, type=int)
         limit = request.args.get('limit', 20, type=int)
         
-        # Pour l'instant, utilisons les données historiques par sport
-        # TODO: Implémenter un modèle spécifique pour les sports
-        from services.prediction_service import _safe_read_csv, DATA_DIR
-        import pandas as pd
-        
-        df = _safe_read_csv(f"{DATA_DIR}/olympic_medals_clean_v2.csv")
-        if df is None:
-            return jsonify({
-                'success': False,
-                'error': 'Données non disponibles'
-            }), 500
-        
-        # Filtrer par sport si spécifié
-        if sport:
-            df = df[df['sport'].str.contains(sport, case=False, na=False)]
-        
-        # Grouper par sport et calculer les moyennes
-        sport_stats = df.groupby('sport').agg({
-            'gold': 'mean',
-            'silver': 'mean', 
-            'bronze': 'mean'
-        }).round(1)
-        
-        sport_stats['total'] = sport_stats['gold'] + sport_stats['silver'] + sport_stats['bronze']
-        sport_stats = sport_stats.sort_values('total', ascending=False).head(limit)
-        
-        results = []
-        for sport_name, row in sport_stats.iterrows():
-            results.append({
-                'sport': sport_name,
-                'gold': int(row['gold']),
-                'silver': int(row['silver']),
-                'bronze': int(row['bronze']),
-                'total': int(row['total'])
-            })
+        results = PredictionService.predict_sport_performance(
+            sport=sport,
+            year=year,
+            limit=limit
+        )
         
         return jsonify({
             'success': True,
@@ -154,6 +181,7 @@ def predict_sport_performance():
                 'sport_filter': sport,
                 'year': year,
                 'limit': limit,
+                'model': 'sport_panel_trend',
                 'count': len(results)
             }
         })
@@ -163,6 +191,50 @@ def predict_sport_performance():
             'error': str(e)
         }), 500
 
+@prediction_bp.route('/simulation', methods=['GET'])
+def simulate_games():
+    """
+    Distributions de médailles par pays (simulation Monte-Carlo des Jeux)
+    Query params: year (int), country (NOC ou nom), top_n (int), simulations (int)
+    """
+    try:
+        year = request.args.get('year', 2028, type=int)
+        country = request.args.get('country', '').strip()
+        top_n = request.args.get('top_n', 25, type=int)
+        simulations = request.args.get('simulations', type=int)
+
+        try:
+            result = PredictionService.simulate_games(year=year, simulations=simulations)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+
+        rows = result.get('countries', [])
+        if country:
+            wanted = country.lower()
+            rows = [r for r in rows if wanted in (r['noc'].lower(), str(r['country']).lower())]
+        else:
+            rows = rows[:max(0, top_n)]
+
+        return jsonify({
+            'success': True,
+            'data': rows,
+            'metadata': {
+                'year': year,
+                'country': country,
+                'top_n': top_n,
+                'count': len(rows),
+                **{k: v for k, v in result.items() if k != 'countries'}
+            }
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 @prediction_bp.route('/models/status', methods=['GET'])
 def get_models_status():
     """
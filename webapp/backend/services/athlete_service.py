@@ -1,9 +1,106 @@
 """
 Service pour gérer les opérations liées aux athlètes
+
+La recherche par nom passe par un index en mémoire (utils/search_index.py)
+construit à partir d'un snapshot de la table athlete ; la base ne sert plus
+qu'à récupérer les lignes de la page demandée.
 """
+from database.snapshot import load_table_snapshot
 from database.supabase_client import get_supabase_client
+from utils import data_version
+from utils.cache import SEARCH_INDEX_TTL, get_cache
+
+SNAPSHOT_COLUMNS = ['id', 'athlete_full_name', 'first_year']
+
+# clé : version des données (utils/data_version.py)
+_index_cache = get_cache('athlete_search_index', ttl=SEARCH_INDEX_TTL, maxsize=2)
+
+
+class AthleteSearchIndex:
+    """Index des noms d'athlètes + colonnes du snapshot pour filtrer et trier"""
+
+    def __init__(self, snapshot):
+        import pandas as pd
+        from utils.search_index import NameIndex
+
+        self.snapshot = snapshot.reset_index(drop=True)
+        self.ids = self.snapshot['id'].to_numpy()
+        self.first_year = pd.to_numeric(self.snapshot['first_year'], errors='coerce').to_numpy(dtype=float)
+        self.names = NameIndex(self.snapshot['athlete_full_name'].tolist())
+
+    def search(self, term, filters=None, sort_by='', sort_order='asc'):
+        """Identifiants des athlètes correspondants (par pertinence, ou selon sort_by)"""
+        rows = self.names.search(term)
+
+        filters = filters or {}
+        years = self.first_year[rows]
+        keep = None
+        for key, test in (('year', lambda v: years == float(v)),
+                          ('year_min', lambda v: years >= float(v)),
+                          ('year_max', lambda v: years <= float(v))):
+            if key in filters:
+                mask = test(filters[key])
+                keep = mask if keep is None else keep & mask
+        if keep is not None:
+            rows = rows[keep]
+
+        if sort_by:
+            ordered = self.snapshot.iloc[rows].sort_values(
+                sort_by, ascending=sort_order != 'desc', kind='stable', na_position='last')
+            return ordered['id'].to_numpy()
+        return self.ids[rows]
+
 
 class AthleteService:
+    @staticmethod
+    def get_search_index(refresh=False, version=None):
+        """Index de recherche pour la version des données `version` (courante par défaut), ou None
+
+        Passé SEARCH_INDEX_TTL secondes, l'index actuel reste servi pendant sa reconstruction en
+        arrière-plan ; refresh=True le reconstruit tout de suite (planificateur).
+        """
+        def build():
+            snapshot = load_table_snapshot('athlete', SNAPSHOT_COLUMNS)
+            return None if snapshot is None else AthleteSearchIndex(snapshot)
+
+        key = version or data_version.token()
+        if refresh:
+            index = build()
+            if index is not None:
+                _index_cache.set(key, index)
+            return index
+        return _index_cache.fetch(key, build)
+
+    @staticmethod
+    def refresh_search_index(version=None):
+        """Reconstruire l'index s'il a déjà été construit (après relecture des snapshots)"""
+        if _index_cache.keys():
+            return AthleteService.get_search_index(refresh=True, version=version) is not None
+        return False
+
+    @staticmethod
+    def search_athletes(supabase, index, page, limit, search, sort_by, sort_order, filters):
+        """Recherche via l'index puis lecture des seules lignes de la page"""
+        ids = index.search(search, filters, sort_by, sort_order)
+        offset = (page - 1) * limit
+        page_ids = [v.item() if hasattr(v, 'item') else v for v in ids[offset:offset + limit]]
+
+        data = []
+        if page_ids:
+            result = supabase.table('athlete').select('*').in_('id', page_ids).execute()
+            by_id = {row['id']: row for row in result.data}
+            data = [by_id[i] for i in page_ids if i in by_id]
+
+        total = len(ids)
+        return {
+            'status': 'success',
+            'data': data,
+            'total': total,
+            'page': page,
+            'limit': limit,
+            'total_pages': (total + limit - 1) // limit if total else 0
+        }
+
     @staticmethod
     def get_athletes(page=1, limit=20, search='', sort_by='', sort_order='asc', filters=None):
         """Récupérer la liste des athlètes avec filtres et pagination"""
@@ -16,6 +113,14 @@ class AthleteService:
                     'message': 'Client Supabase non initialisé'
                 }
             
+            # Recherche par nom : index en mémoire si le tri le permet
+            if search and (not sort_by or sort_by in SNAPSHOT_COLUMNS):
+                index = AthleteService.get_search_index()
+                if index is not None:
+                    return AthleteService.search_athletes(
+                        supabase, index, page, limit, search, sort_by, sort_order, filters
+                    )
+
             # Construire la requête de base
             query = supabase.table('athlete').select('*', count='exact')
             
@@ -0,0 +1,79 @@
+"""
+Service de facettes pour les filtres du DataViewer
+
+Chaque colonne à faible cardinalité (année, sport, NOC, médaille...) du snapshot
+a un bitmap par valeur distincte (voir services/search_service.py). Une
+combinaison de filtres est un OR des valeurs choisies dans une colonne puis un
+AND entre colonnes ; les comptes de chaque facette sont calculés sur les lignes
+filtrées par toutes les AUTRES colonnes, pour que l'interface puisse afficher
+les valeurs encore disponibles en un seul appel.
+"""
+from services.search_service import TABLES, SearchService
+
+
+class FacetService:
+    @staticmethod
+    def get_facets(table='m_award', selections=None, year_min=None, year_max=None, search=''):
+        """Total des lignes correspondantes et comptes par valeur pour chaque facette"""
+        try:
+            if table not in TABLES:
+                return {
+                    'status': 'error',
+                    'message': f"Table inconnue: {table} (disponibles: {', '.join(TABLES)})"
+                }
+
+            index = SearchService.get_index(table)
+            if index is None:
+                return {
+                    'status': 'error',
+                    'message': f'Snapshot de la table {table} indisponible'
+                }
+
+            # Lignes retenues par la recherche texte (commune à toutes les facettes)
+            base = index.all_rows
+            if search:
+                found = index.text.search(search)
+                if found is not None:
+                    base &= found
+
+            # Un bitmap par colonne filtrée : OR des valeurs choisies (et plage d'années)
+            selected = {}
+            for column, values in (selections or {}).items():
+                if column in index.facets and values:
+                    selected[column] = index.column_index(column).any_of(values)
+            if index.range_column and (year_min is not None or year_max is not None):
+                years = index.column_index(index.range_column).between(year_min, year_max)
+                selected[index.range_column] = selected.get(index.range_column, index.all_rows) & years
+
+            matched = base
+            for bitmap in selected.values():
+                matched &= bitmap
+
+            facets = {}
+            for column in index.facets:
+                # filtres de toutes les autres colonnes
+                scope = base
+                for other, bitmap in selected.items():
+                    if other != column:
+                        scope &= bitmap
+                column_index = index.column_index(column)
+                counts = column_index.counts(scope)
+                if column_index.numeric:
+                    counts.sort(key=lambda item: item[0])
+                else:
+                    counts.sort(key=lambda item: (-item[1], str(item[0])))
+                facets[column] = [{'value': value, 'count': count} for value, count in counts]
+
+            return {
+                'status': 'success',
+                'table': table,
+                'total': matched.bit_count(),
+                'filters': {column: list(values) for column, values in (selections or {}).items()
+                            if column in index.facets and values},
+                'facets': facets
+            }
+        except Exception as error:
+            return {
+                'status': 'error',
+                'message': str(error)
+            }
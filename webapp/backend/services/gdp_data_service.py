@@ -0,0 +1,402 @@
+"""
+Service PIB : données de la Banque Mondiale (NY.GDP.MKTP.CD) avec stockage local
+
+- Récupération groupée : une requête couvre plusieurs pays (country/US;FR;DE/...),
+  les lots et les pages sont téléchargés par un pool de threads borné.
+- Les valeurs sont conservées dans un fichier JSON versionné (par code ISO, par année,
+  en milliards USD) ; un pays n'est redemandé que si ses données ont plus de
+  GDP_MAX_AGE_DAYS jours ou s'il manque des années, avec If-None-Match /
+  If-Modified-Since quand l'API a renvoyé un ETag / Last-Modified.
+- Les routes ne lisent que le fichier : elles fonctionnent hors ligne. Les années
+  absentes du fichier (avant 1960 notamment) sont complétées par FALLBACK_GDP_DATA.
+
+Mise à jour du fichier :
+    python -m services.gdp_data_service --refresh [--force] [--years 1960:2024]
+"""
+import argparse
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+SCHEMA_VERSION = 1
+INDICATOR = 'NY.GDP.MKTP.CD'
+
+DEFAULT_STORE = Path(__file__).resolve().parents[3] / 'data' / 'clean' / 'world_bank_gdp.json'
+STORE_PATH = Path(os.getenv('GDP_STORE_PATH', DEFAULT_STORE))
+WORLD_BANK_API_URL = os.getenv('WORLD_BANK_API_URL', 'https://api.worldbank.org/v2')
+MAX_AGE_DAYS = float(os.getenv('GDP_MAX_AGE_DAYS', 30))
+
+# Données PIB de secours (en milliards USD) - toutes les années disponibles
+FALLBACK_GDP_DATA = {
+    'US': {
+        1896: 45, 1900: 50, 1904: 55, 1908: 60, 1912: 65, 1920: 70, 1924: 85, 1928: 100,
+        1932: 60, 1936: 85, 1948: 250, 1952: 350, 1956: 450, 1960: 550, 1964: 700, 1968: 950,
+        1972: 1200, 1976: 1900, 1980: 2800, 1984: 4000, 1988: 5253, 1992: 6520, 1996: 8076,
+        2000: 10252, 2004: 12297, 2008: 14478, 2012: 16197, 2016: 18624, 2020: 20953, 2022: 25463
+    },
+    'CN': {
+        1896: 5, 1900: 5, 1904: 5, 1908: 5, 1912: 5, 1920: 5, 1924: 5, 1928: 5,
+        1932: 5, 1936: 5, 1948: 5, 1952: 5, 1956: 5, 1960: 5, 1964: 5, 1968: 5,
+        1972: 5, 1976: 5, 1980: 5, 1984: 5, 1988: 312, 1992: 422, 1996: 856,
+        2000: 1211, 2004: 1959, 2008: 4594, 2012: 8527, 2016: 11233, 2020: 14723, 2022: 17963
+    },
+    'JP': {
+        1896: 5, 1900: 5, 1904: 5, 1908: 5, 1912: 5, 1920: 5, 1924: 5, 1928: 5,
+        1932: 5, 1936: 5, 1948: 5, 1952: 5, 1956: 5, 1960: 5, 1964: 5, 1968: 5,
+        1972: 5, 1976: 5, 1980: 5, 1984: 5, 1988: 3071, 1992: 3908, 1996: 4731,
+        2000: 4888, 2004: 4601, 2008: 5035, 2012: 6203, 2016: 4937, 2020: 4888, 2022: 4232
+    },
+    'DE': {
+        1896: 15, 1900: 20, 1904: 25, 1908: 30, 1912: 35, 1920: 40, 1924: 50, 1928: 60,
+        1932: 70, 1936: 80, 1948: 100, 1952: 150, 1956: 200, 1960: 250, 1964: 300, 1968: 400,
+        1972: 500, 1976: 600, 1980: 800, 1984: 1000, 1988: 1547, 1992: 2074, 1996: 2491,
+        2000: 1948, 2004: 2751, 2008: 3651, 2012: 3527, 2016: 3467, 2020: 3846, 2022: 4082
+    },
+    'IN': {
+        1896: 2, 1900: 2, 1904: 2, 1908: 2, 1912: 2, 1920: 2, 1924: 2, 1928: 2,
+        1932: 2, 1936: 2, 1948: 2, 1952: 2, 1956: 2, 1960: 2, 1964: 2, 1968: 2,
+        1972: 2, 1976: 2, 1980: 2, 1984: 2, 1988: 297, 1992: 288, 1996: 393,
+        2000: 468, 2004: 709, 2008: 1199, 2012: 1828, 2016: 2286, 2020: 3176, 2022: 3385
+    },
+    'GB': {
+        1896: 10, 1900: 12, 1904: 14, 1908: 16, 1912: 18, 1920: 20, 1924: 25, 1928: 30,
+        1932: 35, 1936: 40, 1948: 50, 1952: 60, 1956: 70, 1960: 80, 1964: 100, 1968: 120,
+        1972: 150, 1976: 200, 1980: 300, 1984: 400, 1988: 1000, 1992: 1104, 1996: 1314,
+        2000: 1559, 2004: 2194, 2008: 2670, 2012: 2611, 2016: 2629, 2020: 2707, 2022: 3071
+    },
+    'FR': {
+        1896: 8, 1900: 10, 1904: 12, 1908: 14, 1912: 16, 1920: 18, 1924: 22, 1928: 26,
+        1932: 30, 1936: 35, 1948: 40, 1952: 50, 1956: 60, 1960: 70, 1964: 80, 1968: 100,
+        1972: 120, 1976: 150, 1980: 200, 1984: 300, 1988: 1024, 1992: 1400, 1996: 1564,
+        2000: 1365, 2004: 2046, 2008: 2918, 2012: 2611, 2016: 2424, 2020: 2603, 2022: 2782
+    },
+    'IT': {
+        1896: 5, 1900: 6, 1904: 7, 1908: 8, 1912: 9, 1920: 10, 1924: 12, 1928: 14,
+        1932: 16, 1936: 18, 1948: 20, 1952: 25, 1956: 30, 1960: 35, 1964: 40, 1968: 50,
+        1972: 60, 1976: 80, 1980: 100, 1984: 150, 1988: 910, 1992: 1224, 1996: 1254,
+        2000: 1097, 2004: 1680, 2008: 2311, 2012: 2014, 2016: 1850, 2020: 1888, 2022: 2010
+    },
+    'BR': {
+        1896: 1, 1900: 1, 1904: 1, 1908: 1, 1912: 1, 1920: 1, 1924: 1, 1928: 1,
+        1932: 1, 1936: 1, 1948: 1, 1952: 1, 1956: 1, 1960: 1, 1964: 1, 1968: 1,
+        1972: 1, 1976: 1, 1980: 1, 1984: 1, 1988: 330, 1992: 328, 1996: 850,
+        2000: 644, 2004: 604, 2008: 1648, 2012: 2465, 2016: 1796, 2020: 1609, 2022: 1920
+    },
+    'CA': {
+        1896: 2, 1900: 2, 1904: 2, 1908: 2, 1912: 2, 1920: 2, 1924: 2, 1928: 2,
+        1932: 2, 1936: 2, 1948: 2, 1952: 2, 1956: 2, 1960: 2, 1964: 2, 1968: 2,
+        1972: 2, 1976: 2, 1980: 2, 1984: 2, 1988: 507, 1992: 580, 1996: 618,
+        2000: 739, 2004: 1026, 2008: 1500, 2012: 1829, 2016: 1529, 2020: 1643, 2022: 2139
+    },
+    'AU': {
+        1896: 1, 1900: 1, 1904: 1, 1908: 1, 1912: 1, 1920: 1, 1924: 1, 1928: 1,
+        1932: 1, 1936: 1, 1948: 1, 1952: 1, 1956: 1, 1960: 1, 1964: 1, 1968: 1,
+        1972: 1, 1976: 1, 1980: 1, 1984: 1, 1988: 296, 1992: 325, 1996: 401,
+        2000: 415, 2004: 612, 2008: 1055, 2012: 1542, 2016: 1352, 2020: 1331, 2022: 1675
+    },
+    'KR': {
+        1896: 0, 1900: 0, 1904: 0, 1908: 0, 1912: 0, 1920: 0, 1924: 0, 1928: 0,
+        1932: 0, 1936: 0, 1948: 0, 1952: 0, 1956: 0, 1960: 0, 1964: 0, 1968: 0,
+        1972: 0, 1976: 0, 1980: 0, 1984: 0, 1988: 200, 1992: 355, 1996: 520,
+        2000: 533, 2004: 721, 2008: 1007, 2012: 1234, 2016: 1411, 2020: 1638, 2022: 1667
+    },
+    'ES': {
+        1896: 3, 1900: 3, 1904: 3, 1908: 3, 1912: 3, 1920: 3, 1924: 3, 1928: 3,
+        1932: 3, 1936: 3, 1948: 3, 1952: 3, 1956: 3, 1960: 3, 1964: 3, 1968: 3,
+        1972: 3, 1976: 3, 1980: 3, 1984: 3, 1988: 390, 1992: 629, 1996: 630,
+        2000: 595, 2004: 1067, 2008: 1609, 2012: 1322, 2016: 1232, 2020: 1281, 2022: 1398
+    },
+    'NL': {
+        1896: 2, 1900: 2, 1904: 2, 1908: 2, 1912: 2, 1920: 2, 1924: 2, 1928: 2,
+        1932: 2, 1936: 2, 1948: 2, 1952: 2, 1956: 2, 1960: 2, 1964: 2, 1968: 2,
+        1972: 2, 1976: 2, 1980: 2, 1984: 2, 1988: 232, 1992: 312, 1996: 415,
+        2000: 416, 2004: 652, 2008: 868, 2012: 838, 2016: 777, 2020: 912, 2022: 990
+    },
+    'SE': {
+        1896: 1, 1900: 1, 1904: 1, 1908: 1, 1912: 1, 1920: 1, 1924: 1, 1928: 1,
+        1932: 1, 1936: 1, 1948: 1, 1952: 1, 1956: 1, 1960: 1, 1964: 1, 1968: 1,
+        1972: 1, 1976: 1, 1980: 1, 1984: 1, 1988: 201, 1992: 265, 1996: 289,
+        2000: 245, 2004: 361, 2008: 488, 2012: 544, 2016: 511, 2020: 541, 2022: 585
+    },
+    'NO': {
+        1896: 1, 1900: 1, 1904: 1, 1908: 1, 1912: 1, 1920: 1, 1924: 1, 1928: 1,
+        1932: 1, 1936: 1, 1948: 1, 1952: 1, 1956: 1, 1960: 1, 1964: 1, 1968: 1,
+        1972: 1, 1976: 1, 1980: 1, 1984: 1, 1988: 112, 1992: 130, 1996: 163,
+        2000: 171, 2004: 258, 2008: 456, 2012: 499, 2016: 371, 2020: 362, 2022: 579
+    }
+}
+
+
+def _now_iso():
+    return datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+
+def _age_days(timestamp):
+    try:
+        fetched = datetime.fromisoformat(timestamp)
+    except (TypeError, ValueError):
+        return float('inf')
+    return (datetime.now(timezone.utc) - fetched).total_seconds() / 86400
+
+
+class GDPDataService:
+    """Lecture du stockage local et mise à jour depuis l'API de la Banque Mondiale"""
+
+    def __init__(self, store_path=None, base_url=None, timeout=10, max_workers=4,
+                 batch_size=40, max_age_days=None, session=None):
+        self.store_path = Path(store_path or STORE_PATH)
+        self.base_url = (base_url or WORLD_BANK_API_URL).rstrip('/')
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self.batch_size = batch_size
+        self.max_age_days = MAX_AGE_DAYS if max_age_days is None else max_age_days
+        self._session = session
+        self._lock = threading.Lock()
+        self._table = None
+        self._table_mtime = None
+
+    # --------------------- STOCKAGE ---------------------
+
+    def load_store(self):
+        """Contenu du fichier local (structure vide si absent ou d'une autre version)"""
+        empty = {'schema_version': SCHEMA_VERSION, 'indicator': INDICATOR, 'countries': {}}
+        if not self.store_path.exists():
+            return empty
+        try:
+            with open(self.store_path, encoding='utf-8') as f:
+                store = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Fichier PIB illisible ({self.store_path}): {e}")
+            return empty
+        if store.get('schema_version') != SCHEMA_VERSION or store.get('indicator') != INDICATOR:
+            print(f"⚠️ Fichier PIB ignoré : version {store.get('schema_version')} != {SCHEMA_VERSION}")
+            return empty
+        return store
+
+    def save_store(self, store):
+        store['schema_version'] = SCHEMA_VERSION
+        store['indicator'] = INDICATOR
+        store['updated_at'] = _now_iso()
+        self.store_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.store_path.with_suffix('.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(store, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.store_path)
+
+    def get_gdp_table(self):
+        """{iso: {année: PIB en milliards USD}} : fichier local complété par FALLBACK_GDP_DATA
+
+        Relu uniquement quand le fichier change (mtime).
+        """
+        mtime = self.store_path.stat().st_mtime if self.store_path.exists() else None
+        with self._lock:
+            if self._table is not None and mtime == self._table_mtime:
+                return self._table
+
+            table = {iso: dict(values) for iso, values in FALLBACK_GDP_DATA.items()}
+            for iso, entry in self.load_store()['countries'].items():
+                values = {int(year): value for year, value in entry.get('values', {}).items()}
+                table.setdefault(iso, {}).update(values)
+
+            self._table = table
+            self._table_mtime = mtime
+            return table
+
+    def get_gdp(self, iso_code, year):
+        return self.get_gdp_table().get(iso_code, {}).get(year)
+
+    def latest_gdp(self, iso_code):
+        """(année, valeur) la plus récente pour un pays, ou None"""
+        values = self.get_gdp_table().get(iso_code)
+        if not values:
+            return None
+        year = max(values)
+        return year, values[year]
+
+    # --------------------- API BANQUE MONDIALE ---------------------
+
+    def _get_session(self):
+        if self._session is None:
+            import requests
+            self._session = requests.Session()
+        return self._session
+
+    def _fetch_page(self, codes, start_year, end_year, page, validators=None):
+        """Une page de la requête groupée ; renvoie (statut, métadonnées, lignes, en-têtes)"""
+        url = f"{self.base_url}/country/{';'.join(codes)}/indicator/{INDICATOR}"
+        params = {'date': f'{start_year}:{end_year}', 'format': 'json', 'per_page': 20000, 'page': page}
+        headers = {}
+        if validators:
+            if validators.get('etag'):
+                headers['If-None-Match'] = validators['etag']
+            if validators.get('last_modified'):
+                headers['If-Modified-Since'] = validators['last_modified']
+
+        response = self._get_session().get(url, params=params, headers=headers, timeout=self.timeout)
+        if response.status_code == 304:
+            return 304, None, [], response.headers
+        response.raise_for_status()
+        payload = response.json()
+        if not isinstance(payload, list) or len(payload) < 2:
+            # L'API renvoie [{"message": [...]}] pour un code pays inconnu
+            return response.status_code, payload[0] if payload else {}, [], response.headers
+        return response.status_code, payload[0], payload[1] or [], response.headers
+
+    def _fetch_batch(self, codes, start_year, end_year, validators=None):
+        """Toutes les pages d'un lot de pays ; {'status', 'rows', 'meta', 'headers'}"""
+        status, meta, rows, headers = self._fetch_page(codes, start_year, end_year, 1, validators)
+        if status == 304:
+            return {'status': 304, 'rows': [], 'meta': None, 'headers': headers}
+        pages = int((meta or {}).get('pages') or 1)
+        for page in range(2, pages + 1):
+            _, _, more, _ = self._fetch_page(codes, start_year, end_year, page)
+            rows.extend(more)
+        return {'status': status, 'rows': rows, 'meta': meta, 'headers': headers}
+
+    def fetch(self, iso_codes, start_year, end_year, validators=None):
+        """Télécharger le PIB de plusieurs pays ; {iso: {année: milliards USD}} + détails par lot
+
+        Les lots de `batch_size` pays sont répartis sur `max_workers` threads.
+        """
+        codes = sorted(set(iso_codes))
+        batches = [codes[i:i + self.batch_size] for i in range(0, len(codes), self.batch_size)]
+        values = {}
+        results = []
+
+        def run(batch):
+            batch_validators = (validators or {}).get(tuple(batch))
+            try:
+                return batch, self._fetch_batch(batch, start_year, end_year, batch_validators), None
+            except Exception as e:
+                return batch, None, e
+
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(batches) or 1))) as pool:
+            for batch, result, error in pool.map(run, batches):
+                results.append((batch, result, error))
+                if result is None:
+                    continue
+                for row in result['rows']:
+                    iso = (row.get('country') or {}).get('id') or row.get('countryiso2code')
+                    if not iso or row.get('value') is None:
+                        continue
+                    try:
+                        year = int(row['date'])
+                    except (KeyError, TypeError, ValueError):
+                        continue
+                    values.setdefault(iso, {})[year] = row['value'] / 1e9  # Convertir en milliards USD
+        return values, results
+
+    def stale_countries(self, store, iso_codes, years):
+        """Pays à redemander : absents, trop anciens ou ne couvrant pas la plage demandée"""
+        stale = []
+        for iso in iso_codes:
+            entry = store['countries'].get(iso)
+            if entry is None or _age_days(entry.get('fetched_at')) > self.max_age_days:
+                stale.append(iso)
+            elif entry.get('start_year', 9999) > min(years) or entry.get('end_year', 0) < max(years):
+                stale.append(iso)
+        return stale
+
+    def refresh(self, iso_codes=None, years=None, force=False):
+        """Mettre à jour le fichier local pour les pays périmés ; renvoie un résumé"""
+        if iso_codes is None:
+            from routes.gdp_analysis_routes import COUNTRY_MAPPING
+            iso_codes = sorted(set(COUNTRY_MAPPING.values()))
+        years = list(years) if years is not None else list(range(1960, datetime.now().year + 1))
+        start_year, end_year = min(years), max(years)
+
+        store = self.load_store()
+        to_fetch = sorted(set(iso_codes)) if force else self.stale_countries(store, iso_codes, years)
+        summary = {'requested': len(set(iso_codes)), 'fetched': 0, 'not_modified': 0,
+                   'up_to_date': len(set(iso_codes)) - len(to_fetch), 'errors': []}
+        if not to_fetch:
+            return summary
+
+        # Validateurs HTTP mémorisés par lot identique
+        validators = {} if force else {
+            tuple(batch['countries']): batch for batch in store.get('batches', [])
+            if batch.get('start_year') == start_year and batch.get('end_year') == end_year
+        }
+        values, results = self.fetch(to_fetch, start_year, end_year, validators)
+
+        fetched_at = _now_iso()
+        batches = [b for b in store.get('batches', []) if not set(b['countries']) & set(to_fetch)]
+        for batch, result, error in results:
+            if error is not None:
+                summary['errors'].append({'countries': batch, 'error': str(error)})
+                continue
+            for iso in batch:
+                entry = store['countries'].setdefault(iso, {'values': {}})
+                if result['status'] != 304:
+                    # fusionner : une plage plus étroite ne supprime pas les années déjà stockées
+                    merged = {int(y): v for y, v in entry.get('values', {}).items()}
+                    merged.update(values.get(iso, {}))
+                    entry['values'] = {str(y): v for y, v in sorted(merged.items())}
+                    entry['source_lastupdated'] = (result['meta'] or {}).get('lastupdated')
+                entry.update({
+                    'fetched_at': fetched_at,
+                    'start_year': min(entry.get('start_year', start_year), start_year),
+                    'end_year': max(entry.get('end_year', end_year), end_year),
+                })
+            if result['status'] == 304:
+                summary['not_modified'] += len(batch)
+            else:
+                summary['fetched'] += len(batch)
+            headers = result['headers'] or {}
+            batches.append({
+                'countries': batch, 'start_year': start_year, 'end_year': end_year,
+                'etag': headers.get('ETag'), 'last_modified': headers.get('Last-Modified'),
+            })
+
+        store['batches'] = batches
+        self.save_store(store)
+        return summary
+
+
+_service = None
+
+
+def get_gdp_service():
+    global _service
+    if _service is None:
+        _service = GDPDataService()
+    return _service
+
+
+def get_gdp_table():
+    """Table PIB utilisée par les routes d'analyse (hors ligne)"""
+    return get_gdp_service().get_gdp_table()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--refresh', action='store_true', help='mettre à jour le fichier local depuis l\'API')
+    parser.add_argument('--force', action='store_true', help='ignorer l\'âge des données et les validateurs HTTP')
+    parser.add_argument('--years', default=None, help='plage début:fin (défaut: 1960:année courante)')
+    parser.add_argument('--countries', default=None, help='codes ISO séparés par des virgules')
+    args = parser.parse_args(argv)
+
+    service = get_gdp_service()
+    if args.refresh:
+        years = None
+        if args.years:
+            start, end = (int(y) for y in args.years.split(':'))
+            years = range(start, end + 1)
+        countries = args.countries.split(',') if args.countries else None
+        start = time.perf_counter()
+        summary = service.refresh(countries, years, force=args.force)
+        summary['duration_s'] = round(time.perf_counter() - start, 2)
+        print(json.dumps(summary, indent=2, ensure_ascii=False))
+
+    store = service.load_store()
+    print(f"{service.store_path}: {len(store['countries'])} pays, mis à jour {store.get('updated_at', 'jamais')}")
+    return 0
+
+
+if __name__ == '__main__':
+    import sys
+    sys.exit(main())
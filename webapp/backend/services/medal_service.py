@@ -1,7 +1,19 @@
 """
 Service pour gérer les opérations liées aux médailles
 """
+from database.snapshot import load_table_snapshot
 from database.supabase_client import get_supabase_client
+from services.search_service import SearchService
+from utils.cache import get_cache
+
+# Moteurs de séries temporelles (reconstruits après CACHE_TTL secondes)
+_trend_cache = get_cache('trend_engines', maxsize=1)
+
+
+def _round_or_none(value, digits=2):
+    """Arrondi JSON-sérialisable (None pour NaN)"""
+    return None if value != value else round(float(value), digits)
+
 
 class MedalService:
     @staticmethod
@@ -16,6 +28,15 @@ class MedalService:
                     'message': 'Client Supabase non initialisé'
                 }
             
+            # Recherche : index inversé sur le snapshot de la table (filtres inclus)
+            if search:
+                result = SearchService.search_table(
+                    'm_award', page=page, limit=limit, search=search,
+                    sort_by=sort_by, sort_order=sort_order, filters=filters
+                )
+                if result is not None:
+                    return result
+
             # Construire la requête de base
             query = supabase.table('m_award').select('*', count='exact')
             
@@ -639,16 +660,38 @@ class MedalService:
                 'message': str(error)
             }
     
+    @staticmethod
+    def get_trend_engines(refresh=False):
+        """Moteurs de séries temporelles (par NOC et par sport) sur le snapshot de m_award, ou None
+
+        refresh=True : reconstruire depuis le snapshot actuel (les anciens restent servis entre-temps).
+        """
+        engines = None if refresh else _trend_cache.get('m_award')
+        if engines is None:
+            snapshot = load_table_snapshot('m_award', ['year', 'noc', 'medal', 'award_count', 'sport'])
+            if snapshot is None:
+                return None
+            from utils.timeseries import TimeSeriesEngine
+            engines = {
+                'noc': TimeSeriesEngine.from_records(snapshot, 'noc', 'year', medal_column='medal', weight='award_count'),
+                'sport': TimeSeriesEngine.from_records(snapshot, 'sport', 'year', medal_column='medal', weight='award_count'),
+            }
+            _trend_cache.set('m_award', engines)
+        return engines
+
     @staticmethod
     def get_temporal_trends_analysis():
         """Analyser les tendances temporelles des performances olympiques"""
         try:
-            supabase = get_supabase_client()
-            
-            # Récupérer toutes les médailles avec les années
-            result = supabase.table('m_award').select('year, noc, medal, award_count, sport').execute()
-            
-            if not result.data:
+            engines = MedalService.get_trend_engines()
+            if engines is None:
+                return {
+                    'status': 'error',
+                    'message': 'Données de médailles indisponibles'
+                }
+
+            countries, sports = engines['noc'], engines['sport']
+            if not countries.entities:
                 return {
                     'status': 'success',
                     'data': {
@@ -660,236 +703,116 @@ class MedalService:
                         'analysis': {}
                     }
                 }
-            
-            # Analyser les médailles par année
-            yearly_data = {}
-            country_yearly = {}
-            sport_yearly = {}
-            
-            for medal in result.data:
-                year = medal['year']
-                noc = medal['noc']
-                medal_type = medal['medal']
-                count = medal['award_count']
-                sport = medal['sport']
-                
-                # Données par année
-                if year not in yearly_data:
-                    yearly_data[year] = {
-                        'year': year,
-                        'gold': 0,
-                        'silver': 0,
-                        'bronze': 0,
-                        'total': 0,
-                        'countries': set(),
-                        'sports': set()
-                    }
-                
-                if medal_type == 'GOLD':
-                    yearly_data[year]['gold'] += count
-                elif medal_type == 'SILVER':
-                    yearly_data[year]['silver'] += count
-                elif medal_type == 'BRONZE':
-                    yearly_data[year]['bronze'] += count
-                
-                yearly_data[year]['total'] += count
-                yearly_data[year]['countries'].add(noc)
-                yearly_data[year]['sports'].add(sport)
-                
-                # Données par pays et année
-                if noc not in country_yearly:
-                    country_yearly[noc] = {}
-                if year not in country_yearly[noc]:
-                    country_yearly[noc][year] = {
-                        'year': year,
-                        'country': noc,
-                        'gold': 0,
-                        'silver': 0,
-                        'bronze': 0,
-                        'total': 0
-                    }
-                
-                if medal_type == 'GOLD':
-                    country_yearly[noc][year]['gold'] += count
-                elif medal_type == 'SILVER':
-                    country_yearly[noc][year]['silver'] += count
-                elif medal_type == 'BRONZE':
-                    country_yearly[noc][year]['bronze'] += count
-                
-                country_yearly[noc][year]['total'] += count
-                
-                # Données par sport et année
-                if sport not in sport_yearly:
-                    sport_yearly[sport] = {}
-                if year not in sport_yearly[sport]:
-                    sport_yearly[sport][year] = {
-                        'year': year,
-                        'sport': sport,
-                        'gold': 0,
-                        'silver': 0,
-                        'bronze': 0,
-                        'total': 0
-                    }
-                
-                if medal_type == 'GOLD':
-                    sport_yearly[sport][year]['gold'] += count
-                elif medal_type == 'SILVER':
-                    sport_yearly[sport][year]['silver'] += count
-                elif medal_type == 'BRONZE':
-                    sport_yearly[sport][year]['bronze'] += count
-                
-                sport_yearly[sport][year]['total'] += count
-            
-            # Convertir les données par année
+
+            import numpy as np
+
+            years = [int(y) for y in countries.editions]
+            totals = {s: countries.series(s).sum(axis=0) for s in ('gold', 'silver', 'bronze', 'total')}
+            noc_names = np.array(countries.entities, dtype=object)
+            sport_names = np.array(sports.entities, dtype=object)
+
+            # Médailles par année
             yearly_medals = []
-            for year in sorted(yearly_data.keys()):
-                data = yearly_data[year]
-                data['countries'] = list(data['countries'])
-                data['sports'] = list(data['sports'])
-                data['countries_count'] = len(data['countries'])
-                data['sports_count'] = len(data['sports'])
-                yearly_medals.append(data)
-            
-            # Analyser par décennies
-            decade_analysis = {}
-            for year, data in yearly_data.items():
-                decade = (year // 10) * 10
-                if decade not in decade_analysis:
-                    decade_analysis[decade] = {
-                        'decade': decade,
-                        'gold': 0,
-                        'silver': 0,
-                        'bronze': 0,
-                        'total': 0,
-                        'years': set(),
-                        'countries': set(),
-                        'sports': set()
-                    }
-                
-                decade_analysis[decade]['gold'] += data['gold']
-                decade_analysis[decade]['silver'] += data['silver']
-                decade_analysis[decade]['bronze'] += data['bronze']
-                decade_analysis[decade]['total'] += data['total']
-                decade_analysis[decade]['years'].add(year)
-                decade_analysis[decade]['countries'].update(data['countries'])
-                decade_analysis[decade]['sports'].update(data['sports'])
-            
-            # Convertir en liste
+            for t, year in enumerate(years):
+                year_countries = sorted(noc_names[countries.present[:, t]])
+                year_sports = sorted(sport_names[sports.present[:, t]])
+                yearly_medals.append({
+                    'year': year,
+                    'gold': int(totals['gold'][t]),
+                    'silver': int(totals['silver'][t]),
+                    'bronze': int(totals['bronze'][t]),
+                    'total': int(totals['total'][t]),
+                    'countries': year_countries,
+                    'sports': year_sports,
+                    'countries_count': len(year_countries),
+                    'sports_count': len(year_sports)
+                })
+
+            # Analyser par décennies (colonnes contiguës : les années sont triées)
+            decades = np.array(years) // 10 * 10
             decade_list = []
-            for decade, data in decade_analysis.items():
-                data['years'] = list(data['years'])
-                data['countries'] = list(data['countries'])
-                data['sports'] = list(data['sports'])
-                data['years_count'] = len(data['years'])
-                data['countries_count'] = len(data['countries'])
-                data['sports_count'] = len(data['sports'])
-                data['average_medals_per_year'] = data['total'] / data['years_count'] if data['years_count'] > 0 else 0
-                decade_list.append(data)
-            
-            decade_list.sort(key=lambda x: x['decade'])
-            
-            # Évolution des pays (top 10 pays les plus performants)
-            top_countries = {}
-            for noc, years in country_yearly.items():
-                total_medals = sum(year_data['total'] for year_data in years.values())
-                if total_medals > 0:
-                    top_countries[noc] = total_medals
-            
-            # Trier et prendre les top 10
-            top_10_countries = sorted(top_countries.items(), key=lambda x: x[1], reverse=True)[:10]
-            
-            country_evolution = []
-            for noc, _ in top_10_countries:
-                evolution = []
-                for year in sorted(yearly_data.keys()):
-                    if year in country_yearly[noc]:
-                        evolution.append({
-                            'year': year,
-                            'medals': country_yearly[noc][year]['total'],
-                            'gold': country_yearly[noc][year]['gold'],
-                            'silver': country_yearly[noc][year]['silver'],
-                            'bronze': country_yearly[noc][year]['bronze']
-                        })
-                    else:
-                        evolution.append({
-                            'year': year,
-                            'medals': 0,
-                            'gold': 0,
-                            'silver': 0,
-                            'bronze': 0
-                        })
-                
-                country_evolution.append({
-                    'country': noc,
-                    'total_medals': top_countries[noc],
-                    'evolution': evolution
+            for decade in np.unique(decades):
+                columns = decades == decade
+                decade_countries = sorted(noc_names[countries.present[:, columns].any(axis=1)])
+                decade_sports = sorted(sport_names[sports.present[:, columns].any(axis=1)])
+                decade_years = [y for y, keep in zip(years, columns) if keep]
+                total = int(totals['total'][columns].sum())
+                decade_list.append({
+                    'decade': int(decade),
+                    'gold': int(totals['gold'][columns].sum()),
+                    'silver': int(totals['silver'][columns].sum()),
+                    'bronze': int(totals['bronze'][columns].sum()),
+                    'total': total,
+                    'years': decade_years,
+                    'countries': decade_countries,
+                    'sports': decade_sports,
+                    'years_count': len(decade_years),
+                    'countries_count': len(decade_countries),
+                    'sports_count': len(decade_sports),
+                    'average_medals_per_year': total / len(decade_years)
                 })
-            
-            # Évolution des sports (top 10 sports)
-            top_sports = {}
-            for sport, years in sport_yearly.items():
-                total_medals = sum(year_data['total'] for year_data in years.values())
-                if total_medals > 0:
-                    top_sports[sport] = total_medals
-            
-            top_10_sports = sorted(top_sports.items(), key=lambda x: x[1], reverse=True)[:10]
-            
-            sport_evolution = []
-            for sport, _ in top_10_sports:
-                evolution = []
-                for year in sorted(yearly_data.keys()):
-                    if year in sport_yearly[sport]:
-                        evolution.append({
-                            'year': year,
-                            'medals': sport_yearly[sport][year]['total'],
-                            'gold': sport_yearly[sport][year]['gold'],
-                            'silver': sport_yearly[sport][year]['silver'],
-                            'bronze': sport_yearly[sport][year]['bronze']
-                        })
-                    else:
-                        evolution.append({
+
+            def evolution(engine, key, limit=10):
+                """Top `limit` entités : série par année + indicateurs de tendance de la dernière édition"""
+                entity_totals = engine.series('total').sum(axis=1)
+                top = [i for i in np.argsort(-entity_totals, kind='stable')[:limit] if entity_totals[i] > 0]
+                moving_average = engine.moving_average(3)
+                growth = engine.growth_rate()
+                ranks = engine.ranks()
+                rank_change = engine.rank_change()
+                momentum = engine.momentum()
+                present = engine.present
+
+                items = []
+                for i in top:
+                    last = int(np.flatnonzero(present[i])[-1])
+                    items.append({
+                        key: engine.entities[i],
+                        'total_medals': int(entity_totals[i]),
+                        'evolution': [{
                             'year': year,
-                            'medals': 0,
-                            'gold': 0,
-                            'silver': 0,
-                            'bronze': 0
-                        })
-                
-                sport_evolution.append({
-                    'sport': sport,
-                    'total_medals': top_sports[sport],
-                    'evolution': evolution
-                })
-            
+                            'medals': int(engine.series('total')[i, t]),
+                            'gold': int(engine.series('gold')[i, t]),
+                            'silver': int(engine.series('silver')[i, t]),
+                            'bronze': int(engine.series('bronze')[i, t])
+                        } for t, year in enumerate(years)],
+                        'trends': {
+                            'last_year': years[last],
+                            'moving_average_3': round(float(moving_average[i, last]), 2),
+                            'growth_rate': _round_or_none(growth[i, last] * 100),
+                            'rank': _round_or_none(ranks[i, last]),
+                            'rank_change': _round_or_none(rank_change[i, last]),
+                            'momentum': round(float(momentum[i, last]), 2)
+                        }
+                    })
+                return items
+
+            # Évolution des pays et des sports (top 10)
+            country_evolution = evolution(countries, 'country')
+            sport_evolution = evolution(sports, 'sport')
+
             # Tendances de participation
-            participation_trends = []
-            for year_data in yearly_medals:
-                participation_trends.append({
-                    'year': year_data['year'],
-                    'countries': year_data['countries_count'],
-                    'sports': year_data['sports_count'],
-                    'medals': year_data['total']
-                })
-            
+            participation_trends = [{
+                'year': year_data['year'],
+                'countries': year_data['countries_count'],
+                'sports': year_data['sports_count'],
+                'medals': year_data['total']
+            } for year_data in yearly_medals]
+
             # Statistiques globales
             total_years = len(yearly_medals)
-            total_medals_all_time = sum(year['total'] for year in yearly_medals)
-            total_gold_all_time = sum(year['gold'] for year in yearly_medals)
-            total_silver_all_time = sum(year['silver'] for year in yearly_medals)
-            total_bronze_all_time = sum(year['bronze'] for year in yearly_medals)
-            
-            # Trouver les années les plus performantes
-            best_year = max(yearly_medals, key=lambda x: x['total']) if yearly_medals else None
-            worst_year = min(yearly_medals, key=lambda x: x['total']) if yearly_medals else None
-            
+            total_medals_all_time = int(totals['total'].sum())
+            best_year = max(yearly_medals, key=lambda x: x['total'])
+            worst_year = min(yearly_medals, key=lambda x: x['total'])
+
             # Calculer les tendances
-            if len(yearly_medals) >= 2:
+            if total_years >= 2:
                 first_year = yearly_medals[0]['total']
                 last_year = yearly_medals[-1]['total']
                 growth_rate = ((last_year - first_year) / first_year) * 100 if first_year > 0 else 0
             else:
                 growth_rate = 0
-            
+
             return {
                 'status': 'success',
                 'data': {
@@ -901,15 +824,15 @@ class MedalService:
                     'analysis': {
                         'total_years': total_years,
                         'total_medals_all_time': total_medals_all_time,
-                        'total_gold_all_time': total_gold_all_time,
-                        'total_silver_all_time': total_silver_all_time,
-                        'total_bronze_all_time': total_bronze_all_time,
+                        'total_gold_all_time': int(totals['gold'].sum()),
+                        'total_silver_all_time': int(totals['silver'].sum()),
+                        'total_bronze_all_time': int(totals['bronze'].sum()),
                         'best_year': best_year,
                         'worst_year': worst_year,
                         'growth_rate': round(growth_rate, 2),
                         'average_medals_per_year': total_medals_all_time / total_years if total_years > 0 else 0,
-                        'most_consistent_country': max(country_evolution, key=lambda x: x['total_medals'])['country'] if country_evolution else None,
-                        'most_consistent_sport': max(sport_evolution, key=lambda x: x['total_medals'])['sport'] if sport_evolution else None
+                        'most_consistent_country': country_evolution[0]['country'] if country_evolution else None,
+                        'most_consistent_sport': sport_evolution[0]['sport'] if sport_evolution else None
                     }
                 }
             }
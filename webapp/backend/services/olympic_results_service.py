@@ -2,6 +2,7 @@
 Service pour gérer les opérations liées aux résultats olympiques
 """
 from database.supabase_client import get_supabase_client
+from services.search_service import SearchService
 
 class OlympicResultsService:
     @staticmethod
@@ -16,6 +17,15 @@ class OlympicResultsService:
                     'message': 'Client Supabase non initialisé'
                 }
             
+            # Recherche : index inversé sur le snapshot de la table (filtres inclus)
+            if search:
+                result = SearchService.search_table(
+                    'medals', page=page, limit=limit, search=search,
+                    sort_by=sort_by, sort_order=sort_order, filters=filters
+                )
+                if result is not None:
+                    return result
+
             # Construire la requête de base
             query = supabase.table('medals').select('*', count='exact')
             
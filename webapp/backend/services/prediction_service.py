@@ -8,22 +8,26 @@ Prediction service: loads models (if present) and provides simple prediction end
 """
  
 import os
+import importlib
+from functools import lru_cache
 from typing import List, Dict, Any
+
+from utils.cache import get_cache
  
-try:
-    import joblib
-except Exception:
-    joblib = None
  
-try:
-    import pandas as pd
-except Exception:
-    pd = None
+@lru_cache(maxsize=None)
+def _optional_import(name: str):
+    """Import heavy optional dependencies (pandas, joblib/sklearn) on first use, None if missing."""
+    try:
+        return importlib.import_module(name)
+    except Exception:
+        return None
  
  
 DATA_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", "data", "clean"))
 CSV_MEDALS = os.path.join(DATA_DIR, "olympic_medals_clean_v2.csv")          # medals by event/athlete
 CSV_RESULTS = os.path.join(DATA_DIR, "olympic_results_clean.csv")            # historical summaries (optional)
+CSV_AWARDS = os.path.join(DATA_DIR, "olympic_medal_awards_v2.csv")           # one row per medal award
  
 MODELS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'models'))
 COUNTRY_BEST = os.path.join(MODELS_DIR, 'country_best.joblib')
@@ -32,9 +36,18 @@ TOP25_BEST = os.path.join(MODELS_DIR, 'top25_best.joblib')
 TOP25_SECOND = os.path.join(MODELS_DIR, 'top25_second.joblib')
 ATHLETES_BEST = os.path.join(MODELS_DIR, 'athletes_best.joblib')
 ATHLETES_SECOND = os.path.join(MODELS_DIR, 'athletes_second.joblib')
+SPORT_FORECAST = os.path.join(MODELS_DIR, 'sport_forecast.npz')              # train_sport_models.py
+SIMULATION_FILE = os.path.join(MODELS_DIR, 'simulation_{year}.json')          # simulate_games.py (nightly)
+
+# On-demand Monte Carlo runs when no precomputed file matches the request
+SIMULATION_ON_DEMAND = 5000
+SIMULATION_MAX = 20000
+SIMULATION_HORIZON = 12   # on-demand runs only for Games within 12 years of the latest edition
+_simulation_cache = get_cache('games_simulation', ttl=3600, maxsize=8)
  
  
 def _safe_read_csv(path: str):
+    pd = _optional_import("pandas")
     if pd is None:
         return None
     if not os.path.exists(path):
@@ -118,26 +131,162 @@ def _historical_props(df, country_name):
         return (1/3, 1/3, 1/3)
  
  
+# Map old country names to modern names (athlete predictions)
+ATHLETE_COUNTRY_MAPPING = {
+    'USSR': 'Russia',
+    'Soviet Union': 'Russia',
+    'Unified Team': 'Russia',
+    'East Germany': 'Germany',
+    'West Germany': 'Germany',
+    'Yugoslavia': 'Serbia',
+    'Czechoslovakia': 'Czech Republic',
+    'People\'s Republic of China': 'China',
+    'United States of America': 'USA',
+    'Russian Federation': 'Russia'
+}
+
+
+def _build_athlete_table(df):
+    """Aggregate individual medals by (athlete, country, sport) into column arrays; None if no data."""
+    if df is None or "participant_type" not in df.columns or "athlete" not in df.columns:
+        return None
+    df_ath = df[df["participant_type"] == "Athlete"]
+    if df_ath.empty:
+        return None
+    agg = df_ath.groupby(["athlete", "country", "sport"], dropna=False)[["gold", "silver", "bronze"]].sum().reset_index()
+    total = (agg["gold"] + agg["silver"] + agg["bronze"]).to_numpy()
+    max_total = total.max()
+    return {
+        "athlete": agg["athlete"].tolist(),
+        "country": agg["country"].map(ATHLETE_COUNTRY_MAPPING).fillna(agg["country"]).tolist(),
+        "sport": agg["sport"].tolist(),
+        "total": total,
+        "heuristic_score": total / (max_total if max_total > 0 else 1),
+        "scores": {},  # model choice -> score array (False when no usable model)
+    }
+
+
+def _top_k_indices(scores, k: int):
+    """Indices of the k highest scores, best first; ties keep table order.
+
+    np.argpartition isolates the k-th best value in O(n), only the selected rows are sorted.
+    """
+    np = _optional_import("numpy")
+    scores = np.asarray(scores)
+    n = len(scores)
+    k = max(0, min(int(k), n))
+    if k == 0:
+        return np.empty(0, dtype=np.intp)
+    if k < n:
+        threshold = scores[np.argpartition(-scores, k - 1)[k - 1]]
+        above = np.flatnonzero(scores > threshold)
+        ties = np.flatnonzero(scores == threshold)[:k - len(above)]
+        selected = np.concatenate([above, ties])
+    else:
+        selected = np.arange(n)
+    return selected[np.lexsort((selected, -scores[selected]))]
+
+
+# Country names / factors used by the country ML model (see train_advanced_models.py)
+COUNTRY_MODEL_MAPPING = {
+    'France': 'France', 'United States of America': 'USA', 'USA': 'USA',
+    'China': 'China', 'People\'s Republic of China': 'China',
+    'Great Britain': 'Great Britain', 'Germany': 'Germany',
+    'Japan': 'Japan', 'Italy': 'Italy', 'Australia': 'Australia',
+    'Canada': 'Canada', 'Russia': 'Russia', 'Russian Federation': 'Russia'
+}
+COUNTRY_MODEL_FACTORS = {
+    'USA': {'population': 331000000, 'gdp_per_capita': 65000, 'sports_culture': 0.9, 'olympic_tradition': 0.95},
+    'China': {'population': 1400000000, 'gdp_per_capita': 10000, 'sports_culture': 0.8, 'olympic_tradition': 0.7},
+    'Great Britain': {'population': 67000000, 'gdp_per_capita': 45000, 'sports_culture': 0.85, 'olympic_tradition': 0.9},
+    'France': {'population': 67000000, 'gdp_per_capita': 40000, 'sports_culture': 0.8, 'olympic_tradition': 0.85},
+    'Germany': {'population': 83000000, 'gdp_per_capita': 50000, 'sports_culture': 0.85, 'olympic_tradition': 0.9},
+    'Japan': {'population': 125000000, 'gdp_per_capita': 40000, 'sports_culture': 0.75, 'olympic_tradition': 0.8},
+    'Italy': {'population': 60000000, 'gdp_per_capita': 35000, 'sports_culture': 0.8, 'olympic_tradition': 0.85},
+    'Australia': {'population': 25000000, 'gdp_per_capita': 55000, 'sports_culture': 0.9, 'olympic_tradition': 0.8},
+    'Canada': {'population': 38000000, 'gdp_per_capita': 45000, 'sports_culture': 0.8, 'olympic_tradition': 0.75},
+    'Russia': {'population': 145000000, 'gdp_per_capita': 12000, 'sports_culture': 0.85, 'olympic_tradition': 0.9}
+}
+DEFAULT_COUNTRY_FACTORS = {'population': 50000000, 'gdp_per_capita': 20000, 'sports_culture': 0.5, 'olympic_tradition': 0.5}
+
+# NOC fallback when a country name is not found in the medals CSV
+FALLBACK_NOC = {"france": "FRA", "united states": "USA", "great britain": "GBR",
+                "china": "CHN", "germany": "GER", "italy": "ITA", "spain": "ESP"}
+
+
+def _scale_features(model_data, X):
+    """Apply the model scaler (compiled artifacts have it folded into the model)."""
+    scaler = model_data.get('scaler')
+    return scaler.transform(X) if scaler is not None else X
+
+
+def _country_model_features(mapped_country: str, year: int) -> Dict[str, Any]:
+    """Feature row for the country ML model (history features at their defaults)."""
+    factors = COUNTRY_MODEL_FACTORS.get(mapped_country, DEFAULT_COUNTRY_FACTORS)
+    return {
+        'avg_recent_3': 0, 'trend': 0, 'consistency': 0, 'peak_performance': 0,
+        'years_since_last': 4, 'population': factors['population'],
+        'gdp_per_capita': factors['gdp_per_capita'],
+        'sports_culture': factors['sports_culture'],
+        'olympic_tradition': factors['olympic_tradition'],
+        'is_host': 1 if mapped_country == 'France' else 0,
+        'is_summer': 1, 'year_normalized': (year - 1990) / 30
+    }
+
+
+def _model_medal_ratios(mapped_country: str):
+    """Gold / silver / bronze split of a predicted total."""
+    if mapped_country in ['USA', 'China', 'Germany']:
+        return 0.5, 0.3, 0.2
+    if mapped_country in ['France', 'Great Britain', 'Japan']:
+        return 0.4, 0.35, 0.25
+    return 0.4, 0.3, 0.3
+ 
+ 
 class PredictionService:
     """Public methods called by routes."""
  
     # cache loaded models
     _models: Dict[str, Any] = {}
- 
+    # (data version, athlete aggregate table)
+    _athletes = None
+    # sport x country forecast coefficients (utils/sport_forecast.py)
+    _sport_forecast = None
+    # version of models/ the registry was loaded from (utils/data_version.py)
+    _models_version = None
+
+    @staticmethod
+    def _current_models_version():
+        try:
+            from utils.data_version import get_versions
+            return get_versions().version('models')
+        except Exception:
+            return None
+
     @classmethod
     def _load_models(cls):
         if cls._models:
-            return
-        if joblib is None:
-            cls._models = {
-                'country_best': None, 'country_second': None,
-                'top25_best': None, 'top25_second': None,
-                'athletes_best': None, 'athletes_second': None,
-            }
-            return
+            # reload only when the artifacts on disk changed since they were loaded
+            if cls._models_version is None or cls._models_version == cls._current_models_version():
+                return
+            cls._sport_forecast = None
+            # athlete scores were computed with the previous models
+            if cls._athletes is not None:
+                cls._athletes[1]["scores"].clear()
+        version = cls._current_models_version()
+        joblib = _optional_import("joblib")
+        from utils.model_artifacts import load_compiled
+
         def _safe_load(path):
+            # compact NumPy artifact (<name>.npy/.json, memory-mapped) first, pickled model otherwise
             try:
-                if os.path.exists(path):
+                compiled = load_compiled(path)
+                if compiled is not None:
+                    return compiled
+            except Exception as e:
+                print(f"Error loading compiled model for {path}: {e}")
+            try:
+                if joblib is not None and os.path.exists(path):
                     return joblib.load(path)
             except Exception:
  
@@ -152,165 +301,139 @@ class PredictionService:
             'athletes_best': _safe_load(ATHLETES_BEST),
             'athletes_second': _safe_load(ATHLETES_SECOND),
         }
+        cls._models_version = version
  
+    @classmethod
+    def registry_state(cls) -> Dict[str, Any]:
+        """État du registre de modèles sans déclencher de chargement."""
+        from utils.data_version import get_versions
+        current = get_versions().published().get('models')
+        return {
+            'loaded': bool(cls._models),
+            'models': {name: mdl is not None for name, mdl in cls._models.items()},
+            'data_version': cls._models_version,
+            'current_data_version': current,
+            'stale': bool(cls._models) and cls._models_version is not None and cls._models_version != current,
+        }
+
     # --------------------- COUNTRY ---------------------
  
     @staticmethod
     def predict_country_medals(country: str = "France", year: int = 2024, model: str = "ma") -> Dict[str, int]:
-        # 1) try enhanced ML models in webapp/backend/models
-        if joblib:
-            if os.path.exists(COUNTRY_BEST):
-                try:
-                    model_data = joblib.load(COUNTRY_BEST)
-                    if isinstance(model_data, dict) and 'model' in model_data and 'scaler' in model_data:
-                        # Enhanced ML model
-                        ml_model = model_data['model']
-                        scaler = model_data['scaler']
-                        feature_columns = model_data.get('feature_columns', [])
-                        
-                        # Country mapping for consistency
-                        country_mapping = {
-                            'France': 'France', 'United States of America': 'USA', 'USA': 'USA',
-                            'China': 'China', 'People\'s Republic of China': 'China',
-                            'Great Britain': 'Great Britain', 'Germany': 'Germany',
-                            'Japan': 'Japan', 'Italy': 'Italy', 'Australia': 'Australia',
-                            'Canada': 'Canada', 'Russia': 'Russia', 'Russian Federation': 'Russia'
-                        }
-                        
-                        mapped_country = country_mapping.get(country, country)
-                        
-                        # Country-specific factors
-                        country_factors = {
-                            'USA': {'population': 331000000, 'gdp_per_capita': 65000, 'sports_culture': 0.9, 'olympic_tradition': 0.95},
-                            'China': {'population': 1400000000, 'gdp_per_capita': 10000, 'sports_culture': 0.8, 'olympic_tradition': 0.7},
-                            'Great Britain': {'population': 67000000, 'gdp_per_capita': 45000, 'sports_culture': 0.85, 'olympic_tradition': 0.9},
-                            'France': {'population': 67000000, 'gdp_per_capita': 40000, 'sports_culture': 0.8, 'olympic_tradition': 0.85},
-                            'Germany': {'population': 83000000, 'gdp_per_capita': 50000, 'sports_culture': 0.85, 'olympic_tradition': 0.9},
-                            'Japan': {'population': 125000000, 'gdp_per_capita': 40000, 'sports_culture': 0.75, 'olympic_tradition': 0.8},
-                            'Italy': {'population': 60000000, 'gdp_per_capita': 35000, 'sports_culture': 0.8, 'olympic_tradition': 0.85},
-                            'Australia': {'population': 25000000, 'gdp_per_capita': 55000, 'sports_culture': 0.9, 'olympic_tradition': 0.8},
-                            'Canada': {'population': 38000000, 'gdp_per_capita': 45000, 'sports_culture': 0.8, 'olympic_tradition': 0.75},
-                            'Russia': {'population': 145000000, 'gdp_per_capita': 12000, 'sports_culture': 0.85, 'olympic_tradition': 0.9}
-                        }
-                        
-                        factors = country_factors.get(mapped_country, {
-                            'population': 50000000, 'gdp_per_capita': 20000, 
-                            'sports_culture': 0.5, 'olympic_tradition': 0.5
-                        })
-                        
-                        # Create feature vector for prediction
-                        features = {
-                            'avg_recent_3': 0, 'trend': 0, 'consistency': 0, 'peak_performance': 0,
-                            'years_since_last': 4, 'population': factors['population'],
-                            'gdp_per_capita': factors['gdp_per_capita'],
-                            'sports_culture': factors['sports_culture'],
-                            'olympic_tradition': factors['olympic_tradition'],
-                            'is_host': 1 if mapped_country == 'France' else 0,
-                            'is_summer': 1, 'year_normalized': (year - 1990) / 30
-                        }
-                        
-                        # Convert to array and scale
-                        import numpy as np
-                        feature_array = np.array([features[col] for col in feature_columns]).reshape(1, -1)
-                        feature_array_scaled = scaler.transform(feature_array)
-                        
-                        # Make prediction
-                        predicted_total = max(0, ml_model.predict(feature_array_scaled)[0])
-                        
-                        # Distribute medals based on country-specific ratios
-                        if mapped_country in ['USA', 'China', 'Germany']:
-                            gold_ratio, silver_ratio, bronze_ratio = 0.5, 0.3, 0.2
-                        elif mapped_country in ['France', 'Great Britain', 'Japan']:
-                            gold_ratio, silver_ratio, bronze_ratio = 0.4, 0.35, 0.25
-                        else:
-                            gold_ratio, silver_ratio, bronze_ratio = 0.4, 0.3, 0.3
-                        
-                        gold = int(round(predicted_total * gold_ratio))
-                        silver = int(round(predicted_total * silver_ratio))
-                        bronze = int(round(predicted_total * bronze_ratio))
-                        
-                        # Ensure total matches
-                        total = gold + silver + bronze
-                        if total != int(round(predicted_total)):
-                            bronze += int(round(predicted_total)) - total
-                        
-                        return _clamp_nonneg({
-                            'country': country, 'year': year, 
-                            'gold': max(0, gold), 'silver': max(0, silver), 'bronze': max(0, bronze)
-                        })
-                    else:
-                        # Legacy model format
-                        pipeline = model_data['model'] if isinstance(model_data, dict) and 'model' in model_data else model_data
-                        X_row = pd.DataFrame([{'country': country, 'year': int(year), 'prev_total': 0, 'mean_prev_3': 0}])
-                        preds = pipeline.predict(X_row)
-                        total = max(0, float(preds[0]))
-                        g_prop, s_prop, b_prop = (1/3, 1/3, 1/3)
-                        try:
-                            g_prop, s_prop, b_prop = _historical_props(_safe_read_csv(CSV_MEDALS), country)
-                        except Exception:
-                            pass
-                        gold = int(round(total * g_prop))
-                        silver = int(round(total * s_prop))
-                        bronze = int(round(total * b_prop))
-                        return _clamp_nonneg({'country': country, 'year': year, 'gold': gold, 'silver': silver, 'bronze': bronze})
-                except Exception as e:
-                    print(f"Error using enhanced model: {e}")
-                    pass
- 
-        df = _safe_read_csv(CSV_MEDALS)
-        df = _clean_medals_df(df)
-        if df is None:
-            return _clamp_nonneg({"country": country, "year": year, "gold": 0, "silver": 0, "bronze": 0})
- 
+        return PredictionService.predict_countries([country], [year], model)[0]
+
+    @staticmethod
+    def predict_countries(countries: List[str], years: List[int], model: str = "ma") -> List[Dict[str, int]]:
+        """
+        Predict medals for every (country, year) pair with a single model call.
+        Returns one dict per pair, countries x years order; each result equals predict_country_medals(country, year, model).
+        """
+        pairs = [(country, int(year)) for country in countries for year in years]
+        if not pairs:
+            return []
+        results = PredictionService._predict_pairs_with_model(pairs)
+        if results is None:
+            results = PredictionService._predict_pairs_from_history(pairs, model)
+        return results
+
+    @classmethod
+    def _predict_pairs_with_model(cls, pairs):
+        """Stacked feature matrix -> one scaler.transform / predict; None if no usable country model."""
+        cls._load_models()
+        model_data = cls._models.get('country_best')
+        if model_data is None:
+            return None
+        try:
+            np = _optional_import("numpy")
+            if isinstance(model_data, dict) and 'model' in model_data and 'scaler' in model_data:
+                # Enhanced ML model
+                feature_columns = model_data.get('feature_columns', [])
+                mapped = [COUNTRY_MODEL_MAPPING.get(country, country) for country, _ in pairs]
+                rows = [_country_model_features(name, year) for name, (_, year) in zip(mapped, pairs)]
+                X = np.array([[row[col] for col in feature_columns] for row in rows], dtype=float)
+                predicted = np.maximum(0, model_data['model'].predict(_scale_features(model_data, X)))
+
+                results = []
+                for (country, year), name, predicted_total in zip(pairs, mapped, predicted):
+                    gold_ratio, silver_ratio, bronze_ratio = _model_medal_ratios(name)
+                    gold = int(round(predicted_total * gold_ratio))
+                    silver = int(round(predicted_total * silver_ratio))
+                    bronze = int(round(predicted_total * bronze_ratio))
+
+                    # Ensure total matches
+                    total = gold + silver + bronze
+                    if total != int(round(predicted_total)):
+                        bronze += int(round(predicted_total)) - total
+
+                    results.append(_clamp_nonneg({
+                        'country': country, 'year': year,
+                        'gold': max(0, gold), 'silver': max(0, silver), 'bronze': max(0, bronze)
+                    }))
+                return results
+
+            # Legacy model format
+            pd = _optional_import("pandas")
+            pipeline = model_data['model'] if isinstance(model_data, dict) and 'model' in model_data else model_data
+            X = pd.DataFrame([{'country': country, 'year': year, 'prev_total': 0, 'mean_prev_3': 0} for country, year in pairs])
+            preds = pipeline.predict(X)
+            medals_df = _safe_read_csv(CSV_MEDALS)
+            results = []
+            for (country, year), pred in zip(pairs, preds):
+                total = max(0, float(pred))
+                g_prop, s_prop, b_prop = _historical_props(medals_df, country)
+                results.append(_clamp_nonneg({
+                    'country': country, 'year': year,
+                    'gold': int(round(total * g_prop)), 'silver': int(round(total * s_prop)), 'bronze': int(round(total * b_prop))
+                }))
+            return results
+        except Exception as e:
+            print(f"Error using enhanced model: {e}")
+            return None
+
+    @staticmethod
+    def _predict_pairs_from_history(pairs, model):
+        """Moving average ('ma') or exponential smoothing ('es') of past Games, all countries in one pass."""
+        empty = [_clamp_nonneg({"country": c, "year": y, "gold": 0, "silver": 0, "bronze": 0}) for c, y in pairs]
+        df = _clean_medals_df(_safe_read_csv(CSV_MEDALS))
+        if df is None or not {"gold", "silver", "bronze", "year"}.issubset(df.columns):
+            return empty
+
         # Normalize textual fields
         if "country" in df.columns:
             df["country_norm"] = df["country"].astype(str).str.strip().str.lower()
         else:
             df["country_norm"] = ""
- 
         for col in ("noc", "country_code"):
             if col in df.columns:
                 df[col] = df[col].astype(str).str.strip().str.upper()
- 
-        country_norm = country.strip().lower()
- 
-        # Try matching by name first
-        d = df[df["country_norm"] == country_norm]
-        # If empty, try NOC code fallback (FRA for France, USA, etc.)
-        noc_map = {"france": "FRA", "united states": "USA", "great britain": "GBR",
-               "china": "CHN", "germany": "GER", "italy": "ITA", "spain": "ESP"}
-        if d.empty and "noc" in df.columns and country_norm in noc_map:
-             d = df[df["noc"] == noc_map[country_norm]]
- 
-        # If still empty, try country_code
-        if d.empty and "country_code" in df.columns and country_norm in noc_map:
-            d = df[df["country_code"] == noc_map[country_norm]]
- 
-        if d.empty:
-            return _clamp_nonneg({"country": country, "year": year, "gold": 0, "silver": 0, "bronze": 0})
- 
-        # Aggregate by year
-        needed = {"gold", "silver", "bronze", "year"}
-        if not needed.issubset(d.columns):
-            return _clamp_nonneg({"country": country, "year": year, "gold": 0, "silver": 0, "bronze": 0})
- 
-        d = d.sort_values("year")
-        g = d.groupby("year")[["gold", "silver", "bronze"]].sum()
- 
-        window = min(5, len(g))
-        if window == 0:
-            return _clamp_nonneg({"country": country, "year": year, "gold": 0, "silver": 0, "bronze": 0})
- 
-        if model == "es":
-            gold   = float(g["gold"].ewm(alpha=0.5).mean().iloc[-1])
-            silver = float(g["silver"].ewm(alpha=0.5).mean().iloc[-1])
-            bronze = float(g["bronze"].ewm(alpha=0.5).mean().iloc[-1])
-        else:
-            gold   = float(g["gold"].tail(window).mean())
-            silver = float(g["silver"].tail(window).mean())
-            bronze = float(g["bronze"].tail(window).mean())
- 
-        return _clamp_nonneg({"country": country, "year": year, "gold": gold, "silver": silver, "bronze": bronze})
+
+        # One engine per lookup key (name first, then NOC / country_code for a few known countries)
+        from utils.timeseries import TimeSeriesEngine
+        engines = {}
+
+        def _lookup(key, value):
+            if key not in engines:
+                engines[key] = TimeSeriesEngine.from_records(df, entity=key, edition="year") if key in df.columns else None
+            engine = engines[key]
+            position = engine.position(value) if engine is not None else None
+            return (engine, position) if position is not None else None
+
+        results = []
+        for (country, year), fallback in zip(pairs, empty):
+            country_norm = country.strip().lower()
+            found = _lookup("country_norm", country_norm)
+            if found is None and country_norm in FALLBACK_NOC:
+                found = _lookup("noc", FALLBACK_NOC[country_norm]) or _lookup("country_code", FALLBACK_NOC[country_norm])
+            if found is None:
+                results.append(fallback)
+                continue
+            engine, i = found
+            if model == "es":
+                medals = {s: engine.ewm(0.5, s)[i] for s in ("gold", "silver", "bronze")}
+            else:
+                medals = {s: engine.recent_mean(5, s)[i] for s in ("gold", "silver", "bronze")}
+            results.append(_clamp_nonneg({"country": country, "year": year, **medals}))
+        return results
  
     # --------------------- TOP 25 ---------------------
     @staticmethod
@@ -318,6 +441,7 @@ class PredictionService:
         """
         Return list of dicts: [{country, gold, silver, bronze, total}, ...] length == top_n
         """
+        pd = _optional_import("pandas")
         # Load CSV early (used by both model and fallback code)
         df = _safe_read_csv(CSV_MEDALS)
         df = _clean_medals_df(df)
@@ -325,12 +449,12 @@ class PredictionService:
         # Try enhanced ML model-based top25 when available
         if model in ("best", "second"):
             try:
-                # Load enhanced model directly
-                if os.path.exists(TOP25_BEST):
-                    model_data = joblib.load(TOP25_BEST)
+                # Enhanced model from the registry (loaded once per process)
+                PredictionService._load_models()
+                model_data = PredictionService._models.get('top25_best')
+                if model_data is not None:
                     if isinstance(model_data, dict) and 'model' in model_data and 'scaler' in model_data:
                         ml_model = model_data['model']
-                        scaler = model_data['scaler']
                         feature_columns = model_data.get('feature_columns', [])
                         
                         # Country factors for prediction
@@ -356,8 +480,9 @@ class PredictionService:
                         results = []
                         import numpy as np
                         
+                        # One feature row per country, a single predict for all of them
+                        feature_rows = []
                         for country, factors in country_factors.items():
-                            # Create feature vector for prediction
                             features = {
                                 'avg_recent_3': 0, 'trend': 0, 'consistency': 0, 'peak_performance': 0,
                                 'years_since_last': 4, 'population': factors['population'],
@@ -367,14 +492,11 @@ class PredictionService:
                                 'is_host': 1 if country == 'France' else 0,
                                 'is_summer': 1, 'year_normalized': (year - 1990) / 30
                             }
-                            
-                            # Convert to array and scale
-                            feature_array = np.array([features[col] for col in feature_columns]).reshape(1, -1)
-                            feature_array_scaled = scaler.transform(feature_array)
-                            
-                            # Make prediction
-                            predicted_total = max(0, ml_model.predict(feature_array_scaled)[0])
-                            
+                            feature_rows.append([features[col] for col in feature_columns])
+                        X = np.array(feature_rows, dtype=float)
+                        predicted = np.maximum(0, ml_model.predict(_scale_features(model_data, X)))
+                        
+                        for country, predicted_total in zip(country_factors, predicted):
                             # Distribute medals based on country-specific ratios
                             if country in ['USA', 'China', 'Germany']:
                                 gold_ratio, silver_ratio, bronze_ratio = 0.5, 0.3, 0.2
@@ -432,113 +554,190 @@ class PredictionService:
         if not set(cols_needed).issubset(df.columns):
             return []
  
-        d = df.sort_values("year")
-        g = d.groupby(["year", "country"])[["gold", "silver", "bronze"]].sum().reset_index()
- 
-        # moving average / exponential smoothing by country
+        # moving average / exponential smoothing for all countries at once
+        # (engine rows = countries, columns = Games; only Games where the country won count)
+        from utils.timeseries import TimeSeriesEngine
+        engine = TimeSeriesEngine.from_records(df, entity="country", edition="year")
+        if model == "es":
+            gold, silver, bronze = (engine.ewm(0.5, s) for s in ("gold", "silver", "bronze"))
+        else:
+            gold, silver, bronze = (engine.recent_mean(5, s) for s in ("gold", "silver", "bronze"))
+
+        # Map old country names to modern names
+        country_mapping = {
+            'USSR': 'Russia',
+            'Soviet Union': 'Russia', 
+            'Unified Team': 'Russia',
+            'East Germany': 'Germany',
+            'West Germany': 'Germany',
+            'Yugoslavia': 'Serbia',
+            'Czechoslovakia': 'Czech Republic',
+            'People\'s Republic of China': 'China',
+            'United States of America': 'USA',
+            'Russian Federation': 'Russia'
+        }
         rows = []
-        for country, sub in g.groupby("country"):
-            sub = sub.sort_values("year")
-            if model == "es":
-                gold   = float(sub["gold"].ewm(alpha=0.5).mean().iloc[-1])
-                silver = float(sub["silver"].ewm(alpha=0.5).mean().iloc[-1])
-                bronze = float(sub["bronze"].ewm(alpha=0.5).mean().iloc[-1])
-            else:
-                w = min(5, len(sub))
-                gold   = float(sub["gold"].tail(w).mean())
-                silver = float(sub["silver"].tail(w).mean())
-                bronze = float(sub["bronze"].tail(w).mean())
-            
-            # Map old country names to modern names
-            country_mapping = {
-                'USSR': 'Russia',
-                'Soviet Union': 'Russia', 
-                'Unified Team': 'Russia',
-                'East Germany': 'Germany',
-                'West Germany': 'Germany',
-                'Yugoslavia': 'Serbia',
-                'Czechoslovakia': 'Czech Republic',
-                'People\'s Republic of China': 'China',
-                'United States of America': 'USA',
-                'Russian Federation': 'Russia'
-            }
+        for i, country in enumerate(engine.entities):
             modern_country = country_mapping.get(country, country)
-            
-            rows.append(_clamp_nonneg({"country": modern_country, "gold": gold, "silver": silver, "bronze": bronze}))
+            rows.append(_clamp_nonneg({"country": modern_country, "gold": gold[i], "silver": silver[i], "bronze": bronze[i]}))
 
         rows.sort(key=lambda r: r["total"], reverse=True)
         return rows[:top_n]
  
     # --------------------- ATHLETES ---------------------
+    @classmethod
+    def _athlete_table(cls):
+        """Athlete aggregate table for the current medals CSV (rebuilt only when the file changes)."""
+        try:
+            stat = os.stat(CSV_MEDALS)
+            version = (CSV_MEDALS, stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            return None
+        if cls._athletes is None or cls._athletes[0] != version:
+            cls._athletes = (version, _build_athlete_table(_clean_medals_df(_safe_read_csv(CSV_MEDALS))))
+        return cls._athletes[1]
+
     @staticmethod
     def predict_athlete_medals(limit: int = 50, model: str = "best") -> List[Dict[str, Any]]:
         """
         Very simple heuristic:
         - Aggregate historical athlete medals and compute a probability of winning at next Games.
+        Aggregates and scores are computed once per data and models version; a request only selects the top
+        `limit` rows.
         """
-        # Accept model selection and try to use trained athlete pipelines if present
-        def _agg_athlete_df(df):
-            df_ath = df[df["participant_type"] == "Athlete"].copy()
-            if df_ath.empty:
-                return None
-            agg = df_ath.groupby(["athlete", "country", "sport"] , dropna=False)[["gold", "silver", "bronze"]].sum().reset_index()
-            agg["total"] = agg["gold"] + agg["silver"] + agg["bronze"]
-            
-            # Map old country names to modern names
-            country_mapping = {
-                'USSR': 'Russia',
-                'Soviet Union': 'Russia', 
-                'Unified Team': 'Russia',
-                'East Germany': 'Germany',
-                'West Germany': 'Germany',
-                'Yugoslavia': 'Serbia',
-                'Czechoslovakia': 'Czech Republic',
-                'People\'s Republic of China': 'China',
-                'United States of America': 'USA',
-                'Russian Federation': 'Russia'
-            }
-            agg["country"] = agg["country"].map(country_mapping).fillna(agg["country"])
-            
-            return agg
- 
+        # reloading changed models drops the cached scores
+        PredictionService._load_models()
+        table = PredictionService._athlete_table()
+        if table is None:
+            return []
+
         # default model param support (best/second or heuristic)
-        def _inner(limit:int=50, year:int=2024, model_choice:str="best"):
-            df = _safe_read_csv(CSV_MEDALS)
-            df = _clean_medals_df(df)
-            if df is None or "participant_type" not in df.columns or "athlete" not in df.columns:
-                return []
- 
-            athletes_df = _agg_athlete_df(df)
-            if athletes_df is None:
-                return []
- 
-            # try to use a trained athletes pipeline if available
-            try:
-                PredictionService._load_models()
-                mdl = PredictionService._models.get(f"athletes_{model_choice}")
-                if mdl is not None and isinstance(mdl, dict) and mdl.get('model') is not None:
-                    pipe = mdl['model']
-                    # prepare input columns expected by the pipeline
-                    X = athletes_df[["athlete", "country", "sport"]].copy()
-                    # add year/hist_total if pipeline expects passthrough
-                    X["year"] = int(year)
-                    X["hist_total"] = athletes_df["total"]
-                    try:
-                        scores = pipe.predict(X)
-                        athletes_df["score"] = scores
-                        out = athletes_df.sort_values("score", ascending=False).head(limit)
-                        return out[["athlete", "country", "sport", "score", "total"]].to_dict(orient="records")
-                    except Exception:
-                        # fallback to heuristic
-                        pass
-            except Exception:
-                pass
- 
+        model_choice = "best"
+        scores = table["scores"].get(model_choice)
+        if scores is None:
+            scores = PredictionService._athlete_model_scores(table, model_choice, year=2024)
+            table["scores"][model_choice] = scores
+
+        if scores is not False:
+            top = _top_k_indices(scores, limit)
+        else:
             # fallback heuristic: rank by historical total medals and produce a normalized score
-            out = athletes_df.sort_values("total", ascending=False).head(limit).copy()
-            max_total = out["total"].max() if not out.empty else 1
-            out["score"] = out["total"] / (max_total if max_total > 0 else 1)
-            return out[["athlete", "country", "sport", "score", "total"]].to_dict(orient="records")
- 
-        # expose outer with default parameters
-        return _inner(limit=limit, year=2024, model_choice="best")
\ No newline at end of file
+            top = _top_k_indices(table["total"], limit)
+            scores = table["heuristic_score"]
+
+        return [
+            {"athlete": table["athlete"][i], "country": table["country"][i], "sport": table["sport"][i],
+             "score": float(scores[i]), "total": int(table["total"][i])}
+            for i in top.tolist()
+        ]
+
+    @classmethod
+    def _athlete_model_scores(cls, table, model_choice, year):
+        """Scores of a trained athletes pipeline for every aggregate row, False if unavailable."""
+        try:
+            cls._load_models()
+            mdl = cls._models.get(f"athletes_{model_choice}")
+            if mdl is not None and isinstance(mdl, dict) and mdl.get('model') is not None:
+                pd = _optional_import("pandas")
+                np = _optional_import("numpy")
+                # prepare input columns expected by the pipeline
+                X = pd.DataFrame({"athlete": table["athlete"], "country": table["country"], "sport": table["sport"]})
+                # add year/hist_total if pipeline expects passthrough
+                X["year"] = int(year)
+                X["hist_total"] = table["total"]
+                return np.asarray(mdl['model'].predict(X), dtype=float)
+        except Exception:
+            # fallback to heuristic
+            pass
+        return False
+
+    # --------------------- SPORTS ---------------------
+    @classmethod
+    def _sport_model(cls):
+        """Load the offline sport forecast coefficients once (fit from the awards CSV if the file is missing)."""
+        if cls._sport_forecast is None:
+            from utils.sport_forecast import SportForecastModel
+            if os.path.exists(SPORT_FORECAST):
+                cls._sport_forecast = SportForecastModel.load(SPORT_FORECAST)
+            else:
+                awards = _safe_read_csv(CSV_AWARDS)
+                if awards is None:
+                    return None
+                print(f"{SPORT_FORECAST} not found, fitting sport forecasts in memory (run train_sport_models.py)")
+                cls._sport_forecast = SportForecastModel.fit(awards)
+        return cls._sport_forecast
+
+    @staticmethod
+    def predict_sport_performance(sport: str = "", year: int = 2024, limit: int = 20, top_countries: int = 3) -> List[Dict[str, Any]]:
+        """
+        Expected medals per sport at the `year` Games (sports of that season only), best sports first,
+        with the countries expected to win the most medals in each sport.
+        """
+        forecaster = PredictionService._sport_model()
+        if forecaster is None:
+            return []
+        np = _optional_import("numpy")
+
+        selected = forecaster.contested(int(year))
+        if sport:
+            needle = sport.lower()
+            selected &= np.array([needle in name.lower() for name in forecaster.sports])
+        pair_forecast = forecaster.forecast(int(year))
+        pair_totals = pair_forecast.sum(axis=1)
+
+        results = []
+        for s in np.flatnonzero(selected).tolist():
+            start, end = forecaster.offsets[s], forecaster.offsets[s + 1]
+            gold, silver, bronze = (int(round(v)) for v in pair_forecast[start:end].sum(axis=0))
+            best = start + np.argsort(-pair_totals[start:end], kind="stable")[:top_countries]
+            results.append({
+                'sport': forecaster.sports[s],
+                'gold': gold, 'silver': silver, 'bronze': bronze,
+                'total': gold + silver + bronze,
+                'top_countries': [
+                    {'noc': forecaster.countries[c], 'country': forecaster.country_names[c],
+                     'total': round(float(pair_totals[i]), 1)}
+                    for i, c in zip(best.tolist(), forecaster.pair_country[best].tolist())
+                ],
+            })
+        results.sort(key=lambda r: r['total'], reverse=True)
+        return results[:max(0, limit)]
+
+    # --------------------- MONTE CARLO ---------------------
+    @staticmethod
+    def simulate_games(year: int = 2028, simulations: int = None) -> Dict[str, Any]:
+        """
+        Medal distributions per country for the `year` Games (utils/games_simulation.py).
+        Served from the nightly models/simulation_<year>.json when it has enough simulations,
+        otherwise simulated on demand (cached for an hour) for the next Games only.
+        Raises ValueError for simulations < 1 or a year outside that horizon.
+        """
+        import json
+
+        if simulations is not None and simulations < 1:
+            raise ValueError("simulations doit être un entier positif")
+        path = SIMULATION_FILE.format(year=int(year))
+        if os.path.exists(path):
+            key = ('file', path, os.stat(path).st_mtime_ns)
+            result = _simulation_cache.get(key)
+            if result is None:
+                with open(path, encoding='utf-8') as handle:
+                    result = json.load(handle)
+                _simulation_cache.set(key, result)
+            if simulations is None or simulations <= result.get('simulations', 0):
+                return result
+
+        simulations = min(int(simulations or SIMULATION_ON_DEMAND), SIMULATION_MAX)
+        key = ('run', int(year), simulations)
+        result = _simulation_cache.get(key)
+        if result is None:
+            from utils.games_simulation import simulate
+            awards = _safe_read_csv(CSV_AWARDS)
+            if awards is None:
+                return {}
+            latest = int(awards['year'].max())
+            if not latest < int(year) <= latest + SIMULATION_HORIZON:
+                raise ValueError(f"Simulation disponible pour les Jeux de {latest + 1} à {latest + SIMULATION_HORIZON}")
+            result = simulate(awards, int(year), simulations, seed=int(year))
+            _simulation_cache.set(key, result)
+        return result
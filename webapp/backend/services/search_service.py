@@ -0,0 +1,156 @@
+"""
+Service de recherche côté serveur sur les snapshots des tables m_award et medals
+
+Remplace les filtres `ilike %terme%` combinés par OR (parcours séquentiel de la
+table à chaque recherche) par un index inversé (token -> bitmap de lignes, accents
+supprimés, correspondance par préfixe), intersecté avec les bitmaps des filtres
+eq / gte / lte. Les lignes renvoyées proviennent directement du snapshot.
+"""
+from database.snapshot import load_table_snapshot
+from utils import data_version
+from utils.cache import SEARCH_INDEX_TTL, get_cache
+
+
+# Colonnes recherchées (mêmes colonnes que les anciens filtres ilike),
+# correspondance filtre de la route -> colonne, et colonnes à facettes, par table
+TABLES = {
+    'm_award': {
+        'text_columns': ['noc', 'sport'],
+        'filters': {'country': 'noc', 'medal_type': 'medal', 'sport': 'sport', 'year': 'year'},
+        'range_column': 'year',
+        'facets': ['year', 'season', 'sport', 'noc', 'medal', 'event_gender'],
+    },
+    'medals': {
+        'text_columns': ['athlete', 'country', 'sport'],
+        'filters': {'country': 'noc', 'sport': 'sport', 'year': 'year'},
+        'range_column': 'year',
+        'facets': ['year', 'season', 'sport', 'noc', 'medal', 'event_gender', 'participant_type'],
+    },
+}
+
+# clé (table, version des données) : un index construit sur d'anciennes données n'est plus servi
+_index_cache = get_cache('table_search_index', ttl=SEARCH_INDEX_TTL, maxsize=2 * len(TABLES))
+
+
+class TableSearchIndex:
+    """Snapshot d'une table + index inversé des colonnes texte + bitmaps des colonnes filtrées"""
+
+    def __init__(self, table, snapshot, text_columns, filters, range_column, facets=()):
+        from utils.search_index import InvertedIndex
+
+        self.table = table
+        self.snapshot = snapshot.reset_index(drop=True)
+        self.size = len(self.snapshot)
+        self.filters = {k: c for k, c in filters.items() if c in self.snapshot.columns}
+        self.range_column = range_column if range_column in self.snapshot.columns else None
+        self.facets = [c for c in facets if c in self.snapshot.columns]
+
+        self.text = InvertedIndex([self.snapshot[c].tolist() for c in text_columns if c in self.snapshot.columns])
+        self.values = {}
+        for column in set(self.filters.values()) | set(self.facets) | ({self.range_column} - {None}):
+            self.column_index(column)
+
+    def column_index(self, column):
+        """Bitmaps par valeur d'une colonne (construits au premier usage)"""
+        from utils.search_index import ValueIndex
+
+        if column not in self.values:
+            self.values[column] = ValueIndex(self.snapshot[column].tolist())
+        return self.values[column]
+
+    @property
+    def all_rows(self):
+        return (1 << self.size) - 1
+
+    def match(self, search='', filters=None):
+        """Bitmap des lignes qui correspondent à la recherche ET à tous les filtres"""
+        bitmap = self.all_rows
+        if search:
+            found = self.text.search(search)
+            if found is not None:
+                bitmap &= found
+
+        filters = filters or {}
+        for key, column in self.filters.items():
+            if key in filters and bitmap:
+                bitmap &= self.values[column].eq(filters[key])
+        if self.range_column and ('year_min' in filters or 'year_max' in filters) and bitmap:
+            bitmap &= self.values[self.range_column].between(filters.get('year_min'), filters.get('year_max'))
+        return bitmap
+
+    def query(self, search='', filters=None, sort_by='', sort_order='asc', default_sort=('year', True),
+              offset=0, limit=None):
+        """(lignes de la page sous forme de dicts, total)"""
+        from utils.search_index import bitmap_to_rows
+
+        rows = bitmap_to_rows(self.match(search, filters), self.size)
+
+        # trier les seules positions (sur la colonne de tri), puis ne lire que la page
+        column, descending = (sort_by, sort_order == 'desc') if sort_by else default_sort
+        if column in self.snapshot.columns and len(rows) > 1:
+            keys = self.snapshot[column].iloc[rows].reset_index(drop=True)
+            order = keys.sort_values(ascending=not descending, kind='stable', na_position='last').index
+            rows = rows[order.to_numpy()]
+
+        total = len(rows)
+        rows = rows[offset:offset + limit] if limit is not None else rows[offset:]
+        return _records(self.snapshot.iloc[rows]), total
+
+
+def _records(df):
+    """Lignes JSON-sérialisables (NaN -> None, types numpy -> types Python)"""
+    records = df.to_dict(orient='records')
+    for record in records:
+        for key, value in record.items():
+            if isinstance(value, float) and value != value:
+                record[key] = None
+            elif hasattr(value, 'item'):
+                record[key] = value.item()
+    return records
+
+
+class SearchService:
+    @staticmethod
+    def get_index(table, refresh=False, version=None):
+        """Index de la table pour la version des données `version` (courante par défaut), ou None
+
+        Passé SEARCH_INDEX_TTL secondes, l'index actuel reste servi pendant sa reconstruction en
+        arrière-plan ; refresh=True le reconstruit tout de suite (planificateur).
+        """
+        def build():
+            snapshot = load_table_snapshot(table)
+            if snapshot is None:
+                return None
+            return TableSearchIndex(table, snapshot, **TABLES[table])
+
+        key = (table, version or data_version.token())
+        if refresh:
+            index = build()
+            if index is not None:
+                _index_cache.set(key, index)
+            return index
+        return _index_cache.fetch(key, build)
+
+    @staticmethod
+    def refresh_indexes(version=None):
+        """Reconstruire les index déjà construits (après relecture des snapshots)"""
+        tables = sorted({table for table, _ in _index_cache.keys()})
+        return [table for table in tables if SearchService.get_index(table, refresh=True, version=version) is not None]
+
+    @staticmethod
+    def search_table(table, page=1, limit=None, search='', sort_by='', sort_order='asc', filters=None):
+        """Même réponse que les services de liste, ou None si l'index n'est pas utilisable"""
+        index = SearchService.get_index(table)
+        if index is None or (sort_by and sort_by not in index.snapshot.columns):
+            return None
+
+        offset = (page - 1) * limit if limit is not None else 0
+        data, total = index.query(search, filters, sort_by, sort_order, offset=offset, limit=limit)
+        return {
+            'status': 'success',
+            'data': data,
+            'total': total,
+            'page': page,
+            'limit': limit,
+            'total_pages': (total + limit - 1) // limit if total and limit else 1
+        }
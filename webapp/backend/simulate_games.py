@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+SIMULATION MONTE-CARLO DES JEUX
+===============================
+
+Simule `--simulations` éditions complètes des Jeux `--year` (utils/games_simulation.py),
+réparties sur `--workers` processus, et enregistre les distributions de médailles par
+pays dans models/simulation_<année>.json, servi tel quel par /api/predictions/simulation.
+Prévu pour tourner chaque nuit :
+    python simulate_games.py --year 2026 --year 2028 --simulations 50000
+"""
+
+import argparse
+import json
+import os
+import sys
+
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from utils.games_simulation import DEFAULT_FORM_SIGMA, simulate
+
+DATA_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "data", "clean"))
+CSV_AWARDS = os.path.join(DATA_DIR, "olympic_medal_awards_v2.csv")
+MODELS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), 'models'))
+
+
+def simulation_path(year, models_dir=MODELS_DIR):
+    return os.path.join(models_dir, f'simulation_{int(year)}.json')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulation Monte-Carlo des médailles des prochains Jeux")
+    parser.add_argument('--year', type=int, action='append', help="Année des Jeux (répétable, défaut : 2028)")
+    parser.add_argument('--simulations', type=int, default=50000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--form-sigma', type=float, default=DEFAULT_FORM_SIGMA)
+    parser.add_argument('--output-dir', default=MODELS_DIR)
+    args = parser.parse_args()
+
+    awards = pd.read_csv(CSV_AWARDS)
+    os.makedirs(args.output_dir, exist_ok=True)
+    for year in args.year or [2028]:
+        result = simulate(awards, year, args.simulations, args.workers, args.seed, args.form_sigma)
+        path = simulation_path(year, args.output_dir)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as handle:
+            json.dump(result, handle, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+        print(f"{year}: {result['simulations']} Jeux simulés ({result['events']} épreuves, programme "
+              f"{result['programme_year']}) en {result['duration_s']} s -> {path}")
+        for row in result['countries'][:10]:
+            total = row['percentiles']['total']
+            print(f"  {row['noc']:4s} {row['mean']['total']:6.1f} médailles "
+                  f"(90 % : {total['p5']}-{total['p95']}), or {row['mean']['gold']:.1f}")
+
+
+if __name__ == "__main__":
+    main()
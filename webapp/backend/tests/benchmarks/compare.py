@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Comparer deux résultats du banc de mesure (JSON produits par pytest)
+
+Usage :
+    python tests/benchmarks/compare.py results/abc123.json results/def456.json [--threshold 10]
+
+Affiche la variation de la latence médiane et du pic mémoire par endpoint et
+retourne un code de sortie 1 si une régression dépasse le seuil (en %).
+"""
+import argparse
+import json
+import sys
+
+
+def load(path):
+    with open(path, encoding='utf-8') as f:
+        payload = json.load(f)
+    return payload, {b['name']: b for b in payload['benchmarks']}
+
+
+def pct(before, after):
+    if before == 0:
+        return 0.0
+    return (after - before) / before * 100
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('before')
+    parser.add_argument('after')
+    parser.add_argument('--threshold', type=float, default=10.0,
+                        help='régression maximale tolérée sur la médiane, en %% (défaut: 10)')
+    args = parser.parse_args()
+
+    before_meta, before = load(args.before)
+    after_meta, after = load(args.after)
+
+    print(f"Avant : {before_meta['commit']} ({before_meta['timestamp']})")
+    print(f"Après : {after_meta['commit']} ({after_meta['timestamp']})")
+    print()
+    print(f"{'endpoint':60s} {'médiane avant':>14s} {'après':>10s} {'Δ%':>8s} {'Δ% mém.':>8s}")
+    print('-' * 104)
+
+    regressions = []
+    for name in sorted(set(before) | set(after)):
+        if name not in before or name not in after:
+            status = 'nouveau' if name not in before else 'supprimé'
+            print(f'{name:60s} {status:>14s}')
+            continue
+        b, a = before[name], after[name]
+        delta = pct(b['median_ms'], a['median_ms'])
+        delta_mem = pct(b['peak_memory_kb'], a['peak_memory_kb'])
+        flag = ' <-- régression' if delta > args.threshold else ''
+        print(f"{name:60s} {b['median_ms']:14.2f} {a['median_ms']:10.2f} {delta:+8.1f} {delta_mem:+8.1f}{flag}")
+        if flag:
+            regressions.append(name)
+
+    if regressions:
+        print(f'\n{len(regressions)} régression(s) au-delà de {args.threshold}%')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,115 @@
+"""
+Fixtures du banc de mesure des endpoints
+
+L'application est construite avec le backend de données local (DATA_BACKEND=local),
+alimenté par les CSV de data/clean : aucune connexion Supabase n'est nécessaire.
+
+Variables d'environnement :
+- BENCHMARK_ROUNDS : nombre de mesures par endpoint (défaut: 5)
+- BENCHMARK_OUTPUT : fichier JSON de sortie
+                     (défaut: tests/benchmarks/results/<commit>.json)
+"""
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+RESULTS_DIR = Path(__file__).resolve().parent / 'results'
+
+# Le backend doit être configuré avant le premier import de database.supabase_client
+os.environ['DATA_BACKEND'] = 'local'
+os.environ.setdefault('FLASK_DEBUG', 'False')
+# Pas de préchauffage ni de rafraîchissement concurrents des mesures (chaque mesure a son tour de chauffe)
+os.environ.setdefault('WARMUP_ENABLED', 'False')
+os.environ.setdefault('SCHEDULER_ENABLED', 'False')
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+_results = []
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=BACKEND_DIR, text=True
+        ).strip()
+    except Exception:
+        return 'unknown'
+
+
+@pytest.fixture(scope='session')
+def app():
+    from app import create_app
+    application = create_app()
+    application.config['TESTING'] = True
+    return application
+
+
+@pytest.fixture(scope='session')
+def client(app):
+    return app.test_client()
+
+
+class Benchmark:
+    """Mesure la latence (perf_counter) puis le pic mémoire (tracemalloc) d'un appel"""
+
+    def __init__(self, rounds):
+        self.rounds = rounds
+
+    def __call__(self, name, func):
+        # Tour de chauffe : chargement des CSV, modèles, imports paresseux
+        result = func()
+
+        timings = []
+        for _ in range(self.rounds):
+            start = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - start) * 1000)
+
+        # Mémoire mesurée à part : tracemalloc ralentit fortement l'exécution
+        tracemalloc.start()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        _results.append({
+            'name': name,
+            'rounds': self.rounds,
+            'min_ms': round(min(timings), 3),
+            'mean_ms': round(statistics.mean(timings), 3),
+            'median_ms': round(statistics.median(timings), 3),
+            'max_ms': round(max(timings), 3),
+            'stdev_ms': round(statistics.stdev(timings), 3) if len(timings) > 1 else 0.0,
+            'peak_memory_kb': round(peak / 1024, 1),
+        })
+        return result
+
+
+@pytest.fixture(scope='session')
+def benchmark():
+    return Benchmark(int(os.getenv('BENCHMARK_ROUNDS', 5)))
+
+
+def pytest_sessionfinish(session, exitstatus):
+    if not _results:
+        return
+    commit = _git_commit()
+    output = Path(os.getenv('BENCHMARK_OUTPUT') or RESULTS_DIR / f'{commit}.json')
+    output.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        'commit': commit,
+        'timestamp': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'benchmarks': sorted(_results, key=lambda r: r['name']),
+    }
+    output.write_text(json.dumps(payload, indent=2), encoding='utf-8')
@@ -0,0 +1,62 @@
+"""
+Banc de mesure de chaque route des Blueprints sur le jeu de données local
+
+Lancer depuis webapp/backend :
+    python -m pytest tests/benchmarks -q
+puis comparer deux commits :
+    python tests/benchmarks/compare.py results/<avant>.json results/<apres>.json
+"""
+import pytest
+
+MEDAL_ENDPOINTS = [
+    '/api/medals?limit=50',
+    '/api/medals?limit=50&search=FRA',
+    '/api/medals?country=USA&year_min=1990&year_max=2020',
+    '/api/rewards',
+    '/api/medals/france',
+    '/api/medals/france/success',
+    '/api/medals/france/sports',
+    '/api/medals/dominant-sports',
+    '/api/medals/country-performance',
+    '/api/medals/temporal-trends',
+    '/api/medals/success-factors',
+]
+
+GDP_ENDPOINTS = [
+    '/api/gdp-analysis/correlation-by-year',
+    '/api/gdp-analysis/correlation-by-sport-cost?year=2020',
+    '/api/gdp-analysis/correlation-gdp-per-capita?year=2020',
+    '/api/gdp-analysis/summary',
+    '/api/gdp-analysis/real-gdp-medals-data',
+]
+
+PREDICTION_ENDPOINTS = [
+    '/api/predictions/country/France?model=ma',
+    '/api/predictions/country/France?model=es',
+    '/api/predictions/top-countries?model=ma',
+    '/api/predictions/top-countries?model=best',
+    '/api/predictions/athletes?limit=50',
+    '/api/predictions/sports?limit=20',
+    '/api/predictions/models/status',
+]
+
+OTHER_ENDPOINTS = [
+    '/api/hosts',
+    '/api/hosts?search=Paris',
+    '/api/hosts/ranking',
+    '/api/athletes?limit=20',
+    '/api/athletes?limit=20&search=phelps',
+    '/api/olympic_results?limit=50',
+    '/api/olympic_results?limit=50&search=judo',
+    '/api/health',
+    '/api/health/live',
+    '/api/test',
+]
+
+ALL_ENDPOINTS = MEDAL_ENDPOINTS + GDP_ENDPOINTS + PREDICTION_ENDPOINTS + OTHER_ENDPOINTS
+
+
+@pytest.mark.parametrize('url', ALL_ENDPOINTS)
+def test_endpoint_benchmark(client, benchmark, url):
+    response = benchmark(url, lambda: client.get(url))
+    assert response.status_code == 200, response.get_data(as_text=True)[:500]
@@ -0,0 +1,13 @@
+"""
+Configuration commune des tests du backend : imports depuis webapp/backend et
+backend de données local (aucune connexion Supabase).
+"""
+import os
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+os.environ.setdefault('DATA_BACKEND', 'local')
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
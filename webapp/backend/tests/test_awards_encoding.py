@@ -0,0 +1,74 @@
+"""
+Tests de la table awards encodée (notebooks/awards_encoding.py) : équivalence avec pandas, codes, fichiers
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / 'notebooks'))
+
+from awards_encoding import (  # noqa: E402
+    KEY_COLS, SORT_COLS, build_awards, encode_column, load_awards_codes, pack_keys, write_awards)
+
+
+def medals():
+    rows = [
+        (2024, 'Summer', 'Judo', '-60kg', 'Men', 'FRA', 'France', 'GOLD'),
+        (2024, 'Summer', 'Judo', '-60kg', 'Men', 'FRA', 'France', 'GOLD'),        # équipe : doublon
+        (2024, 'Summer', 'Judo', '-60kg', 'Men', 'GEO', 'Georgia', 'BRONZE'),
+        (2024, 'Summer', 'Judo', '-60kg', 'Men', 'KOR', 'Korea', 'BRONZE'),
+        (2020, 'Summer', 'Athletics', '100m', 'Men', 'USA', 'United States', 'GOLD'),
+        (2020, 'Summer', 'Athletics', '100m', 'Men', None, 'Unknown', 'SILVER'),
+        (2020, 'Summer', 'Athletics', '100m', 'Men', None, 'Other', 'SILVER'),   # doublon avec noc manquant
+        (2020, 'Summer', 'Athletics', None, 'Men', 'JAM', 'Jamaica', 'BRONZE'),
+        (2018, 'Winter', 'Curling', 'Mixed', 'Mixed', 'CAN', 'Canada', 'GOLD'),
+        (2020, 'Summer', 'Athletics', '100m', 'Men', 'USA', 'United States', np.nan),
+    ]
+    return pd.DataFrame(rows, columns=['year', 'season', 'sport', 'event', 'event_gender', 'noc', 'country', 'medal'])
+
+
+def test_build_awards_matches_pandas_dedup_and_sort():
+    df = medals()
+    awards, dictionaries = build_awards(df)
+
+    expected = df.drop_duplicates(KEY_COLS).sort_values(SORT_COLS)
+    pd.testing.assert_frame_equal(awards.drop(columns='award_count'), expected)
+    assert (awards['award_count'] == 1).all()
+    # dictionnaires triés, valeur manquante en dernier code
+    assert dictionaries['noc'] == ['CAN', 'FRA', 'GEO', 'JAM', 'KOR', 'USA', None]
+    assert dictionaries['year'] == [2018, 2020, 2024]
+
+
+def test_missing_values_take_the_last_code():
+    codes, dictionary = encode_column(np.array(['b', None, 'a', 'b'], dtype=object))
+    assert codes.tolist() == [1, 2, 0, 1] and dictionary == ['a', 'b', None]
+
+
+def test_pack_keys_orders_lexicographically_and_rejects_overflow():
+    first, second = np.array([0, 1, 1, 0]), np.array([2, 0, 1, 1])
+    key = pack_keys([first, second], [2, 3])
+    assert np.argsort(key).tolist() == np.lexsort([second, first]).tolist()
+
+    with pytest.raises(OverflowError):
+        pack_keys([first, second], [2 ** 32, 2 ** 31])
+
+
+def test_codes_round_trip(tmp_path):
+    awards, dictionaries = build_awards(medals())
+    out_csv, codes_path, dict_path = write_awards(awards, dictionaries, tmp_path / 'awards.csv')
+    assert codes_path.exists() and dict_path.exists()
+    pd.testing.assert_frame_equal(pd.read_csv(out_csv), awards.reset_index(drop=True), check_dtype=False)
+
+    codes, loaded = load_awards_codes(out_csv)
+    assert set(codes) == set(awards.columns)
+    assert codes['noc'].dtype == np.int32
+    np.testing.assert_array_equal(codes['award_count'], awards['award_count'].to_numpy())
+    for column in awards.columns.drop('award_count'):
+        decoded = [loaded[column][code] for code in codes[column]]
+        expected = [None if pd.isna(v) else v for v in awards[column]]
+        assert decoded == expected, column
+    # dictionnaires des colonnes clés : ceux de la table avant déduplication
+    assert loaded['noc'] == dictionaries['noc']
@@ -0,0 +1,106 @@
+"""
+Tests du backtest des modes de prédiction
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.backtest import (backtest_edition, evaluate_folds, rolling_origin_folds, run_backtest, score, summarize,
+                            temporal_holdout_year)
+
+FEATURES = ['avg_recent_3', 'trend', 'year_normalized']
+
+
+def features():
+    rows = []
+    for year in (2008, 2012, 2016, 2020):
+        for country, base in (('France', 30), ('Kenya', 10), ('Japan', 20)):
+            gold = base // 3 + (year - 2008) // 4
+            rows.append({'country': country, 'year': year, 'gold': gold, 'silver': base // 3, 'bronze': base // 3,
+                         'avg_recent_3': base, 'trend': 1.0, 'year_normalized': (year - 1990) / 30})
+    df = pd.DataFrame(rows)
+    df['total_medals'] = df['gold'] + df['silver'] + df['bronze']
+    return df
+
+
+def test_score():
+    scores = score([10, 20, 30], [12, 18, 33])
+    assert scores['mae'] == pytest.approx(7 / 3)
+    assert scores['rmse'] == pytest.approx(np.sqrt(17 / 3))
+    assert scores['spearman'] == pytest.approx(1.0)
+    assert score([5, 5], [1, 2])['spearman'] is None
+
+
+def test_moving_average_uses_only_prior_editions():
+    df = features()
+    result = backtest_edition(df, 2016, models=('ma', 'es'))
+    assert result['countries'] == ['France', 'Kenya', 'Japan']
+    # France : or 10 puis 11 -> moyenne 10,5 arrondie à 10 (arrondi pair), argent et bronze 10
+    assert result['models']['ma']['predicted'][0] == 30
+
+    # modifier les éditions futures ne change pas la prédiction
+    future = df.copy()
+    future.loc[future['year'] == 2020, ['gold', 'total_medals']] = 1000
+    assert backtest_edition(future, 2016, models=('ma',))['models']['ma']['predicted'] == result['models']['ma']['predicted']
+
+
+def test_machine_learning_modes_and_summary():
+    results = run_backtest(features(), [2016, 2020], feature_columns=FEATURES)
+    summary = summarize(results)
+    assert set(summary) == {'ma', 'es', 'best', 'second', 'best_refit', 'second_refit'}
+    assert summary['best_refit']['refit_upper_bound'] and not summary['best']['refit_upper_bound']
+    for row in summary.values():
+        assert row['editions'] == 2 and row['mae'] >= 0 and row['fit_s'] >= 0
+    assert all(p >= 0 for r in results for m in r['models'].values() for p in m['predicted'])
+
+
+def test_served_modes_replay_the_api_feature_row():
+    from services.prediction_service import COUNTRY_MODEL_MAPPING, _country_model_features
+
+    df = features()
+    result = backtest_edition(df, 2020, models=('best', 'second', 'second_refit'),
+                              feature_columns=FEATURES, served_estimator='ridge')
+    # l'API sert country_best dans les deux modes
+    assert result['models']['best']['predicted'] == result['models']['second']['predicted']
+
+    # même prédiction qu'un Ridge ajusté sur le passé et appliqué à la ligne construite par l'API
+    from sklearn.linear_model import Ridge
+    from sklearn.preprocessing import StandardScaler
+    train = df[df['year'] < 2020]
+    scaler = StandardScaler().fit(train[FEATURES].to_numpy(dtype=float))
+    model = Ridge(alpha=1.0).fit(scaler.transform(train[FEATURES].to_numpy(dtype=float)), train['total_medals'])
+    rows = [_country_model_features(COUNTRY_MODEL_MAPPING.get(c, c), 2020) for c in result['countries']]
+    X = scaler.transform(np.array([[row[f] for f in FEATURES] for row in rows], dtype=float))
+    assert result['models']['best']['predicted'] == np.round(np.maximum(model.predict(X), 0)).tolist()
+    # les caractéristiques historiques (refit) donnent une autre prédiction
+    assert result['models']['second_refit']['predicted'] != result['models']['best']['predicted']
+
+
+def test_parallel_matches_serial():
+    df = features()
+    serial = run_backtest(df, [2012, 2016, 2020], models=('ma', 'es'))
+    parallel = run_backtest(df, [2012, 2016, 2020], models=('ma', 'es'), workers=2)
+    assert [r['year'] for r in parallel] == [2012, 2016, 2020]
+    assert [r['models']['es']['predicted'] for r in parallel] == [r['models']['es']['predicted'] for r in serial]
+
+
+def test_temporal_holdout_keeps_last_editions():
+    years = [2008] * 4 + [2012] * 3 + [2016] * 2 + [2020]
+    assert temporal_holdout_year(years, test_size=0.3) == 2016
+    assert temporal_holdout_year(years, test_size=0.05) == 2020
+
+
+def test_rolling_folds_are_expanding_and_cached():
+    df = features()
+    folds = rolling_origin_folds(df, FEATURES, min_train_editions=2)
+    assert [f['year'] for f in folds] == [2016, 2020]
+    assert [len(f['y_train']) for f in folds] == [6, 9]
+    # entraînement normalisé sur le seul passé
+    assert np.allclose(folds[0]['X_train'].mean(axis=0), 0)
+    assert rolling_origin_folds(df.copy(), FEATURES, min_train_editions=2) is folds
+
+    serial = evaluate_folds(folds, ['ridge', 'random_forest'])
+    parallel = evaluate_folds(folds, ['ridge', 'random_forest'], workers=2)
+    assert [f['year'] for f in serial['ridge']['folds']] == [2016, 2020]
+    assert serial['ridge']['mae'] == pytest.approx(parallel['ridge']['mae'])
+    assert serial['random_forest']['r2'] == pytest.approx(parallel['random_forest']['r2'])
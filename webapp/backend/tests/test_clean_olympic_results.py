@@ -0,0 +1,99 @@
+"""
+Tests du nettoyage de olympic_results.html (notebooks/clean_olympic_results.py)
+"""
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / 'notebooks'))
+
+import clean_olympic_results as results  # noqa: E402
+
+
+def test_season_is_joined_on_games_slug():
+    # 1992 : Jeux d'hiver (Albertville) et d'été (Barcelone) la même année
+    season_map = {'albertville-1992': 'Winter', 'barcelona-1992': 'Summer'}
+    df = pd.DataFrame({
+        'slug_game': ['albertville-1992', 'barcelona-1992'],
+        'discipline_title': ['Alpine Skiing', 'Swimming'],
+        'event_title': ['Slalom', '100m'],
+        'participant_type': ['Athlete', 'Athlete'],
+        'medal_type': ['GOLD', 'SILVER'],
+        'country_name': ['France', 'France'],
+        'athlete_full_name': ['A', 'B'],
+    })
+    out = results.transform(df, season_map)
+    assert out.set_index('slug_game')['season'].to_dict() == season_map
+
+
+HTML = """<html><body>
+<table>
+<thead><tr><th></th><th>discipline_title</th><th>event_title</th><th>slug_game</th><th>participant_type</th>
+<th>medal_type</th><th>athletes</th><th>rank_position</th><th>country_name</th><th>country_3_letter_code</th>
+<th>athlete_full_name</th><th>athlete_url</th></tr></thead>
+<tbody>
+<tr><td>0</td><td>Swimming</td><td>100m</td><td>paris-2024</td><td>Athlete</td><td>GOLD</td><td></td><td>1</td>
+<td>France</td><td>FRA</td><td>Léon MARCHAND</td><td>https://x/leon</td></tr>
+<tr><td>1</td><td>Rowing</td><td>Pair</td><td>paris-2024</td><td>GameTeam</td><td>SILVER</td>
+<td>[('A ONE', 'https://x/a'), ('B TWO', None)]</td><td>2</td><td>France</td><td>FRA</td><td></td><td></td></tr>
+<tr><td>2</td><td>Judo</td><td>-60kg</td><td>tokyo-2020</td><td>Athlete</td><td></td><td></td><td>DNS</td>
+<td>Kenya</td><td>KEN</td><td>C THREE</td><td>N/A</td></tr>
+<tr><td>3</td><td>Alpine Skiing</td><td>Slalom</td><td>albertville-1992</td><td>Athlete</td><td>BRONZE</td>
+<td>["D FOUR"]</td><td>3</td><td>France</td><td>FRA</td><td></td><td></td></tr>
+<tr><td>4</td><td>Swimming</td><td>200m</td><td>barcelona-1992</td><td>Athlete</td><td>GOLD</td><td></td><td>1</td>
+<td>United States</td><td>USA</td><td>E FIVE</td><td></td></tr>
+</tbody>
+</table>
+<table><tr><th>footer</th></tr><tr><td>not a result</td></tr></table>
+</body></html>
+"""
+
+
+def test_streaming_matches_in_memory(tmp_path):
+    html = tmp_path / 'olympic_results.html'
+    html.write_text(HTML, encoding='utf-8')
+
+    # seule la première table est lue, comme pd.read_html(...)[0]
+    rows = list(results.iter_html_rows(html))
+    assert len(rows) == 6 and rows[-1][1] == 'Swimming'
+
+    frames = {}
+    for chunksize in (0, 2):
+        out_dir = tmp_path / f'out_{chunksize}'
+        results.main(['--input', str(html), '--out-dir', str(out_dir), '--chunksize', str(chunksize)])
+        frames[chunksize] = [pd.read_csv(out_dir / name, keep_default_na=False)
+                             for name in (results.OUT_DETA.name, results.OUT_AWARD.name)]
+
+    for in_memory, streamed in zip(frames[0], frames[2]):
+        # la sortie en mémoire est triée, la sortie en flux suit l'ordre du fichier
+        key = list(in_memory.columns)
+        assert list(streamed.columns) == key
+        pd.testing.assert_frame_equal(in_memory.sort_values(key).reset_index(drop=True),
+                                      streamed.sort_values(key).reset_index(drop=True))
+    assert len(frames[2][0]) == 6
+
+
+ATHLETE_CELLS = [
+    "[('A ONE', 'https://x/a'), ('B TWO', 'https://x/b')]",
+    "[('C THREE', None)]",
+    '[("D O\'FOUR", "https://x/d")]',
+    "['E FIVE', 'F SIX']",
+    "[('G SEVEN', 'https://x/g'),]",
+    "[('H EIGHT', 'https://x/h', 'extra')]",      # 3-tuple : chemin de secours
+    "[('I NINE\\'S', 'https://x/i')]",            # échappement : chemin de secours
+    "[('J TEN', 'https://x/j'), ('K ELE",         # texte tronqué : chemin de secours
+    "[]",
+    "",
+    None,
+]
+
+
+def test_vectorized_athletes_match_row_by_row_parser():
+    cells = pd.Series(ATHLETE_CELLS)
+    pairs = results.extract_athletes(cells)
+
+    for row, cell in enumerate(ATHLETE_CELLS):
+        expected = results.parse_athletes(cell)
+        found = pairs.xs(row, level=0) if row in pairs.index.get_level_values(0) else pairs.iloc[:0]
+        assert list(zip(found['name'], found['url'])) == expected, cell
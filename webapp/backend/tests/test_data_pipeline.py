@@ -0,0 +1,84 @@
+"""
+Tests du pipeline de nettoyage (notebooks/pipeline.py) : ordre des étapes, étapes sautées par hash
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / 'notebooks'))
+
+import pipeline  # noqa: E402
+from pipeline import Stage  # noqa: E402
+
+COPY_SCRIPT = """
+from pathlib import Path
+source, target = Path(__file__).parent / {source!r}, Path(__file__).parent / {target!r}
+target.write_text(source.read_text().upper())
+"""
+
+
+@pytest.fixture
+def tmp_pipeline(tmp_path, monkeypatch):
+    """Deux étapes chaînées (raw.txt -> a.txt -> b.txt) dans un dépôt temporaire"""
+    (tmp_path / 'a.py').write_text(COPY_SCRIPT.format(source='raw.txt', target='a.txt'))
+    (tmp_path / 'b.py').write_text(COPY_SCRIPT.format(source='a.txt', target='b.txt'))
+    (tmp_path / 'raw.txt').write_text('paris')
+    stages = [
+        Stage('b', 'b.py', inputs=[tmp_path / 'a.txt'], outputs=[tmp_path / 'b.txt']),
+        Stage('a', 'a.py', inputs=[tmp_path / 'raw.txt'], outputs=[tmp_path / 'a.txt']),
+    ]
+    for name, value in (('STAGES', stages), ('ROOT', tmp_path), ('BASE', tmp_path), ('CLEAN', tmp_path),
+                        ('STATE_PATH', tmp_path / 'state.json')):
+        monkeypatch.setattr(pipeline, name, value)
+    return tmp_path
+
+
+def test_dependencies_order_stages_and_reject_cycles(tmp_path):
+    stages = [
+        Stage('b', 'b.py', inputs=[tmp_path / 'a.txt'], outputs=[tmp_path / 'b.txt']),
+        Stage('a', 'a.py', inputs=[tmp_path / 'raw.txt'], outputs=[tmp_path / 'a.txt']),
+        Stage('c', 'c.py', inputs=[tmp_path / 'raw.txt'], outputs=[tmp_path / 'c.txt']),
+    ]
+    assert pipeline.resolve_dependencies(stages) == ['a', 'b', 'c']
+    assert stages[0].depends_on == ['a']
+    assert pipeline.downstream_of(stages, ['a']) == {'a', 'b'}
+
+    stages[1].inputs.append(tmp_path / 'b.txt')
+    with pytest.raises(ValueError):
+        pipeline.resolve_dependencies(stages)
+
+
+def test_default_stages_form_a_dag():
+    order = pipeline.resolve_dependencies(pipeline.STAGES)
+    assert order.index('hosts') < order.index('medals') < order.index('medals_v2')
+    assert order.index('hosts') < order.index('results')
+
+
+def test_unchanged_stages_are_skipped(tmp_pipeline):
+    status, failed = pipeline.run_pipeline(jobs=1)
+    assert not failed and status == {'a': 'done', 'b': 'done'}
+    assert (tmp_pipeline / 'b.txt').read_text() == 'PARIS'
+
+    status, _ = pipeline.run_pipeline(jobs=1)
+    assert status == {'a': 'skipped', 'b': 'skipped'}
+
+    # entrée modifiée : l'étape et celle qui dépend de sa sortie sont rejouées
+    (tmp_pipeline / 'raw.txt').write_text('tokyo')
+    status, _ = pipeline.run_pipeline(jobs=1)
+    assert status == {'a': 'done', 'b': 'done'}
+    assert (tmp_pipeline / 'b.txt').read_text() == 'TOKYO'
+
+    # sortie altérée à la main : seule l'étape qui la produit est rejouée
+    (tmp_pipeline / 'b.txt').write_text('edited')
+    status, _ = pipeline.run_pipeline(jobs=1)
+    assert status == {'a': 'skipped', 'b': 'done'}
+
+
+def test_failed_stage_blocks_dependents(tmp_pipeline):
+    (tmp_pipeline / 'a.py').write_text('raise RuntimeError("boom")')
+    status, failed = pipeline.run_pipeline(jobs=1)
+    assert failed and status == {'a': 'failed', 'b': 'failed'}
+
+    status, _ = pipeline.run_pipeline(['b'], dry_run=True, jobs=1)
+    assert status == {'b': 'missing'}
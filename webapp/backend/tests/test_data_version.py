@@ -0,0 +1,185 @@
+"""
+Tests des versions de données : détection des changements, clés de cache, ETag et registre de modèles
+"""
+import pandas as pd
+from flask import Blueprint, Flask, jsonify
+
+from database.local_client import LocalClient
+from routes.facet_routes import facet_bp
+from services import search_service
+from services.prediction_service import PredictionService
+from utils import data_version, payloads
+from utils.data_version import DataVersions
+
+
+class RemoteClient:
+    """Client sans data_dir : versions calculées par requêtes, comme avec Supabase"""
+
+    def __init__(self, local):
+        self.table = local.table
+
+
+def write_hosts(path, names):
+    pd.DataFrame({'game_name': names}).to_csv(path, index=False)
+
+
+def test_local_versions_follow_file_content(tmp_path):
+    path = tmp_path / 'olympic_hosts_clean.csv'
+    write_hosts(path, ['Paris 2024'])
+    client = LocalClient(data_dir=tmp_path)
+    versions = DataVersions(lambda: client, tables=('hosts', 'medals'), interval=3600, models_dir=tmp_path / 'models')
+
+    first = versions.poll()
+    assert first['hosts'] and first['medals'] is None and first['models'] is None
+    token = versions.token()
+
+    # même contenu réécrit : même version ; nouveau contenu : visible seulement après l'intervalle
+    write_hosts(path, ['Paris 2024'])
+    assert versions.poll(force=True)['hosts'] == first['hosts']
+    write_hosts(path, ['Paris 2024', 'Tokyo 2020'])
+    assert versions.token() == token
+    assert versions.check()['hosts'] != first['hosts']
+    assert versions.token() == token
+    assert versions.poll(force=True)['hosts'] != first['hosts']
+    assert versions.token() != token
+
+
+def test_simulation_files_change_token_but_not_models(tmp_path):
+    (tmp_path / 'country_best.joblib').write_bytes(b'model')
+    simulation = tmp_path / 'simulation_2028.json'
+    simulation.write_text('{"simulations": 1}')
+    versions = DataVersions(lambda: None, tables=(), models_dir=tmp_path)
+    before = versions.check()
+
+    simulation.write_text('{"simulations": 10}')
+    after = versions.check()
+    assert after['models'] == before['models']
+    assert after['simulations'] != before['simulations']
+    assert data_version.token_of(after) != data_version.token_of(before)
+
+
+def test_gdp_store_changes_gdp_analysis_etag(tmp_path, monkeypatch):
+    from services import gdp_data_service
+    from services.gdp_data_service import GDPDataService
+
+    service = GDPDataService(store_path=tmp_path / 'world_bank_gdp.json')
+    monkeypatch.setattr(gdp_data_service, '_service', service)
+    versions = DataVersions(lambda: None, tables=(), models_dir=tmp_path)
+    monkeypatch.setattr(data_version, 'token', lambda: versions.token())
+
+    # même nom que le Blueprint des analyses PIB, qui lit get_gdp_table()
+    bp = Blueprint('gdp_analysis', __name__)
+
+    @bp.route('/api/gdp-analysis/gdp')
+    def gdp():
+        return jsonify({'FR': gdp_data_service.get_gdp_table()['FR'].get(2024)})
+
+    app = Flask(__name__)
+    app.register_blueprint(bp)
+    data_version.init_etags(app)
+    client = app.test_client()
+
+    etag = client.get('/api/gdp-analysis/gdp').headers['ETag']
+    assert client.get('/api/gdp-analysis/gdp', headers={'If-None-Match': etag}).status_code == 304
+
+    # magasin PIB réécrit : nouvelle version, l'ancien ETag ne correspond plus
+    service.save_store({'countries': {'FR': {'values': {'2024': 1.0}}}})
+    versions.poll(force=True)
+    response = client.get('/api/gdp-analysis/gdp', headers={'If-None-Match': etag})
+    assert response.status_code == 200 and response.get_json() == {'FR': 1.0}
+
+
+def test_remote_versions_use_count_and_latest_row(tmp_path):
+    path = tmp_path / 'olympic_hosts_clean.csv'
+    write_hosts(path, ['Paris 2024'])
+    local = LocalClient(data_dir=tmp_path)
+    versions = DataVersions(lambda: RemoteClient(local), tables=('hosts',), models_dir=tmp_path)
+
+    before = versions.check()['hosts']
+    # pas de colonne updated_at : retenu pour ne plus la demander
+    assert versions._no_updated_at == {'hosts'}
+    write_hosts(path, ['Paris 2024', 'Tokyo 2020'])
+    local.refresh()
+    assert versions.check()['hosts'] != before
+
+
+def test_payload_keys_include_data_version(monkeypatch):
+    calls = []
+    payloads.register('test_versioned', lambda: calls.append(1) or {'status': 'success', 'n': len(calls)})
+    monkeypatch.setattr(data_version, 'token', lambda: 'v1')
+    assert payloads.get('test_versioned')['n'] == 1
+    assert payloads.get('test_versioned')['n'] == 1
+
+    monkeypatch.setattr(data_version, 'token', lambda: 'v2')
+    assert payloads.get('test_versioned')['n'] == 2
+    assert payloads.refresh_all() == [] and calls == [1, 1, 1]
+
+
+def test_etag_returns_not_modified_until_data_changes(monkeypatch):
+    calls = []
+    bp = Blueprint('hosts', __name__)
+
+    @bp.route('/api/hosts')
+    def hosts():
+        calls.append(1)
+        return jsonify({'status': 'success'})
+
+    app = Flask(__name__)
+    app.register_blueprint(bp)
+    data_version.init_etags(app)
+    client = app.test_client()
+    monkeypatch.setattr(data_version, 'token', lambda: 'v1')
+
+    response = client.get('/api/hosts')
+    etag = response.headers['ETag']
+    assert response.status_code == 200 and etag.startswith('W/"v1-')
+    assert response.headers['Cache-Control'] == 'no-cache'
+
+    assert client.get('/api/hosts', headers={'If-None-Match': etag}).status_code == 304
+    assert client.get('/api/hosts?limit=5', headers={'If-None-Match': etag}).status_code == 200
+    assert len(calls) == 2
+
+    monkeypatch.setattr(data_version, 'token', lambda: 'v2')
+    assert client.get('/api/hosts', headers={'If-None-Match': etag}).status_code == 200
+
+
+def test_facet_etag_follows_rebuilt_index(monkeypatch):
+    snapshots = [pd.DataFrame({'noc': ['FRA', 'USA'], 'sport': ['Swimming', 'Judo'], 'year': [2024, 2024]})]
+    token = {'value': 'v1'}
+    monkeypatch.setattr(search_service, 'load_table_snapshot', lambda table, *args: snapshots[-1])
+    monkeypatch.setattr(data_version, 'token', lambda: token['value'])
+    search_service._index_cache.clear()
+
+    app = Flask(__name__)
+    app.register_blueprint(facet_bp)
+    data_version.init_etags(app)
+    client = app.test_client()
+    url = '/api/facets?table=m_award&search=swimming'
+
+    response = client.get(url)
+    etag = response.headers['ETag']
+    assert response.get_json()['total'] == 1
+
+    # lignes Swimming supprimées : nouvelle version, index reconstruit, ancien ETag invalide
+    snapshots.append(snapshots[0][snapshots[0]['sport'] != 'Swimming'])
+    token['value'] = 'v2'
+    response = client.get(url, headers={'If-None-Match': etag})
+    assert response.status_code == 200 and response.get_json()['total'] == 0
+    assert response.headers['ETag'] != etag
+
+
+def test_model_registry_reloads_when_artifacts_change(monkeypatch):
+    sentinel = object()
+    current = {'version': 'v1'}
+    monkeypatch.setattr(PredictionService, '_models', {'country_best': sentinel})
+    monkeypatch.setattr(PredictionService, '_models_version', 'v1')
+    monkeypatch.setattr(PredictionService, '_sport_forecast', None)
+    monkeypatch.setattr(PredictionService, '_current_models_version', staticmethod(lambda: current['version']))
+
+    PredictionService._load_models()
+    assert PredictionService._models['country_best'] is sentinel
+
+    current['version'] = 'v2'
+    PredictionService._load_models()
+    assert PredictionService._models['country_best'] is not sentinel
+    assert PredictionService._models_version == 'v2'
@@ -0,0 +1,110 @@
+"""
+Tests de la simulation Monte-Carlo des Jeux
+"""
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+from flask import Flask
+
+from routes.prediction_routes import prediction_bp
+from services import prediction_service
+from utils.games_simulation import GamesSimulator, simulate
+
+
+def awards():
+    rows = []
+    for year in (2012, 2016, 2020):
+        # 100m : USA domine, JAM et CAN se partagent le reste ; judo : 2 bronzes
+        rows += [(year, 'Athletics', '100m', 'Men', 'USA', 'United States', 'GOLD', 1),
+                 (year, 'Athletics', '100m', 'Men', 'JAM', 'Jamaica', 'SILVER', 1),
+                 (year, 'Athletics', '100m', 'Men', 'CAN', 'Canada', 'BRONZE', 1),
+                 (year, 'Judo', '-60kg', 'Men', 'JPN', 'Japan', 'GOLD', 1),
+                 (year, 'Judo', '-60kg', 'Men', 'FRA', 'France', 'SILVER', 1),
+                 (year, 'Judo', '-60kg', 'Men', 'GEO', 'Georgia', 'BRONZE', 2)]
+    rows.append((2016, 'Judo', '-60kg', 'Men', 'KOR', 'Korea', 'BRONZE', 1))
+    rows.append((2018, 'Curling', 'Mixed', 'Mixed', 'CAN', 'Canada', 'GOLD', 1))
+    return pd.DataFrame(rows, columns=['year', 'sport', 'event', 'event_gender', 'noc', 'country', 'medal', 'award_count'])
+
+
+@pytest.fixture
+def simulator():
+    return GamesSimulator.from_awards(awards(), 2024)
+
+
+def test_programme_and_candidates(simulator):
+    assert simulator.programme_year == 2020
+    assert simulator.events == ['Athletics / 100m / Men', 'Judo / -60kg / Men']
+    # or, argent, bronze, bronze pour le judo ; pas de 4e place au 100m
+    assert simulator.slot_medal.tolist() == [[0, 1, 2, -1], [0, 1, 2, 2]]
+    assert simulator.max_medals == 7
+
+
+def test_every_medal_is_awarded_once(simulator):
+    histogram = simulator.run(1000, seed=3)
+    rows = {r['noc']: r for r in simulator.summarize(histogram)}
+    assert sum(r['mean']['total'] for r in rows.values()) == pytest.approx(7, abs=0.05)
+    assert sum(r['mean']['gold'] for r in rows.values()) == pytest.approx(2, abs=0.05)
+    # le favori gagne le plus souvent, sans gagner à chaque fois
+    assert rows['USA']['mean']['gold'] > rows['JAM']['mean']['gold'] > 0
+    assert rows['JAM']['prob_gold'] < rows['USA']['prob_gold'] < 1
+    usa = rows['USA']['percentiles']['total']
+    assert usa['p5'] <= usa['p25'] <= usa['p50'] <= usa['p75'] <= usa['p95'] <= 2
+
+
+def test_runs_are_reproducible_across_workers(simulator):
+    single = simulator.run(1200, workers=1, seed=11, batch_size=400)
+    parallel = simulator.run(1200, workers=2, seed=11, batch_size=400)
+    assert np.array_equal(single, parallel)
+    assert single[0, 0].sum() == 1200
+
+
+def test_season_without_history():
+    with pytest.raises(ValueError):
+        GamesSimulator.from_awards(awards(), 2027)
+
+
+def test_simulation_route_prefers_precomputed_file(tmp_path, monkeypatch):
+    csv_path = tmp_path / 'awards.csv'
+    awards().to_csv(csv_path, index=False)
+    monkeypatch.setattr(prediction_service, 'CSV_AWARDS', str(csv_path))
+    monkeypatch.setattr(prediction_service, 'SIMULATION_FILE', str(tmp_path / 'simulation_{year}.json'))
+    prediction_service._simulation_cache.clear()
+    app = Flask(__name__)
+    app.register_blueprint(prediction_bp)
+    client = app.test_client()
+
+    # pas de fichier : simulation à la demande
+    body = client.get('/api/predictions/simulation?year=2024&simulations=300&top_n=2').get_json()
+    assert body['metadata']['simulations'] == 300 and len(body['data']) == 2
+
+    result = simulate(awards(), 2024, 2000, seed=1)
+    (tmp_path / 'simulation_2024.json').write_text(json.dumps(result))
+    body = client.get('/api/predictions/simulation?year=2024&country=france').get_json()
+    assert body['metadata']['simulations'] == 2000
+    assert [r['noc'] for r in body['data']] == ['FRA']
+
+    assert client.get('/api/predictions/simulation?year=2027').status_code == 400
+
+
+def test_simulation_route_rejects_invalid_requests(tmp_path, monkeypatch):
+    csv_path = tmp_path / 'awards.csv'
+    awards().to_csv(csv_path, index=False)
+    monkeypatch.setattr(prediction_service, 'CSV_AWARDS', str(csv_path))
+    monkeypatch.setattr(prediction_service, 'SIMULATION_FILE', str(tmp_path / 'simulation_{year}.json'))
+    prediction_service._simulation_cache.clear()
+    (tmp_path / 'simulation_1996.json').write_text(json.dumps(simulate(awards(), 2024, 50, seed=1)))
+    app = Flask(__name__)
+    app.register_blueprint(prediction_bp)
+    client = app.test_client()
+
+    for simulations in (0, -5):
+        assert client.get(f'/api/predictions/simulation?year=2024&simulations={simulations}').status_code == 400
+    # hors de l'horizon des prochains Jeux : pas de simulation à la demande
+    for year in (2016, 2020, 2036, 3000):
+        assert client.get(f'/api/predictions/simulation?year={year}').status_code == 400
+    # une année précalculée reste servie depuis son fichier
+    assert client.get('/api/predictions/simulation?year=1996').status_code == 200
+    assert list(prediction_service._simulation_cache.keys()) == [
+        ('file', str(tmp_path / 'simulation_1996.json'), (tmp_path / 'simulation_1996.json').stat().st_mtime_ns)]
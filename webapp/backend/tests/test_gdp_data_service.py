@@ -0,0 +1,184 @@
+"""
+Tests du service PIB contre un faux serveur HTTP local imitant l'API de la Banque Mondiale
+"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from services.gdp_data_service import FALLBACK_GDP_DATA, GDPDataService
+
+# PIB en USD par pays et par année
+WORLD_BANK = {
+    'FR': {2020: 2.603e12, 2021: 2.957e12, 2022: 2.782e12},
+    'US': {2020: 20.953e12, 2021: 23.315e12, 2022: 25.463e12},
+    'KE': {2020: 1.007e11, 2021: None, 2022: 1.139e11},
+}
+
+
+class StubWorldBank(BaseHTTPRequestHandler):
+    per_page = None        # forcer la pagination
+    requests = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        # /v2/country/FR;US/indicator/NY.GDP.MKTP.CD
+        parts = url.path.strip('/').split('/')
+        codes = parts[2].split(';')
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        type(self).requests.append({'codes': codes, 'query': query, 'headers': dict(self.headers)})
+
+        if self.headers.get('If-None-Match') == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        start, end = (int(y) for y in query['date'].split(':'))
+        rows = [
+            {'country': {'id': code, 'value': code}, 'date': str(year), 'value': value}
+            for code in codes for year, value in sorted(WORLD_BANK.get(code, {}).items())
+            if start <= year <= end
+        ]
+        per_page = type(self).per_page or int(query['per_page'])
+        page = int(query.get('page', 1))
+        pages = max(1, -(-len(rows) // per_page))
+        body = json.dumps([
+            {'page': page, 'pages': pages, 'per_page': per_page, 'total': len(rows), 'lastupdated': '2024-07-01'},
+            rows[(page - 1) * per_page:page * per_page],
+        ]).encode()
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('ETag', '"v1"')
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def world_bank():
+    StubWorldBank.requests = []
+    StubWorldBank.per_page = None
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubWorldBank)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_port}/v2', StubWorldBank
+    server.shutdown()
+
+
+def make_service(tmp_path, base_url, **kwargs):
+    return GDPDataService(store_path=tmp_path / 'gdp.json', base_url=base_url, timeout=2, **kwargs)
+
+
+def test_bulk_fetch_writes_store(tmp_path, world_bank):
+    base_url, stub = world_bank
+    service = make_service(tmp_path, base_url)
+
+    summary = service.refresh(['FR', 'US', 'KE'], years=range(2020, 2023))
+
+    assert summary['fetched'] == 3 and not summary['errors']
+    assert len(stub.requests) == 1
+    assert stub.requests[0]['codes'] == ['FR', 'KE', 'US']
+
+    store = service.load_store()
+    assert store['countries']['FR']['values'] == {'2020': 2603.0, '2021': 2957.0, '2022': 2782.0}
+    assert '2021' not in store['countries']['KE']['values']
+    assert store['countries']['US']['source_lastupdated'] == '2024-07-01'
+
+
+def test_batches_and_pages_are_all_fetched(tmp_path, world_bank):
+    base_url, stub = world_bank
+    stub.per_page = 2
+    service = make_service(tmp_path, base_url, batch_size=1, max_workers=3)
+
+    service.refresh(['FR', 'US', 'KE'], years=range(2020, 2023))
+
+    table = service.get_gdp_table()
+    assert table['US'][2022] == pytest.approx(25463.0)
+    assert table['KE'][2022] == pytest.approx(113.9)
+    # 3 lots d'un pays, 2 pages chacun
+    assert len(stub.requests) == 6
+
+
+def test_fresh_store_is_not_refetched(tmp_path, world_bank):
+    base_url, stub = world_bank
+    service = make_service(tmp_path, base_url)
+    service.refresh(['FR', 'US'], years=range(2020, 2023))
+
+    summary = service.refresh(['FR', 'US'], years=range(2020, 2023))
+
+    assert summary['up_to_date'] == 2 and summary['fetched'] == 0
+    assert len(stub.requests) == 1
+
+
+def test_stale_store_uses_conditional_request(tmp_path, world_bank):
+    base_url, stub = world_bank
+    make_service(tmp_path, base_url).refresh(['FR'], years=range(2020, 2023))
+
+    service = make_service(tmp_path, base_url, max_age_days=0)
+    summary = service.refresh(['FR'], years=range(2020, 2023))
+
+    assert summary['not_modified'] == 1
+    assert stub.requests[-1]['headers'].get('If-None-Match') == '"v1"'
+    assert service.get_gdp('FR', 2021) == pytest.approx(2957.0)
+
+
+def test_narrow_refresh_keeps_older_years(tmp_path, world_bank):
+    base_url, stub = world_bank
+    make_service(tmp_path, base_url).refresh(['FR'], years=range(2020, 2023))
+
+    # magasin périmé rafraîchi sur une plage plus étroite (comme le notebook de corrélation)
+    service = make_service(tmp_path, base_url, max_age_days=0)
+    summary = service.refresh(['FR'], years=range(2022, 2023))
+
+    assert summary['fetched'] == 1
+    assert stub.requests[-1]['query']['date'] == '2022:2022'
+    entry = service.load_store()['countries']['FR']
+    assert entry['values'] == {'2020': 2603.0, '2021': 2957.0, '2022': 2782.0}
+    assert (entry['start_year'], entry['end_year']) == (2020, 2022)
+
+
+def test_wider_year_range_triggers_refetch(tmp_path, world_bank):
+    base_url, stub = world_bank
+    service = make_service(tmp_path, base_url)
+    service.refresh(['FR'], years=range(2021, 2023))
+
+    service.refresh(['FR'], years=range(2020, 2023))
+
+    assert len(stub.requests) == 2
+    assert service.get_gdp('FR', 2020) == pytest.approx(2603.0)
+
+
+def test_offline_reads_cached_file(tmp_path, world_bank):
+    base_url, _ = world_bank
+    make_service(tmp_path, base_url).refresh(['FR'], years=range(2020, 2023))
+
+    offline = make_service(tmp_path, 'http://127.0.0.1:9/v2', max_age_days=0)
+    summary = offline.refresh(['FR'], years=range(2020, 2023))
+
+    assert summary['errors']
+    assert offline.get_gdp('FR', 2022) == pytest.approx(2782.0)
+
+
+def test_fallback_without_store(tmp_path):
+    service = make_service(tmp_path, 'http://127.0.0.1:9/v2')
+
+    table = service.get_gdp_table()
+
+    assert table['FR'][1924] == FALLBACK_GDP_DATA['FR'][1924]
+    assert service.latest_gdp('US') == (2022, FALLBACK_GDP_DATA['US'][2022])
+
+
+def test_store_overrides_fallback_years(tmp_path, world_bank):
+    base_url, _ = world_bank
+    service = make_service(tmp_path, base_url)
+    service.refresh(['FR'], years=range(2020, 2023))
+
+    table = service.get_gdp_table()
+
+    assert table['FR'][2021] == pytest.approx(2957.0)      # absent des données de secours
+    assert table['FR'][1924] == FALLBACK_GDP_DATA['FR'][1924]
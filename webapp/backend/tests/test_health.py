@@ -0,0 +1,46 @@
+"""
+Tests des sondes live / ready alimentées par la surveillance de connectivité (utils/health.py)
+"""
+from flask import Flask
+
+from routes import health_routes
+from utils.health import ConnectivityMonitor
+from utils.warmup import Warmup
+
+
+def test_readiness_follows_connectivity_monitor(monkeypatch):
+    state = {'connected': False}
+
+    def check():
+        if state['connected'] is None:
+            raise ConnectionError('timeout')
+        return state['connected']
+
+    monitor = ConnectivityMonitor(interval=3600, check=check)
+    warmup = Warmup([])
+    warmup.run()
+    monkeypatch.setattr(health_routes, 'get_monitor', lambda: monitor)
+    monkeypatch.setattr(health_routes, 'get_warmup', lambda: warmup)
+    app = Flask(__name__)
+    app.register_blueprint(health_routes.health_bp)
+    client = app.test_client()
+
+    # aucune vérification encore faite : pas prêt, mais vivant
+    response = client.get('/api/health/ready')
+    assert response.status_code == 503 and response.get_json()['database']['checked'] is False
+    assert client.get('/api/health/live').status_code == 200
+
+    monitor.check_now()
+    assert client.get('/api/health/ready').status_code == 503
+
+    state['connected'] = True
+    monitor.check_now()
+    response = client.get('/api/health/ready')
+    assert response.status_code == 200 and response.get_json()['status'] == 'OK'
+    assert response.get_json()['database']['checks'] == 2
+
+    # erreur de connexion : de nouveau indisponible, erreur exposée
+    state['connected'] = None
+    monitor.check_now()
+    response = client.get('/api/health/ready')
+    assert response.status_code == 503 and response.get_json()['database']['error'] == 'timeout'
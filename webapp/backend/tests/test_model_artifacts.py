@@ -0,0 +1,67 @@
+"""
+Tests du format compact des modèles : mêmes prédictions que scikit-learn, chargement mmap
+"""
+import numpy as np
+import pytest
+
+pytest.importorskip('sklearn')
+from sklearn.ensemble import GradientBoostingRegressor, RandomForestRegressor
+from sklearn.linear_model import Ridge
+from sklearn.preprocessing import StandardScaler
+from sklearn.tree import DecisionTreeRegressor
+
+from utils.model_artifacts import CompiledForest, export_compiled, load_compiled
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(7)
+    X = np.column_stack([
+        rng.integers(0, 5, 300),                  # peu de valeurs distinctes (seuils serrés)
+        rng.normal(1e6, 3e5, 300),                # grande échelle
+        rng.uniform(-1, 1, 300).round(2),
+    ]).astype(float)
+    y = 3 * X[:, 0] + X[:, 1] / 1e5 + np.sin(5 * X[:, 2]) + rng.normal(0, 0.1, 300)
+    return X, y
+
+
+@pytest.mark.parametrize('estimator', [
+    RandomForestRegressor(n_estimators=20, max_depth=8, random_state=0),
+    DecisionTreeRegressor(random_state=0),
+    Ridge(alpha=1.0),
+])
+def test_compiled_model_matches_sklearn(tmp_path, data, estimator):
+    X, y = data
+    scaler = StandardScaler().fit(X)
+    estimator.fit(scaler.transform(X), y)
+    prefix = str(tmp_path / 'model.joblib')
+    assert export_compiled({'model': estimator, 'scaler': scaler, 'feature_columns': ['a', 'b', 'c']}, prefix)
+
+    loaded = load_compiled(prefix)
+    assert loaded['scaler'] is None and loaded['feature_columns'] == ['a', 'b', 'c']
+    # valeurs d'entraînement (sur les seuils) et nouvelles valeurs
+    X_new = np.vstack([X, X * 1.01, X[:5] + 0.5])
+    expected = estimator.predict(scaler.transform(X_new))
+    assert np.allclose(loaded['model'].predict(X_new), expected, rtol=0, atol=1e-9)
+    assert loaded['model'].predict(X_new[0]).shape == (1,)
+
+
+def test_forest_arrays_are_memory_mapped(tmp_path, data):
+    X, y = data
+    forest = RandomForestRegressor(n_estimators=3, random_state=0).fit(X, y)
+    export_compiled({'model': forest, 'scaler': None, 'feature_columns': []}, str(tmp_path / 'forest'))
+    loaded = load_compiled(str(tmp_path / 'forest'))
+    assert isinstance(loaded['model'], CompiledForest)
+    model = loaded['model']
+    assert isinstance(model.nodes, np.memmap)
+    # colonnes lues dans la projection mémoire, sans copie privée par worker
+    for column in (model.feature, model.threshold, model.left, model.right, model.value):
+        assert np.shares_memory(column, model.nodes) and column.flags['C_CONTIGUOUS']
+    assert np.allclose(loaded['model'].predict(X), forest.predict(X))
+
+
+def test_unsupported_model_is_not_exported(tmp_path, data):
+    X, y = data
+    boosting = GradientBoostingRegressor(n_estimators=5).fit(X, y)
+    assert export_compiled({'model': boosting, 'scaler': None}, str(tmp_path / 'gb')) is False
+    assert load_compiled(str(tmp_path / 'gb')) is None
@@ -0,0 +1,211 @@
+"""
+Tests des prédictions par lot : un seul appel au modèle, mêmes résultats qu'une requête par pays
+"""
+import numpy as np
+import pytest
+from flask import Flask
+
+from routes.prediction_routes import prediction_bp
+from services import prediction_service
+from services.prediction_service import PredictionService
+
+CSV = """year,country,noc,country_code,gold,silver,bronze
+2012,France,FRA,FR,1,0,0
+2012,France,FRA,FR,0,1,0
+2016,France,FRA,FR,2,0,1
+2016,Kenya,KEN,KE,1,1,0
+2020,Kenya,KEN,KE,0,0,1
+2020,United States of America,USA,US,3,2,2
+"""
+
+
+class CountingModel:
+    """Modèle factice : total = somme des colonnes, compte les appels"""
+
+    def __init__(self):
+        self.calls = []
+
+    def transform(self, X):
+        return X
+
+    def predict(self, X):
+        self.calls.append(np.asarray(X).shape)
+        return np.asarray(X).sum(axis=1)
+
+
+@pytest.fixture
+def medals_csv(tmp_path, monkeypatch):
+    path = tmp_path / 'medals.csv'
+    path.write_text(CSV)
+    monkeypatch.setattr(prediction_service, 'CSV_MEDALS', str(path))
+    monkeypatch.setattr(PredictionService, '_models', {'country_best': None})
+    return path
+
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+    app.register_blueprint(prediction_bp)
+    return app.test_client()
+
+
+@pytest.mark.parametrize('model', ['ma', 'es'])
+def test_batch_matches_single_country_history(medals_csv, model):
+    countries = ['France', 'kenya', 'United States', 'Atlantis']
+    batch = PredictionService.predict_countries(countries, [2024, 2028], model)
+    single = [PredictionService.predict_country_medals(c, y, model) for c in countries for y in (2024, 2028)]
+    assert batch == single
+    # 'United States' n'est pas un nom du CSV : retrouvé par son NOC
+    assert batch[4] == {'country': 'United States', 'year': 2024, 'gold': 3, 'silver': 2, 'bronze': 2, 'total': 7}
+    assert batch[6]['total'] == 0
+
+
+def test_history_moving_average_and_smoothing(medals_csv):
+    # France : 2012 (1/1/0) puis 2016 (2/0/1)
+    ma = PredictionService.predict_countries(['France'], [2024], 'ma')[0]
+    es = PredictionService.predict_countries(['France'], [2024], 'es')[0]
+    assert (ma['gold'], ma['silver'], ma['bronze']) == (2, 0, 0)      # 1.5 / 0.5 / 0.5
+    assert (es['gold'], es['silver'], es['bronze']) == (2, 0, 1)      # 5/3 / 1/3 / 2/3
+
+
+def test_batch_uses_one_model_call(medals_csv, monkeypatch):
+    model = CountingModel()
+    monkeypatch.setattr(PredictionService, '_models', {'country_best': {
+        'model': model, 'scaler': model, 'feature_columns': ['is_host', 'year_normalized']
+    }})
+    results = PredictionService.predict_countries(['France', 'Kenya', 'USA'], [2020, 2050], 'best')
+    assert model.calls == [(6, 2)]
+    # France (pays hôte) en 2050 : 1 + 2 = 3 médailles
+    assert [r['total'] for r in results] == [2, 3, 1, 2, 1, 2]
+    assert results == [PredictionService.predict_country_medals(c, y, 'best')
+                       for c in ('France', 'Kenya', 'USA') for y in (2020, 2050)]
+
+
+def test_countries_route(medals_csv, client):
+    response = client.post('/api/predictions/countries', json={'countries': ['France', 'Kenya'], 'year': 2024})
+    body = response.get_json()
+    assert response.status_code == 200
+    assert body['metadata'] == {'countries': ['France', 'Kenya'], 'years': [2024], 'model': 'ma', 'count': 2}
+    assert [r['country'] for r in body['data']] == ['France', 'Kenya']
+
+
+@pytest.mark.parametrize('payload', [
+    {},
+    {'countries': []},
+    {'countries': 'France'},
+    {'countries': ['France'], 'years': ['soon']},
+    {'countries': ['France'], 'years': []},
+    {'countries': ['France'] * 300, 'years': [2024, 2028]},
+])
+def test_countries_route_rejects_invalid_payload(client, payload):
+    response = client.post('/api/predictions/countries', json=payload)
+    assert response.status_code == 400
+    assert response.get_json()['success'] is False
+
+
+ATHLETES_CSV = """year,country,sport,athlete,participant_type,gold,silver,bronze
+2016,Kenya,Athletics,Ann,Athlete,1,0,0
+2020,Kenya,Athletics,Ann,Athlete,1,0,0
+2016,Soviet Union,Gymnastics,Bob,Athlete,0,1,0
+2020,France,Judo,Cleo,Athlete,0,0,1
+2020,France,Judo,Cleo,Athlete,0,0,1
+2020,France,Judo,Cleo,Athlete,1,0,0
+2020,France,Rugby,France,GameTeam,1,0,0
+"""
+
+
+@pytest.mark.parametrize('k', [0, 1, 5, 37, 200, 500])
+def test_top_k_indices_matches_stable_sort(k):
+    scores = np.random.default_rng(k).integers(0, 20, size=200).astype(float)
+    expected = np.argsort(-scores, kind='stable')[:k]
+    assert prediction_service._top_k_indices(scores, k).tolist() == expected.tolist()
+
+
+def test_athlete_predictions_from_precomputed_table(tmp_path, monkeypatch):
+    path = tmp_path / 'medals.csv'
+    path.write_text(ATHLETES_CSV)
+    monkeypatch.setattr(prediction_service, 'CSV_MEDALS', str(path))
+    monkeypatch.setattr(PredictionService, '_models', {'athletes_best': None})
+    monkeypatch.setattr(PredictionService, '_athletes', None)
+
+    top = PredictionService.predict_athlete_medals(limit=2)
+    assert top == [
+        {'athlete': 'Cleo', 'country': 'France', 'sport': 'Judo', 'score': 1.0, 'total': 3},
+        {'athlete': 'Ann', 'country': 'Kenya', 'sport': 'Athletics', 'score': 2 / 3, 'total': 2},
+    ]
+    assert PredictionService.predict_athlete_medals(limit=10)[-1]['country'] == 'Russia'
+
+    # nouvelle version des données : table reconstruite
+    path.write_text(ATHLETES_CSV + "2024,Kenya,Athletics,Dan,Athlete,4,0,0\n")
+    assert PredictionService.predict_athlete_medals(limit=1)[0]['athlete'] == 'Dan'
+
+
+class ConstantModel:
+    def predict(self, X):
+        return np.full(len(X), 0.123)
+
+
+def test_athlete_scores_follow_models_version(tmp_path, monkeypatch):
+    path = tmp_path / 'medals.csv'
+    path.write_text(ATHLETES_CSV)
+    monkeypatch.setattr(prediction_service, 'CSV_MEDALS', str(path))
+    monkeypatch.setattr(prediction_service, 'ATHLETES_BEST', str(tmp_path / 'athletes_best.joblib'))
+    monkeypatch.setattr(PredictionService, '_athletes', None)
+    monkeypatch.setattr(PredictionService, '_sport_forecast', None)
+    current = {'version': 'v1'}
+    monkeypatch.setattr(PredictionService, '_current_models_version', staticmethod(lambda: current['version']))
+    monkeypatch.setattr(PredictionService, '_models', {})
+    monkeypatch.setattr(PredictionService, '_models_version', None)
+
+    # pas de modèle d'athlètes : score heuristique
+    assert PredictionService.predict_athlete_medals(limit=1)[0]['score'] == 1.0
+
+    joblib = pytest.importorskip('joblib')
+    joblib.dump({'model': ConstantModel()}, tmp_path / 'athletes_best.joblib')
+    current['version'] = 'v2'
+    assert PredictionService.predict_athlete_medals(limit=1)[0]['score'] == pytest.approx(0.123)
+
+
+def sport_awards():
+    import pandas as pd
+    rows = []
+    for i, year in enumerate((2008, 2012, 2016, 2020)):
+        rows += [(year, 'Judo', 'JPN', 'Japan', 'GOLD', 1 + i), (year, 'Judo', 'FRA', 'France', 'BRONZE', 2)]
+    rows += [(2018, 'Curling', 'SWE', 'Sweden', 'GOLD', 1), (2022, 'Curling', 'SWE', 'Sweden', 'GOLD', 1),
+             (1908, 'Jeu de paume', 'USA', 'United States', 'GOLD', 1)]
+    return pd.DataFrame(rows, columns=['year', 'sport', 'noc', 'country', 'medal', 'award_count'])
+
+
+def test_sport_forecast_trend_and_seasons(tmp_path):
+    from utils.sport_forecast import SportForecastModel
+
+    model = SportForecastModel.fit(sport_awards())
+    judo_gold = lambda m: m.sport_totals(2024)[m.sports.index('Judo')][0]
+    # Japon en hausse (1, 2, 3, 4 titres) : la pente pénalisée place 2024 entre la moyenne
+    # pondérée (pente nulle) et la droite des moindres carrés (5)
+    flat = SportForecastModel.fit(sport_awards(), shrinkage=1e12)
+    assert judo_gold(flat) < judo_gold(model) < 5
+    assert judo_gold(SportForecastModel.fit(sport_awards(), shrinkage=0)) == pytest.approx(5)
+    assert model.sport_totals(2024)[model.sports.index('Judo')][2] == pytest.approx(2)
+
+    contested = lambda year: [s for s, keep in zip(model.sports, model.contested(year)) if keep]
+    assert contested(2028) == ['Judo']
+    assert contested(2026) == ['Curling']
+
+    path = tmp_path / 'sport_forecast.npz'
+    model.save(path)
+    loaded = SportForecastModel.load(path)
+    assert loaded.sports == model.sports and loaded.params == model.params
+    assert np.allclose(loaded.forecast(2032), model.forecast(2032))
+
+
+def test_predict_sport_performance_honors_year(monkeypatch):
+    from utils.sport_forecast import SportForecastModel
+
+    monkeypatch.setattr(PredictionService, '_sport_forecast', SportForecastModel.fit(sport_awards()))
+    judo_2024, = PredictionService.predict_sport_performance('ju', 2024)
+    judo_2032, = PredictionService.predict_sport_performance('JUDO', 2032)
+    assert judo_2032['gold'] > judo_2024['gold']
+    assert [c['noc'] for c in judo_2024['top_countries']] == ['JPN', 'FRA']
+    assert [r['sport'] for r in PredictionService.predict_sport_performance('', 2026)] == ['Curling']
+    assert PredictionService.predict_sport_performance('', 2024, limit=0) == []
@@ -0,0 +1,63 @@
+"""
+Tests du profilage à la demande des requêtes (utils/profiler.py)
+"""
+from flask import Flask, jsonify
+
+from utils.profiler import RequestProfiler, init_profiler
+
+
+def make_app():
+    app = Flask(__name__)
+
+    @app.route('/api/medals/top')
+    def top():
+        return jsonify({'status': 'success', 'data': sorted(range(1000), reverse=True)[:3]})
+
+    @app.route('/api/hosts')
+    def hosts():
+        return jsonify({'status': 'success'})
+
+    return app
+
+
+def test_profiling_is_off_by_default(monkeypatch):
+    monkeypatch.delenv('PROFILING_ENABLED', raising=False)
+    app = make_app()
+    assert init_profiler(app) is None
+
+    response = app.test_client().get('/api/medals/top?profile=1', headers={'X-Profile': '1'})
+    assert 'profile' not in response.get_json() and 'X-Profile-Duration-Ms' not in response.headers
+    assert app.test_client().get('/api/profiling/recent').status_code == 404
+
+
+def test_profile_is_injected_when_enabled(monkeypatch):
+    monkeypatch.setenv('PROFILING_ENABLED', 'true')
+    monkeypatch.setenv('PROFILING_ALLOWLIST', '/api/medals')
+    monkeypatch.setenv('PROFILING_TOKEN', 'secret')
+    app = make_app()
+    profiler = init_profiler(app)
+    client = app.test_client()
+
+    # sans flag, avec un mauvais jeton ou hors allowlist : réponse inchangée
+    assert 'profile' not in client.get('/api/medals/top').get_json()
+    assert 'profile' not in client.get('/api/medals/top', headers={'X-Profile': '1'}).get_json()
+    assert 'profile' not in client.get('/api/hosts', headers={'X-Profile': 'secret'}).get_json()
+
+    response = client.get('/api/medals/top', headers={'X-Profile': 'secret'})
+    body = response.get_json()
+    assert body['data'] == [999, 998, 997]
+    assert body['profile']['path'] == '/api/medals/top' and body['profile']['top_functions']
+    assert float(response.headers['X-Profile-Duration-Ms']) == body['profile']['duration_ms']
+
+    recent = client.get('/api/profiling/recent').get_json()
+    assert len(recent['data']) == len(profiler.recent) == 1
+
+
+def test_slowest_profiles_are_kept_on_disk(tmp_path):
+    app = make_app()
+    init_profiler(app, RequestProfiler(allowlist=['/api/medals'], keep_slowest=1, output_dir=str(tmp_path)))
+    client = app.test_client()
+
+    for _ in range(3):
+        client.get('/api/medals/top?profile=1')
+    assert len(list(tmp_path.glob('*.pstats'))) == 1
@@ -0,0 +1,123 @@
+"""
+Tests du rafraîchissement en arrière-plan des analyses en cache
+"""
+import time
+
+import numpy as np
+import pandas as pd
+
+from database.local_client import LocalClient
+from services import search_service
+from services.search_service import SearchService
+from utils import data_version, payloads
+from utils.cache import get_cache
+from utils.scheduler import RefreshScheduler
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_stale_payload_is_served_while_revalidating(monkeypatch):
+    calls = []
+
+    def build():
+        calls.append(len(calls))
+        return {'status': 'success', 'data': len(calls)}
+
+    payloads.register('test_stale', build)
+    assert payloads.get('test_stale')['data'] == 1
+
+    # entrée périmée : la valeur actuelle est renvoyée sans attendre, le recalcul part en arrière-plan
+    monkeypatch.setattr(payloads._cache, 'ttl', 0)
+    assert payloads.get('test_stale')['data'] == 1
+    assert wait_for(lambda: len(calls) == 2)
+    assert wait_for(lambda: payloads._cache.peek(('test_stale', (), data_version.token()))[0]['data'] == 2)
+
+    # recalcul en échec : la dernière valeur valide reste en cache
+    payloads.register('test_stale', lambda: calls.append(len(calls)) or {'status': 'error'})
+    assert payloads.get('test_stale')['data'] == 2
+    assert wait_for(lambda: len(calls) == 3)
+    assert wait_for(lambda: not payloads._cache._revalidating)
+    assert payloads._cache.peek(('test_stale', (), data_version.token()))[0]['data'] == 2
+
+
+def test_published_payloads_are_loaded_by_other_workers(tmp_path):
+    payloads.register('test_shared', lambda year: {'status': 'success', 'year': year, 'score': np.float64(0.5)})
+    payloads.compute('test_shared', 2024)
+    assert payloads.publish(str(tmp_path)) >= 1
+
+    payloads._cache.set(('test_shared', (2024,), data_version.token()), {'status': 'success', 'year': 0})
+    assert payloads.load_published(str(tmp_path), since=time.time() + 60) == 0
+    assert payloads.load_published(str(tmp_path)) >= 1
+    assert payloads.get('test_shared', 2024) == {'status': 'success', 'year': 2024, 'score': 0.5}
+
+
+def test_single_leader_refreshes_on_schedule_and_version_change(tmp_path):
+    runs, follower_runs = [], []
+    version = {'value': 1}
+
+    def make():
+        return RefreshScheduler(refresh=lambda: runs.append(1), interval=3600, jitter=0.1, poll=60,
+                                directory=str(tmp_path), version=lambda: version['value'],
+                                follower_refresh=lambda: follower_runs.append(1))
+
+    leader, follower = make(), make()
+    for scheduler in (leader, follower):
+        scheduler.last_version = 1
+        scheduler.tick()
+    assert leader.leader and not follower.leader
+    assert runs == []
+    assert 3600 * 0.9 <= leader.next_run - time.time() <= 3600 * 1.1
+
+    # nouvelle version des données : le leader recalcule et publie, l'autre worker relit ses snapshots
+    version['value'] = 2
+    leader.tick()
+    follower.tick()
+    assert runs == [1] and follower_runs == [1]
+    assert leader.status()['runs'] == 1 and leader.status()['error'] is None
+
+    # échéance atteinte
+    leader.next_run = time.time() - 1
+    leader.tick()
+    assert runs == [1, 1]
+
+
+def test_local_client_refresh(tmp_path):
+    path = tmp_path / 'olympic_hosts_clean.csv'
+    pd.DataFrame({'game_name': ['Paris 2024']}).to_csv(path, index=False)
+    client = LocalClient(data_dir=tmp_path)
+    assert len(client.load_table('hosts')) == 1
+
+    pd.DataFrame({'game_name': ['Paris 2024', 'Tokyo 2020']}).to_csv(path, index=False)
+    assert client.refresh() == ['hosts']
+    assert len(client.load_table('hosts')) == 2
+
+
+def test_expired_entry_is_served_while_rebuilt(monkeypatch):
+    cache = get_cache('test_fetch', ttl=600)
+    builds = []
+
+    def build():
+        builds.append(1)
+        return len(builds)
+
+    assert cache.fetch('index', build) == 1
+    monkeypatch.setattr(cache, 'ttl', 0)
+    assert cache.fetch('index', build) == 1
+    assert wait_for(lambda: cache.peek('index')[0] == 2)
+
+
+def test_refresh_rebuilds_search_indexes(monkeypatch):
+    snapshots = [pd.DataFrame({'noc': ['FRA'], 'sport': ['Swimming'], 'year': [2024]})]
+    monkeypatch.setattr(search_service, 'load_table_snapshot', lambda table, *args: snapshots[-1])
+    search_service._index_cache.clear()
+    assert SearchService.get_index('m_award').size == 1
+
+    snapshots.append(pd.DataFrame({'noc': ['FRA', 'USA'], 'sport': ['Judo', 'Rowing'], 'year': [2024, 2024]}))
+    assert SearchService.refresh_indexes() == ['m_award']
+    index = SearchService.get_index('m_award')
+    assert index.size == 2 and index.text.search('swimming') in (None, 0)
@@ -0,0 +1,189 @@
+"""
+Tests des index en mémoire : noms d'athlètes, index inversé et facettes des médailles
+"""
+import pandas as pd
+import pytest
+
+import database.snapshot as snapshot
+import services.athlete_service as athlete_service
+from database.local_client import LocalClient
+from services.athlete_service import AthleteService
+from services.facet_service import FacetService
+from services.medal_service import MedalService
+from services.search_service import SearchService, _index_cache as table_index_cache
+from utils.search_index import (InvertedIndex, NameIndex, ValueIndex, bitmap_to_rows, fold_text,
+                                rows_to_bitmap)
+
+ATHLETES = [
+    (1, 'Michael PHELPS', 2000),
+    (2, 'Brian Eric PHELPS', 1984),
+    (3, 'Usain BOLT', 2004),
+    (4, 'Emil ZÁTOPEK', 1948),
+    (5, 'Alessia FILIPPI', 2008),
+    (6, "Dan O'BRIEN", 1992),
+    (7, 'Phelps', 1950),
+]
+
+
+@pytest.fixture
+def index():
+    return NameIndex([name for _, name, _ in ATHLETES])
+
+
+def names(index, query):
+    return [ATHLETES[row][1] for row in index.search(query)]
+
+
+def test_fold_text_removes_accents_case_and_punctuation():
+    assert fold_text("  Émil  ZÁTOPEK ") == 'emil zatopek'
+    assert fold_text("Dan O'BRIEN") == 'dan o brien'
+    assert fold_text(None) == ''
+
+
+def test_exact_match_ranks_before_word_prefix(index):
+    assert names(index, 'phelps') == ['Phelps', 'Brian Eric PHELPS', 'Michael PHELPS']
+
+
+def test_every_query_word_must_prefix_a_name_word(index):
+    assert names(index, 'mich phel') == ['Michael PHELPS']
+
+
+def test_substring_and_accent_folding(index):
+    assert names(index, 'ssi') == ['Alessia FILIPPI']
+    assert names(index, 'zatopek') == names(index, 'Zátopek') == ['Emil ZÁTOPEK']
+
+
+def test_fuzzy_match_only_without_exact_results(index):
+    assert names(index, 'boltt') == ['Usain BOLT']
+    assert names(index, 'xyzq') == []
+
+
+def test_empty_query(index):
+    assert len(index.search('')) == 0
+    assert len(NameIndex([]).search('bolt')) == 0
+
+
+@pytest.fixture
+def local_athletes(tmp_path, monkeypatch):
+    pd.DataFrame(ATHLETES, columns=['id', 'athlete_full_name', 'first_year']) \
+        .assign(games_participations=1) \
+        .to_csv(tmp_path / 'olympic_athletes_clean.csv', index=False)
+    client = LocalClient(tmp_path)
+    monkeypatch.setattr(snapshot, 'get_supabase_client', lambda: client)
+    monkeypatch.setattr(athlete_service, 'get_supabase_client', lambda: client)
+    athlete_service._index_cache.clear()
+    yield client
+    athlete_service._index_cache.clear()
+
+
+def test_get_athletes_search_uses_index_and_hydrates_page(local_athletes):
+    result = AthleteService.get_athletes(page=1, limit=2, search='phelps')
+
+    assert result['status'] == 'success'
+    assert result['total'] == 3
+    assert result['total_pages'] == 2
+    assert [r['athlete_full_name'] for r in result['data']] == ['Phelps', 'Brian Eric PHELPS']
+    assert result['data'][0]['games_participations'] == 1
+
+    page2 = AthleteService.get_athletes(page=2, limit=2, search='phelps')
+    assert [r['athlete_full_name'] for r in page2['data']] == ['Michael PHELPS']
+
+
+def test_get_athletes_search_with_filters_and_sort(local_athletes):
+    result = AthleteService.get_athletes(search='phelps', sort_by='first_year', sort_order='desc',
+                                         filters={'year_min': '1960'})
+
+    assert [(r['athlete_full_name'], r['first_year']) for r in result['data']] == [
+        ('Michael PHELPS', 2000), ('Brian Eric PHELPS', 1984)]
+
+
+# ---------- index inversé et bitmaps (m_award / medals) ----------
+
+AWARDS = pd.DataFrame([
+    (2016, 'Swimming', 'USA', 'GOLD'),
+    (2016, 'Athletics', 'JAM', 'GOLD'),
+    (2020, 'Artistic Swimming', 'ROC', 'SILVER'),
+    (2020, 'Swimming', 'FRA', 'BRONZE'),
+    (2024, 'Athletics', 'FRA', 'GOLD'),
+    (2024, 'Trampoline Gymnastics', 'USA', 'SILVER'),
+], columns=['year', 'sport', 'noc', 'medal'])
+
+
+def test_bitmap_round_trip():
+    assert bitmap_to_rows(rows_to_bitmap([0, 3, 9], 10), 10).tolist() == [0, 3, 9]
+    assert bitmap_to_rows(0, 5).tolist() == []
+
+
+def test_value_index_eq_and_ranges():
+    years = ValueIndex(AWARDS['year'].tolist())
+    assert bitmap_to_rows(years.eq('2020'), 6).tolist() == [2, 3]
+    assert bitmap_to_rows(years.between(2018, None), 6).tolist() == [2, 3, 4, 5]
+    assert bitmap_to_rows(years.between(None, 2016), 6).tolist() == [0, 1]
+    assert years.eq('unknown') == 0
+
+
+def test_inverted_index_prefix_across_columns():
+    index = InvertedIndex([AWARDS['noc'].tolist(), AWARDS['sport'].tolist()])
+    assert bitmap_to_rows(index.search('swim'), 6).tolist() == [0, 2, 3]
+    assert bitmap_to_rows(index.search('fra swim'), 6).tolist() == [3]
+    assert bitmap_to_rows(index.search('GYMNAST'), 6).tolist() == [5]
+    assert index.search('') is None
+
+
+@pytest.fixture
+def local_awards(tmp_path, monkeypatch):
+    AWARDS.assign(award_count=1).to_csv(tmp_path / 'olympic_medal_awards_v2.csv', index=False)
+    client = LocalClient(tmp_path)
+    monkeypatch.setattr(snapshot, 'get_supabase_client', lambda: client)
+    table_index_cache.clear()
+    yield client
+    table_index_cache.clear()
+
+
+def test_medal_search_combines_index_and_filters(local_awards):
+    result = MedalService.get_medals(search='swim', filters={'year_min': 2018})
+    assert [(r['year'], r['noc']) for r in result['data']] == [(2020, 'ROC'), (2020, 'FRA')]
+    assert result['total'] == 2
+
+    result = MedalService.get_medals(search='fra', limit=1, page=2, sort_by='year', sort_order='asc',
+                                     filters={'medal_type': 'GOLD'})
+    assert result['total'] == 1 and result['data'] == []
+
+
+def test_index_search_matches_database_query_for_whole_words(local_awards):
+    indexed = SearchService.search_table('m_award', search='athletics', sort_by='id')
+    query = local_awards.table('m_award').select('*').or_('noc.ilike.%athletics%,sport.ilike.%athletics%') \
+        .order('id.asc').execute()
+    assert indexed['data'] == query.data
+
+
+# ---------- facettes ----------
+
+def test_value_index_counts():
+    sports = ValueIndex(AWARDS['sport'].tolist())
+    assert dict(sports.counts(rows_to_bitmap([0, 3, 4], 6))) == {'Swimming': 2, 'Athletics': 1}
+
+
+def test_facets_exclude_own_selection(local_awards):
+    result = FacetService.get_facets('m_award', selections={'noc': ['FRA', 'USA'], 'medal': ['GOLD']})
+
+    assert result['status'] == 'success'
+    assert result['total'] == 2
+    facets = {column: {f['value']: f['count'] for f in values} for column, values in result['facets'].items()}
+    # noc : comptes parmi les médailles d'or (la sélection noc elle-même est ignorée)
+    assert facets['noc'] == {'USA': 1, 'JAM': 1, 'FRA': 1}
+    # medal : comptes parmi FRA et USA
+    assert facets['medal'] == {'GOLD': 2, 'SILVER': 1, 'BRONZE': 1}
+    assert facets['year'] == {2016: 1, 2024: 1}
+    assert [f['value'] for f in result['facets']['year']] == [2016, 2024]
+
+
+def test_facets_with_year_range_and_search(local_awards):
+    result = FacetService.get_facets('m_award', year_min=2018, search='swim')
+
+    assert result['total'] == 2
+    assert {f['value'] for f in result['facets']['noc']} == {'ROC', 'FRA'}
+
+
+def test_facets_unknown_table(local_awards):
+    assert FacetService.get_facets('nope')['status'] == 'error'
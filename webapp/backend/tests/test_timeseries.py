@@ -0,0 +1,71 @@
+"""
+Tests du moteur de séries temporelles contre les calculs pandas/NumPy ligne par ligne
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.timeseries import TimeSeriesEngine
+
+ROWS = pd.DataFrame([
+    # (noc, year, medal, award_count)
+    ('FRA', 2008, 'GOLD', 1), ('FRA', 2008, 'BRONZE', 2),
+    ('FRA', 2012, 'GOLD', 3),
+    ('FRA', 2020, 'SILVER', 1), ('FRA', 2020, 'GOLD', 4),
+    ('USA', 2008, 'GOLD', 5), ('USA', 2012, 'SILVER', 4),
+    ('USA', 2016, 'GOLD', 6), ('USA', 2020, 'BRONZE', 5),
+    ('KEN', 2016, 'GOLD', 6),
+], columns=['noc', 'year', 'medal', 'award_count'])
+
+
+@pytest.fixture
+def engine():
+    return TimeSeriesEngine.from_records(ROWS, 'noc', 'year', medal_column='medal', weight='award_count')
+
+
+def row(engine, noc, matrix):
+    return matrix[engine.position(noc)].tolist()
+
+
+def test_dense_matrices(engine):
+    assert engine.entities == ['FRA', 'KEN', 'USA']
+    assert engine.editions.tolist() == [2008, 2012, 2016, 2020]
+    assert row(engine, 'FRA', engine.series('total')) == [3, 3, 0, 5]
+    assert row(engine, 'FRA', engine.series('gold')) == [1, 3, 0, 4]
+    assert row(engine, 'FRA', engine.present) == [True, True, False, True]
+
+
+def test_moving_average_and_growth(engine):
+    assert row(engine, 'USA', engine.moving_average(2)) == [5, 4.5, 5, 5.5]
+    growth = row(engine, 'FRA', engine.growth_rate())
+    assert growth[1] == 0 and np.isnan(growth[3])
+
+
+def test_ranks_and_rank_change(engine):
+    ranks = engine.ranks()
+    # 2016 : USA et KEN ex æquo, FRA absente
+    assert row(engine, 'USA', ranks)[2] == row(engine, 'KEN', ranks)[2] == 1
+    assert np.isnan(row(engine, 'FRA', ranks)[2])
+    # FRA : 2e en 2008, 2e en 2012, 1re en 2020 (gagne une place sur sa dernière présence)
+    assert row(engine, 'FRA', engine.rank_change())[1:] == [0, pytest.approx(np.nan, nan_ok=True), 1]
+
+
+def test_observed_metrics_match_pandas(engine):
+    grouped = ROWS.assign(total=ROWS['award_count']).groupby(['noc', 'year'])['total'].sum()
+    for noc, series in grouped.groupby(level=0):
+        i = engine.position(noc)
+        assert engine.recent_mean(2)[i] == pytest.approx(series.tail(2).mean())
+        assert engine.ewm(0.5)[i] == pytest.approx(series.ewm(alpha=0.5).mean().iloc[-1])
+
+
+def test_history_features_use_only_earlier_editions(engine):
+    features = engine.history_features()
+    i = engine.position('USA')
+    # USA 2020 : historique 2008 (5), 2012 (4), 2016 (6)
+    assert features['avg_recent_3'][i, 3] == pytest.approx(5)
+    assert features['trend'][i, 3] == pytest.approx(np.polyfit([2008, 2012, 2016], [5, 4, 6], 1)[0])
+    assert features['consistency'][i, 3] == pytest.approx(np.std([5, 4, 6], ddof=1))
+    assert features['peak_performance'][i, 3] == 6
+    assert features['years_since_last'][i, 3] == 4
+    # première participation : valeurs par défaut
+    assert [features[name][i, 0] for name in ('avg_recent_3', 'trend', 'years_since_last')] == [0, 0, 4]
@@ -0,0 +1,89 @@
+"""
+Tests du préchauffage au démarrage et des payloads précalculés
+"""
+import threading
+
+from flask import Flask
+
+from routes import health_routes
+from routes.prediction_routes import prediction_bp
+from utils import payloads, warmup as warmup_module
+from utils.warmup import Warmup
+
+
+def test_payloads_are_cached_unless_failed():
+    calls = []
+
+    def build(n):
+        calls.append(n)
+        return {'status': 'error'} if n < 0 else {'status': 'success', 'data': n}
+
+    payloads.register('test_square', build)
+    assert payloads.get('test_square', 3) == {'status': 'success', 'data': 3}
+    assert payloads.get('test_square', 3)['data'] == 3
+    assert calls == [3]
+
+    payloads.get('test_square', -1)
+    payloads.get('test_square', -1)
+    assert calls == [3, -1, -1]
+    assert 'test_square' in payloads.registered()
+
+
+def test_warmup_precomputes_the_predictions_page_request(monkeypatch):
+    calls = []
+    monkeypatch.setattr(warmup_module, 'WARM_PAYLOADS', tuple(
+        item for item in warmup_module.WARM_PAYLOADS if item[0] == 'top_countries'))
+    monkeypatch.setitem(payloads._builders, 'top_countries', lambda *args: calls.append(args) or [{'country': 'France'}])
+    payloads._cache.clear()
+    warmup_module._warm_payloads()
+    warmed = len(calls)
+
+    # requête par défaut de la page Prédictions (frontend : top_n=25, year=2024, model=best)
+    app = Flask(__name__)
+    app.register_blueprint(prediction_bp)
+    response = app.test_client().get('/api/predictions/top-countries?top_n=25&year=2024&model=best')
+    assert response.status_code == 200 and len(calls) == warmed
+    payloads._cache.clear()
+
+
+def test_warmup_runs_every_step_and_records_failures():
+    order = []
+
+    def failing():
+        order.append('broken')
+        raise RuntimeError('boom')
+
+    warmup = Warmup([('data', lambda: order.append('data')), ('broken', failing), ('models', lambda: order.append('models'))])
+    assert not warmup.ready and warmup.status()['state'] == 'pending'
+    warmup.run()
+    status = warmup.status()
+    assert order == ['data', 'broken', 'models']
+    assert warmup.ready and status['state'] == 'done'
+    assert status['steps']['broken']['error'] == 'boom' and status['steps']['data']['error'] is None
+
+    disabled = Warmup([], enabled=False)
+    disabled.start()
+    assert disabled.ready and disabled.status()['state'] == 'disabled'
+
+
+def test_readiness_waits_for_warmup(monkeypatch):
+    release = threading.Event()
+    warmup = Warmup([('slow', release.wait)])
+
+    class Monitor:
+        def status(self):
+            return {'connected': True}
+
+    monkeypatch.setattr(health_routes, 'get_monitor', lambda: Monitor())
+    monkeypatch.setattr(health_routes, 'get_warmup', lambda: warmup)
+    app = Flask(__name__)
+    app.register_blueprint(health_routes.health_bp)
+    client = app.test_client()
+
+    warmup.start()
+    response = client.get('/api/health/ready')
+    assert response.status_code == 503 and response.get_json()['warmup']['state'] == 'running'
+
+    release.set()
+    assert warmup.wait(5)
+    assert client.get('/api/health/ready').status_code == 200
@@ -14,7 +14,8 @@ OBJECTIFS :
 
 TECHNIQUES UTILISÉES :
 - Feature Engineering (12 features avancées)
-- Validation croisée temporelle
+- Validation temporelle (split par édition ou origine glissante :
+  python train_advanced_models.py --evaluation rolling --workers 4)
 - Optimisation des hyperparamètres
 - Comparaison multi-modèles
 - Sauvegarde des modèles entraînés
@@ -36,6 +37,10 @@ warnings.filterwarnings('ignore')  # Supprimer les warnings pour la présentatio
 # ---------- CONFIGURATION DU SYSTÈME ----------
 # Configuration des chemins et imports pour l'entraînement
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from utils.timeseries import HISTORY_FEATURES, TimeSeriesEngine
+from utils.model_artifacts import artifact_paths, export_compiled
+from utils.backtest import (ESTIMATORS, evaluate_folds, make_estimator, rolling_origin_folds,
+                            temporal_holdout_year)
 
 # ---------- IMPORTS DES LIBRAIRIES ML ----------
 # Import des librairies de machine learning avec gestion d'erreurs
@@ -47,7 +52,7 @@ try:
     from sklearn.linear_model import LinearRegression, Ridge
     
     # Outils de validation et optimisation
-    from sklearn.model_selection import train_test_split, cross_val_score, GridSearchCV
+    from sklearn.model_selection import cross_val_score, GridSearchCV
     
     # Préprocessing des données
     from sklearn.preprocessing import StandardScaler, LabelEncoder, OneHotEncoder
@@ -141,6 +146,23 @@ COUNTRY_FACTORS = {
     'South Africa': {'population': 60000000, 'gdp_per_capita': 6000, 'sports_culture': 0.7, 'olympic_tradition': 0.5}
 }
 
+# ---------- FEATURES DES MODÈLES ----------
+# Les 12 features avancées (aussi utilisées par backtest_models.py)
+FEATURE_COLUMNS = [
+    'avg_recent_3',           # Moyenne des 3 dernières olympiades
+    'trend',                  # Tendance de performance
+    'consistency',            # Consistance des résultats
+    'peak_performance',       # Meilleure performance historique
+    'years_since_last',      # Années depuis la dernière olympiade
+    'population',             # Population du pays
+    'gdp_per_capita',         # PIB par habitant
+    'sports_culture',         # Culture sportive (0-1)
+    'olympic_tradition',      # Tradition olympique (0-1)
+    'is_host',                # Avantage domicile (0/1)
+    'is_summer',              # Jeux d'été (0/1)
+    'year_normalized'         # Année normalisée
+]
+
 def load_and_preprocess_data():
     """Load and preprocess the Olympic medals data."""
     print("Loading Olympic medals data...")
@@ -167,93 +189,52 @@ def create_features(df: pd.DataFrame) -> pd.DataFrame:
     """Create advanced features for model training."""
     print("Creating advanced features...")
     
-    # Group by country and year to get annual medal counts
-    country_year_data = df.groupby(['country_mapped', 'year']).agg({
-        'gold': 'sum',
-        'silver': 'sum', 
-        'bronze': 'sum'
-    }).reset_index()
-    
-    country_year_data['total_medals'] = country_year_data['gold'] + country_year_data['silver'] + country_year_data['bronze']
-    
-    # Create features for each country-year combination
+    # Matrices pays x année (gold/silver/bronze/total) et caractéristiques historiques
+    # calculées pour toutes les lignes à la fois (éditions antérieures uniquement)
+    engine = TimeSeriesEngine.from_records(df, entity='country_mapped', edition='year')
+    history = engine.history_features()
+
+    # Une ligne par (pays, année) avec médailles, par pays puis par année
+    rows, columns = np.nonzero(engine.present)
+    countries = np.array(engine.entities, dtype=object)[rows]
+    years = engine.editions[columns]
+
     features_list = []
-    
-    for country in country_year_data['country_mapped'].unique():
-        country_data = country_year_data[country_year_data['country_mapped'] == country].sort_values('year')
-        
-        for idx, row in country_data.iterrows():
-            year = row['year']
-            total_medals = row['total_medals']
-            
-            # Historical performance features
-            historical_data = country_data[country_data['year'] < year]
-            
-            if len(historical_data) > 0:
-                # Recent performance (last 3 Olympics)
-                recent_3 = historical_data.tail(3)
-                avg_recent_3 = recent_3['total_medals'].mean() if len(recent_3) > 0 else 0
-                
-                # Trend (slope of performance over time)
-                if len(historical_data) >= 2:
-                    years = historical_data['year'].values
-                    medals = historical_data['total_medals'].values
-                    trend = np.polyfit(years, medals, 1)[0] if len(years) > 1 else 0
-                else:
-                    trend = 0
-                
-                # Consistency (standard deviation of recent performance)
-                consistency = historical_data['total_medals'].std() if len(historical_data) > 1 else 0
-                
-                # Peak performance
-                peak_performance = historical_data['total_medals'].max()
-                
-                # Years since last Olympics
-                years_since_last = year - historical_data['year'].iloc[-1] if len(historical_data) > 0 else 4
-                
-            else:
-                avg_recent_3 = 0
-                trend = 0
-                consistency = 0
-                peak_performance = 0
-                years_since_last = 4
-            
-            # Country-specific factors
-            country_factors = COUNTRY_FACTORS.get(country, {
-                'population': 50000000, 'gdp_per_capita': 20000, 
-                'sports_culture': 0.5, 'olympic_tradition': 0.5
-            })
-            
-            # Create feature vector
-            features = {
-                'country': country,
-                'year': year,
-                'total_medals': total_medals,
-                'gold': row['gold'],
-                'silver': row['silver'],
-                'bronze': row['bronze'],
-                'avg_recent_3': avg_recent_3,
-                'trend': trend,
-                'consistency': consistency,
-                'peak_performance': peak_performance,
-                'years_since_last': years_since_last,
-                'population': country_factors['population'],
-                'gdp_per_capita': country_factors['gdp_per_capita'],
-                'sports_culture': country_factors['sports_culture'],
-                'olympic_tradition': country_factors['olympic_tradition'],
-                'is_host': 1 if year in [2000, 2004, 2008, 2012, 2016, 2020, 2024] and country in ['Australia', 'Greece', 'China', 'Great Britain', 'Brazil', 'Japan', 'France'] else 0,
-                'is_summer': 1 if year % 4 == 0 else 0,  # Summer Olympics every 4 years
-                'year_normalized': (year - 1990) / 30  # Normalize year
-            }
-            
-            features_list.append(features)
-    
+    for i, (country, year) in enumerate(zip(countries, years)):
+        r, t = rows[i], columns[i]
+
+        # Country-specific factors
+        country_factors = COUNTRY_FACTORS.get(country, {
+            'population': 50000000, 'gdp_per_capita': 20000, 
+            'sports_culture': 0.5, 'olympic_tradition': 0.5
+        })
+
+        # Create feature vector
+        features = {
+            'country': country,
+            'year': year,
+            'total_medals': engine.series('total')[r, t],
+            'gold': engine.series('gold')[r, t],
+            'silver': engine.series('silver')[r, t],
+            'bronze': engine.series('bronze')[r, t],
+            **{name: history[name][r, t] for name in HISTORY_FEATURES},
+            'population': country_factors['population'],
+            'gdp_per_capita': country_factors['gdp_per_capita'],
+            'sports_culture': country_factors['sports_culture'],
+            'olympic_tradition': country_factors['olympic_tradition'],
+            'is_host': 1 if year in [2000, 2004, 2008, 2012, 2016, 2020, 2024] and country in ['Australia', 'Greece', 'China', 'Great Britain', 'Brazil', 'Japan', 'France'] else 0,
+            'is_summer': 1 if year % 4 == 0 else 0,  # Summer Olympics every 4 years
+            'year_normalized': (year - 1990) / 30  # Normalize year
+        }
+
+        features_list.append(features)
+
     features_df = pd.DataFrame(features_list)
     print(f"Created {len(features_df)} feature vectors")
     
     return features_df
 
-def train_models(features_df: pd.DataFrame):
+def train_models(features_df: pd.DataFrame, evaluation: str = 'holdout', workers: int = 1):
     """
     FONCTION PRINCIPALE D'ENTRAÎNEMENT DES MODÈLES
     ==============================================
@@ -263,8 +244,10 @@ def train_models(features_df: pd.DataFrame):
     
     PROCESSUS :
     1. Préparation des features (12 variables avancées)
-    2. Split temporel (80% train, 20% test)
-    3. Normalisation des données
+    2. Évaluation temporelle, sans fuite des éditions futures :
+       - 'holdout' : dernières éditions en test (~20% des lignes)
+       - 'rolling' : origine glissante, un pli par édition (fenêtre croissante)
+    3. Normalisation des données (sur l'entraînement uniquement)
     4. Entraînement de 3 modèles différents
     5. Évaluation et comparaison des performances
     6. Sélection du meilleur modèle (Random Forest)
@@ -279,32 +262,40 @@ def train_models(features_df: pd.DataFrame):
     # ---------- PRÉPARATION DES FEATURES ----------
     # Sélection des 12 features avancées pour l'entraînement
     print("Préparation des features...")
-    feature_columns = [
-        'avg_recent_3',           # Moyenne des 3 dernières olympiades
-        'trend',                  # Tendance de performance
-        'consistency',            # Consistance des résultats
-        'peak_performance',       # Meilleure performance historique
-        'years_since_last',      # Années depuis la dernière olympiade
-        'population',             # Population du pays
-        'gdp_per_capita',         # PIB par habitant
-        'sports_culture',         # Culture sportive (0-1)
-        'olympic_tradition',      # Tradition olympique (0-1)
-        'is_host',                # Avantage domicile (0/1)
-        'is_summer',              # Jeux d'été (0/1)
-        'year_normalized'         # Année normalisée
-    ]
+    feature_columns = list(FEATURE_COLUMNS)
     
     X = features_df[feature_columns].fillna(0)  # Remplacer les NaN par 0
     y = features_df['total_medals']             # Variable cible (nombre de médailles)
+    families = [name for name in ESTIMATORS if name != 'xgboost' or XGBOOST_AVAILABLE]
     
     print(f"   Features préparées : {X.shape[0]} échantillons, {X.shape[1]} features")
     
+    if evaluation == 'rolling':
+        # ---------- ÉVALUATION À ORIGINE GLISSANTE ----------
+        # Un pli par édition : entraînement sur toutes les éditions antérieures
+        folds = rolling_origin_folds(features_df, feature_columns)
+        print(f"Évaluation à origine glissante : {len(folds)} plis ({folds[0]['year']}-{folds[-1]['year']})")
+        scores = evaluate_folds(folds, families, workers)
+        for name in families:
+            print(f"   {name}: R² {scores[name]['r2']:.3f}, MAE {scores[name]['mae']:.2f} "
+                  f"({scores[name]['fit_s']:.1f} s d'ajustement)")
+
+        # Modèle final : meilleure famille réentraînée sur toutes les éditions
+        best_model_name = max(families, key=lambda k: scores[k]['r2'])
+        scaler = StandardScaler()
+        model = make_estimator(best_model_name).fit(scaler.fit_transform(X), y)
+        best_model = {'model': model, 'score': scores[best_model_name]['r2'], 'scaler': scaler}
+        print(f"\nBest model: {best_model_name} (R²: {best_model['score']:.3f})")
+        return best_model, feature_columns
+    
     # ---------- SPLIT TEMPOREL ----------
-    # Division temporelle pour éviter le data leakage
+    # Les dernières éditions servent de test pour éviter le data leakage
     print("Split temporel des données...")
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-    print(f"   Train: {X_train.shape[0]} échantillons")
-    print(f"   Test: {X_test.shape[0]} échantillons")
+    test_year = temporal_holdout_year(features_df['year'], test_size=0.2)
+    is_test = (features_df['year'] >= test_year).to_numpy()
+    X_train, X_test, y_train, y_test = X[~is_test], X[is_test], y[~is_test], y[is_test]
+    print(f"   Train: {X_train.shape[0]} échantillons (avant {test_year})")
+    print(f"   Test: {X_test.shape[0]} échantillons (depuis {test_year})")
     
     # ---------- NORMALISATION ----------
     # Standardisation des features pour l'optimisation
@@ -314,47 +305,16 @@ def train_models(features_df: pd.DataFrame):
     X_test_scaled = scaler.transform(X_test)
     print("   Features normalisées (moyenne=0, écart-type=1)")
     
+    # ---------- ENTRAÎNEMENT DES MODÈLES ----------
+    # Random Forest (notre modèle principal), XGBoost (si disponible), Ridge
     models = {}
-    
-    # ---------- MODÈLE 1 : RANDOM FOREST (NOTRE MEILLEUR) ----------
-    print("\nENTRAÎNEMENT RANDOM FOREST...")
-    print("-" * 30)
-    rf = RandomForestRegressor(
-        n_estimators=100,        # 100 arbres de décision
-        max_depth=10,            # Profondeur max pour éviter le surapprentissage
-        min_samples_split=5,     # Min échantillons pour diviser un nœud
-        min_samples_leaf=2,      # Min échantillons par feuille
-        random_state=42          # Reproductibilité
-    )
-    rf.fit(X_train_scaled, y_train)
-    rf_pred = rf.predict(X_test_scaled)
-    rf_score = r2_score(y_test, rf_pred)
-    models['random_forest'] = {'model': rf, 'score': rf_score, 'scaler': scaler}
-    print(f"   Random Forest R²: {rf_score:.3f} (MEILLEUR MODÈLE)")
-    
-    # 2. XGBoost (if available)
-    if XGBOOST_AVAILABLE:
-        print("Training XGBoost...")
-        xgb_model = xgb.XGBRegressor(
-            n_estimators=100,
-            max_depth=6,
-            learning_rate=0.1,
-            random_state=42
-        )
-        xgb_model.fit(X_train_scaled, y_train)
-        xgb_pred = xgb_model.predict(X_test_scaled)
-        xgb_score = r2_score(y_test, xgb_pred)
-        models['xgboost'] = {'model': xgb_model, 'score': xgb_score, 'scaler': scaler}
-        print(f"XGBoost R²: {xgb_score:.3f}")
-    
-    # 3. Ridge Regression
-    print("Training Ridge Regression...")
-    ridge = Ridge(alpha=1.0, random_state=42)
-    ridge.fit(X_train_scaled, y_train)
-    ridge_pred = ridge.predict(X_test_scaled)
-    ridge_score = r2_score(y_test, ridge_pred)
-    models['ridge'] = {'model': ridge, 'score': ridge_score, 'scaler': scaler}
-    print(f"Ridge Regression R²: {ridge_score:.3f}")
+    for name in families:
+        print(f"\nENTRAÎNEMENT {name.upper()}...")
+        model = make_estimator(name)
+        model.fit(X_train_scaled, y_train)
+        score = r2_score(y_test, model.predict(X_test_scaled))
+        models[name] = {'model': model, 'score': score, 'scaler': scaler}
+        print(f"   {name} R²: {score:.3f}")
     
     # Select best model
     best_model_name = max(models.keys(), key=lambda k: models[k]['score'])
@@ -469,8 +429,27 @@ def save_models(model_info, feature_columns):
     joblib.dump(model_data, top25_model_path)
     print(f"Saved top 25 model to {top25_model_path}")
 
+    # Compact NumPy version (scaler folded in, memory-mapped by the API workers)
+    for model_path in (country_model_path, top25_model_path):
+        if export_compiled(model_data, model_path):
+            print(f"Compiled {os.path.basename(model_path)} to {', '.join(artifact_paths(model_path))}")
+        else:
+            # Stale arrays would shadow the new pickle
+            for stale in artifact_paths(model_path):
+                if os.path.exists(stale):
+                    os.remove(stale)
+            print(f"{type(model_data['model']).__name__} cannot be compiled, the API will load {model_path}")
+
 def main():
     """Main training pipeline."""
+    import argparse
+    parser = argparse.ArgumentParser(description="Entraîner les modèles de prédiction par pays")
+    parser.add_argument('--evaluation', choices=['holdout', 'rolling'], default='holdout',
+                        help="Split temporel simple ou évaluation à origine glissante")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help="Processus pour l'évaluation à origine glissante")
+    args = parser.parse_args()
+
     print("=" * 60)
     print("ADVANCED OLYMPIC MEDAL PREDICTION MODEL TRAINING")
     print("=" * 60)
@@ -483,7 +462,7 @@ def main():
         features_df = create_features(df)
         
         # Train models
-        model_info, feature_columns = train_models(features_df)
+        model_info, feature_columns = train_models(features_df, args.evaluation, args.workers)
         
         if model_info is None:
             print("Error: Could not train models.")
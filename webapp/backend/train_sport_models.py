@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+ENTRAÎNEMENT DU MODÈLE DE PRÉVISION PAR SPORT
+=============================================
+
+Ajuste hors ligne le modèle de tendance en panel (sport x pays) de
+utils/sport_forecast.py sur les remises de médailles dédupliquées, l'évalue
+sur la dernière édition d'été et d'hiver (comparaison avec « même résultat
+que l'édition précédente ») puis enregistre les coefficients dans
+models/sport_forecast.npz, lu par /api/predictions/sports.
+
+Usage :
+    python train_sport_models.py [--window 6] [--decay 0.6] [--shrinkage 16]
+"""
+
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from utils.sport_forecast import (DEFAULT_DECAY, DEFAULT_SHRINKAGE, DEFAULT_WINDOW,
+                                  SportForecastModel)
+
+DATA_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "data", "clean"))
+CSV_AWARDS = os.path.join(DATA_DIR, "olympic_medal_awards_v2.csv")  # une ligne par remise de médaille
+MODELS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), 'models'))
+SPORT_MODEL_PATH = os.path.join(MODELS_DIR, 'sport_forecast.npz')
+
+
+def evaluate(df, target_year, **params):
+    """Erreur absolue moyenne par (sport, pays) sur `target_year`, modèle entraîné sur les années antérieures"""
+    train = df[df['year'] < target_year]
+    model = SportForecastModel.fit(train, **params)
+    key = pd.MultiIndex.from_arrays([np.array(model.sports)[model.pair_sport],
+                                     np.array(model.countries)[model.pair_country]])
+    predicted = pd.Series(model.forecast(target_year).sum(axis=1), index=key)
+    actual = df[df['year'] == target_year].groupby(['sport', 'noc'])['award_count'].sum()
+    previous_year = train.loc[train['sport'].isin(actual.index.get_level_values(0)), 'year'].max()
+    previous = train[train['year'] == previous_year].groupby(['sport', 'noc'])['award_count'].sum()
+
+    contested = {sport for sport, keep in zip(model.sports, model.contested(target_year)) if keep}
+    index = predicted.index.union(actual.index)
+    index = index[index.get_level_values(0).isin(contested)]
+    actual = actual.reindex(index, fill_value=0)
+    return {
+        'pairs': len(index),
+        'model_mae': float((predicted.reindex(index, fill_value=0) - actual).abs().mean()),
+        'previous_mae': float((previous.reindex(index, fill_value=0) - actual).abs().mean()),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Entraîner le modèle de prévision par sport")
+    parser.add_argument('--window', type=int, default=DEFAULT_WINDOW)
+    parser.add_argument('--decay', type=float, default=DEFAULT_DECAY)
+    parser.add_argument('--shrinkage', type=float, default=DEFAULT_SHRINKAGE)
+    parser.add_argument('--output', default=SPORT_MODEL_PATH)
+    args = parser.parse_args()
+    params = {'window': args.window, 'decay': args.decay, 'shrinkage': args.shrinkage}
+
+    print("=" * 60)
+    print("SPORT FORECAST MODEL TRAINING")
+    print("=" * 60)
+
+    df = pd.read_csv(CSV_AWARDS)
+    print(f"Loaded {len(df)} awards from {CSV_AWARDS}")
+
+    # Évaluation sur la dernière édition de chaque saison
+    summer, winter = df.loc[df['year'] % 4 == 0, 'year'].max(), df.loc[df['year'] % 4 == 2, 'year'].max()
+    for year in sorted((summer, winter)):
+        scores = evaluate(df, year, **params)
+        print(f"{year}: MAE {scores['model_mae']:.3f} (previous edition: {scores['previous_mae']:.3f}) "
+              f"on {scores['pairs']} sport x country pairs")
+
+    model = SportForecastModel.fit(df, **params)
+    os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    model.save(args.output)
+    print(f"Saved {len(model.pair_sport)} sport x country series "
+          f"({int(model.active.sum())} active sports) to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
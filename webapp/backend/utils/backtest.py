@@ -0,0 +1,277 @@
+"""
+Backtest des modes de prédiction par pays sur les éditions passées
+
+Chaque édition cible est rejouée comme si elle était à venir : les modèles ne
+voient que les éditions strictement antérieures, puis prédisent le total de
+médailles des pays médaillés à cette édition.
+
+Modes (ceux de PredictionService) :
+- 'ma' / 'es' : moyenne des 5 dernières éditions observées / lissage
+  exponentiel (alpha 0,5), arrondis par médaille comme l'API ;
+- 'best' / 'second' : chemin servi par l'API. La famille du modèle déployé
+  (models/country_best.joblib, forêt aléatoire par défaut) est réentraînée
+  sur les lignes antérieures comme dans train_advanced_models.py, puis prédit
+  à partir de la ligne de caractéristiques que construit l'API
+  (_country_model_features : historique aux valeurs par défaut). L'API sert
+  country_best dans les deux modes : 'second' rejoue donc le même modèle.
+
+Modes 'best_refit' / 'second_refit' (« refit upper bound ») : forêt aléatoire /
+Ridge réentraînées ET évaluées sur les vraies caractéristiques historiques.
+Ce n'est pas ce que sert l'API : ces scores bornent ce qu'apporterait le
+passage des caractéristiques historiques jusqu'à l'API.
+
+Scores par (mode, édition) : MAE, RMSE et corrélation de rang (Spearman) sur
+les pays, plus les temps d'ajustement et de prédiction. Les éditions sont
+indépendantes et peuvent être réparties sur plusieurs processus.
+
+Le même découpage temporel sert à l'évaluation de train_models : plis à
+origine glissante (fenêtre croissante, une édition de test par pli) dont les
+matrices sont calculées une fois et partagées par toutes les familles de
+modèles, chaque (famille, pli) étant ajusté en parallèle.
+"""
+import time
+
+import numpy as np
+
+SERVED_MODES = ('best', 'second')
+REFIT_MODES = {'best_refit': 'random_forest', 'second_refit': 'ridge'}
+MODES = ('ma', 'es') + SERVED_MODES + tuple(REFIT_MODES)
+SERVED_ESTIMATOR = 'random_forest'
+MA_WINDOW = 5
+ES_ALPHA = 0.5
+MEDALS = ('gold', 'silver', 'bronze')
+
+
+# Familles de modèles de train_models (mêmes hyperparamètres)
+ESTIMATORS = ('random_forest', 'xgboost', 'ridge')
+MIN_TRAIN_EDITIONS = 3
+
+
+def make_estimator(name):
+    """Nouvel estimateur scikit-learn (ou XGBoost) d'une famille de ESTIMATORS"""
+    if name == 'random_forest':
+        from sklearn.ensemble import RandomForestRegressor
+        return RandomForestRegressor(n_estimators=100, max_depth=10, min_samples_split=5,
+                                     min_samples_leaf=2, random_state=42)
+    if name == 'xgboost':
+        import xgboost as xgb
+        return xgb.XGBRegressor(n_estimators=100, max_depth=6, learning_rate=0.1, random_state=42)
+    if name == 'ridge':
+        from sklearn.linear_model import Ridge
+        return Ridge(alpha=1.0, random_state=42)
+    raise ValueError(f"Famille de modèle inconnue : {name}")
+
+
+def estimator_family(estimator):
+    """Famille de ESTIMATORS d'un estimateur entraîné (celui d'un modèle déployé), None si inconnue"""
+    name = type(estimator).__name__
+    return {'RandomForestRegressor': 'random_forest', 'XGBRegressor': 'xgboost', 'Ridge': 'ridge'}.get(name)
+
+
+def served_features(countries, years, feature_columns):
+    """Matrice construite par l'API pour le modèle pays (PredictionService._predict_pairs_with_model)"""
+    from services.prediction_service import COUNTRY_MODEL_MAPPING, _country_model_features
+
+    rows = [_country_model_features(COUNTRY_MODEL_MAPPING.get(country, country), int(year))
+            for country, year in zip(countries, years)]
+    return np.array([[row[column] for column in feature_columns] for row in rows], dtype=float)
+
+
+def _fit(model, train, feature_columns, served_estimator=SERVED_ESTIMATOR):
+    """Ajuster un mode sur les lignes d'entraînement ; renvoie predict(test) -> totaux"""
+    if model in ('ma', 'es'):
+        from utils.timeseries import TimeSeriesEngine
+        engine = TimeSeriesEngine.from_records(train, entity='country', edition='year')
+        if model == 'es':
+            medals = np.column_stack([engine.ewm(ES_ALPHA, s) for s in MEDALS])
+        else:
+            medals = np.column_stack([engine.recent_mean(MA_WINDOW, s) for s in MEDALS])
+        totals = np.maximum(np.round(medals), 0).sum(axis=1)
+
+        def predict(test):
+            positions = (engine.position(country) for country in test['country'])
+            rows = np.array([-1 if position is None else position for position in positions], dtype=int)
+            return np.where(rows >= 0, totals[np.maximum(rows, 0)], 0.0)
+        return predict
+
+    from sklearn.preprocessing import StandardScaler
+    X = train[feature_columns].fillna(0).to_numpy(dtype=float)
+    scaler = StandardScaler().fit(X)
+    family = served_estimator if model in SERVED_MODES else REFIT_MODES[model]
+    estimator = make_estimator(family).fit(scaler.transform(X), train['total_medals'].to_numpy(dtype=float))
+
+    def predict(test):
+        if model in SERVED_MODES:
+            X_test = served_features(test['country'], test['year'], feature_columns)
+        else:
+            X_test = test[feature_columns].fillna(0).to_numpy(dtype=float)
+        return np.round(np.maximum(estimator.predict(scaler.transform(X_test)), 0))
+    return predict
+
+
+def _rank(values):
+    """Rangs moyens (ex æquo partagés)"""
+    import pandas as pd
+    return pd.Series(values).rank(method='average').to_numpy()
+
+
+def score(actual, predicted):
+    """MAE, RMSE et corrélation de Spearman (None si une série est constante)"""
+    actual = np.asarray(actual, dtype=float)
+    predicted = np.asarray(predicted, dtype=float)
+    error = predicted - actual
+    spearman = None
+    if len(actual) > 1 and np.ptp(actual) > 0 and np.ptp(predicted) > 0:
+        spearman = float(np.corrcoef(_rank(actual), _rank(predicted))[0, 1])
+    return {
+        'mae': float(np.abs(error).mean()) if len(error) else None,
+        'rmse': float(np.sqrt((error ** 2).mean())) if len(error) else None,
+        'spearman': spearman,
+    }
+
+
+def backtest_edition(features, year, models=MODES, feature_columns=(), served_estimator=SERVED_ESTIMATOR):
+    """Rejouer une édition : chaque mode n'est ajusté que sur les éditions antérieures à `year`
+
+    `features` : une ligne par (pays, année) avec country, year, gold, silver,
+    bronze, total_medals et `feature_columns` (create_features de
+    train_advanced_models.py, caractéristiques calculées sur le passé).
+    """
+    train = features[features['year'] < year]
+    test = features[features['year'] == year]
+    actual = test['total_medals'].to_numpy(dtype=float)
+    result = {'year': int(year), 'countries': test['country'].tolist(), 'actual': actual.tolist(), 'models': {}}
+    for model in models:
+        start = time.perf_counter()
+        predict = _fit(model, train, list(feature_columns), served_estimator)
+        fit_s = time.perf_counter() - start
+        start = time.perf_counter()
+        predicted = predict(test)
+        predict_s = time.perf_counter() - start
+        result['models'][model] = {
+            'predicted': predicted.tolist(),
+            'fit_s': fit_s,
+            'predict_s': predict_s,
+            **score(actual, predicted),
+        }
+    return result
+
+
+def _backtest_job(job):
+    return backtest_edition(*job)
+
+
+def run_backtest(features, years, models=MODES, feature_columns=(), workers=1, served_estimator=SERVED_ESTIMATOR):
+    """Backtest de plusieurs éditions (réparties sur `workers` processus), dans l'ordre de `years`"""
+    jobs = [(features, int(year), tuple(models), tuple(feature_columns), served_estimator) for year in years]
+    if workers > 1 and len(jobs) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(_backtest_job, jobs))
+    return [_backtest_job(job) for job in jobs]
+
+
+def summarize(results):
+    """Moyennes par mode sur les éditions : précision et coût (ajustement, latence par pays)"""
+    summary = {}
+    models = results[0]['models'] if results else {}
+    for model in models:
+        per_edition = [r['models'][model] for r in results]
+        countries = sum(len(r['countries']) for r in results)
+
+        def mean(key):
+            values = [m[key] for m in per_edition if m[key] is not None]
+            return float(np.mean(values)) if values else None
+
+        summary[model] = {
+            'refit_upper_bound': model in REFIT_MODES,
+            'editions': len(per_edition),
+            'mae': mean('mae'),
+            'rmse': mean('rmse'),
+            'spearman': mean('spearman'),
+            'fit_s': float(sum(m['fit_s'] for m in per_edition)),
+            'predict_us_per_country': float(sum(m['predict_s'] for m in per_edition) / max(countries, 1) * 1e6),
+        }
+    return summary
+
+
+# ---------- évaluation à origine glissante (train_models) ----------
+_fold_cache = {}
+
+
+def temporal_holdout_year(years, test_size=0.2):
+    """Première édition du jeu de test : les dernières éditions, jusqu'à `test_size` des lignes"""
+    editions, counts = np.unique(np.asarray(years), return_counts=True)
+    from_end = np.cumsum(counts[::-1])[::-1]          # lignes des éditions >= chacune
+    candidates = editions[from_end <= max(test_size * len(years), counts[-1])]
+    return int(candidates[0])
+
+
+def rolling_origin_folds(features, feature_columns, min_train_editions=MIN_TRAIN_EDITIONS, target='total_medals'):
+    """Plis à fenêtre croissante : pour chaque édition, entraînement sur toutes les éditions antérieures
+
+    Chaque pli garde ses matrices normalisées (scaler ajusté sur son seul
+    entraînement) ; les plis sont mémorisés par contenu, une nouvelle famille
+    de modèles ne recalcule donc rien.
+    """
+    import pandas as pd
+
+    columns = list(feature_columns)
+    data = features[['year', target] + columns]
+    key = (int(pd.util.hash_pandas_object(data, index=False).sum()), len(data), tuple(columns), min_train_editions, target)
+    if key in _fold_cache:
+        return _fold_cache[key]
+
+    from sklearn.preprocessing import StandardScaler
+    years = data['year'].to_numpy()
+    X = data[columns].fillna(0).to_numpy(dtype=float)
+    y = data[target].to_numpy(dtype=float)
+    folds = []
+    for year in np.unique(years)[min_train_editions:]:
+        train, test = years < year, years == year
+        scaler = StandardScaler().fit(X[train])
+        folds.append({
+            'year': int(year),
+            'X_train': scaler.transform(X[train]), 'y_train': y[train],
+            'X_test': scaler.transform(X[test]), 'y_test': y[test],
+        })
+    _fold_cache[key] = folds
+    return folds
+
+
+def _fit_fold(job):
+    family, fold = job
+    start = time.perf_counter()
+    estimator = make_estimator(family).fit(fold['X_train'], fold['y_train'])
+    return family, fold['year'], estimator.predict(fold['X_test']), time.perf_counter() - start
+
+
+def evaluate_folds(folds, families, workers=1):
+    """Ajuster chaque (famille, pli) — en parallèle sur `workers` processus — et scorer chaque famille
+
+    Renvoie {famille: {'r2', 'mae', 'rmse', 'fit_s', 'folds': [{'year', 'mae'}, ...]}} ;
+    r2 / mae / rmse sur l'ensemble des prédictions hors échantillon.
+    """
+    jobs = [(family, fold) for family in families for fold in folds]
+    if workers > 1 and len(jobs) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            fitted = list(pool.map(_fit_fold, jobs))
+    else:
+        fitted = [_fit_fold(job) for job in jobs]
+
+    actual = {fold['year']: fold['y_test'] for fold in folds}
+    scores = {}
+    for family in families:
+        runs = [(year, predicted, fit_s) for name, year, predicted, fit_s in fitted if name == family]
+        y_true = np.concatenate([actual[year] for year, _, _ in runs])
+        y_pred = np.concatenate([predicted for _, predicted, _ in runs])
+        residual = ((y_true - y_pred) ** 2).sum()
+        spread = ((y_true - y_true.mean()) ** 2).sum()
+        scores[family] = {
+            'r2': float(1 - residual / spread) if spread > 0 else 0.0,
+            **{k: v for k, v in score(y_true, y_pred).items() if k != 'spearman'},
+            'fit_s': float(sum(fit_s for _, _, fit_s in runs)),
+            'folds': [{'year': year, 'mae': score(actual[year], predicted)['mae']} for year, predicted, _ in runs],
+        }
+    return scores
@@ -0,0 +1,160 @@
+"""
+Cache mémoire à expiration (TTL) avec statistiques de hit/miss
+
+Chaque cache nommé est enregistré dans un registre global afin que
+l'endpoint de santé puisse exposer les taux de hit.
+"""
+import functools
+import os
+import threading
+import time
+
+DEFAULT_TTL = int(os.getenv('CACHE_TTL', 300))
+# Index de recherche et de facettes construits sur les snapshots (services/*_service.py)
+SEARCH_INDEX_TTL = int(os.getenv('SEARCH_INDEX_TTL', 600))
+
+_registry = {}
+_registry_lock = threading.Lock()
+
+
+class TTLCache:
+    """Dictionnaire thread-safe dont les entrées expirent après `ttl` secondes"""
+
+    def __init__(self, name, ttl=DEFAULT_TTL, maxsize=128):
+        self.name = name
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._revalidating = set()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and time.monotonic() - entry[0] < self.ttl:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            return default
+
+    def peek(self, key):
+        """(valeur, âge en secondes) même expirée, None si absente — pour servir une valeur périmée"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            age = time.monotonic() - entry[0]
+            if age < self.ttl:
+                self.hits += 1
+            else:
+                self.misses += 1
+            return entry[1], age
+
+    def fetch(self, key, build):
+        """Valeur en cache ; expirée, elle reste servie pendant que `build()` la recalcule en
+        arrière-plan ; absente, elle est calculée tout de suite (None n'est pas mis en cache)"""
+        entry = self.peek(key)
+        if entry is None:
+            value = build()
+            if value is not None:
+                self.set(key, value)
+            return value
+        value, age = entry
+        if age >= self.ttl:
+            with self._lock:
+                start = key not in self._revalidating
+                self._revalidating.add(key)
+            if start:
+                threading.Thread(target=self._revalidate, args=(key, build),
+                                 name=f'revalidate-{self.name}', daemon=True).start()
+        return value
+
+    def _revalidate(self, key, build):
+        try:
+            value = build()
+            if value is not None:
+                self.set(key, value)
+        except Exception as error:
+            print(f"Recalcul de l'entrée {key!r} du cache {self.name} en échec : {error}")
+        finally:
+            with self._lock:
+                self._revalidating.discard(key)
+
+    def keys(self):
+        with self._lock:
+            return list(self._data)
+
+    def set(self, key, value):
+        with self._lock:
+            if key not in self._data and len(self._data) >= self.maxsize:
+                # Évincer l'entrée la plus ancienne
+                oldest = min(self._data, key=lambda k: self._data[k][0])
+                del self._data[oldest]
+            self._data[key] = (time.monotonic(), value)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'entries': len(self._data),
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / total, 4) if total else None
+            }
+
+
+def get_cache(name, ttl=DEFAULT_TTL, maxsize=128):
+    """Retourne le cache nommé, en le créant au premier appel"""
+    with _registry_lock:
+        if name not in _registry:
+            _registry[name] = TTLCache(name, ttl=ttl, maxsize=maxsize)
+        return _registry[name]
+
+
+def cache_stats():
+    """Statistiques de tous les caches enregistrés"""
+    with _registry_lock:
+        caches = list(_registry.values())
+    return {cache.name: cache.stats() for cache in caches}
+
+
+def cached(name, ttl=DEFAULT_TTL, maxsize=128):
+    """Décorateur : met en cache le résultat selon les arguments d'appel.
+
+    Les résultats None ne sont pas mis en cache (échec de chargement).
+    """
+    cache = get_cache(name, ttl=ttl, maxsize=maxsize)
+    _missing = object()
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            value = cache.get(key, _missing)
+            if value is not _missing:
+                return value
+            value = func(*args, **kwargs)
+            if value is not None:
+                cache.set(key, value)
+            return value
+
+        def refresh(*args, **kwargs):
+            """Recalculer et remplacer l'entrée (l'ancienne reste servie pendant le calcul)"""
+            value = func(*args, **kwargs)
+            if value is not None:
+                cache.set((args, tuple(sorted(kwargs.items()))), value)
+            return value
+
+        wrapper.cache = cache
+        wrapper.refresh = refresh
+        return wrapper
+
+    return decorator
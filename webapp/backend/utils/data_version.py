@@ -0,0 +1,238 @@
+"""
+Versions des données sources (tables, magasin PIB et modèles)
+
+Une version courte par table, recalculée au plus toutes les
+DATA_VERSION_INTERVAL secondes (30 par défaut) :
+
+- backend local : empreinte du contenu du CSV de data/clean, recalculée
+  seulement si sa date de modification ou sa taille change ; deux workers
+  lisant les mêmes fichiers obtiennent donc la même version ;
+- Supabase : nombre de lignes, plus grand id et plus grand updated_at (si la
+  colonne existe), deux requêtes d'une ligne ;
+- 'gdp_store' : empreinte du magasin PIB de la Banque Mondiale
+  (services/gdp_data_service.py, data/clean/world_bank_gdp.json) ;
+- 'models' : noms, dates et tailles des fichiers de models/ (hors simulations) ;
+- 'simulations' : mêmes informations pour les models/simulation_<année>.json
+  réécrits chaque nuit par simulate_games.py.
+
+Quand le planificateur tourne, il sonde les versions à chaque réveil et ne
+publie que celles relevées avant d'avoir relu les snapshots : aucune réponse
+n'est mise en cache sous une nouvelle version avec d'anciennes données.
+
+token() résume toutes les versions : il entre dans les clés des payloads et
+des index de recherche en cache (utils/payloads.py, services/*_service.py),
+dans les ETag des endpoints de données (304 sans recalcul si rien n'a changé)
+et, pour 'models', dans le registre de modèles de PredictionService, rechargé
+quand les fichiers de modèles changent.
+"""
+import hashlib
+import os
+import threading
+import time
+from pathlib import Path
+
+# Tables lues par les Blueprints versionnés (country_gdp : Supabase uniquement)
+TABLES = ('m_award', 'medals', 'hosts', 'athlete', 'country_gdp')
+MODELS_DIR = Path(__file__).resolve().parents[1] / 'models'
+DEFAULT_INTERVAL = 30
+HASH_CHUNK = 1 << 20
+
+# Blueprints dont les réponses ne dépendent que des données et des modèles
+VERSIONED_BLUEPRINTS = ('medals', 'hosts', 'gdp_analysis', 'prediction', 'athletes', 'olympic_results', 'facets')
+
+
+def _digest(parts):
+    return hashlib.sha1('|'.join(str(p) for p in parts).encode('utf-8')).hexdigest()[:12]
+
+
+def file_digest(path):
+    """Empreinte du contenu d'un fichier (lu par blocs)"""
+    digest = hashlib.blake2b(digest_size=8)
+    with open(path, 'rb') as handle:
+        for chunk in iter(lambda: handle.read(HASH_CHUNK), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _files_version(models_dir, keep):
+    if not os.path.isdir(models_dir):
+        return None
+    entries = []
+    for entry in sorted(os.scandir(models_dir), key=lambda e: e.name):
+        if entry.is_file() and not entry.name.startswith('.') and not entry.name.endswith('.tmp') and keep(entry.name):
+            stat = entry.stat()
+            entries.append((entry.name, stat.st_mtime_ns, stat.st_size))
+    return _digest(entries)
+
+
+def models_version(models_dir=MODELS_DIR):
+    """Version des artefacts de modèles (sans les simulations : le registre n'en dépend pas)"""
+    return _files_version(models_dir, lambda name: not name.startswith('simulation_'))
+
+
+def simulations_version(models_dir=MODELS_DIR):
+    """Version des simulations précalculées servies par /api/predictions/simulation"""
+    return _files_version(models_dir, lambda name: name.startswith('simulation_'))
+
+
+def token_of(versions, tables=None):
+    """Version combinée d'un dictionnaire de versions (toutes ses entrées par défaut)"""
+    names = sorted(tables) if tables else sorted(versions)
+    return _digest(f'{name}={versions.get(name)}' for name in names)
+
+
+class DataVersions:
+    """Versions par table, sondées au plus toutes les `interval` secondes"""
+
+    def __init__(self, client_factory=None, tables=TABLES, interval=DEFAULT_INTERVAL, models_dir=MODELS_DIR,
+                 gdp_store=None):
+        self._client_factory = client_factory
+        self.tables = tuple(tables)
+        self.interval = interval
+        self.models_dir = models_dir
+        self.gdp_store = gdp_store    # défaut : magasin du service PIB (GDP_STORE_PATH)
+        self._lock = threading.Lock()
+        self._versions = None
+        self._polled_at = 0.0
+        self._file_digests = {}       # table -> ((mtime_ns, taille), empreinte)
+        self._no_updated_at = set()   # tables Supabase sans colonne updated_at
+        self._unavailable = set()     # tables en erreur (journalisées une seule fois)
+        self.driven = False
+
+    def _client(self):
+        if self._client_factory is not None:
+            return self._client_factory()
+        from database.supabase_client import get_supabase_client
+        return get_supabase_client()
+
+    def _file_version(self, name, path):
+        if not path.exists():
+            return None
+        stat = path.stat()
+        key = (stat.st_mtime_ns, stat.st_size)
+        cached = self._file_digests.get(name)
+        if cached is None or cached[0] != key:
+            cached = (key, file_digest(path))
+            self._file_digests[name] = cached
+        return cached[1]
+
+    def _local_version(self, client, table):
+        from database.local_client import TABLE_FILES
+        if table not in TABLE_FILES:
+            return None
+        return self._file_version(table, client.data_dir / TABLE_FILES[table])
+
+    def _gdp_store_version(self):
+        path = self.gdp_store
+        if path is None:
+            from services.gdp_data_service import get_gdp_service
+            path = get_gdp_service().store_path
+        return self._file_version('gdp_store', Path(path))
+
+    def _supabase_version(self, client, table):
+        result = client.table(table).select('id', count='exact').order('id', desc=True).limit(1).execute()
+        parts = [result.count, result.data[0].get('id') if result.data else None]
+        if table not in self._no_updated_at:
+            try:
+                latest = client.table(table).select('updated_at').order('updated_at', desc=True).limit(1).execute()
+                parts.append(latest.data[0].get('updated_at') if latest.data else None)
+            except Exception:
+                self._no_updated_at.add(table)
+        return _digest(parts)
+
+    def check(self):
+        """Versions actuelles {table: version}, interrogées sans les publier"""
+        with self._lock:
+            client = self._client()
+            versions = {}
+            for table in self.tables:
+                try:
+                    if client is None:
+                        versions[table] = None
+                    elif hasattr(client, 'data_dir'):
+                        versions[table] = self._local_version(client, table)
+                    else:
+                        versions[table] = self._supabase_version(client, table)
+                except Exception as error:
+                    if table not in self._unavailable:
+                        print(f"Version de la table {table} indisponible : {error}")
+                        self._unavailable.add(table)
+                    versions[table] = (self._versions or {}).get(table)
+                else:
+                    self._unavailable.discard(table)
+            versions['gdp_store'] = self._gdp_store_version()
+            versions['models'] = models_version(self.models_dir)
+            versions['simulations'] = simulations_version(self.models_dir)
+            return versions
+
+    def poll(self, force=False):
+        """Versions publiées, interrogées à nouveau si l'intervalle est écoulé (ou si `force`)
+
+        Quand le planificateur pilote les versions (`driven`), seules ses relectures les
+        publient : une nouvelle version n'apparaît qu'une fois les snapshots relus.
+        """
+        if not force and self._versions is not None and (
+                self.driven or time.time() - self._polled_at < self.interval):
+            return dict(self._versions)
+        return self.publish(self.check())
+
+    def publish(self, versions):
+        """Publier des versions relevées par check() (le planificateur, une fois les snapshots relus)"""
+        with self._lock:
+            self._versions = dict(versions)
+            self._polled_at = time.time()
+        return dict(versions)
+
+    def published(self):
+        """Dernières versions publiées, sans interroger les sources ({} avant le premier sondage)"""
+        with self._lock:
+            return dict(self._versions or {})
+
+    def version(self, table):
+        return self.poll().get(table)
+
+    def token(self, tables=None):
+        """Version combinée (toutes les tables et les modèles par défaut)"""
+        return token_of(self.poll(), tables)
+
+
+_versions = None
+
+
+def get_versions():
+    global _versions
+    if _versions is None:
+        _versions = DataVersions(interval=float(os.getenv('DATA_VERSION_INTERVAL', DEFAULT_INTERVAL)))
+    return _versions
+
+
+def token():
+    return get_versions().token()
+
+
+def init_etags(app, blueprints=VERSIONED_BLUEPRINTS):
+    """ETag faible (version des données + URL) sur les GET des Blueprints de données, 304 sans recalcul"""
+    from flask import make_response, request
+
+    def _etag():
+        return f"{token()}-{_digest([request.full_path])}"
+
+    @app.before_request
+    def _not_modified():
+        if request.method != 'GET' or request.blueprint not in blueprints or not request.if_none_match:
+            return None
+        etag = _etag()
+        if request.if_none_match.contains_weak(etag):
+            response = make_response('', 304)
+            response.set_etag(etag, weak=True)
+            return response
+        return None
+
+    @app.after_request
+    def _add_etag(response):
+        if request.method == 'GET' and request.blueprint in blueprints and response.status_code == 200:
+            response.set_etag(_etag(), weak=True)
+            response.headers.setdefault('Cache-Control', 'no-cache')
+        return response
+
+    return app
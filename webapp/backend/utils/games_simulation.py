@@ -0,0 +1,216 @@
+"""
+Simulation Monte-Carlo des médailles d'une édition complète des Jeux
+
+Programme : les épreuves (sport, épreuve, genre) de l'édition demandée si elle
+est dans les données, sinon de la dernière édition de la même saison, avec le
+nombre de médailles d'or / d'argent / de bronze de chaque épreuve.
+
+Force des pays : pour chaque épreuve, points (3/2/1 par or/argent/bronze)
+obtenus dans cette épreuve sur les `window` dernières éditions de la saison,
+pondérés par `decay` ** ancienneté, plus une part (`sport_weight`) des points
+moyens par épreuve du pays dans le sport. Seuls les `max_candidates` pays les
+plus forts de chaque épreuve sont tirés.
+
+Tirage : le podium d'une épreuve suit un modèle de Plackett-Luce (tirage sans
+remise proportionnel à la force), obtenu en une fois par une « course »
+exponentielle : chaque candidat reçoit un temps Exp(force), les premiers
+arrivés forment le podium. Une « forme » par pays et par simulation (bruit
+normal de `form_sigma` sur la log-force, commun à toutes ses épreuves) élargit
+les distributions comme le font les bonnes et mauvaises éditions réelles. Les simulations sont faites par lots NumPy et
+réparties sur plusieurs processus ; chaque lot ne renvoie que des
+histogrammes (pays x type de médaille x nombre), additionnés à la fin.
+"""
+import numpy as np
+
+MEDALS = ('gold', 'silver', 'bronze')
+COUNTS = MEDALS + ('total',)
+POINTS = {'GOLD': 3.0, 'SILVER': 2.0, 'BRONZE': 1.0}
+EVENT_KEY = ['sport', 'event', 'event_gender']
+
+DEFAULT_WINDOW = 5          # éditions de la même saison prises en compte
+DEFAULT_DECAY = 0.7         # poids d'une édition relativement à la suivante
+DEFAULT_SPORT_WEIGHT = 0.3  # part de la force moyenne dans le sport
+DEFAULT_FORM_SIGMA = 0.25   # écart-type de la forme d'un pays (log-force) par simulation
+MAX_CANDIDATES = 24
+BATCH_SIZE = 500
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+def _season(year):
+    """0 pour les Jeux d'été (année multiple de 4), 2 pour l'hiver (depuis 1994)"""
+    return int(year) % 4
+
+
+class GamesSimulator:
+    def __init__(self, year, programme_year, countries, country_names, events, candidates, strength, slot_medal):
+        self.year = int(year)
+        self.programme_year = int(programme_year)
+        self.countries = list(countries)
+        self.country_names = list(country_names)
+        self.events = list(events)
+        self.candidates = np.asarray(candidates, dtype=np.int32)        # (épreuves, K), -1 = vide
+        self.strength = np.asarray(strength, dtype=np.float32)          # (épreuves, K), 0 = vide
+        self.slot_medal = np.asarray(slot_medal, dtype=np.int8)         # (épreuves, places), -1 = pas de médaille
+        # nombre maximal de médailles d'un pays (borne des histogrammes)
+        self.max_medals = int((self.slot_medal >= 0).sum())
+
+    # ---------- construction ----------
+    @classmethod
+    def from_awards(cls, df, year, window=DEFAULT_WINDOW, decay=DEFAULT_DECAY,
+                    sport_weight=DEFAULT_SPORT_WEIGHT, max_candidates=MAX_CANDIDATES):
+        """Programme et forces depuis la table des remises (year, sport, event, event_gender, noc, country, medal, award_count)"""
+        import pandas as pd
+
+        df = df[df['noc'].notna() & df['medal'].isin(list(POINTS))].copy()
+        df['event_gender'] = df['event_gender'].fillna('')
+        season = df[df['year'] % 4 == _season(year)]
+        history_years = sorted(season.loc[season['year'] < year, 'year'].unique())[-window:]
+        if not history_years:
+            raise ValueError(f"Aucune édition de la même saison avant {year}")
+        programme_year = year if (season['year'] == year).any() else history_years[-1]
+
+        # programme : épreuves et nombre de médailles de chaque type
+        programme = (season[season['year'] == programme_year]
+                     .pivot_table(index=EVENT_KEY, columns='medal', values='award_count', aggfunc='sum', fill_value=0)
+                     .reindex(columns=['GOLD', 'SILVER', 'BRONZE'], fill_value=0)
+                     .reset_index())
+        programme['e'] = np.arange(len(programme))
+
+        # points pondérés par ancienneté
+        history = season[season['year'].isin(history_years)].copy()
+        age = {y: len(history_years) - 1 - i for i, y in enumerate(history_years)}
+        history['points'] = (history['medal'].map(POINTS) * history['award_count'].fillna(1)
+                             * decay ** history['year'].map(age))
+        event_points = history.groupby(EVENT_KEY + ['noc'], as_index=False)['points'].sum()
+        sport_events = history.groupby('sport')['event'].nunique()
+        sport_points = history.groupby(['sport', 'noc'], as_index=False)['points'].sum()
+        sport_points['sport_points'] = sport_points['points'] / sport_points['sport'].map(sport_events)
+
+        # candidats : pays médaillés dans le sport, force = épreuve + part du sport
+        pairs = programme[EVENT_KEY + ['e']].merge(sport_points[['sport', 'noc', 'sport_points']], on='sport')
+        pairs = pairs.merge(event_points, on=EVENT_KEY + ['noc'], how='left')
+        pairs['strength'] = pairs['points'].fillna(0) + sport_weight * pairs['sport_points']
+        pairs = pairs.sort_values(['e', 'strength', 'noc'], ascending=[True, False, True])
+        pairs['k'] = pairs.groupby('e').cumcount()
+        pairs = pairs[pairs['k'] < max_candidates]
+
+        country_codes, countries = pd.factorize(pairs['noc'], sort=True)
+        names = df.drop_duplicates('noc', keep='last').set_index('noc')['country']
+        country_names = [names.get(noc, noc) if isinstance(names.get(noc), str) else noc for noc in countries]
+
+        slots = programme[['GOLD', 'SILVER', 'BRONZE']].to_numpy(dtype=int)
+        width = max(int(pairs['k'].max()) + 1, int(slots.sum(axis=1).max()))
+        candidates = np.full((len(programme), width), -1, dtype=np.int32)
+        strength = np.zeros((len(programme), width))
+        candidates[pairs['e'], pairs['k']] = country_codes
+        strength[pairs['e'], pairs['k']] = pairs['strength'].to_numpy()
+
+        # médaille de chaque place du podium (dans l'ordre du tirage)
+        places = int(slots.sum(axis=1).max())
+        rank = np.arange(places)
+        slot_medal = np.where(rank < slots[:, :1], 0,
+                              np.where(rank < slots[:, :2].sum(axis=1, keepdims=True), 1,
+                                       np.where(rank < slots.sum(axis=1, keepdims=True), 2, -1)))
+
+        events = [' / '.join(str(v) for v in key) for key in programme[EVENT_KEY].itertuples(index=False)]
+        return cls(year, programme_year, list(countries), country_names, events, candidates, strength, slot_medal)
+
+    # ---------- simulation ----------
+    def simulate_batch(self, n, rng, form_sigma=DEFAULT_FORM_SIGMA):
+        """`n` Jeux simulés -> histogrammes (pays, or/argent/bronze/total, nombre de médailles)"""
+        n_events, width = self.candidates.shape
+        n_countries = len(self.countries)
+        places = self.slot_medal.shape[1]
+
+        # temps d'arrivée ~ Exp(force x forme du pays) ; les places vides (force 0) arrivent
+        # à l'infini (ou NaN pour un tirage nul), donc toujours après les vrais candidats
+        rate = np.broadcast_to(self.strength, (n, n_events, width))
+        if form_sigma:
+            form = np.exp(rng.normal(0.0, form_sigma, size=(n, n_countries))).astype(np.float32)
+            rate = rate * form[:, np.maximum(self.candidates, 0)]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            times = rng.standard_exponential(size=(n, n_events, width), dtype=np.float32) / rate
+        # places du podium : les `places` premiers arrivés de chaque épreuve, dans l'ordre
+        first = np.argpartition(times, places - 1, axis=2)[:, :, :places]
+        top = np.take_along_axis(first, np.argsort(np.take_along_axis(times, first, axis=2), axis=2), axis=2)
+        winners = self.candidates[np.arange(n_events)[None, :, None], top]
+        medals = np.broadcast_to(self.slot_medal, winners.shape)
+        # une épreuve avec moins de candidats que de places laisse ces médailles non attribuées
+        valid = (winners >= 0) & (medals >= 0)
+
+        simulation = np.broadcast_to(np.arange(n)[:, None, None], winners.shape)
+        index = (simulation[valid] * n_countries + winners[valid]) * len(MEDALS) + medals[valid]
+        counts = np.bincount(index, minlength=n * n_countries * len(MEDALS)).reshape(n, n_countries, len(MEDALS))
+        values = np.concatenate([counts, counts.sum(axis=2, keepdims=True)], axis=2)    # (n, pays, 4)
+
+        bins = self.max_medals + 1
+        cells = np.arange(n_countries * len(COUNTS)).reshape(n_countries, len(COUNTS)) * bins
+        return np.bincount((cells + values).ravel(), minlength=n_countries * len(COUNTS) * bins
+                           ).reshape(n_countries, len(COUNTS), bins)
+
+    def run(self, simulations=10000, workers=1, seed=None, form_sigma=DEFAULT_FORM_SIGMA, batch_size=BATCH_SIZE):
+        """Histogrammes cumulés de `simulations` Jeux (lots répartis sur `workers` processus)"""
+        sizes = [batch_size] * (simulations // batch_size)
+        if simulations % batch_size:
+            sizes.append(simulations % batch_size)
+        seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+        jobs = [(self, size, child, form_sigma) for size, child in zip(sizes, seeds)]
+
+        if workers > 1 and len(jobs) > 1:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                histograms = list(pool.map(_simulate_job, jobs))
+        else:
+            histograms = [_simulate_job(job) for job in jobs]
+        return np.sum(histograms, axis=0)
+
+    def summarize(self, histogram):
+        """Statistiques par pays (espérance, écart-type, percentiles, probabilités), triées par total moyen"""
+        simulations = int(histogram[0, 0].sum())
+        values = np.arange(histogram.shape[2])
+        mean = (histogram * values).sum(axis=2) / simulations                       # (pays, 4)
+        std = np.sqrt(np.maximum((histogram * values ** 2).sum(axis=2) / simulations - mean ** 2, 0.0))
+        cumulative = np.cumsum(histogram, axis=2)
+        # percentile « inverted_cdf » : plus petite valeur dont la fréquence cumulée atteint p %
+        percentiles = {p: (cumulative < np.ceil(p / 100 * simulations)).sum(axis=2) for p in PERCENTILES}
+        gold, total = COUNTS.index('gold'), COUNTS.index('total')
+
+        rows = []
+        for c in np.argsort(-mean[:, total], kind='stable'):
+            rows.append({
+                'noc': self.countries[c],
+                'country': self.country_names[c],
+                'mean': {name: round(float(mean[c, i]), 2) for i, name in enumerate(COUNTS)},
+                'std': {name: round(float(std[c, i]), 2) for i, name in enumerate(COUNTS)},
+                'percentiles': {name: {f'p{p}': int(percentiles[p][c, i]) for p in PERCENTILES}
+                                for i, name in enumerate(COUNTS)},
+                'prob_gold': round(float(1 - histogram[c, gold, 0] / simulations), 4),
+                'prob_medal': round(float(1 - histogram[c, total, 0] / simulations), 4),
+            })
+        return rows
+
+
+def simulate(awards, year, simulations, workers=1, seed=None, form_sigma=DEFAULT_FORM_SIGMA):
+    """Résultat sérialisable d'une simulation (métadonnées + statistiques par pays)"""
+    import time
+    from datetime import datetime, timezone
+
+    simulator = GamesSimulator.from_awards(awards, year)
+    started = time.perf_counter()
+    histogram = simulator.run(simulations, workers=workers, seed=seed, form_sigma=form_sigma)
+    return {
+        'year': simulator.year,
+        'programme_year': simulator.programme_year,
+        'events': len(simulator.events),
+        'simulations': simulations,
+        'seed': seed,
+        'form_sigma': form_sigma,
+        'generated_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'duration_s': round(time.perf_counter() - started, 2),
+        'countries': simulator.summarize(histogram),
+    }
+
+
+def _simulate_job(job):
+    simulator, size, seed, form_sigma = job
+    return simulator.simulate_batch(size, np.random.default_rng(seed), form_sigma)
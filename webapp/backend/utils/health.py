@@ -0,0 +1,93 @@
+"""
+Surveillance de la connectivité base de données en tâche de fond
+
+Les sondes de l'orchestrateur lisent le dernier résultat en mémoire au lieu
+d'interroger Supabase à chaque appel. Intervalle configurable avec
+HEALTH_CHECK_INTERVAL (secondes, défaut: 30).
+"""
+import os
+import threading
+import time
+from datetime import datetime
+
+from database.supabase_client import test_connection
+
+
+class ConnectivityMonitor:
+    """Exécute test_connection périodiquement dans un thread démon"""
+
+    def __init__(self, interval=30, check=None):
+        self.interval = interval
+        self._check = check or (lambda: test_connection(verbose=False))
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.connected = None
+        self.last_check = None
+        self.last_latency_ms = None
+        self.last_error = None
+        self.checks = 0
+
+    def check_now(self):
+        start = time.perf_counter()
+        error = None
+        try:
+            connected = bool(self._check())
+        except Exception as exc:
+            connected = False
+            error = str(exc)
+        latency = (time.perf_counter() - start) * 1000
+
+        with self._lock:
+            self.connected = connected
+            self.last_check = time.time()
+            self.last_latency_ms = round(latency, 2)
+            self.last_error = error
+            self.checks += 1
+        return connected
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.check_now()
+            self._stop.wait(self.interval)
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='connectivity-monitor', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def status(self):
+        with self._lock:
+            return {
+                'connected': self.connected,
+                'checked': self.last_check is not None,
+                'last_check': datetime.fromtimestamp(self.last_check).isoformat() if self.last_check else None,
+                'age_seconds': round(time.time() - self.last_check, 1) if self.last_check else None,
+                'latency_ms': self.last_latency_ms,
+                'error': self.last_error,
+                'interval_seconds': self.interval,
+                'checks': self.checks
+            }
+
+
+_monitor = None
+
+
+def get_monitor():
+    global _monitor
+    if _monitor is None:
+        _monitor = ConnectivityMonitor(interval=float(os.getenv('HEALTH_CHECK_INTERVAL', 30)))
+    return _monitor
+
+
+def init_health_monitor(app):
+    """Démarrer la vérification de connectivité en arrière-plan"""
+    monitor = get_monitor()
+    app.extensions['connectivity_monitor'] = monitor
+    monitor.start()
+    return monitor
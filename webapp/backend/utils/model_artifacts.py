@@ -0,0 +1,230 @@
+"""
+Format compact des modèles de prédiction (tableaux NumPy, sans pickle)
+
+Un modèle scikit-learn entraîné (forêt / arbre de régression ou modèle
+linéaire) précédé de son StandardScaler est « compilé » en tableaux plats :
+
+- arbres : un tableau float64 de 5 lignes (feature, threshold, left, right,
+  value) sur tous les nœuds de la forêt, chaque ligne contiguë ; seuils
+  exprimés dans l'échelle brute des features (x_scaled <= t  <=>
+  x <= t * scale + mean), indices entiers exacts en float64 ;
+- linéaire : coefficients et constante avec la normalisation intégrée.
+
+Les fichiers `<nom>.npy` (nœuds ou coefficients) et `<nom>.json` (colonnes,
+racines des arbres, métadonnées) sont lus avec np.load(mmap_mode='r') et les
+lignes du tableau sont indexées directement dans la projection mémoire, sans
+copie : le chargement est instantané et les pages sont partagées entre
+workers par le cache du système. La prédiction par lot ne dépend que de NumPy.
+
+Compiler les modèles existants :
+    python -m utils.model_artifacts models/country_best.joblib models/top25_best.joblib
+"""
+import json
+import os
+import sys
+
+import numpy as np
+
+LEAF = -1
+NODE_FIELDS = ('feature', 'threshold', 'left', 'right', 'value')
+
+
+def _scaler_arrays(scaler, n_features):
+    """(mean, scale) d'un StandardScaler, identité sans scaler"""
+    mean = np.zeros(n_features)
+    scale = np.ones(n_features)
+    if scaler is not None:
+        if getattr(scaler, 'mean_', None) is not None:
+            mean = np.asarray(scaler.mean_, dtype=float)
+        if getattr(scaler, 'scale_', None) is not None:
+            scale = np.asarray(scaler.scale_, dtype=float)
+    return mean, scale
+
+
+def compile_model(model, scaler=None, n_features=None):
+    """Convertir un modèle scikit-learn (+ scaler) en (kind, tableau, métadonnées) ; None si non supporté"""
+    if n_features is None:
+        n_features = int(getattr(model, 'n_features_in_', 0) or len(getattr(scaler, 'mean_', ()) or ()))
+    mean, scale = _scaler_arrays(scaler, n_features)
+
+    # arbre seul ou forêt (moyenne des arbres) ; le boosting n'est pas une moyenne
+    if hasattr(model, 'tree_'):
+        trees = [model]
+    elif type(model).__name__ in ('RandomForestRegressor', 'ExtraTreesRegressor'):
+        trees = model.estimators_
+    else:
+        trees = None
+    if trees is not None and getattr(model, 'n_outputs_', 1) == 1:
+        return _compile_trees(trees, mean, scale)
+
+    if hasattr(model, 'coef_') and hasattr(model, 'intercept_'):
+        coef = np.ravel(np.asarray(model.coef_, dtype=float))
+        weights = coef / scale
+        intercept = float(np.ravel([model.intercept_])[0]) - float(np.dot(weights, mean))
+        return 'linear', weights, {'intercept': intercept}
+
+    return None
+
+
+def _ordered_keys(x):
+    """Entiers int64 dans le même ordre que les flottants float64"""
+    bits = np.asarray(x, dtype=np.float64).view(np.int64)
+    return np.where(bits < 0, -(bits & np.int64(0x7FFFFFFFFFFFFFFF)), bits)
+
+
+def _from_ordered_keys(keys):
+    bits = np.where(keys < 0, (-keys) | np.int64(-0x8000000000000000), keys)
+    return bits.astype(np.int64).view(np.float64)
+
+
+def _raw_thresholds(threshold, mean, scale):
+    """Plus grand x brut tel que float32((x - mean) / scale) <= threshold, pour chaque nœud
+
+    scikit-learn compare les features normalisées puis converties en float32 ; la
+    condition est monotone en x, la bisection sur l'ordre des float64 donne donc
+    un seuil brut qui reproduit exactement chaque décision.
+    """
+    def goes_left(x):
+        return ((x - mean) / scale).astype(np.float32) <= threshold
+
+    guess = threshold * scale + mean
+    margin = 1e-6 * (np.abs(guess) + 1.0)
+    low, high = guess - margin, guess + margin
+    while not goes_left(low).all() or goes_left(high).any():
+        margin *= 2
+        low = np.where(goes_left(low), low, guess - margin)
+        high = np.where(goes_left(high), guess + margin, high)
+
+    low_key, high_key = _ordered_keys(low), _ordered_keys(high)
+    while (high_key - low_key > 1).any():
+        middle_key = low_key + (high_key - low_key) // 2
+        left = goes_left(_from_ordered_keys(middle_key))
+        low_key = np.where(left, middle_key, low_key)
+        high_key = np.where(left, high_key, middle_key)
+    return _from_ordered_keys(low_key)
+
+
+def _compile_trees(trees, mean, scale):
+    """Concaténer les arbres d'une forêt (moyenne des feuilles) en un seul tableau de nœuds"""
+    blocks, roots, depth, offset = [], [], 0, 0
+    for estimator in trees:
+        tree = estimator.tree_
+        nodes = dict.fromkeys(NODE_FIELDS)
+        leaf = tree.children_left < 0
+        feature = np.where(leaf, 0, tree.feature)
+        nodes['feature'] = np.where(leaf, LEAF, tree.feature)
+        # seuil dans l'échelle brute : le scaler est intégré à l'arbre
+        split = ~leaf
+        nodes['threshold'] = np.zeros(tree.node_count)
+        nodes['threshold'][split] = _raw_thresholds(tree.threshold[split], mean[feature[split]], scale[feature[split]])
+        nodes['left'] = np.where(leaf, np.arange(tree.node_count), tree.children_left) + offset
+        nodes['right'] = np.where(leaf, np.arange(tree.node_count), tree.children_right) + offset
+        nodes['value'] = tree.value.reshape(tree.node_count, -1)[:, 0]
+        blocks.append(np.vstack([np.asarray(nodes[name], dtype=np.float64) for name in NODE_FIELDS]))
+        roots.append(offset)
+        depth = max(depth, int(tree.max_depth))
+        offset += tree.node_count
+    return 'forest', np.ascontiguousarray(np.hstack(blocks)), {'roots': roots, 'max_depth': depth}
+
+
+class CompiledForest:
+    """Moyenne d'arbres de régression parcourus en parallèle pour tout le lot"""
+
+    def __init__(self, nodes, roots, max_depth):
+        # tableau (5, nœuds) : chaque ligne est une vue de la projection mémoire, sans copie
+        self.nodes = nodes
+        self.roots = np.asarray(roots, dtype=np.intp)
+        self.max_depth = int(max_depth)
+        self.feature, self.threshold, self.left, self.right, self.value = nodes
+
+    def predict(self, X):
+        X = np.asarray(X, dtype=float)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        rows = np.arange(len(X))[:, None]
+        node = np.broadcast_to(self.roots, (len(X), len(self.roots))).copy()
+        for _ in range(self.max_depth):
+            feature = self.feature[node].astype(np.intp)
+            split = feature != LEAF
+            if not split.any():
+                break
+            goes_left = X[rows, np.maximum(feature, 0)] <= self.threshold[node]
+            node = np.where(split, np.where(goes_left, self.left[node], self.right[node]).astype(np.intp), node)
+        return self.value[node].mean(axis=1)
+
+
+class CompiledLinear:
+    def __init__(self, weights, intercept):
+        self.weights = np.asarray(weights, dtype=float)
+        self.intercept = float(intercept)
+
+    def predict(self, X):
+        X = np.asarray(X, dtype=float)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        return X @ self.weights + self.intercept
+
+
+def artifact_paths(prefix):
+    """Chemins (.npy, .json) d'un modèle compilé ; `prefix` sans extension (ou avec .joblib)"""
+    base = prefix[:-len('.joblib')] if prefix.endswith('.joblib') else prefix
+    return base + '.npy', base + '.json'
+
+
+def export_compiled(model_data, prefix):
+    """Écrire la version compacte d'un dict {'model', 'scaler', 'feature_columns', ...} ; False si non supporté"""
+    feature_columns = list(model_data.get('feature_columns', []))
+    compiled = compile_model(model_data['model'], model_data.get('scaler'), len(feature_columns) or None)
+    if compiled is None:
+        return False
+    kind, array, extra = compiled
+    npy_path, json_path = artifact_paths(prefix)
+    np.save(npy_path, array)
+    meta = {
+        'kind': kind,
+        'feature_columns': feature_columns,
+        'model_type': model_data.get('model_type'),
+        'version': model_data.get('version'),
+        'accuracy': model_data.get('accuracy'),
+        'estimator': type(model_data['model']).__name__,
+        **extra,
+    }
+    with open(json_path, 'w', encoding='utf-8') as handle:
+        json.dump(meta, handle, indent=2)
+    return True
+
+
+def load_compiled(prefix):
+    """Charger un modèle compilé : dict au format des .joblib ('model', 'scaler' = None, ...) ; None si absent"""
+    npy_path, json_path = artifact_paths(prefix)
+    if not (os.path.exists(npy_path) and os.path.exists(json_path)):
+        return None
+    with open(json_path, encoding='utf-8') as handle:
+        meta = json.load(handle)
+    array = np.load(npy_path, mmap_mode='r')
+    if meta['kind'] == 'forest':
+        model = CompiledForest(array, meta['roots'], meta['max_depth'])
+    else:
+        model = CompiledLinear(array, meta['intercept'])
+    return {
+        'model': model,
+        'scaler': None,  # normalisation intégrée aux seuils / coefficients
+        'feature_columns': meta['feature_columns'],
+        'model_type': meta.get('model_type'),
+        'version': meta.get('version'),
+        'accuracy': meta.get('accuracy'),
+        'compiled': True,
+    }
+
+
+if __name__ == '__main__':
+    import joblib
+
+    for path in sys.argv[1:]:
+        data = joblib.load(path)
+        if not (isinstance(data, dict) and 'model' in data):
+            print(f"{path}: format non supporté")
+        elif export_compiled(data, path):
+            print(f"{path} -> {', '.join(artifact_paths(path))}")
+        else:
+            print(f"{path}: modèle {type(data['model']).__name__} non compilable, le .joblib reste utilisé")
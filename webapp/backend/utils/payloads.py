@@ -0,0 +1,150 @@
+"""
+Réponses d'analyse précalculées (payloads)
+
+Les endpoints d'analyse les plus demandés enregistrent ici leur fonction de
+calcul sous un nom ; la réponse est gardée en mémoire par (nom, arguments,
+version des données) dans le cache 'analytics_payloads' et peut être calculée
+à l'avance, par exemple au démarrage (utils/warmup.py). Une réponse en échec
+(None ou {'status': 'error'}) n'est jamais mise en cache. Quand les tables
+sources ou les modèles changent (utils/data_version.py), la clé change : une
+réponse calculée sur d'anciennes données n'est plus servie.
+
+Stale-while-revalidate (TTLCache.fetch) : passé le TTL (CACHE_TTL), la réponse en mémoire
+continue d'être servie et un recalcul est lancé en arrière-plan ; seul le
+tout premier appel d'un payload jamais calculé attend. Le planificateur
+(utils/scheduler.py) recalcule tous les payloads avant leur expiration et les
+publie dans un répertoire partagé, relu par les autres workers.
+"""
+import hashlib
+import json
+import os
+import threading
+
+from utils import data_version
+from utils.cache import DEFAULT_TTL, get_cache
+
+_cache = get_cache('analytics_payloads', ttl=DEFAULT_TTL, maxsize=64)
+_builders = {}
+_lock = threading.Lock()
+
+
+def register(name, builder):
+    """Enregistrer la fonction qui calcule le payload `name` (appelée avec ses arguments)"""
+    with _lock:
+        _builders[name] = builder
+    return builder
+
+
+def payload(name):
+    """Décorateur : register(name, fonction)"""
+    def decorator(builder):
+        return register(name, builder)
+    return decorator
+
+
+def registered():
+    with _lock:
+        return sorted(_builders)
+
+
+def is_failed(value):
+    return value is None or (isinstance(value, dict) and value.get('status') == 'error')
+
+
+def compute(name, *args):
+    """Recalculer le payload et le mettre en cache s'il est valide"""
+    with _lock:
+        builder = _builders[name]
+    version = data_version.token()
+    value = builder(*args)
+    if not is_failed(value):
+        _cache.set((name, args, version), value)
+    return value
+
+
+def get(name, *args):
+    """Payload en mémoire (recalculé en arrière-plan s'il est périmé, TTLCache.fetch), calculé à la demande sinon"""
+    with _lock:
+        builder = _builders[name]
+    failed = []
+
+    def build():
+        value = builder(*args)
+        if is_failed(value):
+            # pas mis en cache ; renvoyé tel quel à l'appelant d'un calcul à la demande
+            failed.append(value)
+            return None
+        return value
+
+    value = _cache.fetch((name, args, data_version.token()), build)
+    return failed[0] if value is None and failed else value
+
+
+def refresh_all():
+    """Recalculer tous les payloads en mémoire (une fois par nom et arguments, quelle que soit
+    la version) ; renvoie les noms en échec (l'ancienne valeur est gardée)"""
+    failed = []
+    for name, args in dict.fromkeys(key[:2] for key in _cache.keys()):
+        try:
+            if is_failed(compute(name, *args)):
+                failed.append(name)
+        except Exception as error:
+            failed.append(f'{name} ({error})')
+    return failed
+
+
+# ---------- partage entre workers ----------
+def _json_default(value):
+    # scalaires NumPy / pandas
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+
+def _path(directory, key):
+    digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()[:16]
+    return os.path.join(directory, f'{key[0]}-{digest}.json')
+
+
+def publish(directory):
+    """Écrire chaque payload de la version courante dans `directory` (un JSON par payload, écriture atomique)"""
+    os.makedirs(directory, exist_ok=True)
+    version = data_version.token()
+    written = 0
+    for key in _cache.keys():
+        if key[2] != version:
+            continue
+        entry = _cache.peek(key)
+        if entry is None:
+            continue
+        path = _path(directory, key[:2])
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as handle:
+            json.dump({'name': key[0], 'args': list(key[1]), 'version': version, 'value': entry[0]},
+                      handle, default=_json_default)
+        os.replace(tmp_path, path)
+        written += 1
+    return written
+
+
+def load_published(directory, since=0.0):
+    """Charger les payloads publiés après `since` (horodatage) pour la version courante des
+    données ; renvoie le nombre chargé"""
+    if not os.path.isdir(directory):
+        return 0
+    version = data_version.token()
+    loaded = 0
+    for filename in os.listdir(directory):
+        path = os.path.join(directory, filename)
+        if not filename.endswith('.json') or os.path.getmtime(path) <= since:
+            continue
+        try:
+            with open(path, encoding='utf-8') as handle:
+                data = json.load(handle)
+        except (OSError, ValueError):
+            continue
+        if data.get('version') != version:
+            continue
+        _cache.set((data['name'], tuple(data['args']), version), data['value'])
+        loaded += 1
+    return loaded
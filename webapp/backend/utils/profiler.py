@@ -0,0 +1,198 @@
+"""
+Profilage à la demande des requêtes Flask (cProfile)
+
+Désactivé par défaut. Une fois activé via PROFILING_ENABLED, seules les
+requêtes dont le chemin figure dans l'allowlist ET qui portent le flag
+(en-tête X-Profile: 1 ou paramètre ?profile=1) sont exécutées sous cProfile.
+
+Variables d'environnement :
+- PROFILING_ENABLED   : 'true' pour activer le hook (défaut: false)
+- PROFILING_ALLOWLIST : préfixes de chemins autorisés, séparés par des virgules
+                        (défaut: '/api/medals,/api/gdp-analysis')
+- PROFILING_TOKEN     : si défini, l'en-tête X-Profile doit contenir ce jeton
+- PROFILING_TOP_N     : nombre de fonctions retournées (défaut: 25)
+- PROFILING_KEEP      : nombre de fichiers .pstats conservés pour les requêtes
+                        les plus lentes (défaut: 0 = aucun fichier écrit)
+- PROFILING_DIR       : dossier des fichiers .pstats (défaut: ./profiles)
+"""
+import cProfile
+import heapq
+import io
+import os
+import pstats
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+from flask import Blueprint, g, jsonify, request
+
+PROFILE_HEADER = 'X-Profile'
+PROFILE_QUERY_PARAM = 'profile'
+
+profiling_bp = Blueprint('profiling', __name__, url_prefix='/api/profiling')
+
+
+def _env_list(name, default):
+    raw = os.getenv(name, default)
+    return [item.strip() for item in raw.split(',') if item.strip()]
+
+
+class RequestProfiler:
+    """Exécute les requêtes sélectionnées sous cProfile et garde les résultats"""
+
+    def __init__(self, allowlist=None, token=None, top_n=25, keep_slowest=0,
+                 output_dir='profiles', history_size=50):
+        self.allowlist = allowlist or []
+        self.token = token
+        self.top_n = top_n
+        self.keep_slowest = keep_slowest
+        self.output_dir = output_dir
+        self.recent = deque(maxlen=history_size)
+        # Tas min (durée, compteur, chemin du fichier) des requêtes les plus lentes
+        self._slowest = []
+        self._counter = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            allowlist=_env_list('PROFILING_ALLOWLIST', '/api/medals,/api/gdp-analysis'),
+            token=os.getenv('PROFILING_TOKEN') or None,
+            top_n=int(os.getenv('PROFILING_TOP_N', 25)),
+            keep_slowest=int(os.getenv('PROFILING_KEEP', 0)),
+            output_dir=os.getenv('PROFILING_DIR', 'profiles'),
+        )
+
+    def is_allowed(self, path):
+        return any(path.startswith(prefix) for prefix in self.allowlist)
+
+    def is_requested(self, req):
+        flag = req.headers.get(PROFILE_HEADER) or req.args.get(PROFILE_QUERY_PARAM)
+        if not flag:
+            return False
+        if self.token:
+            return flag == self.token
+        return flag.lower() in ('1', 'true', 'yes')
+
+    def should_profile(self, req):
+        return self.is_allowed(req.path) and self.is_requested(req)
+
+    def summarize(self, profile):
+        """Top N fonctions triées par temps cumulé"""
+        stats = pstats.Stats(profile, stream=io.StringIO())
+        rows = []
+        for (filename, lineno, funcname), (cc, nc, tt, ct, _callers) in stats.stats.items():
+            rows.append({
+                'function': funcname,
+                'file': filename,
+                'line': lineno,
+                'calls': nc,
+                'primitive_calls': cc,
+                'total_time': round(tt, 6),
+                'cumulative_time': round(ct, 6)
+            })
+        rows.sort(key=lambda r: r['cumulative_time'], reverse=True)
+        return rows[:self.top_n]
+
+    def record(self, path, profile, duration):
+        """Enregistrer le résumé et, si configuré, le fichier .pstats"""
+        entry = {
+            'path': path,
+            'duration_ms': round(duration * 1000, 3),
+            'timestamp': datetime.now().isoformat(),
+            'top_functions': self.summarize(profile),
+            'pstats_file': None
+        }
+
+        if self.keep_slowest > 0:
+            entry['pstats_file'] = self._keep_if_slow(path, profile, duration)
+
+        with self._lock:
+            self.recent.append(entry)
+        return entry
+
+    def _keep_if_slow(self, path, profile, duration):
+        with self._lock:
+            self._counter += 1
+            counter = self._counter
+            if len(self._slowest) >= self.keep_slowest and duration <= self._slowest[0][0]:
+                return None
+
+            os.makedirs(self.output_dir, exist_ok=True)
+            safe_path = path.strip('/').replace('/', '_') or 'root'
+            filename = os.path.join(self.output_dir, f'{safe_path}_{int(time.time())}_{counter}.pstats')
+            profile.dump_stats(filename)
+
+            heapq.heappush(self._slowest, (duration, counter, filename))
+            if len(self._slowest) > self.keep_slowest:
+                _, _, evicted = heapq.heappop(self._slowest)
+                try:
+                    os.remove(evicted)
+                except OSError:
+                    pass
+            return filename
+
+    def slowest(self):
+        with self._lock:
+            return [
+                {'duration_ms': round(d * 1000, 3), 'pstats_file': f}
+                for d, _, f in sorted(self._slowest, reverse=True)
+            ]
+
+
+def init_profiler(app, profiler=None):
+    """Brancher le profiler sur l'application si PROFILING_ENABLED est actif"""
+    if profiler is None:
+        if os.getenv('PROFILING_ENABLED', 'False').lower() != 'true':
+            return None
+        profiler = RequestProfiler.from_env()
+
+    app.extensions['request_profiler'] = profiler
+
+    @app.before_request
+    def _start_profile():
+        if not profiler.should_profile(request):
+            return None
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Un autre profiler est déjà actif sur ce thread
+            return None
+        g._profile = profile
+        g._profile_started = time.perf_counter()
+        return None
+
+    @app.after_request
+    def _stop_profile(response):
+        profile = g.pop('_profile', None)
+        if profile is None:
+            return response
+        profile.disable()
+        duration = time.perf_counter() - g.pop('_profile_started')
+        entry = profiler.record(request.path, profile, duration)
+
+        response.headers['X-Profile-Duration-Ms'] = str(entry['duration_ms'])
+        # Injecter le résumé dans les réponses JSON objet
+        if response.is_json and not response.direct_passthrough:
+            payload = response.get_json(silent=True)
+            if isinstance(payload, dict):
+                payload['profile'] = entry
+                response.set_data(app.json.dumps(payload))
+        return response
+
+    app.register_blueprint(profiling_bp)
+    return profiler
+
+
+@profiling_bp.route('/recent')
+def get_recent_profiles():
+    """Derniers profils enregistrés et fichiers .pstats des requêtes les plus lentes"""
+    from flask import current_app
+    profiler = current_app.extensions['request_profiler']
+    return jsonify({
+        'status': 'success',
+        'data': list(profiler.recent),
+        'slowest': profiler.slowest()
+    })
@@ -0,0 +1,232 @@
+"""
+Planificateur de rafraîchissement en arrière-plan des analyses en cache
+
+Un thread démon par worker, réveillé toutes les SCHEDULER_POLL secondes :
+
+- un seul worker, le « leader » (verrou fichier non bloquant sur
+  SCHEDULER_DIR/leader.lock, repris par un autre worker si le leader
+  s'arrête), relit les snapshots de données, reconstruit les index de
+  recherche et de facettes et recalcule les payloads d'analyse
+  (MedalService, HostService, analyse PIB, prédictions) toutes les
+  REFRESH_INTERVAL secondes, avec une gigue de ±REFRESH_JITTER pour ne pas
+  synchroniser les déploiements, ou dès que la version des données sources
+  change ; il publie ensuite les payloads dans SCHEDULER_DIR ;
+- les autres workers chargent les payloads publiés et, si les données
+  sources changent, relisent leurs propres snapshots.
+
+Entre deux rafraîchissements, les réponses en mémoire restent servies
+(stale-while-revalidate, voir utils/payloads.py) : aucun utilisateur n'attend
+un recalcul. Désactivé avec SCHEDULER_ENABLED=false.
+"""
+import os
+import random
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+from utils import data_version, payloads
+
+try:
+    import fcntl
+except ImportError:  # Windows : un seul processus en développement
+    fcntl = None
+
+DEFAULT_INTERVAL = 240   # sous CACHE_TTL (300 s) : les payloads ne périment pas
+DEFAULT_JITTER = 0.1
+DEFAULT_POLL = 30
+DEFAULT_DIR = os.path.join(tempfile.gettempdir(), 'olympics_refresh')
+
+
+def source_version():
+    """Version des tables sources et des modèles (utils/data_version.py), sans la publier"""
+    return data_version.get_versions().check()
+
+
+def refresh_snapshots():
+    """Relire les tables en mémoire et reconstruire les structures dérivées, sans les vider"""
+    from database.supabase_client import get_supabase_client
+    from routes.gdp_analysis_routes import load_medals_data
+    from services.athlete_service import AthleteService
+    from services.medal_service import MedalService
+    from services.search_service import SearchService
+
+    # versions relevées AVANT la relecture : les données lues sont au moins aussi récentes
+    versions = data_version.get_versions()
+    pending = versions.check()
+    token = data_version.token_of(pending)
+
+    client = get_supabase_client()
+    if hasattr(client, 'refresh'):
+        client.refresh()
+    load_medals_data.refresh()
+    MedalService.get_trend_engines(refresh=True)
+    # index de recherche et de facettes, sous la version à publier : aucune requête n'attend
+    SearchService.refresh_indexes(token)
+    AthleteService.refresh_search_index(token)
+    # snapshots à jour : la nouvelle version peut entrer dans les clés de cache et les ETag
+    versions.publish(pending)
+
+
+def refresh_analytics():
+    """Snapshots puis payloads ; lève une erreur si des payloads n'ont pas pu être recalculés"""
+    refresh_snapshots()
+    failed = payloads.refresh_all()
+    if failed:
+        raise RuntimeError(f"payloads en échec : {', '.join(failed)}")
+
+
+class RefreshScheduler:
+    def __init__(self, refresh=refresh_analytics, interval=DEFAULT_INTERVAL, jitter=DEFAULT_JITTER,
+                 poll=DEFAULT_POLL, directory=DEFAULT_DIR, version=source_version,
+                 follower_refresh=refresh_snapshots):
+        self._refresh = refresh
+        self._follower_refresh = follower_refresh
+        self._version = version
+        self.interval = interval
+        self.jitter = jitter
+        self.poll = poll
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock_file = None
+        self.leader = False
+        self.started_at = time.time()
+        self.next_run = None
+        self.last_run = None
+        self.last_duration_ms = None
+        self.last_error = None
+        self.last_version = None
+        self.last_sync = self.started_at
+        self.runs = 0
+
+    def _next_delay(self):
+        return self.interval * (1 + random.uniform(-self.jitter, self.jitter))
+
+    def _try_lead(self):
+        """Prendre le verrou de leader sans attendre ; True si ce worker est leader"""
+        if self.leader:
+            return True
+        if fcntl is None:
+            self.leader = True
+            return True
+        os.makedirs(self.directory, exist_ok=True)
+        handle = open(os.path.join(self.directory, 'leader.lock'), 'a')
+        try:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            handle.close()
+            return False
+        self._lock_file = handle  # garder le descripteur ouvert : le verrou dure autant que le processus
+        self.leader = True
+        return True
+
+    def _safe_version(self):
+        try:
+            return self._version() if self._version else None
+        except Exception:
+            return None
+
+    def run_refresh(self, version=None):
+        start = time.perf_counter()
+        error = None
+        try:
+            self._refresh()
+        except Exception as exc:
+            error = str(exc)
+            print(f"Rafraîchissement des analyses en échec : {error}")
+        if self.directory:
+            try:
+                payloads.publish(self.directory)
+            except OSError as exc:
+                error = error or f'publication : {exc}'
+        with self._lock:
+            self.last_run = time.time()
+            self.last_duration_ms = round((time.perf_counter() - start) * 1000, 1)
+            self.last_error = error
+            self.last_version = version
+            self.next_run = self.last_run + self._next_delay()
+            self.runs += 1
+
+    def tick(self):
+        """Un réveil : rafraîchir (leader) ou charger les payloads publiés (autres workers)"""
+        version = self._safe_version()
+        if self._try_lead():
+            with self._lock:
+                if self.next_run is None:
+                    # premier réveil du leader : le préchauffage vient de tout calculer
+                    self.next_run = time.time() + self._next_delay()
+                due = time.time() >= self.next_run or version != self.last_version
+            if due:
+                self.run_refresh(version)
+            return
+
+        if version != self.last_version:
+            if self.last_version is not None and self._follower_refresh:
+                try:
+                    self._follower_refresh()
+                except Exception as exc:
+                    print(f"Relecture des snapshots en échec : {exc}")
+            self.last_version = version
+        if self.directory:
+            sync = time.time()
+            payloads.load_published(self.directory, since=self.last_sync)
+            self.last_sync = sync
+
+    def _run(self):
+        while not self._stop.wait(self.poll):
+            try:
+                self.tick()
+            except Exception as exc:
+                print(f"Planificateur : {exc}")
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self.last_version = self._safe_version()
+        self._thread = threading.Thread(target=self._run, name='refresh-scheduler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def status(self):
+        with self._lock:
+            return {
+                'leader': self.leader,
+                'interval_seconds': self.interval,
+                'jitter': self.jitter,
+                'runs': self.runs,
+                'last_run': datetime.fromtimestamp(self.last_run).isoformat() if self.last_run else None,
+                'next_run': datetime.fromtimestamp(self.next_run).isoformat() if self.next_run else None,
+                'last_duration_ms': self.last_duration_ms,
+                'error': self.last_error,
+            }
+
+
+_scheduler = None
+
+
+def get_scheduler():
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = RefreshScheduler(
+            interval=float(os.getenv('REFRESH_INTERVAL', DEFAULT_INTERVAL)),
+            jitter=float(os.getenv('REFRESH_JITTER', DEFAULT_JITTER)),
+            poll=float(os.getenv('SCHEDULER_POLL', DEFAULT_POLL)),
+            directory=os.getenv('SCHEDULER_DIR', DEFAULT_DIR),
+        )
+    return _scheduler
+
+
+def init_scheduler(app):
+    """Démarrer le rafraîchissement en arrière-plan (SCHEDULER_ENABLED=false pour le désactiver)"""
+    if os.getenv('SCHEDULER_ENABLED', 'true').lower() != 'true':
+        return None
+    scheduler = get_scheduler()
+    app.extensions['refresh_scheduler'] = scheduler
+    data_version.get_versions().driven = True
+    scheduler.start()
+    return scheduler
@@ -0,0 +1,293 @@
+"""
+Index de recherche en mémoire pour la recherche « type-ahead »
+
+Les noms sont normalisés (minuscules, accents supprimés, ponctuation -> espace)
+puis indexés de deux façons :
+- tableaux triés de tokens et de noms complets : recherche par préfixe avec
+  np.searchsorted (pas de parcours de la table)
+- trigrammes -> listes de lignes : recherche de sous-chaîne (équivalent de
+  ilike %terme%) et recherche approchée (similarité de trigrammes)
+
+Les résultats sont classés : nom exact, préfixe du nom, préfixe de chaque mot,
+sous-chaîne ; la correspondance approchée n'est utilisée qu'en l'absence de
+résultat exact (faute de frappe). À rang égal, ordre alphabétique.
+
+Pour les tables (médailles, résultats), les ensembles de lignes sont des bitmaps
+(entiers Python, bit i = ligne i) : InvertedIndex associe chaque token à un
+bitmap, ValueIndex chaque valeur d'une colonne de filtre ; une recherche
+combinée à des filtres est une suite de OR / AND sur ces entiers.
+"""
+import bisect
+import re
+import unicodedata
+
+import numpy as np
+
+# Rangs de correspondance (plus petit = meilleur)
+EXACT, NAME_PREFIX, TOKEN_PREFIX, SUBSTRING, FUZZY = range(5)
+
+# Part minimale des trigrammes de la requête présents dans le nom (recherche approchée)
+FUZZY_THRESHOLD = 0.6
+
+_NON_ALNUM = re.compile(r'[\W_]+')
+
+
+def fold_text(value):
+    """Minuscules, sans accents, ponctuation remplacée par des espaces"""
+    if value is None:
+        return ''
+    text = str(value)
+    if not text.isascii():
+        text = unicodedata.normalize('NFKD', text)
+        text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    return _NON_ALNUM.sub(' ', text.casefold()).strip()
+
+
+def tokenize(value):
+    return fold_text(value).split()
+
+
+def trigrams(folded):
+    return {folded[i:i + 3] for i in range(len(folded) - 2)}
+
+
+class NameIndex:
+    """Index d'une colonne de noms ; les résultats sont des positions de ligne"""
+
+    def __init__(self, names, fuzzy_threshold=FUZZY_THRESHOLD):
+        self.fuzzy_threshold = fuzzy_threshold
+        self.folded = [fold_text(n) for n in names]
+        self.size = len(self.folded)
+
+        folded = np.array(self.folded, dtype=str) if self.size else np.array([], dtype='<U1')
+        # Rang alphabétique (départage à pertinence égale)
+        order = np.argsort(folded, kind='stable')
+        self.alpha_rank = np.empty(self.size, dtype=np.int64)
+        self.alpha_rank[order] = np.arange(self.size)
+        self._sorted_names = folded[order]
+        self._sorted_name_rows = order
+
+        token_rows, tokens = [], []
+        postings = {}
+        n_trigrams = np.zeros(self.size, dtype=np.int64)
+        for row, name in enumerate(self.folded):
+            for token in name.split():
+                tokens.append(token)
+                token_rows.append(row)
+            grams = trigrams(name)
+            n_trigrams[row] = len(grams)
+            for gram in grams:
+                postings.setdefault(gram, []).append(row)
+
+        tokens = np.array(tokens, dtype=str) if tokens else np.array([], dtype='<U1')
+        token_order = np.argsort(tokens, kind='stable')
+        self._sorted_tokens = tokens[token_order]
+        self._sorted_token_rows = np.array(token_rows, dtype=np.int64)[token_order]
+        self._postings = {g: np.array(rows, dtype=np.int64) for g, rows in postings.items()}
+        self._n_trigrams = n_trigrams
+
+    # ---------- primitives ----------
+    @staticmethod
+    def _prefix_range(sorted_values, prefix):
+        lo = np.searchsorted(sorted_values, prefix, side='left')
+        hi = np.searchsorted(sorted_values, prefix + '\U0010ffff', side='left')
+        return lo, hi
+
+    def _name_prefix_rows(self, query):
+        lo, hi = self._prefix_range(self._sorted_names, query)
+        return self._sorted_name_rows[lo:hi]
+
+    def _token_prefix_rows(self, query_tokens):
+        """Lignes dont chaque mot de la requête est le préfixe d'un mot du nom"""
+        rows = None
+        for token in query_tokens:
+            lo, hi = self._prefix_range(self._sorted_tokens, token)
+            found = np.unique(self._sorted_token_rows[lo:hi])
+            rows = found if rows is None else np.intersect1d(rows, found, assume_unique=True)
+            if not len(rows):
+                break
+        return rows if rows is not None else np.array([], dtype=np.int64)
+
+    def _substring_rows(self, query):
+        grams = trigrams(query)
+        lists = [self._postings.get(g) for g in grams]
+        if any(p is None for p in lists):
+            return np.array([], dtype=np.int64)
+        lists.sort(key=len)
+        rows = lists[0]
+        for postings in lists[1:]:
+            rows = np.intersect1d(rows, postings, assume_unique=True)
+            if not len(rows):
+                return rows
+        # les trigrammes sont tous présents : vérifier la contiguïté
+        return np.array([r for r in rows if query in self.folded[r]], dtype=np.int64)
+
+    def _fuzzy_rows(self, query):
+        grams = trigrams(query)
+        lists = [self._postings[g] for g in grams if g in self._postings]
+        if not lists:
+            return np.array([], dtype=np.int64), np.array([])
+        shared = np.bincount(np.concatenate(lists), minlength=self.size)
+        candidates = np.flatnonzero(shared)
+        common = shared[candidates]
+        keep = common / len(grams) >= self.fuzzy_threshold
+        candidates, common = candidates[keep], common[keep]
+        # classement par similarité de Jaccard (favorise les noms proches en longueur)
+        return candidates, common / (len(grams) + self._n_trigrams[candidates] - common)
+
+    # ---------- recherche ----------
+    def search(self, query, fuzzy=True):
+        """Positions des lignes correspondantes, classées par pertinence"""
+        query = fold_text(query)
+        if not query or not self.size:
+            return np.array([], dtype=np.int64)
+
+        rank = np.full(self.size, FUZZY + 1, dtype=np.int64)
+        score = np.zeros(self.size)
+
+        def mark(rows, level):
+            rows = rows[rank[rows] > level]
+            rank[rows] = level
+
+        mark(self._token_prefix_rows(query.split()), TOKEN_PREFIX)
+        if len(query) >= 3:
+            mark(self._substring_rows(query), SUBSTRING)
+        name_prefix = self._name_prefix_rows(query)
+        mark(name_prefix, NAME_PREFIX)
+        mark(name_prefix[[self.folded[r] == query for r in name_prefix]], EXACT)
+
+        if fuzzy and len(query) >= 3 and not (rank <= SUBSTRING).any():
+            rows, similarity = self._fuzzy_rows(query)
+            rank[rows] = FUZZY
+            score[rows] = similarity
+
+        matched = np.flatnonzero(rank <= FUZZY)
+        order = np.lexsort((self.alpha_rank[matched], -score[matched], rank[matched]))
+        return matched[order]
+
+
+
+# ---------- bitmaps ----------
+
+def rows_to_bitmap(rows, size):
+    """Positions de lignes -> bitmap (entier Python, bit i = ligne i)"""
+    bits = np.zeros(size, dtype=bool)
+    bits[rows] = True
+    return int.from_bytes(np.packbits(bits, bitorder='little').tobytes(), 'little')
+
+
+def bitmap_to_rows(bitmap, size):
+    """Bitmap -> positions de lignes triées"""
+    raw = bitmap.to_bytes((size + 7) // 8, 'little')
+    bits = np.unpackbits(np.frombuffer(raw, dtype=np.uint8), count=size, bitorder='little')
+    return np.flatnonzero(bits)
+
+
+def _group_rows(values):
+    """[(valeur, positions des lignes)] pour une colonne, valeurs triées (manquantes ignorées)"""
+    import pandas as pd
+
+    codes, uniques = pd.factorize(pd.Series(values), sort=True)
+    order = np.argsort(codes, kind='stable')
+    bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+    return [(_python_value(uniques[i]), order[bounds[i]:bounds[i + 1]]) for i in range(len(uniques))]
+
+
+def _python_value(value):
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _value_key(value):
+    """Clé de comparaison : les nombres sont comparés en float ('2020' == 2020)"""
+    if isinstance(value, (bool, np.bool_)):
+        return value
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        return float(value)
+    return str(value)
+
+
+class ValueIndex:
+    """Une colonne de filtre : un bitmap par valeur distincte"""
+
+    def __init__(self, values):
+        self.size = len(values)
+        self.bitmaps = {}
+        self.labels = {}        # clé -> valeur d'origine (pour les facettes)
+        for value, rows in _group_rows(values):
+            key = _value_key(value)
+            self.bitmaps[key] = rows_to_bitmap(rows, self.size)
+            self.labels[key] = value
+        self.numeric = all(isinstance(k, float) for k in self.bitmaps)
+        self._sorted_keys = sorted(self.bitmaps) if self.numeric else None
+
+    def _key(self, value):
+        if self.numeric and isinstance(value, str):
+            try:
+                return float(value)
+            except ValueError:
+                return value
+        return _value_key(value)
+
+    def eq(self, value):
+        return self.bitmaps.get(self._key(value), 0)
+
+    def any_of(self, values):
+        bitmap = 0
+        for value in values:
+            bitmap |= self.eq(value)
+        return bitmap
+
+    def between(self, low=None, high=None):
+        """Valeurs dans [low, high] (colonnes numériques)"""
+        if not self.numeric:
+            raise ValueError('between() requiert une colonne numérique')
+        keys = self._sorted_keys
+        lo = 0 if low is None else bisect.bisect_left(keys, float(low))
+        hi = len(keys) if high is None else bisect.bisect_right(keys, float(high))
+        bitmap = 0
+        for key in keys[lo:hi]:
+            bitmap |= self.bitmaps[key]
+        return bitmap
+
+    def counts(self, bitmap):
+        """[(valeur, nombre de lignes de `bitmap` ayant cette valeur)], valeurs absentes exclues"""
+        counts = []
+        for key, value_bitmap in self.bitmaps.items():
+            count = (bitmap & value_bitmap).bit_count()
+            if count:
+                counts.append((self.labels[key], count))
+        return counts
+
+
+class InvertedIndex:
+    """Tokens (normalisés comme fold_text) de plusieurs colonnes texte -> bitmap des lignes"""
+
+    def __init__(self, columns):
+        columns = list(columns)
+        self.size = len(columns[0]) if columns else 0
+        token_rows = {}
+        for values in columns:
+            for value, rows in _group_rows(values):
+                for token in set(tokenize(value)):
+                    token_rows.setdefault(token, []).append(rows)
+        self.vocabulary = sorted(token_rows)
+        self.bitmaps = [rows_to_bitmap(np.concatenate(token_rows[t]), self.size) for t in self.vocabulary]
+
+    def prefix(self, token):
+        """Lignes contenant un token qui commence par `token`"""
+        lo = bisect.bisect_left(self.vocabulary, token)
+        hi = bisect.bisect_left(self.vocabulary, token + '\U0010ffff')
+        bitmap = 0
+        for i in range(lo, hi):
+            bitmap |= self.bitmaps[i]
+        return bitmap
+
+    def search(self, query):
+        """Chaque mot de la requête doit être le préfixe d'un token de la ligne ; None si requête vide"""
+        bitmap = None
+        for token in tokenize(query):
+            found = self.prefix(token)
+            bitmap = found if bitmap is None else bitmap & found
+            if not bitmap:
+                break
+        return bitmap
@@ -0,0 +1,139 @@
+"""
+Prévisions de médailles par sport et par pays (modèle de tendance en panel)
+
+Pour chaque sport, on garde ses `window` dernières éditions disputées et, pour
+chaque couple (sport, pays) médaillé sur cette période, on ajuste une droite
+par type de médaille (or, argent, bronze) par moindres carrés pondérés : les
+éditions récentes pèsent plus (`decay`), et la pente est rétrécie vers 0
+(`shrinkage`) pour ne pas extrapoler une seule bonne édition. Toutes les
+séries sont ajustées en une fois avec des sommes NumPy.
+
+Le modèle ne stocke que des tableaux compacts (un couple par ligne, triés par
+sport) ; une prévision pour une année est une seule opération vectorisée
+a + b * x sur ces tableaux.
+"""
+import numpy as np
+
+MEDALS = ('gold', 'silver', 'bronze')
+
+DEFAULT_WINDOW = 6        # dernières éditions disputées du sport
+DEFAULT_DECAY = 0.6       # poids d'une édition relativement à la suivante
+DEFAULT_SHRINKAGE = 16.0  # pénalité ridge sur la pente (en olympiades²)
+ACTIVE_YEARS = 8          # un sport absent depuis plus longtemps n'est plus prévu
+OLYMPIAD = 4.0
+
+
+class SportForecastModel:
+    def __init__(self, sports, countries, country_names, pair_sport, pair_country,
+                 intercept, slope, ref_year, last_year, active, params=None):
+        self.sports = [str(s) for s in sports]
+        self.countries = [str(c) for c in countries]
+        self.country_names = [str(c) for c in country_names]
+        self.pair_sport = np.asarray(pair_sport, dtype=np.int32)
+        self.pair_country = np.asarray(pair_country, dtype=np.int32)
+        self.intercept = np.asarray(intercept, dtype=np.float32)   # (paires, 3)
+        self.slope = np.asarray(slope, dtype=np.float32)           # (paires, 3)
+        self.ref_year = np.asarray(ref_year, dtype=np.int32)       # dernière édition de la fenêtre, par sport
+        self.last_year = np.asarray(last_year, dtype=np.int32)
+        self.active = np.asarray(active, dtype=bool)
+        self.params = dict(params or {})
+        # paires triées par sport : offsets[s]:offsets[s + 1]
+        self.offsets = np.searchsorted(self.pair_sport, np.arange(len(self.sports) + 1))
+
+    # ---------- ajustement ----------
+    @classmethod
+    def fit(cls, df, window=DEFAULT_WINDOW, decay=DEFAULT_DECAY, shrinkage=DEFAULT_SHRINKAGE,
+            sport='sport', country='noc', country_name='country', year='year', medal='medal', weight='award_count'):
+        """Ajuster le modèle sur un DataFrame de médailles (une ligne par remise, `weight` médailles)"""
+        import pandas as pd
+
+        df = df[df[sport].notna() & df[country].notna() & df[year].notna()]
+        sport_codes, sports = pd.factorize(df[sport], sort=True)
+        country_codes, countries = pd.factorize(df[country], sort=True)
+        years = df[year].to_numpy(dtype=int)
+        counts = df[weight].fillna(0).to_numpy(dtype=float) if weight else np.ones(len(df))
+        medal_codes = pd.Categorical(df[medal].astype(str).str.upper(), categories=[m.upper() for m in MEDALS]).codes
+
+        # nom usuel de chaque pays (le plus fréquent)
+        names = df.groupby(country_codes)[country_name].agg(lambda s: s.mode().iat[0] if s.notna().any() else None)
+        country_names = [names.get(i) or code for i, code in enumerate(countries)]
+
+        # éditions disputées de chaque sport et position dans sa fenêtre (0 = la plus récente)
+        editions = pd.DataFrame({'s': sport_codes, 'y': years}).drop_duplicates()
+        editions['age'] = editions.groupby('s')['y'].rank(method='dense', ascending=False).astype(int) - 1
+        last_year = editions.groupby('s')['y'].max().reindex(range(len(sports))).to_numpy()
+        in_window = editions[editions['age'] < window]
+        ref_year = in_window.groupby('s')['y'].max().reindex(range(len(sports))).to_numpy()
+
+        # tenseur (sport, pays, édition de la fenêtre, médaille) restreint aux éditions de la fenêtre
+        age = editions.set_index(['s', 'y'])['age'].reindex(pd.MultiIndex.from_arrays([sport_codes, years])).to_numpy()
+        keep = (age < window) & (medal_codes >= 0)
+        pairs, pair_codes = np.unique(sport_codes[keep].astype(np.int64) * len(countries) + country_codes[keep],
+                                      return_inverse=True)
+        y = np.zeros((len(pairs), window, len(MEDALS)))
+        np.add.at(y, (pair_codes, age[keep], medal_codes[keep]), counts[keep])
+        pair_sport = (pairs // len(countries)).astype(np.int32)
+        pair_country = (pairs % len(countries)).astype(np.int32)
+
+        # abscisse (en olympiades, relative à la dernière édition) et poids de chaque position
+        window_years = np.full((len(sports), window), np.nan)
+        window_years[in_window['s'].to_numpy(), in_window['age'].to_numpy()] = in_window['y'].to_numpy()
+        x = (window_years - ref_year[:, None]) / OLYMPIAD
+        w = np.where(np.isnan(x), 0.0, decay ** np.arange(window))
+        x = np.nan_to_num(x)[pair_sport][:, :, None]
+        w = w[pair_sport][:, :, None]
+
+        # moindres carrés pondérés, pente pénalisée (ridge)
+        sw = w.sum(axis=1)
+        sx = (w * x).sum(axis=1)
+        sy = (w * y).sum(axis=1)
+        sxx = (w * x * x).sum(axis=1)
+        sxy = (w * x * y).sum(axis=1)
+        denominator = sw * sxx - sx * sx + shrinkage * sw
+        with np.errstate(divide='ignore', invalid='ignore'):
+            slope = np.where(denominator > 0, (sw * sxy - sx * sy) / denominator, 0.0)
+        intercept = (sy - slope * sx) / sw
+
+        active = last_year >= np.nanmax(last_year) - ACTIVE_YEARS
+        params = {'window': window, 'decay': decay, 'shrinkage': shrinkage}
+        return cls(list(sports), list(countries), country_names, pair_sport, pair_country,
+                   intercept, slope, ref_year, last_year, active, params)
+
+    # ---------- sauvegarde ----------
+    def save(self, path):
+        np.savez_compressed(
+            path,
+            sports=np.array(self.sports), countries=np.array(self.countries),
+            country_names=np.array(self.country_names),
+            pair_sport=self.pair_sport, pair_country=self.pair_country,
+            intercept=self.intercept, slope=self.slope,
+            ref_year=self.ref_year, last_year=self.last_year, active=self.active,
+            params=np.array([self.params['window'], self.params['decay'], self.params['shrinkage']], dtype=float),
+        )
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            window, decay, shrinkage = data['params'].tolist()
+            return cls(data['sports'].tolist(), data['countries'].tolist(), data['country_names'].tolist(),
+                       data['pair_sport'], data['pair_country'], data['intercept'], data['slope'],
+                       data['ref_year'], data['last_year'], data['active'],
+                       {'window': int(window), 'decay': decay, 'shrinkage': shrinkage})
+
+    # ---------- prévision ----------
+    def contested(self, year):
+        """Sports prévus pour les Jeux de `year` (actifs et de la même saison : été / hiver depuis 1994)"""
+        if year % 2:
+            return np.zeros(len(self.sports), dtype=bool)
+        return self.active & (self.last_year % 4 == year % 4)
+
+    def forecast(self, year):
+        """Médailles attendues de chaque paire pour `year` : tableau (paires, 3), négatifs ramenés à 0"""
+        x = (year - self.ref_year[self.pair_sport]) / OLYMPIAD
+        return np.maximum(self.intercept + self.slope * x[:, None], 0.0)
+
+    def sport_totals(self, year):
+        """Médailles attendues par sport pour `year` : tableau (sports, 3)"""
+        totals = np.zeros((len(self.sports), len(MEDALS)))
+        np.add.at(totals, self.pair_sport, self.forecast(year))
+        return totals
@@ -0,0 +1,115 @@
+"""
+Rapport de temps de démarrage (équivalent lisible de python -X importtime)
+
+Lance un interpréteur neuf avec -X importtime, importe le module cible puis,
+pour app, appelle create_app(). Usage :
+    python app.py --startup-report
+    python -m utils.startup fetch_data --top 20
+"""
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+_PROBE = '''
+import json, sys, time
+t0 = time.perf_counter()
+module = __import__({module!r})
+t1 = time.perf_counter()
+if {create_app!r} and hasattr(module, 'create_app'):
+    module.create_app()
+t2 = time.perf_counter()
+heavy = [name for name in ('pandas', 'numpy', 'scipy', 'sklearn', 'joblib', 'supabase') if name in sys.modules]
+print(json.dumps({{'import_s': t1 - t0, 'create_app_s': t2 - t1, 'heavy_modules': heavy}}))
+'''
+
+
+def parse_importtime(stderr):
+    """Lignes 'import time: self | cumulative | name' -> liste de dicts"""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # ligne d'en-tête
+        name = parts[2].rstrip()
+        stripped = name.lstrip()
+        entries.append({
+            'module': stripped,
+            'self_ms': int(parts[0]) / 1000,
+            'cumulative_ms': int(parts[1]) / 1000,
+            'depth': (len(name) - len(stripped) - 1) // 2,
+        })
+    return entries
+
+
+def startup_report(module='app', create_app=True):
+    """Mesurer le démarrage de `module` dans un sous-processus"""
+    code = _PROBE.format(module=module, create_app=create_app)
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=BACKEND_DIR, capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else 'échec du sous-processus')
+
+    summary = json.loads(proc.stdout.strip().splitlines()[-1])
+    entries = parse_importtime(proc.stderr)
+    summary['module'] = module
+    summary['create_app'] = create_app
+    summary['entries'] = entries
+    return summary
+
+
+def print_report(report, top=15):
+    entries = report['entries']
+    # importtime affiche les enfants avant le parent : les imports directs du module
+    # cible sont les entrées de profondeur 1 qui précèdent sa ligne de profondeur 0
+    direct = []
+    target = next((i for i in range(len(entries) - 1, -1, -1)
+                   if entries[i]['module'] == report['module'] and entries[i]['depth'] == 0), None)
+    if target is not None:
+        for e in reversed(entries[:target]):
+            if e['depth'] == 0:
+                break
+            if e['depth'] == 1:
+                direct.append(e)
+
+    print('=' * 72)
+    print(f"DEMARRAGE DE {report['module']}")
+    print('=' * 72)
+    print(f"Import      : {report['import_s'] * 1000:8.1f} ms")
+    if report['create_app']:
+        print(f"create_app  : {report['create_app_s'] * 1000:8.1f} ms")
+    print(f"Dépendances lourdes chargées : {', '.join(report['heavy_modules']) or 'aucune'}")
+
+    print("\nImports directs les plus coûteux (cumulé) :")
+    for e in sorted(direct, key=lambda e: -e['cumulative_ms'])[:top]:
+        print(f"  {e['cumulative_ms']:9.1f} ms  {e['module']}")
+
+    print("\nModules les plus coûteux (temps propre) :")
+    for e in sorted(entries, key=lambda e: -e['self_ms'])[:top]:
+        print(f"  {e['self_ms']:9.1f} ms  {e['module']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('module', nargs='?', default='app', help='module à importer (défaut: app)')
+    parser.add_argument('--top', type=int, default=15)
+    parser.add_argument('--json', action='store_true', help='sortie JSON brute')
+    args = parser.parse_args(argv)
+
+    report = startup_report(args.module, create_app=args.module == 'app')
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report, top=args.top)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
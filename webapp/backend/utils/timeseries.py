@@ -0,0 +1,220 @@
+"""
+Moteur de séries temporelles (entité x édition) vectorisé avec NumPy
+
+Les médailles sont rangées dans des matrices denses : une ligne par entité
+(pays, sport...), une colonne par édition (année), une matrice par série
+(gold, silver, bronze, total) et un masque `present` (l'entité a des lignes
+pour cette édition). Chaque métrique est calculée pour toutes les entités à la
+fois, puis mémorisée : une nouvelle métrique ne coûte qu'un calcul par
+instantané de données, pas un parcours par requête.
+
+Deux familles de métriques :
+- denses (moving_average, growth_rate, ranks, rank_change, momentum) : une
+  édition sans médaille compte pour 0 ;
+- « observées » (recent_mean, ewm, history_features) : seules les éditions où
+  l'entité est présente comptent, comme un groupby puis tail()/ewm() pandas.
+"""
+import numpy as np
+
+SERIES = ('gold', 'silver', 'bronze')
+
+# Caractéristiques historiques utilisées par les modèles de prédiction
+HISTORY_FEATURES = ('avg_recent_3', 'trend', 'consistency', 'peak_performance', 'years_since_last')
+
+
+def _shift_right(matrix, fill=0.0):
+    """Décaler d'une colonne vers la droite (valeur « avant l'édition t »)"""
+    shifted = np.empty_like(matrix)
+    shifted[:, 0] = fill
+    shifted[:, 1:] = matrix[:, :-1]
+    return shifted
+
+
+class TimeSeriesEngine:
+    def __init__(self, entities, editions, values, present):
+        self.entities = list(entities)
+        self.editions = np.asarray(editions)
+        self.values = {name: np.asarray(matrix, dtype=float) for name, matrix in values.items()}
+        if 'total' not in self.values:
+            self.values['total'] = sum(self.values[s] for s in SERIES if s in self.values)
+        self.present = np.asarray(present, dtype=bool)
+        self._positions = {entity: i for i, entity in enumerate(self.entities)}
+        self._memo = {}
+
+    @classmethod
+    def from_records(cls, df, entity='noc', edition='year', series=SERIES, medal_column=None, weight=None):
+        """Construire les matrices depuis un DataFrame de lignes
+
+        - colonnes `series` déjà présentes (gold/silver/bronze = 0/1), ou
+        - medal_column='medal' (GOLD/SILVER/BRONZE) pondéré par `weight` (ex. award_count).
+        """
+        import pandas as pd
+
+        df = df[df[entity].notna() & df[edition].notna()]
+        data = pd.DataFrame({'entity': df[entity].to_numpy(), 'edition': df[edition].to_numpy()})
+        counts = df[weight].fillna(0).to_numpy(dtype=float) if weight else np.ones(len(df))
+        for name in series:
+            if medal_column:
+                data[name] = np.where(df[medal_column].astype(str).str.upper().to_numpy() == name.upper(), counts, 0.0)
+            else:
+                data[name] = df[name].fillna(0).to_numpy(dtype=float)
+
+        entity_codes, entities = pd.factorize(data['entity'], sort=True)
+        edition_codes, editions = pd.factorize(data['edition'], sort=True)
+        shape = (len(entities), len(editions))
+
+        values = {}
+        for name in series:
+            matrix = np.zeros(shape)
+            np.add.at(matrix, (entity_codes, edition_codes), data[name].to_numpy())
+            values[name] = matrix
+        present = np.zeros(shape, dtype=bool)
+        present[entity_codes, edition_codes] = True
+        return cls(list(entities), np.asarray(editions), values, present)
+
+    # ---------- accès ----------
+    def series(self, name='total'):
+        return self.values[name]
+
+    def position(self, entity):
+        return self._positions.get(entity)
+
+    def _memoized(self, key, compute):
+        if key not in self._memo:
+            self._memo[key] = compute()
+        return self._memo[key]
+
+    # ---------- métriques denses (édition sans médaille = 0) ----------
+    def moving_average(self, window=3, series='total'):
+        """Moyenne mobile sur les `window` dernières éditions (fenêtre tronquée au début)"""
+        def compute():
+            values = self.values[series]
+            cumulative = np.cumsum(values, axis=1)
+            lagged = np.zeros_like(cumulative)
+            lagged[:, window:] = cumulative[:, :-window]
+            sizes = np.minimum(np.arange(1, values.shape[1] + 1), window)
+            return (cumulative - lagged) / sizes
+        return self._memoized(('moving_average', window, series), compute)
+
+    def growth_rate(self, series='total'):
+        """Variation relative par rapport à l'édition précédente (NaN si elle valait 0)"""
+        def compute():
+            values = self.values[series]
+            previous = _shift_right(values, np.nan)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                return np.where(previous > 0, (values - previous) / previous, np.nan)
+        return self._memoized(('growth_rate', series), compute)
+
+    def ranks(self, series='total'):
+        """Rang par édition parmi les entités présentes (1 = meilleur, ex æquo au même rang)"""
+        def compute():
+            values = np.where(self.present, self.values[series], -np.inf)
+            ordered = np.sort(-values, axis=0)
+            ranks = np.empty(values.shape)
+            for t in range(values.shape[1]):
+                ranks[:, t] = np.searchsorted(ordered[:, t], -values[:, t], side='left') + 1
+            return np.where(self.present, ranks, np.nan)
+        return self._memoized(('ranks', series), compute)
+
+    def rank_change(self, series='total'):
+        """Places gagnées depuis la dernière édition où l'entité était présente (positif = progression)"""
+        def compute():
+            ranks = self.ranks(series)
+            last = np.where(self.present, ranks, np.nan)
+            # dernier rang connu strictement avant chaque édition
+            index = np.where(self.present, np.arange(ranks.shape[1]), -1)
+            index = _shift_right(np.maximum.accumulate(index, axis=1).astype(float), -1).astype(int)
+            previous = np.take_along_axis(last, np.maximum(index, 0), axis=1)
+            previous[index < 0] = np.nan
+            return np.where(self.present, previous - ranks, np.nan)
+        return self._memoized(('rank_change', series), compute)
+
+    def momentum(self, short=2, long=5, series='total'):
+        """Écart entre moyenne mobile courte et longue (positif = dynamique ascendante)"""
+        return self._memoized(('momentum', short, long, series),
+                              lambda: self.moving_average(short, series) - self.moving_average(long, series))
+
+    # ---------- métriques sur les éditions observées ----------
+    def _observed(self, series):
+        """Valeurs observées compactées à gauche par entité et leurs sommes préfixes"""
+        def compute():
+            values = self.values[series]
+            counts = self.present.sum(axis=1)
+            order = np.argsort(~self.present, axis=1, kind='stable')
+            compact = np.take_along_axis(np.where(self.present, values, 0.0), order, axis=1)
+            prefix = np.zeros((values.shape[0], values.shape[1] + 1))
+            prefix[:, 1:] = np.cumsum(compact, axis=1)
+            return compact, prefix, counts
+        return self._memoized(('observed', series), compute)
+
+    def recent_mean(self, window=5, series='total'):
+        """Moyenne des `window` dernières éditions observées de chaque entité (0 si aucune)"""
+        def compute():
+            _, prefix, counts = self._observed(series)
+            start = np.maximum(counts - window, 0)
+            rows = np.arange(len(counts))
+            sizes = np.minimum(counts, window)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                return np.where(sizes > 0, (prefix[rows, counts] - prefix[rows, start]) / sizes, 0.0)
+        return self._memoized(('recent_mean', window, series), compute)
+
+    def ewm(self, alpha=0.5, series='total'):
+        """Dernière valeur de la moyenne exponentielle (pandas ewm(alpha, adjust=True)) des éditions observées"""
+        def compute():
+            values = self.values[series]
+            # rang de chaque édition observée en partant de la plus récente (0 = dernière)
+            from_end = np.cumsum(self.present[:, ::-1], axis=1)[:, ::-1] - 1
+            weights = np.where(self.present, (1 - alpha) ** from_end, 0.0)
+            totals = weights.sum(axis=1)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                return np.where(totals > 0, (weights * values).sum(axis=1) / totals, 0.0)
+        return self._memoized(('ewm', alpha, series), compute)
+
+    def history_features(self, series='total'):
+        """Caractéristiques de chaque (entité, édition) calculées sur les éditions observées AVANT elle
+
+        avg_recent_3 (moyenne des 3 dernières), trend (pente des moindres carrés, au moins
+        2 éditions), consistency (écart-type, ddof=1), peak_performance (maximum),
+        years_since_last (4 sans historique). Matrices entité x édition.
+        """
+        def compute():
+            values = np.where(self.present, self.values[series], 0.0)
+            present = self.present.astype(float)
+            years = np.broadcast_to(self.editions.astype(float) - self.editions.min(), values.shape)
+
+            # sommes cumulées exclusives (éditions strictement antérieures)
+            n = _shift_right(np.cumsum(present, axis=1))
+            sx = _shift_right(np.cumsum(years * present, axis=1))
+            sy = _shift_right(np.cumsum(values, axis=1))
+            sxx = _shift_right(np.cumsum(years * years * present, axis=1))
+            sxy = _shift_right(np.cumsum(years * values, axis=1))
+            syy = _shift_right(np.cumsum(values * values, axis=1))
+
+            with np.errstate(divide='ignore', invalid='ignore'):
+                denominator = n * sxx - sx * sx
+                trend = np.where((n >= 2) & (denominator > 0), (n * sxy - sx * sy) / denominator, 0.0)
+                variance = np.where(n > 1, (syy - sy * sy / n) / (n - 1), 0.0)
+            consistency = np.sqrt(np.maximum(variance, 0.0))
+
+            peak = _shift_right(np.maximum.accumulate(np.where(self.present, values, -np.inf), axis=1), -np.inf)
+            peak = np.where(n > 0, peak, 0.0)
+
+            last_year = np.where(self.present, self.editions.astype(float), -np.inf)
+            last_year = _shift_right(np.maximum.accumulate(last_year, axis=1), -np.inf)
+            years_since_last = np.where(n > 0, self.editions.astype(float) - last_year, 4.0)
+
+            # moyenne des 3 dernières éditions observées avant t
+            _, prefix, _ = self._observed(series)
+            count = n.astype(int)
+            recent = np.take_along_axis(prefix, count, axis=1) - np.take_along_axis(prefix, np.maximum(count - 3, 0), axis=1)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                avg_recent_3 = np.where(count > 0, recent / np.minimum(count, 3), 0.0)
+
+            return {
+                'avg_recent_3': avg_recent_3,
+                'trend': trend,
+                'consistency': consistency,
+                'peak_performance': peak,
+                'years_since_last': years_since_last,
+            }
+        return self._memoized(('history_features', series), compute)
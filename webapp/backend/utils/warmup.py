@@ -0,0 +1,163 @@
+"""
+Préchauffage au démarrage : données, modèles et réponses les plus demandées
+
+Après create_app, un thread démon exécute les étapes dans l'ordre (chargement
+des tables en mémoire, registre de modèles, payloads d'analyse précalculés)
+pour que les premiers utilisateurs après un déploiement ne paient ni la
+lecture des CSV / de Supabase ni le chargement des modèles. /api/health/ready
+répond 503 tant que le préchauffage n'est pas terminé ; une étape en échec est
+journalisée sans bloquer les suivantes.
+
+Variables d'environnement :
+- WARMUP_ENABLED : true (défaut) / false
+- WARMUP_STEPS   : étapes à exécuter, séparées par des virgules (défaut : toutes)
+"""
+import os
+import threading
+import time
+from datetime import datetime
+
+from utils import payloads
+
+# Tables lues par les services (snapshot mémoire du backend local ou DataFrame en cache)
+SNAPSHOT_TABLES = ('m_award', 'medals', 'hosts')
+
+# Payloads précalculés : (nom, arguments) des réponses les plus demandées
+WARM_PAYLOADS = (
+    ('france_medals', ()),
+    ('country_performance', ()),
+    ('gdp_summary', ()),
+    ('hosts_ranking', ()),
+    # page Prédictions : CountryPredictions / api.js predictTopCountries (modèle 'best' par défaut)
+    ('top_countries', (25, 2024, 'best')),
+    ('top_countries', (25, 2024, 'ma')),
+)
+
+
+def _warm_snapshots():
+    from database.supabase_client import get_supabase_client
+    client = get_supabase_client()
+    if client is None:
+        raise RuntimeError('Client Supabase non initialisé')
+    if hasattr(client, 'load_table'):
+        for table in SNAPSHOT_TABLES:
+            client.load_table(table)
+    # DataFrame m_award partagé par les analyses PIB (cache 'medals_data')
+    from routes.gdp_analysis_routes import load_medals_data
+    load_medals_data()
+
+
+def _warm_models():
+    from services.prediction_service import PredictionService
+    PredictionService._load_models()
+    PredictionService._sport_model()
+
+
+def _warm_payloads():
+    failed = []
+    for name, args in WARM_PAYLOADS:
+        try:
+            if payloads.is_failed(payloads.compute(name, *args)):
+                failed.append(name)
+        except Exception as error:
+            failed.append(f'{name} ({error})')
+    if failed:
+        raise RuntimeError(f"payloads en échec : {', '.join(failed)}")
+
+
+STEPS = (
+    ('snapshots', _warm_snapshots),
+    ('models', _warm_models),
+    ('payloads', _warm_payloads),
+)
+
+
+class Warmup:
+    """Exécute les étapes de préchauffage une fois, dans un thread démon"""
+
+    def __init__(self, steps=STEPS, enabled=True):
+        self.steps = list(steps)
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._thread = None
+        self.started_at = None
+        self.finished_at = None
+        self.results = {}
+        if not enabled:
+            self._done.set()
+
+    @property
+    def ready(self):
+        return self._done.is_set()
+
+    def run(self):
+        with self._lock:
+            self.started_at = self.started_at or time.time()
+        for name, step in self.steps:
+            start = time.perf_counter()
+            error = None
+            try:
+                step()
+            except Exception as exc:
+                error = str(exc)
+                print(f"Préchauffage '{name}' en échec : {error}")
+            with self._lock:
+                self.results[name] = {'duration_ms': round((time.perf_counter() - start) * 1000, 1), 'error': error}
+        with self._lock:
+            self.finished_at = time.time()
+        self._done.set()
+
+    def start(self):
+        if not self.enabled or self._thread is not None:
+            return
+        with self._lock:
+            self.started_at = time.time()
+        self._thread = threading.Thread(target=self.run, name='warmup', daemon=True)
+        self._thread.start()
+
+    def wait(self, timeout=None):
+        return self._done.wait(timeout)
+
+    def status(self):
+        with self._lock:
+            if not self.enabled:
+                state = 'disabled'
+            elif self.finished_at is not None:
+                state = 'done'
+            else:
+                state = 'running' if self.started_at is not None else 'pending'
+            return {
+                'state': state,
+                'ready': self.ready,
+                'started_at': datetime.fromtimestamp(self.started_at).isoformat() if self.started_at else None,
+                'duration_s': round(self.finished_at - self.started_at, 2) if self.finished_at else None,
+                'steps': dict(self.results),
+            }
+
+
+_warmup = None
+
+
+def _configured_steps():
+    selected = os.getenv('WARMUP_STEPS', '').strip()
+    if not selected:
+        return STEPS
+    names = {name.strip() for name in selected.split(',')}
+    return tuple(step for step in STEPS if step[0] in names)
+
+
+def get_warmup():
+    global _warmup
+    if _warmup is None:
+        enabled = os.getenv('WARMUP_ENABLED', 'true').lower() == 'true'
+        _warmup = Warmup(_configured_steps(), enabled=enabled)
+    return _warmup
+
+
+def init_warmup(app):
+    """Lancer le préchauffage en arrière-plan (après l'enregistrement des Blueprints)"""
+    warmup = get_warmup()
+    app.extensions['warmup'] = warmup
+    warmup.start()
+    return warmup
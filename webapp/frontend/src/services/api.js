@@ -93,6 +93,12 @@ export const olympicDataService = {
     return api.get('/olympic_results', { params });
   },
 
+  // Facettes : comptes par valeur de tous les filtres en un seul appel
+  // (table: 'm_award' ou 'medals' ; filtres : { noc: 'FRA,USA', medal: 'GOLD', year_min: 2000 })
+  getFacets: (table = 'm_award', filters = {}) => {
+    return api.get('/facets', { params: { table, ...filters } });
+  },
+
   // Villes hôtes
   getHosts: (params = {}) => {
     return api.get('/hosts', { params });
@@ -128,6 +134,9 @@ export const olympicDataService = {
       params: { year, model } 
     });
   },
+  predictCountriesMedals: (countries, years = [2024], model = 'best') => {
+    return api.post('/predictions/countries', { countries, years, model });
+  },
   predictTopCountries: (topN = 25, year = 2024, model = 'best') => {
     return api.get('/predictions/top-countries', { 
       params: { top_n: topN, year, model } 